@@ -0,0 +1,47 @@
+"""Create idempotency_key for replayed deliveries
+
+Revision ID: 5b7e9c2d4f61
+Revises: 8d2f4b6a1c3e
+Create Date: 2026-10-19 14:03:27.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from src.itaufluxcontrol.config.constants import STATIC_IDEMPOTENCY_COMPLETED, STATIC_IDEMPOTENCY_IN_PROGRESS
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e9c2d4f61'
+down_revision: Union[str, None] = '8d2f4b6a1c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'idempotency_key',
+        sa.Column('id', mysql.INTEGER(), autoincrement=True, nullable=False),
+        sa.Column('key', mysql.VARCHAR(collation='utf8mb4_general_ci', length=64), nullable=False),
+        sa.Column('route', mysql.VARCHAR(collation='utf8mb4_general_ci', length=100), nullable=False),
+        sa.Column('status', mysql.ENUM(STATIC_IDEMPOTENCY_IN_PROGRESS, STATIC_IDEMPOTENCY_COMPLETED, collation='utf8mb4_general_ci'), nullable=False, server_default=STATIC_IDEMPOTENCY_IN_PROGRESS),
+        sa.Column('response', mysql.JSON(), nullable=True),
+        sa.Column('created_at', mysql.DATETIME(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('expires_at', mysql.DATETIME(), nullable=False),
+        sa.Column('date_deleted', mysql.DATETIME(), nullable=True),
+        sa.Column('deleted_by', mysql.VARCHAR(collation='utf8mb4_general_ci', length=255), nullable=True),
+        sa.Column('tenant_id', mysql.INTEGER(), nullable=False, server_default='1'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key', name='uq_idempotency_key_key'),
+        mysql_collate='utf8mb4_general_ci',
+        mysql_default_charset='utf8mb4',
+        mysql_engine='InnoDB'
+    )
+    op.create_index('idx_idempotency_key_expires_at', 'idempotency_key', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_idempotency_key_expires_at', table_name='idempotency_key')
+    op.drop_table('idempotency_key')
@@ -0,0 +1,51 @@
+"""Create outbox_message for post-commit dispatches
+
+Revision ID: 8d2f4b6a1c3e
+Revises: 317f492f38cd
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_DISPATCHED, STATIC_OUTBOX_DISPATCHING, STATIC_OUTBOX_FAILED, STATIC_OUTBOX_PENDING
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b6a1c3e'
+down_revision: Union[str, None] = '317f492f38cd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_message',
+        sa.Column('id', mysql.INTEGER(), autoincrement=True, nullable=False),
+        sa.Column('operation', mysql.VARCHAR(collation='utf8mb4_general_ci', length=100), nullable=False),
+        sa.Column('aggregate_id', mysql.INTEGER(), nullable=True),
+        sa.Column('payload', mysql.JSON(), nullable=False),
+        sa.Column('status', mysql.ENUM(STATIC_OUTBOX_PENDING, STATIC_OUTBOX_DISPATCHING, STATIC_OUTBOX_DISPATCHED, STATIC_OUTBOX_FAILED, collation='utf8mb4_general_ci'), nullable=False, server_default=STATIC_OUTBOX_PENDING),
+        sa.Column('attempts', mysql.INTEGER(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', mysql.DATETIME(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('claimed_at', mysql.DATETIME(), nullable=True),
+        sa.Column('claim_token', mysql.VARCHAR(collation='utf8mb4_general_ci', length=36), nullable=True),
+        sa.Column('dispatched_at', mysql.DATETIME(), nullable=True),
+        sa.Column('last_error', mysql.VARCHAR(collation='utf8mb4_general_ci', length=1000), nullable=True),
+        sa.Column('created_at', mysql.DATETIME(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('date_deleted', mysql.DATETIME(), nullable=True),
+        sa.Column('deleted_by', mysql.VARCHAR(collation='utf8mb4_general_ci', length=255), nullable=True),
+        sa.Column('tenant_id', mysql.INTEGER(), nullable=False, server_default='1'),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_collate='utf8mb4_general_ci',
+        mysql_default_charset='utf8mb4',
+        mysql_engine='InnoDB'
+    )
+    op.create_index('idx_outbox_message_status_next_attempt', 'outbox_message', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_outbox_message_status_next_attempt', table_name='outbox_message')
+    op.drop_table('outbox_message')
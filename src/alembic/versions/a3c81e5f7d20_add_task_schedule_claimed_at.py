@@ -0,0 +1,26 @@
+"""Add claimed_at to task_schedule for atomic trigger claims
+
+Revision ID: a3c81e5f7d20
+Revises: 5b7e9c2d4f61
+Create Date: 2026-10-19 15:21:09.744310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c81e5f7d20'
+down_revision: Union[str, None] = '5b7e9c2d4f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task_schedule', sa.Column('claimed_at', mysql.DATETIME(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('task_schedule', 'claimed_at')
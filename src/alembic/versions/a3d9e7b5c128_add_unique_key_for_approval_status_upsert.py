@@ -0,0 +1,37 @@
+"""Add unique key to approval_status.task_schedule_id for upserts
+
+Revision ID: a3d9e7b5c128
+Revises: f2b8c6d1e347
+Create Date: 2026-10-19 20:11:37.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e7b5c128'
+down_revision: Union[str, None] = 'f2b8c6d1e347'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicatas antigas: mantém a aprovação mais recente de cada agendamento
+    op.execute("""
+        CREATE TEMPORARY TABLE approval_status_duplicates AS
+        SELECT task_schedule_id, MAX(id) AS keep_id
+        FROM approval_status GROUP BY task_schedule_id HAVING COUNT(*) > 1
+    """)
+    op.execute("""
+        DELETE a FROM approval_status a
+        JOIN approval_status_duplicates d ON d.task_schedule_id = a.task_schedule_id
+        WHERE a.id <> d.keep_id
+    """)
+    op.execute("DROP TEMPORARY TABLE approval_status_duplicates")
+
+    op.create_unique_constraint('uq_approval_status_task_schedule_id', 'approval_status', ['task_schedule_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_approval_status_task_schedule_id', 'approval_status', type_='unique')
@@ -0,0 +1,126 @@
+"""Create table_process_summary replacing table_process_view
+
+Revision ID: b6e2f9a4d317
+Revises: a3d9e7b5c128
+Create Date: 2026-10-19 21:36:08.204719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2f9a4d317'
+down_revision: Union[str, None] = 'a3d9e7b5c128'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_process_summary',
+        sa.Column('id', mysql.INTEGER(), autoincrement=True, nullable=False),
+        sa.Column('table_id', mysql.INTEGER(), nullable=False),
+        sa.Column('partition_key', mysql.VARCHAR(collation='utf8mb4_general_ci', length=40), nullable=False),
+        sa.Column('partition_set', mysql.TEXT(collation='utf8mb4_general_ci'), nullable=False),
+        sa.Column('table_name', mysql.VARCHAR(collation='utf8mb4_general_ci', length=255), nullable=False),
+        sa.Column('table_description', mysql.TEXT(collation='utf8mb4_general_ci'), nullable=True),
+        sa.Column('execution_id', mysql.INTEGER(), nullable=False),
+        sa.Column('execution_time', mysql.DATETIME(), nullable=False),
+        sa.Column('approver_name', mysql.VARCHAR(collation='utf8mb4_general_ci', length=255), nullable=True),
+        sa.Column('task_executors', mysql.TEXT(collation='utf8mb4_general_ci'), nullable=True),
+        sa.Column('status', mysql.VARCHAR(collation='utf8mb4_general_ci', length=50), nullable=True),
+        sa.Column('last_updated', mysql.DATETIME(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('date_deleted', mysql.DATETIME(), nullable=True),
+        sa.Column('deleted_by', mysql.VARCHAR(collation='utf8mb4_general_ci', length=255), nullable=True),
+        sa.Column('tenant_id', mysql.INTEGER(), nullable=False, server_default='1'),
+        sa.ForeignKeyConstraint(['table_id'], ['tables.id']),
+        sa.ForeignKeyConstraint(['execution_id'], ['table_execution.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('table_id', 'partition_key', name='uq_table_process_summary_table_partition'),
+        mysql_collate='utf8mb4_general_ci',
+        mysql_default_charset='utf8mb4',
+        mysql_engine='InnoDB'
+    )
+    op.create_index('idx_table_process_summary_execution_id', 'table_process_summary', ['execution_id'])
+
+    # Carga inicial, uma única vez: a última execução de cada tabela x conjunto
+    # de partições, com executores, aprovador e status dos agendamentos que ela disparou
+    op.execute("SET SESSION group_concat_max_len = 65535")
+    op.execute("""
+        INSERT INTO table_process_summary (
+            table_id, partition_key, partition_set, table_name, table_description,
+            execution_id, execution_time, approver_name, task_executors, status, last_updated
+        )
+        SELECT
+            latest.table_id, SHA1(latest.partition_set), latest.partition_set, t.name, t.description,
+            latest.execution_id, latest.date_time,
+            (SELECT aps.approver_name FROM task_schedule ts
+             JOIN approval_status aps ON aps.task_schedule_id = ts.id
+             WHERE ts.table_execution_id = latest.execution_id AND aps.approver_name IS NOT NULL
+             ORDER BY aps.reviewed_at DESC LIMIT 1),
+            (SELECT GROUP_CONCAT(DISTINCT tex.alias ORDER BY tex.alias SEPARATOR ', ') FROM task_schedule ts
+             JOIN task_table tt ON tt.id = ts.task_id
+             JOIN task_executor tex ON tex.id = tt.task_executor_id
+             WHERE ts.table_execution_id = latest.execution_id),
+            (SELECT ts.status FROM task_schedule ts
+             WHERE ts.table_execution_id = latest.execution_id
+             ORDER BY ts.id DESC LIMIT 1),
+            UTC_TIMESTAMP()
+        FROM (
+            SELECT
+                executions.*,
+                ROW_NUMBER() OVER (
+                    PARTITION BY executions.table_id, executions.partition_set
+                    ORDER BY executions.date_time DESC, executions.execution_id DESC
+                ) AS position
+            FROM (
+                SELECT
+                    te.id AS execution_id, te.table_id, te.date_time,
+                    COALESCE(GROUP_CONCAT(CONCAT(p.name, '=', tpe.value) ORDER BY p.name SEPARATOR ', '), '') AS partition_set
+                FROM table_execution te
+                LEFT JOIN table_partition_exec tpe ON tpe.execution_id = te.id
+                LEFT JOIN partitions p ON p.id = tpe.partition_id
+                WHERE te.date_deleted IS NULL
+                GROUP BY te.id, te.table_id, te.date_time
+            ) executions
+        ) latest
+        JOIN tables t ON t.id = latest.table_id
+        WHERE latest.position = 1
+    """)
+
+    op.execute("DROP VIEW IF EXISTS table_process_view")
+
+
+def downgrade() -> None:
+    op.execute("""
+    CREATE VIEW table_process_view AS
+    SELECT
+        t.name AS table_name,
+        t.description AS table_description,
+        GROUP_CONCAT(CONCAT(p.name, '=', tpe.value) SEPARATOR ', ') AS partition_set,
+        te.date_time AS execution_time,
+        aps.approver_name,
+        GROUP_CONCAT(te_exec.alias SEPARATOR ', ') AS task_executors
+    FROM
+        tables t
+    JOIN
+        table_execution te ON t.id = te.table_id
+    LEFT JOIN
+        table_partition_exec tpe ON te.id = tpe.execution_id
+    LEFT JOIN
+        partitions p ON tpe.partition_id = p.id
+    LEFT JOIN
+        task_schedule ts ON te.id = ts.table_execution_id
+    LEFT JOIN
+        task_table tt ON ts.task_id = tt.id
+    LEFT JOIN
+        task_executor te_exec ON tt.task_executor_id = te_exec.id
+    LEFT JOIN
+        approval_status aps ON ts.id = aps.task_schedule_id
+    GROUP BY
+        te.id, t.name, t.description, te.date_time, aps.approver_name;
+    """)
+    op.drop_table('table_process_summary')
@@ -0,0 +1,35 @@
+"""Add index on task_schedule.result_execution_id for execution lineage
+
+Revision ID: c4f8a2e6b931
+Revises: b6e2f9a4d317
+Create Date: 2026-10-19 22:48:51.306127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2e6b931'
+down_revision: Union[str, None] = 'b6e2f9a4d317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A coluna existe no modelo, mas nenhuma migration anterior a cria
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('task_schedule')}
+    missing = 'result_execution_id' not in columns
+    if missing:
+        op.add_column('task_schedule', sa.Column('result_execution_id', mysql.INTEGER(), nullable=True))
+
+    # Linhagem para cima: agendamentos que produziram a execução
+    op.create_index('idx_task_schedule_result_execution_id', 'task_schedule', ['result_execution_id'])
+    if missing:
+        op.create_foreign_key('task_schedule_ibfk_3', 'task_schedule', 'table_execution', ['result_execution_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_task_schedule_result_execution_id', table_name='task_schedule')
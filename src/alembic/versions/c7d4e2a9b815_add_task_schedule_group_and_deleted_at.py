@@ -0,0 +1,30 @@
+"""Add schedule_group and schedule_deleted_at to task_schedule
+
+Revision ID: c7d4e2a9b815
+Revises: a3c81e5f7d20
+Create Date: 2026-10-19 17:02:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d4e2a9b815'
+down_revision: Union[str, None] = 'a3c81e5f7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task_schedule', sa.Column('schedule_group', mysql.VARCHAR(length=64), nullable=True))
+    op.add_column('task_schedule', sa.Column('schedule_deleted_at', mysql.DATETIME(), nullable=True))
+    op.create_index('idx_task_schedule_status_schedule_deleted_at', 'task_schedule', ['status', 'schedule_deleted_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_task_schedule_status_schedule_deleted_at', table_name='task_schedule')
+    op.drop_column('task_schedule', 'schedule_deleted_at')
+    op.drop_column('task_schedule', 'schedule_group')
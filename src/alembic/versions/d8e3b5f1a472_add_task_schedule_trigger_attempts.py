@@ -0,0 +1,26 @@
+"""Add trigger_attempts to task_schedule
+
+Revision ID: d8e3b5f1a472
+Revises: c4f8a2e6b931
+Create Date: 2026-10-19 23:41:07.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e3b5f1a472'
+down_revision: Union[str, None] = 'c4f8a2e6b931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task_schedule', sa.Column('trigger_attempts', mysql.INTEGER(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('task_schedule', 'trigger_attempts')
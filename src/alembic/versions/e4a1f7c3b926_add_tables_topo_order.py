@@ -0,0 +1,57 @@
+"""Add topo_order to tables
+
+Revision ID: e4a1f7c3b926
+Revises: c7d4e2a9b815
+Create Date: 2026-10-19 18:11:27.503916
+
+"""
+from collections import deque
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1f7c3b926'
+down_revision: Union[str, None] = 'c7d4e2a9b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tables', sa.Column('topo_order', mysql.INTEGER(), nullable=True))
+    op.create_index('idx_tables_topo_order', 'tables', ['topo_order'])
+
+    # Preenche a ordem topológica (Kahn) como uma permutação dos IDs; tabelas
+    # em ciclos já existentes ficam no fim, em ordem de ID
+    bind = op.get_bind()
+    table_ids = [row.id for row in bind.execute(sa.text("SELECT id FROM tables ORDER BY id"))]
+    in_degree = dict.fromkeys(table_ids, 0)
+    dependents = {table_id: [] for table_id in table_ids}
+    for row in bind.execute(sa.text("SELECT table_id, dependency_id FROM dependencies WHERE date_deleted IS NULL")):
+        if row.table_id in in_degree and row.dependency_id in in_degree:
+            dependents[row.dependency_id].append(row.table_id)
+            in_degree[row.table_id] += 1
+
+    ordered = []
+    ready = deque(table_id for table_id, degree in in_degree.items() if degree == 0)
+    while ready:
+        node = ready.popleft()
+        ordered.append(node)
+        for dependent in dependents[node]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                ready.append(dependent)
+    ordered += [table_id for table_id, degree in in_degree.items() if degree > 0]
+
+    if ordered:
+        bind.execute(
+            sa.text("UPDATE tables SET topo_order = :topo_order, last_modified_at = last_modified_at WHERE id = :id"),
+            [{"id": table_id, "topo_order": order} for table_id, order in zip(ordered, table_ids)],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tables_topo_order', table_name='tables')
+    op.drop_column('tables', 'topo_order')
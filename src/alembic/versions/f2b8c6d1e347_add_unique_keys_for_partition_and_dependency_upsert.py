@@ -0,0 +1,76 @@
+"""Add unique keys to partitions and dependencies for set-based upserts
+
+Revision ID: f2b8c6d1e347
+Revises: e4a1f7c3b926
+Create Date: 2026-10-19 19:04:52.117630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c6d1e347'
+down_revision: Union[str, None] = 'e4a1f7c3b926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicatas antigas: mantém a linha de menor ID (reativada se alguma
+    # cópia estava ativa) e aponta as referências para ela antes de remover
+    op.execute("""
+        CREATE TEMPORARY TABLE partition_duplicates AS
+        SELECT table_id, name, MIN(id) AS keep_id, MAX(date_deleted IS NULL) AS active
+        FROM partitions GROUP BY table_id, name HAVING COUNT(*) > 1
+    """)
+    op.execute("""
+        UPDATE table_partition_exec tpe
+        JOIN partitions p ON p.id = tpe.partition_id
+        JOIN partition_duplicates d ON d.table_id = p.table_id AND d.name = p.name
+        SET tpe.partition_id = d.keep_id
+        WHERE p.id <> d.keep_id
+    """)
+    op.execute("""
+        UPDATE partitions p JOIN partition_duplicates d ON d.keep_id = p.id
+        SET p.date_deleted = NULL, p.deleted_by = NULL
+        WHERE d.active = 1
+    """)
+    op.execute("""
+        DELETE p FROM partitions p
+        JOIN partition_duplicates d ON d.table_id = p.table_id AND d.name = p.name
+        WHERE p.id <> d.keep_id
+    """)
+    op.execute("DROP TEMPORARY TABLE partition_duplicates")
+
+    op.execute("""
+        CREATE TEMPORARY TABLE dependency_duplicates AS
+        SELECT table_id, dependency_id, MIN(id) AS keep_id, MAX(date_deleted IS NULL) AS active
+        FROM dependencies GROUP BY table_id, dependency_id HAVING COUNT(*) > 1
+    """)
+    op.execute("""
+        UPDATE dependencies o
+        JOIN dependencies dup ON dup.id = o.optative_with_dependency_id
+        JOIN dependency_duplicates d ON d.table_id = dup.table_id AND d.dependency_id = dup.dependency_id
+        SET o.optative_with_dependency_id = d.keep_id
+        WHERE dup.id <> d.keep_id
+    """)
+    op.execute("""
+        UPDATE dependencies p JOIN dependency_duplicates d ON d.keep_id = p.id
+        SET p.date_deleted = NULL, p.deleted_by = NULL
+        WHERE d.active = 1
+    """)
+    op.execute("""
+        DELETE p FROM dependencies p
+        JOIN dependency_duplicates d ON d.table_id = p.table_id AND d.dependency_id = p.dependency_id
+        WHERE p.id <> d.keep_id
+    """)
+    op.execute("DROP TEMPORARY TABLE dependency_duplicates")
+
+    op.create_unique_constraint('uq_partitions_table_id_name', 'partitions', ['table_id', 'name'])
+    op.create_unique_constraint('uq_dependencies_table_id_dependency_id', 'dependencies', ['table_id', 'dependency_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_dependencies_table_id_dependency_id', 'dependencies', type_='unique')
+    op.drop_constraint('uq_partitions_table_id_name', 'partitions', type_='unique')
@@ -0,0 +1,60 @@
+import json
+import os
+from typing import Any, Dict, List
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# p99 com poucas amostras é dominado por pausas de GC: é reportado, mas não bloqueia.
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+
+
+def load_baselines(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(profile: str, results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH):
+    baselines = load_baselines(path)
+    baselines[profile] = results
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 2.0,
+    min_delta_kb: float = 64.0,
+) -> List[str]:
+    """
+    Compara os resultados com o baseline do perfil e devolve as regressões.
+
+    Tempo, throughput e memória variam com a máquina: só contam quando passam
+    de `tolerance` e também de um piso absoluto (`min_delta_ms`/`min_delta_kb`),
+    para rotas sub-milissegundo não acusarem ruído. `queries_per_call` é
+    determinístico e qualquer aumento é regressão.
+    """
+    regressions = []
+    for scenario, metrics in results.items():
+        expected = baseline.get(scenario)
+        if not expected:
+            continue
+        for metric in LATENCY_METRICS:
+            current, reference = metrics[metric], expected.get(metric)
+            if reference and current > reference * (1 + tolerance) and current - reference > min_delta_ms:
+                regressions.append(f"{scenario}: {metric} {current} > {reference} (+{tolerance:.0%})")
+        current, reference = metrics["throughput"], expected.get("throughput")
+        if reference and current and current < reference * (1 - tolerance) and 1000 / current - 1000 / reference > min_delta_ms:
+            regressions.append(f"{scenario}: throughput {current} < {reference} (-{tolerance:.0%})")
+        current, reference = metrics["peak_memory_kb"], expected.get("peak_memory_kb")
+        if reference and current > reference * (1 + tolerance) and current - reference > min_delta_kb:
+            regressions.append(f"{scenario}: peak_memory_kb {current} > {reference} (+{tolerance:.0%})")
+        if metrics["queries_per_call"] > expected.get("queries_per_call", float("inf")):
+            regressions.append(f"{scenario}: queries_per_call {metrics['queries_per_call']} > {expected['queries_per_call']}")
+        if metrics["errors"] > expected.get("errors", 0):
+            regressions.append(f"{scenario}: errors {metrics['errors']} > {expected.get('errors', 0)}")
+    return regressions
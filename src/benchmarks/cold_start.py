@@ -0,0 +1,155 @@
+"""
+Benchmark de cold start: cada medição roda em um processo novo (spawn), que
+monta o Injector, constrói o `ItauFluxControl` e atende a primeira requisição,
+com o `AppModule` em modo eager e em modo lazy.
+
+O boto3 é real (a construção de sessão e clients é parte do custo); o banco é
+SQLite em memória e a chamada ao Secrets Manager é simulada com `--secret-latency-ms`.
+
+    python -m src.benchmarks.cold_start --runs 5
+    python -m src.benchmarks.cold_start --route /health --route /task-schedules --secret-latency-ms 80
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from aws_lambda_powertools.event_handler import ApiGatewayResolver
+from injector import Binder, ClassProvider, Injector, NoScope, singleton
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.benchmarks.runner import percentile
+from src.itaufluxcontrol.config.config import AppModule
+from src.itaufluxcontrol.itaufluxcontrol import ItauFluxControl
+from src.itaufluxcontrol.models.base import Base
+from src.itaufluxcontrol.provider.database_provider import DatabaseProvider
+from src.itaufluxcontrol.service.boto_service import BotoService
+
+DEFAULT_ROUTES = ("/health", "/tables")
+
+
+class ColdStartDatabaseProvider(DatabaseProvider):
+    """
+    DatabaseProvider com SQLite em memória. Constrói o client real do
+    Secrets Manager e simula apenas a latência da chamada.
+    """
+    secret_latency_ms = 50.0
+    secrets_fetched = 0
+
+    def _get_secret(self, secret_name):
+        self.boto_service.get_client("secretsmanager")
+        time.sleep(self.secret_latency_ms / 1000)
+        ColdStartDatabaseProvider.secrets_fetched += 1
+        return json.dumps({})
+
+    def _configure_database(self):
+        self._get_secret(os.getenv("DB_SECRET_NAME", "default_secret"))
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+
+class ColdStartBotoService(BotoService):
+    """
+    BotoService real que conta os clients criados no processo.
+    """
+    clients_created = 0
+
+    def get_client(self, service_name, region_name=None):
+        if service_name != "requests" and (service_name, region_name) not in self._clients:
+            ColdStartBotoService.clients_created += 1
+        return super().get_client(service_name, region_name)
+
+
+class ColdStartModule(AppModule):
+    def configure(self, binder: Binder) -> None:
+        super().configure(binder)
+        binder.bind(DatabaseProvider, to=ColdStartDatabaseProvider, scope=singleton)
+        binder.bind(BotoService, to=self.provider(BotoService, ClassProvider(ColdStartBotoService)), scope=singleton if self.lazy else NoScope)
+
+
+def _cold_start_worker(lazy: bool, route: str, secret_latency_ms: float, results):
+    ColdStartDatabaseProvider.secret_latency_ms = secret_latency_ms
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        injector = Injector([ColdStartModule(lazy=lazy)])
+        app = ItauFluxControl(injector=injector, app_resolver=ApiGatewayResolver())
+        built = time.perf_counter()
+        response = app.process_event({"httpMethod": "GET", "path": route}, None)
+        finished = time.perf_counter()
+
+    results.put({
+        "init_ms": (built - started) * 1000,
+        "first_request_ms": (finished - built) * 1000,
+        "status": response.get("statusCode", 200),
+        "boto_clients": ColdStartBotoService.clients_created,
+        "secrets_fetched": ColdStartDatabaseProvider.secrets_fetched,
+    })
+
+
+def measure(lazy: bool, route: str, runs: int, secret_latency_ms: float) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    samples: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        results = context.Queue()
+        process = context.Process(target=_cold_start_worker, args=(lazy, route, secret_latency_ms, results))
+        process.start()
+        samples.append(results.get(timeout=120))
+        process.join()
+
+    totals = [sample["init_ms"] + sample["first_request_ms"] for sample in samples]
+    last = samples[-1]
+    return {
+        "mode": "lazy" if lazy else "eager",
+        "route": route,
+        "runs": runs,
+        "init_ms": round(percentile([sample["init_ms"] for sample in samples], 50), 2),
+        "first_request_ms": round(percentile([sample["first_request_ms"] for sample in samples], 50), 2),
+        "total_p50_ms": round(percentile(totals, 50), 2),
+        "status": last["status"],
+        "boto_clients": last["boto_clients"],
+        "secrets_fetched": last["secrets_fetched"],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks.cold_start", description="Cold start eager x lazy do ItauFluxControl.")
+    parser.add_argument("--route", action="append", help=f"Rota medida (padrão: {', '.join(DEFAULT_ROUTES)}).")
+    parser.add_argument("--runs", type=int, default=5, help="Processos novos por combinação modo/rota.")
+    parser.add_argument("--secret-latency-ms", type=float, default=50.0, help="Latência simulada do Secrets Manager.")
+    parser.add_argument("--output", help="Arquivo para salvar o resultado em JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = [
+        measure(lazy, route, args.runs, args.secret_latency_ms)
+        for route in (args.route or DEFAULT_ROUTES)
+        for lazy in (False, True)
+    ]
+
+    print(f"{'rota':<22}{'modo':>7}{'init':>10}{'1ª req':>10}{'total':>10}{'clients':>9}{'secrets':>9}")
+    for result in results:
+        print(
+            f"{result['route']:<22}{result['mode']:>7}{result['init_ms']:>10.2f}{result['first_request_ms']:>10.2f}"
+            f"{result['total_p50_ms']:>10.2f}{result['boto_clients']:>9}{result['secrets_fetched']:>9}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
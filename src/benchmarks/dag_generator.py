@@ -0,0 +1,172 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from src.itaufluxcontrol.models.dependencies import Dependencies
+from src.itaufluxcontrol.models.partitions import Partitions
+from src.itaufluxcontrol.models.table_execution import TableExecution
+from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
+from src.itaufluxcontrol.models.tables import Tables
+from src.itaufluxcontrol.models.task_executor import TaskExecutor
+from src.itaufluxcontrol.models.task_table import TaskTable
+
+SHAPES = ("chain", "fan_out", "fan_in", "diamond", "layered")
+
+
+@dataclass
+class GeneratedDag:
+    """
+    Resumo do DAG gerado, usado pelo runner para montar os eventos.
+    """
+    shape: str
+    table_names: List[str] = field(default_factory=list)
+    roots: List[str] = field(default_factory=list)
+    tasks: Dict[str, str] = field(default_factory=dict)
+    partitions: List[str] = field(default_factory=list)
+    table_ids: Dict[str, int] = field(default_factory=dict)
+    partition_ids: Dict[Tuple[int, str], int] = field(default_factory=dict)
+
+
+class DagGenerator:
+    """
+    Gera DAGs sintéticos de tabelas direto no banco via inserts em lote,
+    sem passar pelas rotas (10k tabelas via /tables levariam minutos).
+
+    Formatos:
+      - chain:   t0 -> t1 -> ... -> tN
+      - fan_out: t0 -> (t1..tN)
+      - fan_in:  (t0..tN-1) -> tN
+      - diamond: t0 -> (t1..tN-1) -> tN
+      - layered: camadas de largura fixa, cada tabela depende de até 3 da camada anterior
+    """
+
+    PARTITIONS = (
+        {"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True},
+        {"name": "versao_processamento", "type": "int", "is_required": True, "sync_column": False},
+    )
+    EXECUTOR_ALIAS = "benchmark_sqs_executor"
+    QUEUE_URL = "http://localhost:4566/000000000000/benchmark-queue"
+
+    def __init__(self, session: Session, chunk_size: int = 5000, seed: int = 42):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.random = random.Random(seed)
+
+    def generate(self, shape: str, size: int, layer_width: int = 100) -> GeneratedDag:
+        if shape not in SHAPES:
+            raise ValueError(f"Formato de DAG desconhecido: {shape}. Opções: {', '.join(SHAPES)}")
+        if size < 3:
+            raise ValueError("O DAG precisa de pelo menos 3 tabelas.")
+
+        edges = getattr(self, f"_{shape}_edges")(size, layer_width)
+        return self._persist(shape, size, edges)
+
+    def _chain_edges(self, size: int, layer_width: int) -> List[tuple]:
+        return [(index, index - 1) for index in range(1, size)]
+
+    def _fan_out_edges(self, size: int, layer_width: int) -> List[tuple]:
+        return [(index, 0) for index in range(1, size)]
+
+    def _fan_in_edges(self, size: int, layer_width: int) -> List[tuple]:
+        return [(size - 1, index) for index in range(size - 1)]
+
+    def _diamond_edges(self, size: int, layer_width: int) -> List[tuple]:
+        middle = range(1, size - 1)
+        return [(index, 0) for index in middle] + [(size - 1, index) for index in middle]
+
+    def _layered_edges(self, size: int, layer_width: int) -> List[tuple]:
+        edges = []
+        for index in range(layer_width, size):
+            layer_start = (index // layer_width - 1) * layer_width
+            parents = self.random.sample(range(layer_start, layer_start + layer_width), k=min(3, layer_width))
+            edges.extend((index, parent) for parent in parents)
+        return edges
+
+    def _persist(self, shape: str, size: int, edges: List[tuple]) -> GeneratedDag:
+        now = datetime.utcnow()
+        table_offset = self._next_id(Tables)
+        partition_offset = self._next_id(Partitions)
+        executor_id = self._ensure_executor()
+
+        dag = GeneratedDag(shape=shape, partitions=[p["name"] for p in self.PARTITIONS])
+        tables, partitions, tasks = [], [], []
+        for index in range(size):
+            table_id = table_offset + index
+            name = f"bench_{shape}_{table_id}"
+            alias = f"{name}_task"
+            dag.table_names.append(name)
+            dag.table_ids[name] = table_id
+            dag.tasks[name] = alias
+            tables.append({
+                "id": table_id, "name": name, "description": f"Tabela sintética {shape}",
+                "requires_approval": False, "created_by": "benchmark", "created_at": now, "last_modified_at": now,
+            })
+            for offset, partition in enumerate(self.PARTITIONS):
+                partition_id = partition_offset + index * len(self.PARTITIONS) + offset
+                dag.partition_ids[(table_id, partition["name"])] = partition_id
+                partitions.append({"id": partition_id, "table_id": table_id, **partition})
+            tasks.append({
+                "table_id": table_id, "task_executor_id": executor_id, "alias": alias,
+                "params": {"table_name": "{{table.name}}"}, "debounce_seconds": 30,
+            })
+
+        dependents = {child for child, _ in edges}
+        dag.roots = [name for index, name in enumerate(dag.table_names) if index not in dependents]
+        dependencies = [
+            {"table_id": table_offset + child, "dependency_id": table_offset + parent, "is_required": True}
+            for child, parent in edges
+        ]
+
+        for model, rows in ((Tables, tables), (Partitions, partitions), (Dependencies, dependencies), (TaskTable, tasks)):
+            self._bulk_insert(model, rows)
+        self.session.commit()
+        return dag
+
+    def seed_executions(self, dag: GeneratedDag, count: int, source: str = "benchmark-seed"):
+        """
+        Popula o histórico com `count` execuções (e suas partições) distribuídas
+        entre as tabelas do DAG, com datas no passado para não interferir nas
+        execuções medidas.
+        """
+        if count <= 0:
+            return
+        ids = list(dag.table_ids.values())
+        execution_offset = self._next_id(TableExecution)
+        past = datetime.utcnow() - timedelta(days=365)
+
+        for start in range(0, count, self.chunk_size):
+            executions, partition_execs = [], []
+            for number in range(start, min(start + self.chunk_size, count)):
+                execution_id = execution_offset + number
+                table_id = ids[number % len(ids)]
+                executed_at = past + timedelta(seconds=number)
+                executions.append({"id": execution_id, "table_id": table_id, "date_time": executed_at, "source": source})
+                values = {"ano_mes_referencia": str(190001 + number % 1200), "versao_processamento": str(number)}
+                for name, value in values.items():
+                    partition_execs.append({
+                        "table_id": table_id, "partition_id": dag.partition_ids[(table_id, name)], "value": value,
+                        "execution_date": executed_at, "execution_id": execution_id,
+                    })
+            self._bulk_insert(TableExecution, executions)
+            self._bulk_insert(TablePartitionExec, partition_execs)
+            self.session.commit()
+
+    def _ensure_executor(self) -> int:
+        executor = self.session.query(TaskExecutor).filter_by(alias=self.EXECUTOR_ALIAS).first()
+        if not executor:
+            executor = TaskExecutor(alias=self.EXECUTOR_ALIAS, method="sqs_process", identification=self.QUEUE_URL)
+            self.session.add(executor)
+            self.session.flush()
+        return executor.id
+
+    def _next_id(self, model) -> int:
+        return (self.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+    def _bulk_insert(self, model, rows: Iterable[dict]):
+        rows = list(rows)
+        for start in range(0, len(rows), self.chunk_size):
+            self.session.execute(insert(model), rows[start:start + self.chunk_size])
@@ -0,0 +1,271 @@
+"""
+Replay de eventos gravados contra o `ItauFluxControl`.
+
+1. Com `EVENT_CAPTURE_ENABLED=true`, a Lambda grava cada evento recebido
+   (já sem dados sensíveis) como uma linha `"type": "captured_event"` no log.
+2. `extract` converte o log exportado do CloudWatch em um arquivo de replay (JSONL).
+3. `run` reexecuta o arquivo com vários processos — cada um com seu próprio
+   Injector e sessão — contra um banco compartilhado (SQLite em arquivo ou MySQL).
+
+    python -m src.benchmarks.replay extract logs.txt -o replay.jsonl
+    python -m src.benchmarks.replay run replay.jsonl --workers 8 --rate 40 --duplicate 2 --latency-ms 80
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import create_engine, func, select
+
+from src.benchmarks.runner import BenchmarkRunner, percentile
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService
+
+SETUP_ROUTES = {("POST", "/tables"), ("POST", "/task_executor"), ("POST", "/tasks")}
+
+
+@dataclass
+class ReplayConfig:
+    database_url: str = "sqlite:///replay.db"
+    workers: int = 4
+    rate: float = 0.0
+    duplicate: int = 1
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    respect_timing: bool = False
+    speed: float = 1.0
+
+
+def extract_events(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Extrai os eventos capturados de linhas de log (o JSON pode vir precedido
+    pelo prefixo do CloudWatch ou do formatter texto) e calcula o offset de cada um.
+    """
+    captured = []
+    for line in lines:
+        start = line.find("{")
+        if start < 0 or "captured_event" not in line:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get("type") == "captured_event":
+            captured.append(record)
+    captured.sort(key=lambda record: record["captured_at"])
+    first = captured[0]["captured_at"] if captured else 0
+    return [
+        {"offset_ms": round((record["captured_at"] - first) * 1000, 3), "event": record["event"]}
+        for record in captured
+    ]
+
+
+def write_replay_file(path: str, records: List[Dict[str, Any]]):
+    with open(path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+
+def load_replay_file(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def route_of(event: Dict[str, Any]) -> Tuple[str, str]:
+    return event.get("httpMethod", "unknown"), event.get("path", "unknown")
+
+
+def _replay_worker(worker_id: int, config: ReplayConfig, records: List[Dict[str, Any]], barrier, results):
+    """
+    Processo de replay: monta seu próprio Injector/sessão e dispara os eventos
+    em malha aberta — a latência é medida a partir do horário planejado, então
+    o tempo de fila entra na conta quando o sistema não acompanha a taxa.
+    """
+    boto_service = MockBotoService(latency_ms=config.latency_ms, jitter_ms=config.jitter_ms)
+    runner = BenchmarkRunner(config.database_url, memory_sample=0, boto_service=boto_service)
+    interval = config.workers / config.rate if config.rate else 0.0
+    samples = []
+
+    barrier.wait(timeout=120)
+    started = time.time()
+    with runner.silenced():
+        for index, record in enumerate(records):
+            if config.respect_timing:
+                planned = started + record["offset_ms"] / 1000 / config.speed
+            else:
+                planned = started + index * interval
+            delay = planned - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            call_started = time.time()
+            response = runner.app.process_event(record["event"], None)
+            finished = time.time()
+            status = response.get("statusCode", 200) if isinstance(response, dict) else 200
+            error = None
+            if status >= 400:
+                error = str(response.get("error") or response.get("body") or "")[:200]
+            samples.append({
+                "route": " ".join(route_of(record["event"])),
+                "latency_ms": (finished - min(planned, call_started)) * 1000,
+                "service_ms": (finished - call_started) * 1000,
+                "status": status,
+                "error": error,
+            })
+    runner.session.close()
+    runner.engine.dispose()
+    results.put((worker_id, samples))
+
+
+class ReplayDriver:
+    def __init__(self, config: ReplayConfig):
+        self.config = config
+
+    def split(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
+        """
+        Separa os eventos de cadastro (executados antes, em série) e distribui
+        o restante em round-robin. Com `duplicate > 1`, as cópias de um mesmo
+        evento caem em workers diferentes no mesmo instante planejado —
+        é assim que se força a corrida em `task_schedule`.
+        """
+        setup = [record for record in records if route_of(record["event"]) in SETUP_ROUTES]
+        load = [
+            record
+            for record in records if route_of(record["event"]) not in SETUP_ROUTES
+            for _ in range(self.config.duplicate)
+        ]
+        shards = [load[worker::self.config.workers] for worker in range(self.config.workers)]
+        return setup, shards
+
+    def run(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        setup, shards = self.split(records)
+
+        runner = BenchmarkRunner(self.config.database_url, memory_sample=0)
+        with runner.silenced():
+            for record in setup:
+                runner.app.process_event(record["event"], None)
+        runner.session.close()
+        runner.engine.dispose()
+
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(self.config.workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_replay_worker, args=(worker, self.config, shard, barrier, results))
+            for worker, shard in enumerate(shards)
+        ]
+        started = time.time()
+        for process in processes:
+            process.start()
+        samples = []
+        pending = len(processes)
+        while pending:
+            try:
+                samples.extend(results.get(timeout=1)[1])
+                pending -= 1
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break
+        for process in processes:
+            process.join()
+        crashed = [process.exitcode for process in processes if process.exitcode]
+        if crashed:
+            raise RuntimeError(f"{len(crashed)} worker(s) de replay falharam (exit codes: {crashed}).")
+        elapsed = time.time() - started
+
+        return self.report(samples, elapsed)
+
+    def report(self, samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        by_route = defaultdict(list)
+        for sample in samples:
+            by_route[sample["route"]].append(sample)
+
+        routes = {}
+        for route, route_samples in sorted(by_route.items()):
+            latencies = [sample["latency_ms"] for sample in route_samples]
+            routes[route] = {
+                "count": len(route_samples),
+                "errors": sum(1 for sample in route_samples if sample["status"] >= 400),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+            }
+
+        errors = Counter(sample["error"] for sample in samples if sample["error"])
+        return {
+            "events": len(samples),
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            "routes": routes,
+            "errors": dict(errors.most_common(10)),
+            "duplicated_pending_schedules": self.duplicated_pending_schedules(),
+        }
+
+    def duplicated_pending_schedules(self) -> Dict[str, int]:
+        """
+        Detecta o sintoma clássico da corrida de registro: mais de um
+        `task_schedule` ativo para o mesmo `unique_alias`.
+        """
+        engine = create_engine(self.config.database_url)
+        try:
+            with engine.connect() as connection:
+                rows = connection.execute(
+                    select(TaskSchedule.unique_alias, func.count(TaskSchedule.id))
+                    .where(TaskSchedule.status.in_([STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL]))
+                    .group_by(TaskSchedule.unique_alias)
+                    .having(func.count(TaskSchedule.id) > 1)
+                ).all()
+        finally:
+            engine.dispose()
+        return {alias: count for alias, count in rows}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks.replay", description="Replay de eventos capturados.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser("extract", help="Extrai eventos capturados de um log exportado.")
+    extract.add_argument("log_file")
+    extract.add_argument("-o", "--output", default="replay.jsonl")
+
+    run = commands.add_parser("run", help="Reexecuta um arquivo de replay.")
+    run.add_argument("replay_file")
+    run.add_argument("--database-url", default=ReplayConfig.database_url, help="Banco compartilhado entre os processos (não use SQLite em memória).")
+    run.add_argument("--workers", type=int, default=ReplayConfig.workers)
+    run.add_argument("--rate", type=float, default=0.0, help="Eventos/s somando todos os workers (0 = sem limite).")
+    run.add_argument("--duplicate", type=int, default=1, help="Dispara cada evento N vezes em paralelo.")
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Latência injetada nos clients AWS fake.")
+    run.add_argument("--jitter-ms", type=float, default=0.0)
+    run.add_argument("--respect-timing", action="store_true", help="Usa os intervalos gravados em vez de --rate.")
+    run.add_argument("--speed", type=float, default=1.0, help="Multiplicador de velocidade com --respect-timing.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.command == "extract":
+        with open(args.log_file, encoding="utf-8") as file:
+            records = extract_events(file)
+        write_replay_file(args.output, records)
+        print(f"{len(records)} eventos gravados em {args.output}")
+        return 0
+
+    if args.database_url in ("sqlite://", "sqlite:///:memory:"):
+        print("SQLite em memória não é compartilhado entre processos; use um arquivo ou MySQL.", file=sys.stderr)
+        return 2
+    config = ReplayConfig(
+        database_url=args.database_url, workers=args.workers, rate=args.rate, duplicate=args.duplicate,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, respect_timing=args.respect_timing, speed=args.speed,
+    )
+    report = ReplayDriver(config).run(load_replay_file(args.replay_file))
+    print(json.dumps(report, indent=2))
+    return 1 if report["duplicated_pending_schedules"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
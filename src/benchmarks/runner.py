@@ -0,0 +1,218 @@
+import contextlib
+import io
+import json
+import logging
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from aws_lambda_powertools.event_handler import ApiGatewayResolver
+from injector import Binder, Injector, singleton
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.benchmarks.dag_generator import DagGenerator, GeneratedDag
+from src.itaufluxcontrol.config.config import AppModule
+from src.itaufluxcontrol.config.query_counter import query_counter
+from src.itaufluxcontrol.itaufluxcontrol import ItauFluxControl
+from src.itaufluxcontrol.models.base import Base
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService
+from src.tests.providers.mock_session_provider import TestSessionProvider
+
+LIST_ROUTES = ("/tables", "/tasks-tables", "/task-schedules", "/approval-status", "/task_executor")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Percentil por interpolação linear (mesma convenção do numpy).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    statements: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    peak_memory_kb: float = 0.0
+
+    @property
+    def iterations(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def throughput(self) -> float:
+        return self.iterations / self.total_seconds if self.total_seconds else 0.0
+
+    @property
+    def queries_per_call(self) -> float:
+        return self.statements / self.iterations if self.iterations else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "errors": self.errors,
+            "throughput": round(self.throughput, 2),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 3),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 3),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 3),
+            "queries_per_call": round(self.queries_per_call, 2),
+            "peak_memory_kb": round(self.peak_memory_kb, 1),
+        }
+
+
+class BenchmarkRunner:
+    """
+    Executa cenários contra `ItauFluxControl.process_event`, com os clients
+    mockados de `tests/providers` no lugar da AWS.
+
+    Cada cenário roda `iterations` chamadas cronometradas e, em seguida,
+    `memory_sample` chamadas sob tracemalloc (fora das latências, para o
+    overhead do tracemalloc não distorcer os percentis).
+    """
+
+    def __init__(self, database_url: str = "sqlite://", memory_sample: int = 10, quiet: bool = True, boto_service: Optional[MockBotoService] = None):
+        in_memory = database_url in ("sqlite://", "sqlite:///:memory:")
+        engine_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}} if in_memory else {}
+        self.engine = create_engine(database_url, **engine_options)
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.boto_service = boto_service or MockBotoService()
+        self.memory_sample = memory_sample
+        self.quiet = quiet
+
+        session = self.session
+        boto_service = self.boto_service
+
+        class BenchmarkModule(AppModule):
+            def configure(self, binder: Binder) -> None:
+                super().configure(binder)
+                binder.bind(BotoService, to=boto_service, scope=singleton)
+                binder.bind(SessionProvider, to=TestSessionProvider(session))
+
+        self.injector = Injector([BenchmarkModule()])
+        self.app = ItauFluxControl(injector=self.injector, app_resolver=ApiGatewayResolver())
+        self._version = 0
+
+    def generate(self, shape: str, size: int, executions: int = 0) -> GeneratedDag:
+        generator = DagGenerator(self.session)
+        dag = generator.generate(shape, size)
+        generator.seed_executions(dag, executions)
+        return dag
+
+    @contextlib.contextmanager
+    def silenced(self):
+        """
+        Silencia logs (abaixo de ERROR) e os prints dos mocks/EMF durante a medição.
+        """
+        if not self.quiet:
+            yield
+            return
+        root = logging.getLogger()
+        level = root.level
+        root.setLevel(logging.ERROR)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                yield
+        finally:
+            root.setLevel(level)
+
+    def measure(self, name: str, events: Iterator[dict], iterations: int) -> ScenarioResult:
+        result = ScenarioResult(name)
+        with self.silenced():
+            started = time.perf_counter()
+            for _ in range(iterations):
+                event = next(events, None)
+                if event is None:
+                    break
+                call_started = time.perf_counter()
+                with query_counter.count() as stats:
+                    response = self.app.process_event(event, None)
+                result.latencies_ms.append((time.perf_counter() - call_started) * 1000)
+                result.statements += stats.statements
+                if response.get("statusCode", 200) >= 400:
+                    result.errors += 1
+            result.total_seconds = time.perf_counter() - started
+
+            if self.memory_sample:
+                tracemalloc.start()
+                try:
+                    baseline, _ = tracemalloc.get_traced_memory()
+                    for _ in range(self.memory_sample):
+                        event = next(events, None)
+                        if event is None:
+                            break
+                        self.app.process_event(event, None)
+                    _, peak = tracemalloc.get_traced_memory()
+                    result.peak_memory_kb = (peak - baseline) / 1024
+                finally:
+                    tracemalloc.stop()
+        return result
+
+    def register_events(self, dag: GeneratedDag) -> Iterator[dict]:
+        while True:
+            for root in dag.roots:
+                self._version += 1
+                yield self._event("POST", "/register_execution", {
+                    "data": [{
+                        "table_name": root,
+                        "partitions": [
+                            {"partition_name": "ano_mes_referencia", "value": "202405"},
+                            {"partition_name": "versao_processamento", "value": str(self._version)},
+                        ],
+                        "source": "benchmark",
+                    }],
+                    "user": "benchmark",
+                })
+
+    def trigger_events(self) -> Iterator[dict]:
+        """
+        Dispara os agendamentos criados pelo cenário de registro, usando o
+        mesmo payload que o EventBridge Scheduler entregaria.
+        """
+        for schedule in list(self.boto_service.scheduler._schedules.values()):
+            payload = json.loads(schedule["Target"]["Input"])
+            yield self._event("POST", "/trigger", payload["body"])
+
+    def run_events(self, dag: GeneratedDag) -> Iterator[dict]:
+        while True:
+            for root in dag.roots:
+                yield self._event("POST", "/run", {"table_name": root, "task_name": dag.tasks[root]})
+
+    def impact_events(self, dag: GeneratedDag) -> Iterator[dict]:
+        while True:
+            for root in dag.roots:
+                yield self._event("GET", f"/tables/{dag.table_ids[root]}/impact")
+
+    def list_events(self, route: str) -> Iterator[dict]:
+        while True:
+            yield self._event("GET", route)
+
+    def run_all(self, dag: GeneratedDag, iterations: int) -> Dict[str, ScenarioResult]:
+        scenarios: Dict[str, Callable[[], Iterator[dict]]] = {
+            "register_execution": lambda: self.register_events(dag),
+            "trigger": self.trigger_events,
+            "run": lambda: self.run_events(dag),
+            "GET /tables/<id>/impact": lambda: self.impact_events(dag),
+            **{f"GET {route}": (lambda route=route: self.list_events(route)) for route in LIST_ROUTES},
+        }
+        return {name: self.measure(name, events(), iterations) for name, events in scenarios.items()}
+
+    @staticmethod
+    def _event(method: str, path: str, body: Optional[dict] = None) -> dict:
+        event = {"httpMethod": method, "path": path}
+        if body is not None:
+            event["body"] = json.dumps(body)
+        return event
@@ -1,19 +1,60 @@
 import logging
+import os
+from typing import Optional
 import boto3
-from injector import Binder, Module, singleton
+from injector import Binder, CallableProvider, ClassProvider, Module, Provider, singleton
 from src.itaufluxcontrol.provider.boto3_session_provider import Boto3SessionProvider
 from src.itaufluxcontrol.config.logger import logger
+from src.itaufluxcontrol.provider.lazy_provider import LazyProvider
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.database_scheduler_service import DatabaseSchedulerService
+from src.itaufluxcontrol.service.dependency_graph_service import DependencyGraphService
+from src.itaufluxcontrol.service.idempotency_service import IdempotencyService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
 from src.itaufluxcontrol.service.table_service import TableService
 from src.itaufluxcontrol.service.table_partition_exec_service import TablePartitionExecService
 from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
 
 class AppModule(Module):
-    """Configuração das dependências para o Injector."""
+    """
+    Configuração das dependências para o Injector.
+
+    Com `lazy=True`, os singletons caros (sessão de banco, boto3 e serviços
+    que criam clients no construtor) são entregues como proxies e só são
+    construídos no primeiro uso — rotas como `/health` não abrem conexão,
+    não consultam o Secrets Manager nem criam clients.
+
+    `scheduler_backend` (padrão `SCHEDULER_BACKEND`, `eventbridge`) escolhe o
+    backend do debounce: `eventbridge` cria um schedule por agendamento;
+    `database` guarda o horário só no banco e usa o tick/worker.
+    """
+    def __init__(self, lazy: bool = False, scheduler_backend: Optional[str] = None):
+        self.lazy = lazy
+        self.scheduler_backend = scheduler_backend or os.getenv("SCHEDULER_BACKEND", "eventbridge")
+
     def configure(self, binder: Binder) -> None:
-        binder.bind(SessionProvider, to=SessionProvider, scope=singleton)
-        binder.bind(TableService, to=TableService, scope=singleton)
-        binder.bind(TablePartitionExecService, to=TablePartitionExecService, scope=singleton)
-        binder.bind(EventBridgeSchedulerService, to=EventBridgeSchedulerService, scope=singleton)
+        binder.bind(SessionProvider, to=self.provider(SessionProvider), scope=singleton)
+        binder.bind(TableService, to=self.provider(TableService), scope=singleton)
+        binder.bind(TablePartitionExecService, to=self.provider(TablePartitionExecService), scope=singleton)
+        if self.scheduler_backend == "database":
+            binder.bind(EventBridgeSchedulerService, to=self.provider(EventBridgeSchedulerService, ClassProvider(DatabaseSchedulerService)), scope=singleton)
+        else:
+            binder.bind(EventBridgeSchedulerService, to=self.provider(EventBridgeSchedulerService), scope=singleton)
+        binder.bind(IdempotencyService, to=self.provider(IdempotencyService), scope=singleton)
+        # Singleton para o snapshot do grafo sobreviver entre invocações
+        binder.bind(DependencyGraphService, to=self.provider(DependencyGraphService), scope=singleton)
+        # Sempre lazy: o dreno pós-commit só olha o outbox se algum serviço o usou na invocação
+        binder.bind(OutboxService, to=LazyProvider(OutboxService, ClassProvider(OutboxService)), scope=singleton)
         binder.bind(logging.Logger, to=logger),
-        binder.bind(boto3.Session, to=Boto3SessionProvider().provide_session(), scope=singleton)
+        if self.lazy:
+            binder.bind(boto3.Session, to=self.provider(boto3.Session, CallableProvider(Boto3SessionProvider().provide_session)), scope=singleton)
+            binder.bind(BotoService, to=self.provider(BotoService), scope=singleton)
+            binder.bind(CloudWatchService, to=self.provider(CloudWatchService), scope=singleton)
+        else:
+            binder.bind(boto3.Session, to=Boto3SessionProvider().provide_session(), scope=singleton)
+
+    def provider(self, interface: type, provider: Provider = None) -> Provider:
+        provider = provider or ClassProvider(interface)
+        return LazyProvider(interface, provider) if self.lazy else provider
@@ -6,4 +6,10 @@ STATIC_SCHEDULE_WAITING_APPROVAL = 'waiting_approval'
 
 STATIC_APPROVE_STATUS_PENDING = 'pending'
 STATIC_APPROVE_STATUS_APPROVED = 'approved'
-STATIC_APPROVE_STATUS_REJECTED = 'rejected'
\ No newline at end of file
+STATIC_APPROVE_STATUS_REJECTED = 'rejected'
+STATIC_OUTBOX_PENDING = 'pending'
+STATIC_OUTBOX_DISPATCHING = 'dispatching'
+STATIC_OUTBOX_DISPATCHED = 'dispatched'
+STATIC_OUTBOX_FAILED = 'failed'
+STATIC_IDEMPOTENCY_IN_PROGRESS = 'in_progress'
+STATIC_IDEMPOTENCY_COMPLETED = 'completed'
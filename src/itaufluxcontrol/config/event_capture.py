@@ -0,0 +1,92 @@
+import copy
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+from src.itaufluxcontrol.config.logger import logger
+
+SCRUBBED = "***"
+
+SENSITIVE_HEADERS = {"authorization", "cookie", "x-api-key", "x-amz-security-token", "x-amz-date", "proxy-authorization"}
+SENSITIVE_KEYS = {"password", "secret", "token", "authorization", "api_key", "apikey", "access_key", "credentials"}
+PSEUDONYMIZED_KEYS = {"user", "deleted_by", "created_by", "last_modified_by"}
+REQUEST_CONTEXT_KEEP = {"httpMethod", "path", "resourcePath", "stage", "requestTimeEpoch"}
+
+
+class EventCapture:
+    """
+    Captura os eventos recebidos pela Lambda (API Gateway e EventBridge Scheduler)
+    como linhas JSON no log (`"type": "captured_event"`), já sem dados sensíveis,
+    para serem extraídas depois em um arquivo de replay (`src/benchmarks/replay.py`).
+
+    - Headers de autenticação e chaves sensíveis do body são mascarados.
+    - Usuários viram pseudônimos estáveis (`user-<hash>`), preservando a cardinalidade.
+    - `requestContext` mantém apenas método, path e horário.
+    """
+
+    def __init__(self):
+        self.logger = logger
+        self.enabled = os.getenv("EVENT_CAPTURE_ENABLED", "false").lower() == "true"
+        self.sample_rate = float(os.getenv("EVENT_CAPTURE_SAMPLE_RATE", "1.0"))
+        extra_keys = os.getenv("EVENT_CAPTURE_SCRUB_KEYS", "")
+        self.sensitive_keys = SENSITIVE_KEYS | {key.strip().lower() for key in extra_keys.split(",") if key.strip()}
+
+    def capture(self, event: Dict[str, Any]):
+        if not self.enabled or random.random() >= self.sample_rate:
+            return
+        try:
+            self.logger.info(json.dumps({
+                "type": "captured_event",
+                "captured_at": time.time(),
+                "event": self.scrub_event(event),
+            }, default=str))
+        except Exception as e:
+            self.logger.warning(f"[{self.__class__.__name__}] Failed to capture event: {e}")
+
+    def scrub_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        scrubbed = copy.deepcopy(event)
+
+        for headers_key in ("headers", "multiValueHeaders"):
+            headers = scrubbed.get(headers_key)
+            if isinstance(headers, dict):
+                for name in list(headers):
+                    if name.lower() in SENSITIVE_HEADERS:
+                        headers[name] = SCRUBBED
+
+        request_context = scrubbed.get("requestContext")
+        if isinstance(request_context, dict):
+            scrubbed["requestContext"] = {key: value for key, value in request_context.items() if key in REQUEST_CONTEXT_KEEP}
+
+        body = scrubbed.get("body")
+        if isinstance(body, str) and body:
+            try:
+                scrubbed["body"] = json.dumps(self._scrub_value(json.loads(body)))
+            except ValueError:
+                scrubbed["body"] = SCRUBBED
+        elif body is not None:
+            scrubbed["body"] = self._scrub_value(body)
+
+        for key in ("queryStringParameters", "pathParameters"):
+            if isinstance(scrubbed.get(key), dict):
+                scrubbed[key] = self._scrub_value(scrubbed[key])
+        return scrubbed
+
+    def _scrub_value(self, value: Any, key: Optional[str] = None) -> Any:
+        if isinstance(value, dict):
+            return {k: self._scrub_value(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._scrub_value(item, key) for item in value]
+        if key is None or value is None:
+            return value
+        lowered = key.lower()
+        if any(sensitive in lowered for sensitive in self.sensitive_keys):
+            return SCRUBBED
+        if lowered in PSEUDONYMIZED_KEYS and isinstance(value, str):
+            return f"user-{hashlib.sha256(value.encode('utf-8')).hexdigest()[:8]}"
+        return value
+
+
+event_capture = EventCapture()
@@ -1,14 +1,131 @@
+import json
 import logging
+import os
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+_request_id: ContextVar[Optional[str]] = ContextVar("itaufluxcontrol_request_id", default=None)
+_unique_alias: ContextVar[Optional[str]] = ContextVar("itaufluxcontrol_unique_alias", default=None)
+_debug_sampled: ContextVar[bool] = ContextVar("itaufluxcontrol_debug_sampled", default=False)
+
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "unique_alias", "correlation"}
+
+
+class SampledLogger(logging.Logger):
+    """
+    Logger que, além do nível configurado, libera DEBUG nas invocações
+    sorteadas por `log_context.invocation` (`DEBUG_SAMPLE_RATE`).
+
+    Como a decisão passa por `isEnabledFor`, chamadas no estilo
+    `logger.debug("... %s", valor)` não formatam nada fora da amostra.
+    """
+
+    def isEnabledFor(self, level: int) -> bool:
+        if super().isEnabledFor(level):
+            return True
+        return level >= logging.DEBUG and _debug_sampled.get()
+
+
+class CorrelationFilter(logging.Filter):
+    """
+    Anexa o request id e o `unique_alias` da invocação corrente a cada registro.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        record.unique_alias = _unique_alias.get()
+        parts = [f"{key}={value}" for key, value in (("request_id", record.request_id), ("unique_alias", record.unique_alias)) if value]
+        record.correlation = f"[{' '.join(parts)}] " if parts else ""
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Emite uma linha JSON por registro. Mensagens que já são objetos JSON
+    (ex.: o resumo do tracer) têm seus campos promovidos para o nível raiz,
+    e campos passados via `extra=` entram como campos estruturados.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        document = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        for key in ("request_id", "unique_alias"):
+            if getattr(record, key, None):
+                document[key] = getattr(record, key)
+
+        structured = None
+        if message.startswith("{"):
+            try:
+                structured = json.loads(message)
+            except ValueError:
+                structured = None
+        if isinstance(structured, dict):
+            document.update({key: value for key, value in structured.items() if key not in document})
+        else:
+            document["message"] = message
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key not in document:
+                document[key] = value
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class LogContext:
+    """
+    Contexto de correlação e amostragem de DEBUG por invocação.
+    """
+
+    def __init__(self):
+        self.debug_sample_rate = float(os.getenv("DEBUG_SAMPLE_RATE", "0"))
+
+    @contextmanager
+    def invocation(self, request_id: Optional[str]):
+        tokens = (
+            _request_id.set(request_id),
+            _unique_alias.set(None),
+            _debug_sampled.set(self.debug_sample_rate > 0 and random.random() < self.debug_sample_rate),
+        )
+        try:
+            yield
+        finally:
+            for var, token in zip((_request_id, _unique_alias, _debug_sampled), tokens):
+                var.reset(token)
+
+    def bind_unique_alias(self, unique_alias: Optional[str]):
+        _unique_alias.set(unique_alias)
+
+    @property
+    def request_id(self) -> Optional[str]:
+        return _request_id.get()
+
 
 def setup_logger() -> logging.Logger:
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
     handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    if os.getenv("LOG_FORMAT", "json").lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(correlation)s%(message)s'))
+    handler.addFilter(CorrelationFilter())
+    root.addHandler(handler)
 
+    logging.setLoggerClass(SampledLogger)
+    try:
+        logger = logging.getLogger("itaufluxcontrol")
+    finally:
+        logging.setLoggerClass(logging.Logger)
     return logger
 
 logger = setup_logger()
+log_context = LogContext()
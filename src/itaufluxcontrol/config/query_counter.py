@@ -0,0 +1,94 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """
+    Contadores de SQL de uma invocação: statements, linhas e tempo de banco.
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.db_time_ms = 0.0
+        self._statements: Counter = Counter()
+
+    def record(self, statement: str, rowcount: int, elapsed_ms: float):
+        self.statements += 1
+        self.rows += max(rowcount, 0)
+        self.db_time_ms += elapsed_ms
+        self._statements[" ".join(statement.split())[:300]] += 1
+
+    def most_common(self, limit: int = 10) -> List[Tuple[str, int]]:
+        return self._statements.most_common(limit)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "sql_statements": self.statements,
+            "sql_rows": self.rows,
+            "sql_time_ms": round(self.db_time_ms, 3),
+        }
+
+
+class QueryCounter:
+    """
+    Instrumento baseado em eventos do SQLAlchemy (`before/after_cursor_execute`).
+
+    Os listeners são registrados uma única vez na classe `Engine` e só contam
+    quando existe um `count()` ativo no contexto corrente, então o custo fora
+    de uma invocação é apenas uma leitura de ContextVar.
+
+    `rows` usa o `cursor.rowcount` do driver: linhas afetadas em DML e, no
+    PyMySQL, linhas retornadas em SELECT (no SQLite, SELECT não contabiliza).
+
+    O início de cada statement fica no `context` da execução, e não na conexão:
+    um statement que falha não dispara `after_cursor_execute` e, assim, não
+    deixa resíduo na conexão devolvida ao pool.
+    """
+
+    def __init__(self):
+        self._active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("itaufluxcontrol_query_stats", default=())
+        self._installed = False
+
+    def install(self):
+        if self._installed:
+            return
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        self._installed = True
+
+    @contextmanager
+    def count(self, stats: Optional[QueryStats] = None):
+        """
+        Conta os statements executados dentro do bloco. Blocos aninhados
+        contam de forma independente (o externo também vê os do interno).
+        """
+        stats = stats if stats is not None else QueryStats()
+        token = self._active.set(self._active.get() + (stats,))
+        try:
+            yield stats
+        finally:
+            self._active.reset(token)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active.get() and context is not None:
+            context._itaufluxcontrol_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        active = self._active.get()
+        if not active:
+            return
+        start = getattr(context, "_itaufluxcontrol_query_start", None)
+        elapsed_ms = (time.perf_counter() - start) * 1000 if start is not None else 0.0
+        rowcount = getattr(cursor, "rowcount", -1) or 0
+        for stats in active:
+            stats.record(statement, rowcount, elapsed_ms)
+
+
+query_counter = QueryCounter()
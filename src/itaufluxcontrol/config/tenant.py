@@ -0,0 +1,71 @@
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+TENANT_HEADER = "X-Tenant-Id"
+TENANT_FIELD = "tenant_id"
+
+_tenant_id: ContextVar[Optional[int]] = ContextVar("itaufluxcontrol_tenant_id", default=None)
+
+
+class TenantContext:
+    """
+    Tenant da invocação corrente. Consultas dos repositórios são filtradas
+    por ele, inserts o gravam em `tenant_id` e o `DatabaseProvider` o usa para
+    escolher a engine. Fora de uma invocação (migrations, scripts, testes de
+    repositório) vale o `DEFAULT_TENANT_ID`.
+    """
+
+    def __init__(self):
+        self.default_tenant_id = int(os.getenv("DEFAULT_TENANT_ID", "1"))
+
+    @contextmanager
+    def invocation(self, tenant_id: Optional[int]):
+        token = _tenant_id.set(tenant_id)
+        try:
+            yield
+        finally:
+            _tenant_id.reset(token)
+
+    @property
+    def tenant_id(self) -> int:
+        tenant_id = _tenant_id.get()
+        return self.default_tenant_id if tenant_id is None else tenant_id
+
+    @property
+    def is_default(self) -> bool:
+        return self.tenant_id == self.default_tenant_id
+
+    def resolve(self, event: Dict[str, Any]) -> int:
+        """
+        Tenant do evento: header `X-Tenant-Id` ou, na falta dele, o campo
+        `tenant_id` do body (payloads do Scheduler e do SQS). Sem nenhum dos
+        dois, o `DEFAULT_TENANT_ID`.
+
+        :raises ValueError: Se o tenant informado não é um inteiro positivo.
+        """
+        headers = event.get("headers") or {}
+        value = next((value for key, value in headers.items() if key.lower() == TENANT_HEADER.lower()), None)
+        if value is None:
+            body = event.get("body")
+            if isinstance(body, str):
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    body = None
+            if isinstance(body, dict):
+                value = body.get(TENANT_FIELD)
+        if value is None:
+            return self.default_tenant_id
+        try:
+            tenant_id = int(value)
+        except (TypeError, ValueError):
+            tenant_id = 0
+        if tenant_id <= 0:
+            raise ValueError(f"Invalid tenant id: {value}")
+        return tenant_id
+
+
+tenant_context = TenantContext()
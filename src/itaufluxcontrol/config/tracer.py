@@ -0,0 +1,240 @@
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+from src.itaufluxcontrol.config.logger import logger
+
+
+class Span:
+    """
+    Trecho cronometrado de uma invocação. Mantém os filhos para permitir
+    a montagem da árvore de durações aninhadas.
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, annotations: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.id = os.urandom(8).hex()
+        self.parent = parent
+        self.annotations = annotations or {}
+        self.children: List["Span"] = []
+        self.overflow: List["Span"] = []
+        self.error: Optional[str] = None
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return (end - self._start) * 1000
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.duration_ms / 1000
+
+    def finish(self, error: Optional[BaseException] = None):
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self._end = time.perf_counter()
+
+    def to_summary(self) -> Dict[str, Any]:
+        summary = {"name": self.name, "duration_ms": round(self.duration_ms, 3)}
+        if self.annotations:
+            summary["annotations"] = self.annotations
+        if self.error:
+            summary["error"] = self.error
+        if self.children:
+            summary["children"] = [child.to_summary() for child in self.children]
+        return summary
+
+    def to_xray(self) -> Dict[str, Any]:
+        """
+        Converte o span para o formato de (sub)segmento do AWS X-Ray.
+        """
+        document = {
+            "id": self.id,
+            "name": self.name[:200],
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
+        if self.annotations:
+            document["annotations"] = {
+                key: value if isinstance(value, (str, int, float, bool)) else str(value)
+                for key, value in self.annotations.items()
+            }
+        if self.error:
+            document["fault"] = True
+            document["cause"] = {"exceptions": [{"message": self.error}]}
+        if self.children:
+            document["subsegments"] = [child.to_xray() for child in self.children]
+        return document
+
+
+class Tracer:
+    """
+    API leve de spans para medir onde uma invocação gasta seu tempo.
+
+    - `invocation(...)` abre o span raiz e, ao final, emite uma única linha
+      estruturada (JSON) com a árvore de durações e os totais por span.
+    - `span(...)` / `trace(...)` criam spans aninhados dentro da invocação corrente.
+    - Quando `TRACING_XRAY_ENABLED=true`, o span raiz também é enviado como
+      segmento X-Ray via UDP para `AWS_XRAY_DAEMON_ADDRESS`.
+    """
+
+    XRAY_HEADER = '{"format": "json", "version": 1}\n'
+
+    def __init__(self, service_name: str = "itaufluxcontrol"):
+        self.service_name = service_name
+        self.logger = logger
+        self._current: ContextVar[Optional[Span]] = ContextVar("itaufluxcontrol_current_span", default=None)
+        self.enabled = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+        self.xray_enabled = os.getenv("TRACING_XRAY_ENABLED", "false").lower() == "true"
+        self.max_spans = int(os.getenv("TRACING_MAX_SPANS", "500"))
+        self._span_count: ContextVar[int] = ContextVar("itaufluxcontrol_span_count", default=0)
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def start_span(self, name: str, **annotations) -> Optional[Span]:
+        """
+        Abre um span filho do span corrente sem torná-lo corrente.
+        Útil para hooks do tipo before/after (ex.: eventos do botocore).
+        """
+        parent = self._current.get()
+        if not self.enabled or parent is None:
+            return None
+        span = Span(name, parent, annotations)
+        count = self._span_count.get() + 1
+        self._span_count.set(count)
+        if count <= self.max_spans:
+            parent.children.append(span)
+        else:
+            parent.overflow.append(span)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        if span is not None:
+            span.finish(error)
+
+    @contextmanager
+    def span(self, name: str, **annotations):
+        span = self.start_span(name, **annotations)
+        if span is None:
+            yield None
+            return
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.finish(e)
+            raise
+        finally:
+            if span._end is None:
+                span.finish()
+            self._current.reset(token)
+
+    def trace(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorator que envolve a função em um span. Em métodos, o nome padrão
+        é `<Classe>.<método>` usando a classe concreta da instância.
+        """
+        def decorator(func: Callable):
+            is_method = "." in func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self._current.get() is None:
+                    return func(*args, **kwargs)
+                span_name = name
+                if span_name is None:
+                    span_name = f"{type(args[0]).__name__}.{func.__name__}" if is_method and args else func.__qualname__
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def invocation(self, name: str, **annotations):
+        """
+        Abre o span raiz de uma invocação e emite o resumo ao final.
+        """
+        if not self.enabled:
+            yield None
+            return
+        root = Span(name, annotations=annotations)
+        token = self._current.set(root)
+        count_token = self._span_count.set(0)
+        try:
+            yield root
+        except BaseException as e:
+            root.finish(e)
+            raise
+        finally:
+            if root._end is None:
+                root.finish()
+            self._current.reset(token)
+            self._span_count.reset(count_token)
+            self._emit(root)
+
+    def summarize(self, root: Span) -> Dict[str, Any]:
+        totals: Dict[str, Dict[str, float]] = {}
+
+        def accumulate(span: Span):
+            for child in span.children + span.overflow:
+                total = totals.setdefault(child.name, {"count": 0, "total_ms": 0.0})
+                total["count"] += 1
+                total["total_ms"] += child.duration_ms
+                accumulate(child)
+
+        accumulate(root)
+        for total in totals.values():
+            total["total_ms"] = round(total["total_ms"], 3)
+
+        summary = {"type": "trace_summary", "service": self.service_name, **root.to_summary()}
+        summary["totals"] = totals
+        return summary
+
+    def _emit(self, root: Span):
+        try:
+            self.logger.info(json.dumps(self.summarize(root), default=str))
+            if self.xray_enabled:
+                self._send_xray(root)
+        except Exception as e:
+            self.logger.warning(f"[{self.__class__.__name__}] Failed to emit trace summary: {e}")
+
+    def build_xray_document(self, root: Span) -> Dict[str, Any]:
+        """
+        Monta o documento X-Ray. Dentro da Lambda o span raiz vira um subsegmento
+        do segmento da função (lido de `_X_AMZN_TRACE_ID`); fora dela, um segmento próprio.
+        """
+        document = root.to_xray()
+        trace_header = dict(
+            item.split("=", 1) for item in os.getenv("_X_AMZN_TRACE_ID", "").split(";") if "=" in item
+        )
+        if trace_header.get("Root") and trace_header.get("Parent"):
+            document.update({
+                "type": "subsegment",
+                "trace_id": trace_header["Root"],
+                "parent_id": trace_header["Parent"],
+            })
+        else:
+            document.update({
+                "name": self.service_name,
+                "trace_id": f"1-{int(root.start_time):08x}-{os.urandom(12).hex()}",
+                "annotations": {**document.get("annotations", {}), "route": root.name},
+            })
+        return document
+
+    def _send_xray(self, root: Span):
+        host, port = os.getenv("AWS_XRAY_DAEMON_ADDRESS", "127.0.0.1:2000").rsplit(":", 1)
+        message = self.XRAY_HEADER + json.dumps(self.build_xray_document(root), default=str)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(message.encode("utf-8"), (host, int(port)))
+
+
+tracer = Tracer()
@@ -1,32 +1,54 @@
+from datetime import date, datetime, timedelta
 from functools import wraps
 from logging import Logger
 import os
+import json
 import time
 import traceback
-from typing import Callable
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from inspect import signature
 
 from alembic.config import Config
 from alembic import command
 
-from aws_lambda_powertools.event_handler import ApiGatewayResolver
+from aws_lambda_powertools.event_handler import ApiGatewayResolver, Response, content_types
 from aws_lambda_powertools.event_handler.exceptions import BadRequestError
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from itaufluxcontrol.service.task_schedule_service import TaskScheduleService
 from itaufluxcontrol.service.task_table_service import TaskTableService
 
+from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_APPROVED, STATIC_APPROVE_STATUS_REJECTED
+from src.itaufluxcontrol.config.event_capture import event_capture
+from src.itaufluxcontrol.config.logger import log_context
+from src.itaufluxcontrol.config.query_counter import QueryStats, query_counter
+from src.itaufluxcontrol.config.tenant import TENANT_HEADER, tenant_context
+from src.itaufluxcontrol.config.tracer import tracer
 from src.itaufluxcontrol.models.dto.task_executor_dto import TaskExecutorDTO
 from src.itaufluxcontrol.models.dto.trigger_process_dto import TriggerProcess
+from src.itaufluxcontrol.service.approval_batch_service import ApprovalBatchService
 from src.itaufluxcontrol.service.approval_status_service import ApprovalStatusService
 from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.database_scheduler_worker import DatabaseSchedulerWorker
+from src.itaufluxcontrol.service.dependency_graph_service import DependencyGraphService
 from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
+from src.itaufluxcontrol.service.execution_lineage_service import DOWN, UP, ExecutionLineageService
+from src.itaufluxcontrol.service.idempotency_service import IDEMPOTENCY_HEADER, IdempotencyService
+from src.itaufluxcontrol.service.latency_analytics_service import LatencyAnalyticsService
+from src.itaufluxcontrol.service.outbox_dispatcher import OutboxDispatcher
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.itaufluxcontrol.service.scheduler_reconciliation_service import SchedulerReconciliationService
+from src.itaufluxcontrol.service.sqs_batch_service import SqsBatchService
 from src.itaufluxcontrol.service.task_executor_service import TaskExecutorService
 from src.itaufluxcontrol.service.task_service import TaskService
-from injector import Injector
+from injector import InstanceProvider, Injector, SingletonScope, UnsatisfiedRequirement
 from src.itaufluxcontrol.models.dto.table_dto import TableDTO, TaskDTO
 from src.itaufluxcontrol.models.dto.table_partition_exec_dto import TablePartitionExecDTO
+from src.itaufluxcontrol.service.table_import_service import TableImportService
 from src.itaufluxcontrol.service.table_service import TableService
 from src.itaufluxcontrol.service.table_partition_exec_service import TablePartitionExecService
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
+from src.itaufluxcontrol.provider.lazy_provider import is_materialized
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 
 
@@ -48,6 +70,8 @@ class ItauFluxControl:
         self.cloudwatch_service = self.injector.get(CloudWatchService)
         self.logger = self.injector.get(Logger)
         self.app = app_resolver
+        self._shared_dependencies: Dict[type, Any] = {}
+        query_counter.install()
         self.define_routes()
 
     def process_event(self, event, context: LambdaContext):
@@ -59,11 +83,33 @@ class ItauFluxControl:
         """
         start_time = time.time()
         error_count = 0
-        route_called = event.get('path', 'unknown')
+        sqs_batch = SqsBatchService.is_sqs_batch(event)
+        route_called = "sqs" if sqs_batch else event.get('path', 'unknown')
+        query_stats = QueryStats()
+        event_capture.capture(event)
 
         try:
-            self.logger.info(f"[{self.__class__.__name__}] Processing event on route: {route_called}")
-            response = self.app.resolve(event, context)
+            with log_context.invocation(self.request_id(event, context)):
+                self.logger.info(f"[{self.__class__.__name__}] Processing event on route: {route_called}")
+                tenant_id = self.tenant_id(event, sqs_batch)
+                with tenant_context.invocation(tenant_id), tracer.invocation(route_called, method=event.get('httpMethod', 'unknown')), query_counter.count(query_stats):
+                    self.use_tenant(tenant_id)
+                    try:
+                        if sqs_batch:
+                            response = self.process_sqs_batch(event["Records"])
+                        else:
+                            response = self.app.resolve(event, context)
+                    finally:
+                        self.drain_outbox()
+
+        except BadRequestError as e:
+            self.logger.warning(f"[{self.__class__.__name__}] Event rejected: {str(e)}")
+            response = {
+                "statusCode": 400,
+                "headers": {"Content-Type": content_types.APPLICATION_JSON},
+                "body": json.dumps({"statusCode": 400, "message": str(e)}),
+            }
+            error_count += 1
 
         except Exception as e:
             stack_trace = traceback.format_exc()
@@ -73,6 +119,8 @@ class ItauFluxControl:
                 "stacktrace": stack_trace,
                 "statusCode": 500
             }
+            if sqs_batch:
+                response = {"batchItemFailures": [{"itemIdentifier": record["messageId"]} for record in event["Records"]]}
             error_count += 1
 
         finally:
@@ -93,20 +141,166 @@ class ItauFluxControl:
                 value=1,
                 unit="Count"
             )
+            self.cloudwatch_service.add_metric(
+                name="SqlStatementCount",
+                value=query_stats.statements,
+                unit="Count"
+            )
+            self.cloudwatch_service.add_metric(
+                name="SqlRowCount",
+                value=query_stats.rows,
+                unit="Count"
+            )
+            self.cloudwatch_service.add_metric(
+                name="SqlTime",
+                value=query_stats.db_time_ms,
+                unit="Milliseconds"
+            )
             self.cloudwatch_service.flush_metrics()
 
         return response
 
+    def process_sqs_batch(self, records):
+        """
+        Processa um lote SQS e devolve a resposta de falha parcial: apenas as
+        mensagens em `batchItemFailures` voltam para a fila. As mensagens são
+        separadas por tenant e cada grupo roda no seu tenant, com sessão,
+        commit e dreno do outbox próprios; se o commit de um grupo falhar, o
+        grupo inteiro é devolvido.
+        """
+        failures = []
+        for tenant_id, tenant_records in SqsBatchService.group_by_tenant(records).items():
+            with tenant_context.invocation(tenant_id):
+                self.use_tenant(tenant_id)
+                sqs_batch_service: SqsBatchService = self.injector.get(SqsBatchService)
+                session_provider: SessionProvider = self.injector.get(SessionProvider)
+                try:
+                    failures.extend(sqs_batch_service.process_batch(tenant_records))
+                    session_provider.commit()
+                except Exception as e:
+                    session_provider.rollback()
+                    self.logger.exception(f"[{self.__class__.__name__}] Erro no processamento do lote SQS do tenant {tenant_id}: {str(e)}")
+                    failures.extend(record["messageId"] for record in tenant_records)
+                finally:
+                    session_provider.close()
+                    self.drain_outbox()
+        return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failures]}
+
+    def drain_outbox(self):
+        """
+        Envia, após o commit, as mensagens de outbox enfileiradas na invocação.
+        Falhas não afetam a resposta: as mensagens ficam para retry/sweeper.
+        """
+        outbox_service: OutboxService = self.resolve_dependency(OutboxService, shared=True)
+        if not is_materialized(outbox_service):
+            return
+        ids = outbox_service.take_enqueued()
+        if not ids:
+            return
+        try:
+            self.resolve_dependency(OutboxDispatcher, shared=True).dispatch(ids)
+        except Exception as e:
+            self.logger.exception(f"[{self.__class__.__name__}] Erro ao drenar o outbox: {str(e)}")
+
+    def run_scheduler_worker(self, interval_seconds: Optional[float] = None, max_ticks: Optional[int] = None):
+        """
+        Loop do worker do backend `database` para processos de longa duração
+        (ex.: ECS): executa `/scheduler/tick` a cada `interval_seconds`
+        (`SCHEDULER_WORKER_INTERVAL_SECONDS`, padrão 5), pelo mesmo pipeline
+        da Lambda — commit, dreno do outbox, métricas e logs. Cada tick roda
+        uma vez por tenant de `SCHEDULER_WORKER_TENANT_IDS` (lista separada por
+        vírgulas; padrão, só o tenant padrão).
+
+        :param max_ticks: Encerra após esse número de ticks (testes); sem ele, roda indefinidamente.
+        """
+        interval = interval_seconds if interval_seconds is not None else float(os.getenv("SCHEDULER_WORKER_INTERVAL_SECONDS", "5"))
+        tenant_ids = [tenant_id.strip() for tenant_id in os.getenv("SCHEDULER_WORKER_TENANT_IDS", "").split(",") if tenant_id.strip()]
+        tick_events = [
+            {"httpMethod": "POST", "path": "/scheduler/tick", "headers": {TENANT_HEADER: tenant_id}, "body": json.dumps({})}
+            for tenant_id in tenant_ids
+        ] or [{"httpMethod": "POST", "path": "/scheduler/tick", "body": json.dumps({})}]
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            started = time.monotonic()
+            for tick_event in tick_events:
+                self.process_event(tick_event, None)
+            ticks += 1
+            if max_ticks is None or ticks < max_ticks:
+                time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    def tenant_id(self, event, sqs_batch: bool) -> int:
+        """
+        Tenant da invocação (header `X-Tenant-Id` ou campo `tenant_id` do
+        body). Um lote SQS começa no tenant padrão e `process_sqs_batch` troca
+        para o tenant de cada grupo de mensagens.
+
+        :raises BadRequestError: Se o tenant informado é inválido.
+        """
+        if sqs_batch:
+            return tenant_context.default_tenant_id
+        try:
+            return tenant_context.resolve(event)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+
+    def use_tenant(self, tenant_id: int):
+        """
+        Troca o tenant da sessão, se ela já existe (uma sessão criada nesta
+        invocação já nasce no tenant certo).
+        """
+        session_provider: SessionProvider = self.resolve_dependency(SessionProvider, shared=True)
+        if is_materialized(session_provider):
+            session_provider.use_tenant(tenant_id)
+
+    @staticmethod
+    def request_id(event, context: LambdaContext) -> str:
+        """
+        Id de correlação da invocação: o request id da Lambda, o do API Gateway
+        ou, na falta dos dois (testes, replay), um uuid.
+        """
+        request_id = getattr(context, "aws_request_id", None)
+        if not request_id:
+            request_context = event.get("requestContext") or {}
+            request_id = request_context.get("requestId") if isinstance(request_context, dict) else None
+        return request_id or str(uuid.uuid4())
+
+    def injection_plan(self, func: Callable) -> List[Tuple[str, type, bool]]:
+        """
+        Monta o plano de injeção de um handler: (parâmetro, interface, compartilhável).
+
+        É compartilhável o que o Injector devolveria igual em toda chamada
+        (bindings singleton e instâncias fixas); o restante é resolvido por requisição.
+        """
+        plan = []
+        for param_name, param in signature(func).parameters.items():
+            if param.annotation is param.empty:
+                continue
+            try:
+                binding, _ = self.injector.binder.get_binding(param.annotation)
+                shared = isinstance(binding.provider, InstanceProvider) or issubclass(binding.scope, SingletonScope)
+            except UnsatisfiedRequirement:
+                shared = False
+            plan.append((param_name, param.annotation, shared))
+        return plan
+
+    def resolve_dependency(self, interface: type, shared: bool):
+        if not shared:
+            return self.injector.get(interface)
+        if interface not in self._shared_dependencies:
+            self._shared_dependencies[interface] = self.injector.get(interface)
+        return self._shared_dependencies[interface]
+
     def inject_dependencies(self, func: Callable):
+        plan = self.injection_plan(func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            func_signature = signature(func)
             dependencies = {
-                param_name: self.injector.get(param.annotation)
-                for param_name, param in func_signature.parameters.items()
-                if param.annotation is not param.empty and param_name not in kwargs
+                param_name: self.resolve_dependency(interface, shared)
+                for param_name, interface, shared in plan
+                if param_name not in kwargs
             }
-            self.logger.debug(f"[{self.__class__.__name__}] Dependencies injected for {func.__name__}: {dependencies}")
+            self.logger.debug("[%s] Dependencies injected for %s: %s", self.__class__.__name__, func.__name__, list(dependencies))
             return func(*args, **dependencies, **kwargs)
         return wrapper
 
@@ -138,11 +332,60 @@ class ItauFluxControl:
                 session_provider.close()
         return wrapper
 
-    def process_entities(self, func: Callable):
+    def idempotent(self, payload_hash: bool = True):
+        """
+        Decorator de idempotência para rotas com efeito colateral.
+
+        Entregas duplicadas (mesmo `Idempotency-Key`/`idempotency_key` ou, com
+        `payload_hash`, mesmo payload) são respondidas com a resposta armazenada
+        antes de qualquer trabalho; se a primeira ainda está em andamento, 409.
+
+        Deve ficar abaixo de `@transactional`: a chave é gravada, executada e
+        concluída na transação do trabalho, que faz o único commit. Em caso de
+        erro o rollback descarta a chave junto com o trabalho, e uma queda antes
+        do commit não deixa a chave presa em andamento.
+
+        :param payload_hash: Usa o hash do payload quando o cliente não envia chave.
+                             Desligado em rotas onde repetir o mesmo payload é legítimo.
+        """
+        def decorator(func: Callable):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                event = self.app.current_event
+                body = event.json_body or {}
+                client_key = event.headers.get(IDEMPOTENCY_HEADER) or body.get("idempotency_key")
+                if not client_key and not payload_hash:
+                    return func(*args, **kwargs)
+
+                idempotency_service: IdempotencyService = self.resolve_dependency(IdempotencyService, shared=True)
+                key = idempotency_service.build_key(event.path, client_key, body)
+
+                record, new = idempotency_service.begin(key, event.path, bool(client_key))
+                if not new:
+                    return Response(
+                        status_code=200,
+                        content_type=content_types.APPLICATION_JSON,
+                        body=json.dumps(idempotency_service.replay_or_conflict(record)),
+                        headers={"Idempotent-Replayed": "true"},
+                    )
+
+                result = func(*args, **kwargs)
+                idempotency_service.complete(record.id, result)
+                return result
+            return wrapper
+        return decorator
+
+    def process_entities(self, func: Callable = None, *, commit_each: bool = True):
         """
         Annotation para processar múltiplos itens em `data`.
         Garante commit após cada item processado e rollback em caso de erro.
+
+        Com `commit_each=False` não faz commit nem fecha a sessão: os itens ficam
+        na transação de um `@transactional` externo (ex.: rotas `@idempotent`).
         """
+        if func is None:
+            return lambda f: self.process_entities(f, commit_each=commit_each)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             session_provider: SessionProvider = kwargs.get('session_provider')
@@ -155,6 +398,16 @@ class ItauFluxControl:
             if not data:
                 raise ValueError("Data is required")
 
+            if not commit_each:
+                items = data if isinstance(data, list) else [data]
+                messages = []
+                for item in items:
+                    kwargs["entity_data"] = item
+                    kwargs["user"] = user
+                    messages.append(func(*args, **kwargs))
+                    logger.debug("[%s] Entity processed successfully: %s", self.__class__.__name__, item)
+                return {"message": "All entities processed successfully.", "details": messages}
+
             messages = []
 
             try:
@@ -166,7 +419,7 @@ class ItauFluxControl:
                             message = func(*args, **kwargs)
                             messages.append(message)
                             session_provider.commit()
-                            logger.debug(f"[{self.__class__.__name__}] Entity processed successfully: {item}")
+                            logger.debug("[%s] Entity processed successfully: %s", self.__class__.__name__, item)
                         except Exception as e:
                             session_provider.rollback()
                             logger.error(f"[{self.__class__.__name__}] Error processing entity: {item}. Error: {e}")
@@ -195,11 +448,88 @@ class ItauFluxControl:
         self.define_approval_routes()
         self.define_table_routes()
         self.define_table_partition_exec_routes()  
+        self.define_process_summary_routes()
         self.define_trigger_routes()
         self.define_task_executor_routes()
         self.define_health_route()
         self.define_task_table_routes()
         self.define_schedule_routes()
+        self.define_outbox_routes()
+        self.define_idempotency_routes()
+        self.define_analytics_routes()
+
+    def define_analytics_routes(self):
+        """
+        Define as rotas de análise de latência do DAG.
+        """
+        @self.app.get("/analytics/latency")
+        @self.inject_dependencies
+        def get_latency(
+            latency_analytics_service: LatencyAnalyticsService,
+            logger: Logger
+        ):
+            """
+            Latências por tabela e dia e caminho crítico (`from`/`to` em AAAA-MM-DD, padrão últimos 7 dias).
+            """
+            params = self.app.current_event.query_string_parameters or {}
+            end = self.parse_day(params.get("to")) or datetime.utcnow().date()
+            start = self.parse_day(params.get("from")) or end - timedelta(days=6)
+            max_days = int(os.getenv("ANALYTICS_LATENCY_MAX_DAYS", "31"))
+            if start > end or (end - start).days >= max_days:
+                raise BadRequestError(f"Interval must be between 1 and {max_days} days")
+            table_id = params.get("table_id")
+            logger.debug("[%s] Getting latency from %s to %s (table %s)", self.__class__.__name__, start, end, table_id)
+            return latency_analytics_service.compute(start, end, int(table_id) if table_id else None)
+
+        @self.app.post("/analytics/latency/job")
+        @self.inject_dependencies
+        def publish_latency(
+            latency_analytics_service: LatencyAnalyticsService,
+            logger: Logger
+        ):
+            body = self.app.current_event.json_body or {}
+            report = latency_analytics_service.publish(self.parse_day(body.get("day")))
+            logger.info(f"[{self.__class__.__name__}] Latency job finished: {report['from']} ({len(report['tables'])} table-days)")
+            return report
+
+    @staticmethod
+    def parse_day(value: Optional[str]) -> Optional[date]:
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise BadRequestError(f"Invalid date: {value} (expected YYYY-MM-DD)")
+
+    def define_idempotency_routes(self):
+        """
+        Define as rotas de manutenção do armazenamento de idempotência.
+        """
+        @self.app.post("/idempotency/purge")
+        @self.inject_dependencies
+        @self.transactional
+        def purge_idempotency_keys(
+            idempotency_service: IdempotencyService,
+            session_provider: SessionProvider,
+            logger: Logger
+        ):
+            removed = idempotency_service.purge_expired()
+            return {"removed": removed}
+
+    def define_outbox_routes(self):
+        """
+        Define as rotas do outbox transacional.
+        """
+        @self.app.post("/outbox/sweep")
+        @self.inject_dependencies
+        def sweep_outbox(
+            outbox_dispatcher: OutboxDispatcher,
+            logger: Logger
+        ):
+            body = self.app.current_event.json_body or {}
+            result = outbox_dispatcher.sweep(body.get("limit"))
+            logger.info(f"[{self.__class__.__name__}] Outbox sweep finished: {result}")
+            return result
         
     def define_schedule_routes(self):
         """
@@ -211,10 +541,10 @@ class ItauFluxControl:
             task_schedule_service: TaskScheduleService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting task schedules: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting task schedules: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             tasks = task_schedule_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Task schedules found: {tasks}")
+            logger.debug("[%s] Task schedules found: %s", self.__class__.__name__, tasks)
             return [task.json_dict() for task in tasks]
 
         @self.app.delete("/task-schedules/<task_schedule_id>")
@@ -226,9 +556,32 @@ class ItauFluxControl:
             session_provider: SessionProvider,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Deleting task schedule with ID: {task_schedule_id}")
+            logger.debug("[%s] Deleting task schedule with ID: %s", self.__class__.__name__, task_schedule_id)
             task_schedule_service.delete(task_schedule_id)
             logger.info(f"[{self.__class__.__name__}] Task schedule with ID {task_schedule_id} deleted successfully.")
+
+        @self.app.post("/scheduler/tick")
+        @self.inject_dependencies
+        def scheduler_tick(
+            database_scheduler_worker: DatabaseSchedulerWorker,
+            logger: Logger
+        ):
+            body = self.app.current_event.json_body or {}
+            return database_scheduler_worker.tick(body.get("limit"))
+
+        @self.app.post("/scheduler/reconcile")
+        @self.inject_dependencies
+        @self.transactional
+        def reconcile_scheduler(
+            scheduler_reconciliation_service: SchedulerReconciliationService,
+            session_provider: SessionProvider,
+            logger: Logger
+        ):
+            body = self.app.current_event.json_body or {}
+            return scheduler_reconciliation_service.reconcile(
+                dry_run=body.get("dry_run", True),
+                limit=body.get("limit")
+            )
         
     def define_task_table_routes(self):
         """
@@ -306,10 +659,10 @@ class ItauFluxControl:
             task_table_service: TaskTableService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting tasks: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting tasks: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             tasks = task_table_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Tasks found: {tasks}")
+            logger.debug("[%s] Tasks found: %s", self.__class__.__name__, tasks)
             return [task.json_dict() for task in tasks]
 
     def define_approval_routes(self):
@@ -319,6 +672,7 @@ class ItauFluxControl:
         @self.app.post("/approve")
         @self.inject_dependencies
         @self.transactional
+        @self.idempotent()
         def approve_task(
             approval_status_service: ApprovalStatusService,
             event_bridge_schedule_service: EventBridgeSchedulerService,
@@ -359,18 +713,87 @@ class ItauFluxControl:
             logger.info("Event processed successfully.")
             return {"message": "Task rejected successfully."}
         
+        @self.app.post("/approve/batch")
+        @self.inject_dependencies
+        @self.transactional
+        @self.idempotent()
+        def approve_tasks_batch(
+            approval_batch_service: ApprovalBatchService,
+            session_provider: SessionProvider,
+            logger: Logger
+        ):
+            """
+            Aprova em lote, por `approval_status_ids` ou por `filter`, e agenda os eventos de uma vez.
+            """
+            body = self.app.current_event.json_body or {}
+            report = approval_batch_service.review(
+                STATIC_APPROVE_STATUS_APPROVED, **self.parse_review_batch(body, approval_batch_service.max_items)
+            )
+            logger.info(f"Aprovação em lote: {report['count']} de {len(report['items'])} aprovadas")
+            return report
+
+        @self.app.post("/reject/batch")
+        @self.inject_dependencies
+        @self.transactional
+        def reject_tasks_batch(
+            approval_batch_service: ApprovalBatchService,
+            session_provider: SessionProvider,
+            logger: Logger
+        ):
+            body = self.app.current_event.json_body or {}
+            report = approval_batch_service.review(
+                STATIC_APPROVE_STATUS_REJECTED, **self.parse_review_batch(body, approval_batch_service.max_items)
+            )
+            logger.info(f"Rejeição em lote: {report['count']} de {len(report['items'])} rejeitadas")
+            return report
+
         @self.app.get("/approval-status")
         @self.inject_dependencies
         def get_approval_status(
             approval_status_service: ApprovalStatusService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting approval status: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting approval status: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             approval_status = approval_status_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Approval status found: {approval_status}")
+            logger.debug("[%s] Approval status found: %s", self.__class__.__name__, approval_status)
             return [status.json_dict() for status in approval_status]
 
+    @staticmethod
+    def parse_review_batch(body: Dict[str, Any], max_items: int) -> Dict[str, Any]:
+        """
+        Valida o corpo de `/approve/batch` e `/reject/batch`: `user` e
+        `approval_status_ids` ou `filter` (`table_id`, `table_name`,
+        `partitions`, `requested_from`/`requested_to` em ISO 8601).
+        """
+        user = body.get("user")
+        if not user:
+            raise BadRequestError("`user` is required")
+        ids = body.get("approval_status_ids")
+        if ids:
+            if not isinstance(ids, list) or not all(isinstance(id, int) for id in ids):
+                raise BadRequestError("`approval_status_ids` must be a list of integers")
+            if len(ids) > max_items:
+                raise BadRequestError(f"At most {max_items} approvals per batch")
+            return {"user": user, "approval_status_ids": ids}
+
+        filters = body.get("filter")
+        if not isinstance(filters, dict) or not filters:
+            raise BadRequestError("`approval_status_ids` or `filter` is required")
+        unknown = set(filters) - {"table_id", "table_name", "partitions", "requested_from", "requested_to"}
+        if unknown:
+            raise BadRequestError(f"Unknown filter fields: {sorted(unknown)}")
+        if filters.get("partitions") is not None and not isinstance(filters["partitions"], dict):
+            raise BadRequestError("`filter.partitions` must be an object")
+        window = {}
+        for field in ("requested_from", "requested_to"):
+            if filters.get(field):
+                try:
+                    window[field] = datetime.fromisoformat(filters[field])
+                except (TypeError, ValueError):
+                    raise BadRequestError(f"Invalid datetime for `{field}`: {filters[field]}")
+        return {"user": user, **filters, **window}
+
     def define_table_routes(self):
         """
         Define as rotas relacionadas a tabelas.
@@ -397,6 +820,32 @@ class ItauFluxControl:
             logger.info(f"Tabela criada com sucesso: {message}")
             return message, 201  
 
+        @self.app.post("/tables/bulk")
+        @self.inject_dependencies
+        @self.transactional
+        def import_tables(
+            table_import_service: TableImportService,
+            session_provider: SessionProvider,
+            logger: Logger
+        ):
+            """
+            Rota de importação em lote: valida o lote inteiro e cria as tabelas
+            numa transação só, com um relatório de erros por item.
+            """
+            body = self.app.current_event.json_body or {}
+            data = body.get("data")
+            user = body.get("user")
+            if not isinstance(data, list) or not data:
+                raise BadRequestError("`data` must be a non-empty list of tables")
+            if len(data) > table_import_service.max_items:
+                raise BadRequestError(f"At most {table_import_service.max_items} tables per bulk import")
+            if not user:
+                raise BadRequestError("`user` is required")
+
+            report = table_import_service.import_tables(data, user)
+            logger.info(f"Importação em lote: {report['count']} tabelas criadas de {len(data)}")
+            return report, 201 if report["imported"] else 400
+
         @self.app.put("/tables/<table_id>", summary="Atualizar uma tabela existente", tags=["Tables"])
         @self.inject_dependencies
         @self.process_entities
@@ -447,19 +896,39 @@ class ItauFluxControl:
             table_service: TableService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting tables: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting tables: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             tables = table_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Tables found: {tables}")
+            logger.debug("[%s] Tables found: %s", self.__class__.__name__, tables)
             return [table.json_dict() for table in tables]
 
+        @self.app.get("/tables/<table_id>/impact")
+        @self.inject_dependencies
+        def get_table_impact(
+            table_id: str,
+            dependency_graph_service: DependencyGraphService,
+            logger: Logger
+        ):
+            """
+            Rota com a closure de dependências da tabela (`direction`: downstream, upstream ou both).
+            """
+            direction = self.app.current_event.get_query_string_value("direction", "both")
+            if direction not in ("downstream", "upstream", "both"):
+                raise BadRequestError("direction must be one of: downstream, upstream, both")
+            if not table_id.isdigit():
+                raise BadRequestError("Table ID must be an integer")
+            logger.debug("[%s] Getting %s impact of table %s", self.__class__.__name__, direction, table_id)
+            return dependency_graph_service.impact(int(table_id), direction)
+
     def define_table_partition_exec_routes(self):
         """
         Define as rotas relacionadas à execução de partições de tabelas.
         """
         @self.app.post("/register_execution")
         @self.inject_dependencies
-        @self.process_entities
+        @self.transactional
+        @self.idempotent(payload_hash=False)
+        @self.process_entities(commit_each=False)
         def register_execution(
             table_partition_exec_service: TablePartitionExecService,
             entity_data: dict,
@@ -481,10 +950,56 @@ class ItauFluxControl:
             table_partition_exec_service: TablePartitionExecService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting executions: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting executions: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             executions = table_partition_exec_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Executions found: {executions}")
+            logger.debug("[%s] Executions found: %s", self.__class__.__name__, executions)
+
+        @self.app.get("/executions/<execution_id>/lineage")
+        @self.inject_dependencies
+        def get_execution_lineage(
+            execution_id: str,
+            execution_lineage_service: ExecutionLineageService,
+            logger: Logger
+        ):
+            """
+            Rota com a linhagem da execução (`direction`: down ou up; `depth`: máximo de saltos).
+            """
+            direction = self.app.current_event.get_query_string_value("direction", DOWN)
+            depth = self.app.current_event.get_query_string_value("depth")
+            if direction not in (DOWN, UP):
+                raise BadRequestError("direction must be one of: down, up")
+            if not execution_id.isdigit():
+                raise BadRequestError("Execution ID must be an integer")
+            if depth is not None and (not depth.isdigit() or not 1 <= int(depth) <= execution_lineage_service.max_depth):
+                raise BadRequestError(f"depth must be between 1 and {execution_lineage_service.max_depth}")
+            logger.debug("[%s] Getting %s lineage of execution %s (depth %s)", self.__class__.__name__, direction, execution_id, depth)
+            return execution_lineage_service.lineage(int(execution_id), direction, int(depth) if depth else None)
+
+    def define_process_summary_routes(self):
+        """
+        Define a rota do resumo do processamento (substitui a `table_process_view`).
+        """
+        @self.app.get("/process-summary")
+        @self.inject_dependencies
+        def get_process_summary(
+            table_process_summary_service: TableProcessSummaryService,
+            logger: Logger
+        ):
+            """
+            Página do resumo por tabela x conjunto de partições (keyset: `after_id` e `limit`).
+            """
+            params = self.app.current_event.query_string_parameters or {}
+            max_limit = int(os.getenv("PROCESS_SUMMARY_MAX_PAGE_SIZE", "500"))
+            after_id, limit, table_id = params.get("after_id", "0"), params.get("limit", "100"), params.get("table_id")
+            if not after_id.isdigit() or not limit.isdigit() or (table_id and not table_id.isdigit()):
+                raise BadRequestError("after_id, limit and table_id must be integers")
+            if not 1 <= int(limit) <= max_limit:
+                raise BadRequestError(f"limit must be between 1 and {max_limit}")
+            logger.debug("[%s] Getting process summary: %s", self.__class__.__name__, params)
+            return table_process_summary_service.get_page(
+                int(after_id), int(limit), int(table_id) if table_id else None, params.get("table_name")
+            )
 
     def define_trigger_routes(self):
         """
@@ -493,6 +1008,7 @@ class ItauFluxControl:
         @self.app.post("/trigger")
         @self.inject_dependencies
         @self.transactional
+        @self.idempotent()
         def trigger_event(
             task_service: TaskService,
             logger: Logger,
@@ -515,8 +1031,9 @@ class ItauFluxControl:
             task_table_id = payload["task_table"]["id"]
             dependency_execution_id = payload["execution"]["id"]
             task_schedule_id = payload["task_schedule"]["id"]
+            log_context.bind_unique_alias(payload["task_schedule"].get("unique_alias"))
 
-            logger.debug(f"Received trigger request: {payload}")
+            logger.debug("Received trigger request: %s", payload)
             logger.info(f"Processing trigger for task table ID: {task_table_id}")
 
             task_service.trigger_tables(
@@ -598,10 +1115,10 @@ class ItauFluxControl:
             task_executor_service: TaskExecutorService,
             logger: Logger
         ):
-            logger.debug(f"[{self.__class__.__name__}] Getting task executors: {self.app.current_event.query_string_parameters}")
+            logger.debug("[%s] Getting task executors: %s", self.__class__.__name__, self.app.current_event.query_string_parameters)
             filters = self.app.current_event.query_string_parameters
             task_executors = task_executor_service.query(**filters)
-            logger.debug(f"[{self.__class__.__name__}] Task executors found: {task_executors}")
+            logger.debug("[%s] Task executors found: %s", self.__class__.__name__, task_executors)
             return [task.json_dict() for task in task_executors]
 
     def define_health_route(self):
@@ -6,8 +6,11 @@ from .task_table import TaskTable
 from .table_execution import TableExecution
 from .table_partition_exec import TablePartitionExec
 from .process_status import ProcessStatus
+from .table_process_summary import TableProcessSummary
 from .task_executor import TaskExecutor
 from .task_schedule import TaskSchedule
+from .outbox_message import OutboxMessage
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
     "Tables",
@@ -18,6 +21,9 @@ __all__ = [
     "TableExecution",
     "TablePartitionExec",
     "ProcessStatus",
+    "TableProcessSummary",
     "TaskExecutor",
-    "TaskSchedule"
+    "TaskSchedule",
+    "OutboxMessage",
+    "IdempotencyKey"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Column, Integer, ForeignKey, Enum, DateTime, String
+from sqlalchemy import JSON, Column, Integer, ForeignKey, Enum, DateTime, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -7,6 +7,9 @@ from .base import AbstractBase
 
 class ApprovalStatus(AbstractBase):
     __tablename__ = 'approval_status'
+    __table_args__ = (
+        UniqueConstraint('task_schedule_id', name='uq_approval_status_task_schedule_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     task_schedule_id = Column(Integer, ForeignKey('task_schedule.id'), nullable=False)
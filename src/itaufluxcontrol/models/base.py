@@ -2,6 +2,8 @@ from datetime import datetime
 from sqlalchemy import Column, DateTime, Integer, String
 from sqlalchemy.orm import declarative_base  
 
+from src.itaufluxcontrol.config.tenant import tenant_context
+
 Base = declarative_base()
 
 class AbstractBase(Base):   
@@ -9,7 +11,8 @@ class AbstractBase(Base):
     
     date_deleted = Column(DateTime, nullable=True)
     deleted_by = Column(String(255), nullable=True)
-    tenant_id = Column(Integer, nullable=False, default=1)
+    # Gravado com o tenant da invocação (ver `config/tenant.py`)
+    tenant_id = Column(Integer, nullable=False, default=lambda: tenant_context.tenant_id)
     
     def dict(self):
         """
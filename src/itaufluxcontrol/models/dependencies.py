@@ -1,9 +1,12 @@
-from sqlalchemy import Boolean, Column, Integer, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import AbstractBase
 
 class Dependencies(AbstractBase):
     __tablename__ = 'dependencies'
+    __table_args__ = (
+        UniqueConstraint('table_id', 'dependency_id', name='uq_dependencies_table_id_dependency_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     table_id = Column(Integer, ForeignKey('tables.id'), nullable=False)
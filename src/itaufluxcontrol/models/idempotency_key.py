@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String
+
+from src.itaufluxcontrol.config.constants import STATIC_IDEMPOTENCY_COMPLETED, STATIC_IDEMPOTENCY_IN_PROGRESS
+
+from .base import AbstractBase
+
+class IdempotencyKey(AbstractBase):
+    __tablename__ = 'idempotency_key'
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(64), nullable=False, unique=True)
+    route = Column(String(100), nullable=False)
+    status = Column(Enum(STATIC_IDEMPOTENCY_IN_PROGRESS, STATIC_IDEMPOTENCY_COMPLETED, name="idempotency_key_status_enum"), nullable=False, default=STATIC_IDEMPOTENCY_IN_PROGRESS)
+    response = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_idempotency_key_expires_at', 'expires_at'),
+    )
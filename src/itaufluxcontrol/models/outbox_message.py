@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_DISPATCHED, STATIC_OUTBOX_DISPATCHING, STATIC_OUTBOX_FAILED, STATIC_OUTBOX_PENDING
+
+from .base import AbstractBase
+
+class OutboxMessage(AbstractBase):
+    __tablename__ = 'outbox_message'
+
+    id = Column(Integer, primary_key=True)
+    operation = Column(String(100), nullable=False)
+    aggregate_id = Column(Integer, nullable=True)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(STATIC_OUTBOX_PENDING, STATIC_OUTBOX_DISPATCHING, STATIC_OUTBOX_DISPATCHED, STATIC_OUTBOX_FAILED, name="outbox_message_status_enum"), nullable=False, default=STATIC_OUTBOX_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    claim_token = Column(String(36), nullable=True)
+    dispatched_at = Column(DateTime, nullable=True)
+    last_error = Column(String(1000), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_outbox_message_status_next_attempt', 'status', 'next_attempt_at'),
+    )
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import AbstractBase
 
 class Partitions(AbstractBase):
     __tablename__ = 'partitions'
+    __table_args__ = (
+        UniqueConstraint('table_id', 'name', name='uq_partitions_table_id_name'),
+    )
     
     id = Column(Integer, primary_key=True)
     table_id = Column(Integer, ForeignKey('tables.id'), nullable=False)
@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+
+from .base import AbstractBase
+
+class TableProcessSummary(AbstractBase):
+    """
+    Resumo do processamento: uma linha por tabela x conjunto de partições,
+    com a última execução desse conjunto. Substitui a `table_process_view` e
+    é mantida de forma incremental pelo registro de execuções, pelos
+    agendamentos que elas disparam e pelas aprovações.
+    """
+    __tablename__ = 'table_process_summary'
+    __table_args__ = (
+        UniqueConstraint('table_id', 'partition_key', name='uq_table_process_summary_table_partition'),
+        Index('idx_table_process_summary_execution_id', 'execution_id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_id = Column(Integer, ForeignKey('tables.id'), nullable=False)
+    # SHA-1 de `partition_set`: a chave única não cabe no índice com o texto inteiro
+    partition_key = Column(String(40), nullable=False)
+    partition_set = Column(Text, nullable=False)
+    table_name = Column(String(255), nullable=False)
+    table_description = Column(Text, nullable=True)
+    execution_id = Column(Integer, ForeignKey('table_execution.id'), nullable=False)
+    execution_time = Column(DateTime, nullable=False)
+    approver_name = Column(String(255), nullable=True)
+    task_executors = Column(Text, nullable=True)
+    status = Column(String(50), nullable=True)
+    last_updated = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Index, Integer, String, Text, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,20 +6,35 @@ from .base import AbstractBase
 
 class Tables(AbstractBase):
     __tablename__ = 'tables'
+    __table_args__ = (
+        Index('idx_tables_topo_order', 'topo_order'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False, unique=True)
     description = Column(Text, nullable=True)
     requires_approval = Column(Boolean, default=False)
+    # Posição numa ordem topológica global: dependência sempre antes da dependente
+    topo_order = Column(Integer, nullable=True)
     
     created_by = Column(String(255), nullable=False)
     last_modified_by = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    partitions = relationship("Partitions", back_populates="table")
-    dependencies = relationship("Dependencies", back_populates="table", foreign_keys="[Dependencies.table_id]")
-    dependent_tables = relationship("Dependencies", foreign_keys="[Dependencies.dependency_id]", back_populates="dependency_table")
+    # Partições e dependências removidas ficam com `date_deleted` (upsert/soft delete)
+    partitions = relationship(
+        "Partitions", back_populates="table",
+        primaryjoin="and_(Tables.id == Partitions.table_id, Partitions.date_deleted.is_(None))",
+    )
+    dependencies = relationship(
+        "Dependencies", back_populates="table", foreign_keys="[Dependencies.table_id]",
+        primaryjoin="and_(Tables.id == Dependencies.table_id, Dependencies.date_deleted.is_(None))",
+    )
+    dependent_tables = relationship(
+        "Dependencies", foreign_keys="[Dependencies.dependency_id]", back_populates="dependency_table",
+        primaryjoin="and_(Tables.id == Dependencies.dependency_id, Dependencies.date_deleted.is_(None))",
+    )
     task_table = relationship("TaskTable", back_populates="table", foreign_keys="[TaskTable.table_id]")
     table_partition_execs = relationship("TablePartitionExec", back_populates="table")
     table_executions = relationship("TableExecution", back_populates="table")
\ No newline at end of file
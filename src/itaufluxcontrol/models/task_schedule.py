@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_COMPLETED, STATIC_SCHEDULE_FAILED, STATIC_SCHEDULE_IN_PROGRESS, STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
@@ -22,8 +22,17 @@ class TaskSchedule(AbstractBase):
     result_execution_id = Column(Integer, ForeignKey('table_execution.id'), nullable=True)
     error_message = Column(String(350), nullable=True)
     partitions = Column(JSON, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    schedule_group = Column(String(64), nullable=True)
+    schedule_deleted_at = Column(DateTime, nullable=True)
+    trigger_attempts = Column(Integer, nullable=False, default=0)
     
     task_table = relationship("TaskTable", back_populates="schedules", foreign_keys=[task_id])
     table_execution = relationship("TableExecution", back_populates="schedules", foreign_keys=[table_execution_id])
     result_execution = relationship("TableExecution", foreign_keys=[result_execution_id])
-    approval_status = relationship("ApprovalStatus", back_populates="task_schedule", foreign_keys="ApprovalStatus.task_schedule_id")
\ No newline at end of file
+    approval_status = relationship("ApprovalStatus", back_populates="task_schedule", foreign_keys="ApprovalStatus.task_schedule_id")
+
+    __table_args__ = (
+        Index('idx_task_schedule_status_schedule_deleted_at', 'status', 'schedule_deleted_at'),
+        Index('idx_task_schedule_result_execution_id', 'result_execution_id'),
+    )
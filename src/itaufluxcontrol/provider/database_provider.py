@@ -1,13 +1,41 @@
 import json
 import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Callable, Dict
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
 from injector import inject
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
 
+from src.itaufluxcontrol.config.tenant import tenant_context
 from src.itaufluxcontrol.service.boto_service import BotoService
 
+
+class TenantRoutingSession(Session):
+    """
+    Sessão que executa cada statement na engine do tenant da invocação corrente.
+    """
+
+    def __init__(self, *args, engine_resolver: Callable[[int], Engine], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.engine_resolver = engine_resolver
+
+    def get_bind(self, mapper=None, **kwargs):
+        return self.engine_resolver(tenant_context.tenant_id)
+
+
 class DatabaseProvider:
+    """
+    Engines do banco. Por padrão todos os tenants usam a engine de
+    `DB_SECRET_NAME`; `TENANT_DATABASES` (JSON) move tenants para um banco
+    próprio, sem mudança de código:
+
+        {"7": {"secret": "itaufluxcontrol-tenant-7"}, "9": {"schema": "itaufluxcontrol_t9"}}
+
+    `secret` aponta para outro secret (outro servidor); `schema` usa outro
+    banco no mesmo servidor, com as credenciais do secret padrão. As engines
+    dos tenants são criadas no primeiro uso e reaproveitadas.
+    """
+
     @inject
     def __init__(self, boto_service: BotoService):
         self.boto_service = boto_service
@@ -25,11 +53,23 @@ class DatabaseProvider:
 
     def _configure_database(self):
         secret_name = os.getenv("DB_SECRET_NAME", "default_secret")
-        region_name = os.getenv("AWS_REGION", "us-east-1")
 
         secret = self._get_secret(secret_name)
-        credentials = json.loads(secret)
+        self.credentials = json.loads(secret)
+        self.engine = self._create_engine(self.credentials)
+        self.tenant_databases: Dict[int, Dict[str, str]] = {
+            int(tenant_id): route for tenant_id, route in json.loads(os.getenv("TENANT_DATABASES", "{}")).items()
+        }
+        self._tenant_engines: Dict[int, Engine] = {}
+        self.SessionLocal = sessionmaker(
+            class_=TenantRoutingSession,
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+            engine_resolver=self.get_engine,
+        )
 
+    def _create_engine(self, credentials: Dict[str, Any]) -> Engine:
         db_user = credentials.get("username", "user")
         db_password = credentials.get("password", "password")
         db_host = credentials.get("host", "localhost")
@@ -41,12 +81,32 @@ class DatabaseProvider:
             "?charset=utf8mb4"
         )
 
-        self.engine = create_engine(
+        return create_engine(
             database_url,
             pool_pre_ping=True,
             connect_args={"charset": "utf8mb4"},
         )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+    def get_engine(self, tenant_id: int) -> Engine:
+        """
+        Engine do tenant: a do seu roteamento em `TENANT_DATABASES` ou a padrão.
+
+        :raises ValueError: Se o roteamento do tenant não tem `secret` nem `schema`.
+        """
+        engine = self._tenant_engines.get(tenant_id)
+        if engine is not None:
+            return engine
+        route = self.tenant_databases.get(tenant_id)
+        if route is None:
+            return self.engine
+        if route.get("secret"):
+            engine = self._create_engine(json.loads(self._get_secret(route["secret"])))
+        elif route.get("schema"):
+            engine = self._create_engine({**self.credentials, "dbname": route["schema"]})
+        else:
+            raise ValueError(f"Tenant {tenant_id} route must define 'secret' or 'schema'.")
+        self._tenant_engines[tenant_id] = engine
+        return engine
 
     def set_charset(self, db):
         db.execute(text("SET NAMES utf8mb4;"))
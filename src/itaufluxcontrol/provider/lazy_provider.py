@@ -0,0 +1,67 @@
+from typing import Any, Callable, Generic, TypeVar
+
+from injector import Injector, Provider
+
+T = TypeVar('T')
+
+
+class LazyProxy:
+    """
+    Proxy que só constrói o objeto real no primeiro acesso a um atributo.
+
+    `isinstance(proxy, Interface)` continua funcionando sem materializar,
+    pois `__class__` devolve a interface do binding.
+    """
+    __slots__ = ("_lazy_interface", "_lazy_factory", "_lazy_instance")
+
+    def __init__(self, interface: type, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lazy_interface", interface)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+
+    @property
+    def __class__(self):
+        return object.__getattribute__(self, "_lazy_interface")
+
+    def _materialize(self):
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is None:
+            instance = object.__getattribute__(self, "_lazy_factory")()
+            object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str):
+        return getattr(self._materialize(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._materialize(), name, value)
+
+    def __repr__(self) -> str:
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is None:
+            return f"<LazyProxy {object.__getattribute__(self, '_lazy_interface').__name__} (não materializado)>"
+        return repr(instance)
+
+
+def is_materialized(obj: Any) -> bool:
+    """
+    Indica se o objeto já foi construído (objetos que não são proxies sempre foram).
+    """
+    if type(obj) is not LazyProxy:
+        return True
+    return object.__getattribute__(obj, "_lazy_instance") is not None
+
+
+class LazyProvider(Provider, Generic[T]):
+    """
+    Provider do Injector que entrega um `LazyProxy` em vez do objeto: o
+    `provider` original só é chamado quando alguém usa a dependência.
+    Combinado com `scope=singleton`, a construção acontece uma única vez.
+    """
+
+    def __init__(self, interface: type, provider: Provider):
+        self._interface = interface
+        self._provider = provider
+
+    def get(self, injector: Injector) -> T:
+        return LazyProxy(self._interface, lambda: self._provider.get(injector))
@@ -1,5 +1,6 @@
 from injector import singleton, inject
 
+from src.itaufluxcontrol.config.tenant import tenant_context
 from src.itaufluxcontrol.provider.database_provider import DatabaseProvider
 
 @singleton
@@ -14,6 +15,7 @@ class SessionProvider:
         self._database_service = database_service
         self._session_generator = self._database_service.get_session()
         self._session = next(self._session_generator)
+        self._tenant_id = tenant_context.tenant_id
 
     def get_session(self):
         """
@@ -21,6 +23,17 @@ class SessionProvider:
         """
         return self._session
 
+    def use_tenant(self, tenant_id: int):
+        """
+        Prepara a sessão para uma invocação do tenant. Na troca de tenant a
+        sessão é fechada: o identity map é descartado (com tenants em bancos
+        separados o mesmo id existe em mais de um) e a conexão com a engine
+        do tenant anterior é devolvida ao pool.
+        """
+        if getattr(self, "_tenant_id", tenant_id) != tenant_id:
+            self._session.close()
+        self._tenant_id = tenant_id
+
     def commit(self):
         """
         Realiza o commit da sessão atual.
@@ -1,6 +1,14 @@
+from datetime import datetime
 from logging import Logger
+from typing import Any, Dict, List, Optional
 from injector import inject
+from sqlalchemy import String, cast, func
+from sqlalchemy.orm import contains_eager, joinedload
+from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_PENDING
 from src.itaufluxcontrol.models.approval_status import ApprovalStatus
+from src.itaufluxcontrol.models.tables import Tables
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.models.task_table import TaskTable
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
 
@@ -12,5 +20,58 @@ class ApprovalStatusRepository(GenericRepository[ApprovalStatus]):
         self.logger = logger
 
     def get_by_task_schedule_id(self, task_schedule_id):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting ApprovalStatus by task_schedule_id: {task_schedule_id}")
-        return self.session.query(ApprovalStatus).filter(ApprovalStatus.task_schedule_id == task_schedule_id).all()
+        self.logger.debug("[%s] Getting ApprovalStatus by task_schedule_id: %s", self.__class__.__name__, task_schedule_id)
+        return self.session.query(ApprovalStatus).filter(ApprovalStatus.task_schedule_id == task_schedule_id).first()
+
+    def get_for_review(
+        self,
+        approval_status_ids: Optional[List[int]] = None,
+        table_id: Optional[int] = None,
+        table_name: Optional[str] = None,
+        requested_from: Optional[datetime] = None,
+        requested_to: Optional[datetime] = None,
+        partitions: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[ApprovalStatus]:
+        """
+        Aprovações a revisar em lote, com agendamento, tarefa, executor e
+        execução de origem na mesma consulta. Com `approval_status_ids` vêm
+        as aprovações em qualquer status; sem, só as pendentes que atendem
+        aos filtros. Partições e `limit` também vão para o SQL, então só as
+        linhas devolvidas ficam travadas até o commit.
+        """
+        self.logger.debug("[%s] Getting approvals for review: ids=%s table=%s/%s partitions=%s requested=[%s, %s) limit=%s", self.__class__.__name__, approval_status_ids, table_id, table_name, partitions, requested_from, requested_to, limit)
+        query = self.session.query(ApprovalStatus).join(
+            ApprovalStatus.task_schedule
+        ).join(
+            TaskSchedule.task_table
+        ).options(
+            contains_eager(ApprovalStatus.task_schedule).contains_eager(TaskSchedule.task_table).joinedload(TaskTable.task_executor),
+            contains_eager(ApprovalStatus.task_schedule).joinedload(TaskSchedule.table_execution),
+        ).filter(ApprovalStatus.date_deleted.is_(None))
+
+        if approval_status_ids:
+            query = query.filter(ApprovalStatus.id.in_(approval_status_ids))
+        else:
+            query = query.filter(ApprovalStatus.status == STATIC_APPROVE_STATUS_PENDING)
+        if table_id:
+            query = query.filter(TaskTable.table_id == table_id)
+        if table_name:
+            query = query.join(TaskTable.table).filter(Tables.name == table_name)
+        if requested_from:
+            query = query.filter(ApprovalStatus.requested_at >= requested_from)
+        if requested_to:
+            query = query.filter(ApprovalStatus.requested_at < requested_to)
+        for name, value in (partitions or {}).items():
+            query = query.filter(self._partition_value(name) == str(value))
+        query = query.order_by(ApprovalStatus.id)
+        if limit:
+            query = query.limit(limit)
+        return query.with_for_update(of=ApprovalStatus).all()
+
+    def _partition_value(self, name: str):
+        # `task_schedule.partitions` guarda o dict serializado como string JSON
+        path = f'$."{name}"'
+        if self.session.get_bind().dialect.name == "mysql":
+            return func.json_unquote(func.json_extract(func.json_unquote(TaskSchedule.partitions), path))
+        return cast(func.json_extract(func.json_extract(TaskSchedule.partitions, "$"), path), String)
@@ -1,9 +1,13 @@
 from logging import Logger
+from typing import Iterable, List, Tuple
 from injector import inject
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
 from src.itaufluxcontrol.models.dependencies import Dependencies
+from src.itaufluxcontrol.models.tables import Tables
+from src.itaufluxcontrol.models.task_table import TaskTable
 
 class DependencyRepository(GenericRepository[Dependencies]):
     @inject
@@ -13,5 +17,51 @@ class DependencyRepository(GenericRepository[Dependencies]):
         self.logger = logger
 
     def get_by_table_id(self, table_id):
-        self.logger.debug(f"[DependencyRepository] Getting dependencies for table [{table_id}]")
+        self.logger.debug("[DependencyRepository] Getting dependencies for table [%s]", table_id)
         return self.session.query(Dependencies).filter(Dependencies.table_id == table_id).all()
+
+
+    def get_graph_version(self) -> Tuple:
+        """
+        Impressão digital barata (uma ida ao banco) de tabelas, dependências e
+        tarefas: muda quando algo é criado, removido ou, nas tabelas, alterado.
+        """
+        return tuple(self.session.execute(select(
+            select(func.count(Dependencies.id)).where(Dependencies.date_deleted.is_(None)).scalar_subquery(),
+            select(func.max(Dependencies.id)).scalar_subquery(),
+            select(func.count(Tables.id)).where(Tables.date_deleted.is_(None)).scalar_subquery(),
+            select(func.max(Tables.last_modified_at)).scalar_subquery(),
+            select(func.count(TaskTable.id)).where(TaskTable.date_deleted.is_(None)).scalar_subquery(),
+            select(func.max(TaskTable.id)).scalar_subquery(),
+        )).one())
+
+    def get_graph(self) -> Tuple[List, List, List]:
+        """
+        Tabelas, arestas e tarefas ativas, só com as colunas do grafo de dependências.
+        """
+        self.logger.debug("[%s] Loading dependency graph", self.__class__.__name__)
+        tables = self.session.query(Tables.id, Tables.name).filter(Tables.date_deleted.is_(None)).all()
+        edges = self.session.query(
+            Dependencies.table_id, Dependencies.dependency_id, Dependencies.is_required
+        ).filter(Dependencies.date_deleted.is_(None)).all()
+        tasks = self.session.query(TaskTable.id, TaskTable.table_id, TaskTable.alias).filter(TaskTable.date_deleted.is_(None)).all()
+        return tables, edges, tasks
+
+    def get_neighbors_in_order_range(self, table_ids: Iterable[int], downstream: bool, lower: int, upper: int) -> List[Tuple[int, int]]:
+        """
+        Vizinhos diretos de `table_ids` (dependentes com `downstream`, senão
+        dependências) cuja `topo_order` está em [`lower`, `upper`].
+
+        :return: Lista de `(id, topo_order)`.
+        """
+        source, target = (
+            (Dependencies.dependency_id, Dependencies.table_id) if downstream
+            else (Dependencies.table_id, Dependencies.dependency_id)
+        )
+        return self.session.query(Tables.id, Tables.topo_order).join(
+            Dependencies, target == Tables.id
+        ).filter(
+            source.in_(list(table_ids)),
+            Dependencies.date_deleted.is_(None),
+            Tables.topo_order.between(lower, upper),
+        ).distinct().all()
@@ -1,12 +1,40 @@
+from contextlib import contextmanager
 from datetime import datetime
 from logging import Logger
-from sqlalchemy.orm import Session
+from sqlalchemy import event, insert, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
 from sqlalchemy.sql import and_
-from typing import Type, TypeVar, Generic, List, Optional
+from typing import Any, Dict, Iterator, Sequence, Type, TypeVar, Generic, List, Optional, Union
 from aws_lambda_powertools.event_handler.exceptions import NotFoundError
 
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.models.base import AbstractBase
+
 T = TypeVar('T')
 
+# Marca, em `session.info`, um escopo `batch()` aberto (compartilhado entre repositórios)
+BATCH_SCOPE = "repository_batch"
+
+
+def apply_tenant_criteria(execute_state: ORMExecuteState):
+    """
+    Restringe SELECTs, UPDATEs e DELETEs do ORM ao tenant da invocação, em
+    todas as entidades do statement (inclusive joins, aliases e CTEs). Cargas
+    de relacionamento e de colunas herdam o critério da consulta de origem.
+    SQL textual (`text()`) não passa por aqui.
+    """
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+    tenant_id = tenant_context.tenant_id
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(AbstractBase, lambda cls: cls.tenant_id == tenant_id, include_aliases=True)
+    )
+
+
 class GenericRepository(Generic[T]):
     """
     Repositório genérico para operações CRUD.
@@ -23,7 +51,10 @@ class GenericRepository(Generic[T]):
         self.db_session = db_session
         self.model = model
         self.logger = logger
+        if isinstance(db_session, Session) and not event.contains(db_session, "do_orm_execute", apply_tenant_criteria):
+            event.listen(db_session, "do_orm_execute", apply_tenant_criteria)
 
+    @tracer.trace()
     def save(self, obj: T) -> T:
         """
         Salva ou atualiza um objeto no banco de dados.
@@ -32,18 +63,159 @@ class GenericRepository(Generic[T]):
         :return: Objeto salvo.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Saving object: [{obj.__dict__}]")
+            self.logger.debug("[%s] Saving object: [%s]", self.__class__.__name__, obj.__dict__)
             if not obj.id:  
                 self.db_session.add(obj)  
             else: 
                 obj = self.db_session.merge(obj)  
+            if self.db_session.info.get(BATCH_SCOPE):
+                return obj
             self.db_session.flush()  
-            self.logger.debug(f"[{self.__class__.__name__}] Object ID after flush: {obj.id}")
+            self.logger.debug("[%s] Object ID after flush: %s", self.__class__.__name__, obj.id)
             return obj
         except Exception as e:
             self.logger.error(f"Error saving object: {e}")
             raise
 
+    @tracer.trace()
+    def save_all(self, objs: List[T], fetch_ids: bool = True) -> List[T]:
+        """
+        Salva ou atualiza vários objetos com um único flush.
+
+        No flush o unit of work agrupa os INSERTs do mesmo modelo e busca os
+        IDs com `RETURNING` (insertmanyvalues) onde o dialeto suporta; no
+        MySQL sem `RETURNING` cada INSERT que precisa do ID vai separado. Com
+        `fetch_ids=False`, quando todos os objetos são novos, as linhas vão num
+        INSERT multi-row sem buscar IDs e os objetos não entram na sessão.
+
+        :param objs: Objetos a serem salvos.
+        :param fetch_ids: Se o chamador precisa dos IDs dos objetos novos.
+        :return: Objetos salvos, na ordem recebida.
+        """
+        if not objs:
+            return []
+        try:
+            self.logger.debug("[%s] Saving %s objects", self.__class__.__name__, len(objs))
+            if not fetch_ids and not any(obj.id for obj in objs):
+                keys = self.model.__mapper__.columns.keys()
+                self.insert_many([
+                    {key: value for key in keys if (value := getattr(obj, key)) is not None}
+                    for obj in objs
+                ])
+                return objs
+
+            saved = []
+            for obj in objs:
+                if not obj.id:
+                    self.db_session.add(obj)
+                    saved.append(obj)
+                else:
+                    saved.append(self.db_session.merge(obj))
+            if not self.db_session.info.get(BATCH_SCOPE):
+                self.db_session.flush()
+            return saved
+        except Exception as e:
+            self.logger.error(f"[{self.__class__.__name__}] Error saving objects: {e}")
+            raise
+
+    @contextmanager
+    def batch(self) -> Iterator["GenericRepository[T]"]:
+        """
+        Escopo de unit of work: dentro dele `save`/`save_all` só colocam os
+        objetos na sessão, sem flush, e o autoflush das consultas fica
+        desligado; um único flush acontece na saída do escopo mais externo.
+        Os IDs dos objetos novos só existem depois desse flush. Vale para
+        todos os repositórios da mesma sessão. Em caso de erro o flush não
+        acontece e o rollback do chamador descarta os objetos.
+
+        Uso: `with repository.batch(): ...`
+        """
+        outer = self.db_session.info.get(BATCH_SCOPE, False)
+        self.db_session.info[BATCH_SCOPE] = True
+        try:
+            with self.db_session.no_autoflush:
+                yield self
+        finally:
+            self.db_session.info[BATCH_SCOPE] = outer
+        if not outer:
+            self.flush()
+
+    @tracer.trace()
+    def insert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insere várias linhas em um único INSERT em lote (multi-row), sem
+        carregar objetos na sessão. Os defaults das colunas são aplicados.
+
+        :param rows: Valores de cada linha, por nome de atributo.
+        :return: Quantidade de linhas inseridas.
+        """
+        if not rows:
+            return 0
+        try:
+            self.logger.debug("[%s] Inserting %s rows", self.__class__.__name__, len(rows))
+            self.db_session.execute(insert(self.model), rows)
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"[{self.__class__.__name__}] Error inserting rows: {e}")
+            raise
+
+    @tracer.trace()
+    def upsert(self, rows: List[Dict[str, Any]], conflict_columns: List[str], update_columns: List[str]) -> int:
+        """
+        Insere ou atualiza várias linhas em um único statement:
+        `INSERT ... ON DUPLICATE KEY UPDATE` no MySQL e
+        `INSERT ... ON CONFLICT DO UPDATE` no SQLite.
+
+        :param rows: Valores de cada linha; todas com as mesmas chaves.
+        :param conflict_columns: Colunas da chave única (usadas pelo SQLite).
+        :param update_columns: Colunas atualizadas quando a linha já existe.
+        :return: Quantidade de linhas enviadas.
+        """
+        if not rows:
+            return 0
+        try:
+            self.logger.debug("[%s] Upserting %s rows", self.__class__.__name__, len(rows))
+            table = self.model.__table__
+            if self.db_session.get_bind().dialect.name == "mysql":
+                statement = mysql.insert(table).values(rows)
+                statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in update_columns})
+            else:
+                statement = sqlite.insert(table).values(rows)
+                statement = statement.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={column: statement.excluded[column] for column in update_columns},
+                )
+            self.db_session.execute(statement)
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"[{self.__class__.__name__}] Error upserting rows: {e}")
+            raise
+
+    @tracer.trace()
+    def bulk_soft_delete(self, obj_ids: List[int], deleted_by: Optional[str] = None) -> int:
+        """
+        Marca vários objetos como deletados (soft delete) em um único UPDATE.
+
+        :param obj_ids: IDs dos objetos.
+        :param deleted_by: Usuário gravado em `deleted_by`.
+        :return: Quantidade de linhas marcadas.
+        """
+        if not obj_ids:
+            return 0
+        try:
+            self.logger.debug("[%s] Soft deleting %s objects", self.__class__.__name__, len(obj_ids))
+            result = self.db_session.execute(
+                update(self.model)
+                .where(self.model.id.in_(obj_ids), self.model.date_deleted.is_(None))
+                .values(date_deleted=datetime.now(), deleted_by=deleted_by)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"[{self.__class__.__name__}] Error soft deleting objects: {e}")
+            raise
+
+    @tracer.trace()
     def get_by_id(self, obj_id: int) -> Optional[T]:
         """
         Obtém um objeto pelo ID, considerando `date_deleted` como null.
@@ -52,7 +224,7 @@ class GenericRepository(Generic[T]):
         :return: Objeto encontrado ou None.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Getting object by ID: [{obj_id}]")
+            self.logger.debug("[%s] Getting object by ID: [%s]", self.__class__.__name__, obj_id)
             return self.db_session.query(self.model).filter(
                 and_(self.model.id == obj_id, self.model.date_deleted.is_(None))
             ).first()
@@ -67,7 +239,7 @@ class GenericRepository(Generic[T]):
         :return: Lista de objetos.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Getting all objects")
+            self.logger.debug("[%s] Getting all objects", self.__class__.__name__)
             return self.db_session.query(self.model).filter(
                 self.model.date_deleted.is_(None)
             ).all()
@@ -84,7 +256,7 @@ class GenericRepository(Generic[T]):
         :return: Objeto atualizado ou None.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Updating object with ID [{obj_id}]: [{updated_data}]")
+            self.logger.debug("[%s] Updating object with ID [%s]: [%s]", self.__class__.__name__, obj_id, updated_data)
             obj = self.get_by_id(obj_id)
             if not obj:
                 self.logger.warning(f"[{self.__class__.__name__}] Object with ID [{obj_id}] not found for update.")
@@ -99,6 +271,49 @@ class GenericRepository(Generic[T]):
             self.logger.error(f"[{self.__class__.__name__}] Error updating object with ID [{obj_id}]: {e}")
             raise
 
+    @tracer.trace()
+    def patch(self, obj_id: int, expected_status: Optional[Union[str, Sequence[str]]] = None, **fields) -> bool:
+        """
+        Atualiza só as colunas informadas em um único `UPDATE ... SET`, sem
+        carregar o objeto antes (o `merge` faz um SELECT e regrava o objeto
+        inteiro). Objetos já carregados na sessão recebem os novos valores.
+
+        :param obj_id: ID do objeto.
+        :param expected_status: Status (ou lista de status) em que a linha precisa estar para ser atualizada.
+        :param fields: Colunas e valores a gravar.
+        :return: True se a linha foi atualizada; False se não existe, foi deletada ou está em outro status.
+        """
+        return self.patch_many([obj_id], expected_status, **fields) == 1
+
+    @tracer.trace()
+    def patch_many(self, obj_ids: List[int], expected_status: Optional[Union[str, Sequence[str]]] = None, **fields) -> int:
+        """
+        Como `patch`, para vários objetos com os mesmos valores, em um único UPDATE.
+
+        :param obj_ids: IDs dos objetos.
+        :param expected_status: Status (ou lista de status) em que cada linha precisa estar para ser atualizada.
+        :param fields: Colunas e valores a gravar.
+        :return: Quantidade de linhas atualizadas.
+        """
+        if not obj_ids:
+            return 0
+        try:
+            self.logger.debug("[%s] Patching %s objects: [%s]", self.__class__.__name__, len(obj_ids), fields)
+            criteria = [self.model.id.in_(obj_ids), self.model.date_deleted.is_(None)]
+            if expected_status is not None:
+                statuses = [expected_status] if isinstance(expected_status, str) else list(expected_status)
+                criteria.append(self.model.status.in_(statuses))
+            result = self.db_session.execute(
+                update(self.model)
+                .where(*criteria)
+                .values(**fields)
+                .execution_options(synchronize_session="evaluate")
+            )
+            return result.rowcount
+        except Exception as e:
+            self.logger.error(f"[{self.__class__.__name__}] Error patching objects {obj_ids}: {e}")
+            raise
+
     def hard_delete(self, obj_id: int) -> bool:
         """
         Remove permanentemente um objeto pelo ID.
@@ -107,7 +322,7 @@ class GenericRepository(Generic[T]):
         :return: True se foi removido, False caso contrário.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Hard deleting object with ID [{obj_id}]")
+            self.logger.debug("[%s] Hard deleting object with ID [%s]", self.__class__.__name__, obj_id)
             obj = self.get_by_id(obj_id)
             if not obj:
                 self.logger.warning(f"[{self.__class__.__name__}] Object with ID [{obj_id}] not found for hard delete.")
@@ -126,7 +341,7 @@ class GenericRepository(Generic[T]):
         :return: True se foi marcado, False caso contrário.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Soft deleting object with ID [{obj_id}]")
+            self.logger.debug("[%s] Soft deleting object with ID [%s]", self.__class__.__name__, obj_id)
             obj = self.get_by_id(obj_id)
             if not obj:
                 self.logger.warning(f"[{self.__class__.__name__}] Object with ID [{obj_id}] not found for soft delete.")
@@ -140,6 +355,7 @@ class GenericRepository(Generic[T]):
             self.logger.error(f"[{self.__class__.__name__}] Error soft deleting object with ID [{obj_id}]: {e}")
             raise
 
+    @tracer.trace()
     def query(self, **filters) -> List[T]: 
         """
         Consulta objetos no banco de dados com base em filtros dinâmicos.
@@ -148,7 +364,7 @@ class GenericRepository(Generic[T]):
         :return: Lista de objetos que atendem aos filtros.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Querying objects with filters: {filters}")
+            self.logger.debug("[%s] Querying objects with filters: %s", self.__class__.__name__, filters)
             query = self.db_session.query(self.model).filter_by(date_deleted=None)
             for attr, value in filters.items():
                 if '.' in attr:
@@ -173,7 +389,7 @@ class GenericRepository(Generic[T]):
         Executa um flush na sessão do banco de dados.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Flushing database session")
+            self.logger.debug("[%s] Flushing database session", self.__class__.__name__)
             self.db_session.flush()
         except Exception as e:
             self.logger.error(f"[{self.__class__.__name__}] Error flushing database session: {e}")
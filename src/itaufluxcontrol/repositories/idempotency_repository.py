@@ -0,0 +1,39 @@
+from datetime import datetime
+from logging import Logger
+from typing import Any, Optional
+
+from injector import inject
+from sqlalchemy import delete, update
+
+from src.itaufluxcontrol.config.constants import STATIC_IDEMPOTENCY_COMPLETED
+from src.itaufluxcontrol.models.idempotency_key import IdempotencyKey
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
+
+
+class IdempotencyRepository(GenericRepository[IdempotencyKey]):
+    @inject
+    def __init__(self, session_provider: SessionProvider, logger: Logger):
+        super().__init__(session_provider.get_session(), IdempotencyKey, logger)
+        self.session = session_provider.get_session()
+        self.logger = logger
+
+    def get_by_key(self, key: str) -> Optional[IdempotencyKey]:
+        self.logger.debug("[%s] Getting idempotency key: %s", self.__class__.__name__, key)
+        return self.session.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+
+    def complete(self, record_id: int, response: Any):
+        self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id)
+            .values(status=STATIC_IDEMPOTENCY_COMPLETED, response=response)
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_expired(self, now: datetime) -> int:
+        result = self.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.expires_at < now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
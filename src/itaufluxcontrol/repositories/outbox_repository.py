@@ -0,0 +1,90 @@
+from datetime import datetime
+from logging import Logger
+from typing import List, Set
+
+from injector import inject
+from sqlalchemy import or_, update
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_DISPATCHED, STATIC_OUTBOX_DISPATCHING, STATIC_OUTBOX_PENDING
+from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
+
+
+class OutboxRepository(GenericRepository[OutboxMessage]):
+    @inject
+    def __init__(self, session_provider: SessionProvider, logger: Logger):
+        super().__init__(session_provider.get_session(), OutboxMessage, logger)
+        self.session = session_provider.get_session()
+        self.logger = logger
+
+    def get_dispatchable_ids(self, now: datetime, stale_before: datetime, limit: int) -> List[int]:
+        """
+        Ids prontos para envio: pendentes cujo backoff já venceu e mensagens
+        presas em `dispatching` (lease expirado).
+        """
+        self.logger.debug("[%s] Getting dispatchable outbox messages (limit %s)", self.__class__.__name__, limit)
+        rows = self.session.query(OutboxMessage.id).filter(
+            or_(
+                (OutboxMessage.status == STATIC_OUTBOX_PENDING) & (OutboxMessage.next_attempt_at <= now),
+                (OutboxMessage.status == STATIC_OUTBOX_DISPATCHING) & (OutboxMessage.claimed_at < stale_before),
+            ),
+            OutboxMessage.date_deleted.is_(None),
+        ).order_by(OutboxMessage.id).limit(limit).with_for_update(skip_locked=True).all()
+        return [row.id for row in rows]
+
+    def claim(self, ids: List[int], token: str, now: datetime, stale_before: datetime) -> List[OutboxMessage]:
+        """
+        Reivindica as mensagens com um UPDATE condicional (`dispatching` + token):
+        só um dispatcher (pós-commit ou sweeper) fica com cada mensagem.
+        Retorna as mensagens reivindicadas por este token, em ordem.
+        """
+        if not ids:
+            return []
+        self.session.execute(
+            update(OutboxMessage)
+            .where(
+                OutboxMessage.id.in_(ids),
+                or_(
+                    OutboxMessage.status == STATIC_OUTBOX_PENDING,
+                    (OutboxMessage.status == STATIC_OUTBOX_DISPATCHING) & (OutboxMessage.claimed_at < stale_before),
+                ),
+            )
+            .values(status=STATIC_OUTBOX_DISPATCHING, claimed_at=now, claim_token=token)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.query(OutboxMessage).filter(
+            OutboxMessage.id.in_(ids),
+            OutboxMessage.claim_token == token,
+        ).order_by(OutboxMessage.id).populate_existing().all()
+
+    def mark_dispatched(self, ids: List[int], now: datetime):
+        self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids))
+            .values(status=STATIC_OUTBOX_DISPATCHED, dispatched_at=now, attempts=OutboxMessage.attempts + 1, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def has_pending(self, aggregate_id: int, operations: List[str]) -> bool:
+        """
+        Indica se há mensagens ainda não enviadas para o agregado.
+        """
+        return self.session.query(OutboxMessage.id).filter(
+            OutboxMessage.aggregate_id == aggregate_id,
+            OutboxMessage.operation.in_(operations),
+            OutboxMessage.status.in_([STATIC_OUTBOX_PENDING, STATIC_OUTBOX_DISPATCHING]),
+        ).first() is not None
+
+    def get_pending_aggregate_ids(self, aggregate_ids: List[int], operations: List[str]) -> Set[int]:
+        """
+        Versão em lote de `has_pending`: agregados com mensagens ainda não enviadas.
+        """
+        if not aggregate_ids:
+            return set()
+        rows = self.session.query(OutboxMessage.aggregate_id).filter(
+            OutboxMessage.aggregate_id.in_(aggregate_ids),
+            OutboxMessage.operation.in_(operations),
+            OutboxMessage.status.in_([STATIC_OUTBOX_PENDING, STATIC_OUTBOX_DISPATCHING]),
+        ).distinct().all()
+        return {row.aggregate_id for row in rows}
@@ -13,5 +13,5 @@ class PartitionRepository(GenericRepository[Partitions]):
         self.logger = logger
 
     def get_by_table_id(self, table_id):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting partitions for table [{table_id}]")
+        self.logger.debug("[%s] Getting partitions for table [%s]", self.__class__.__name__, table_id)
         return self.session.query(Partitions).filter(Partitions.table_id == table_id).all()
\ No newline at end of file
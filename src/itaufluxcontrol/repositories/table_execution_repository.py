@@ -1,12 +1,14 @@
 from logging import Logger
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List
 from injector import inject
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
+from src.itaufluxcontrol.config.tracer import tracer
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
 from src.itaufluxcontrol.models.table_execution import TableExecution
+from src.itaufluxcontrol.models.tables import Tables
 
 class TableExecutionRepository(GenericRepository[TableExecution]):
     @inject
@@ -15,6 +17,7 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
         self.session = session_provider.get_session()
         self.logger = logger
         
+    @tracer.trace()
     def get_latest_execution(self, table_id: int):
         """
         Retorna a última execução de uma tabela pelo ID.
@@ -22,12 +25,22 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
         :return: Instância de TableExecution ou None.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] get last execution for table [{table_id}]")
+            self.logger.debug("[%s] get last execution for table [%s]", self.__class__.__name__, table_id)
             return self.session.query(TableExecution).filter_by(table_id=table_id).order_by(TableExecution.date_time.desc()).first()
         except SQLAlchemyError as e:
             self.logger.error(f"Erro ao buscar última execução da tabela [{table_id}]: {str(e)}")
             raise
 
+    def get_with_table_names(self, execution_ids: Iterable[int]) -> List:
+        """
+        Execuções com o nome da tabela, numa consulta só e só com as colunas usadas na linhagem.
+        """
+        execution_ids = list(execution_ids)
+        self.logger.debug("[%s] Getting %s executions with table names", self.__class__.__name__, len(execution_ids))
+        return self.session.query(
+            TableExecution.id, TableExecution.table_id, Tables.name.label("table_name"), TableExecution.date_time, TableExecution.source
+        ).join(Tables, Tables.id == TableExecution.table_id).filter(TableExecution.id.in_(execution_ids)).all()
+
     def get_executions_by_table(self, table_id: int):
         """
         Retorna todas as execuções associadas a uma tabela.
@@ -40,6 +53,7 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
             self.logger.error(f"Erro ao buscar execuções pela tabela {table_id}: {str(e)}")
             raise
 
+    @tracer.trace()
     def get_latest_execution_with_restrictions(self, table_id: int, required_partitions: Dict[str, Any]):
         """
         Consulta diretamente no banco de dados para encontrar a última execução que respeita as restrições de partições
@@ -49,7 +63,7 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
         :param required_partitions: Dicionário com as partições obrigatórias e seus valores.
         :return: A última execução que respeita as restrições ou None.
         """
-        self.logger.debug(f"[{self.__class__.__name__}] Getting latest execution with restrictions for table [{table_id}]")
+        self.logger.debug("[%s] Getting latest execution with restrictions for table [%s]", self.__class__.__name__, table_id)
 
         available_partition_keys_query = text("""
             SELECT DISTINCT p.name
@@ -63,10 +77,10 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
         filtered_partitions = {key: value for key, value in required_partitions.items() if key in available_partition_keys}
 
         if not filtered_partitions:
-            self.logger.debug(f"[{self.__class__.__name__}] No overlapping partitions found for table [{table_id}]. Returning None.")
+            self.logger.debug("[%s] No overlapping partitions found for table [%s]. Returning None.", self.__class__.__name__, table_id)
             return None
 
-        self.logger.debug(f"[{self.__class__.__name__}] Overlapping partitions found for table [{table_id}]: {filtered_partitions}")
+        self.logger.debug("[%s] Overlapping partitions found for table [%s]: %s", self.__class__.__name__, table_id, filtered_partitions)
 
         partition_conditions = " AND ".join(
             [f"""
@@ -95,14 +109,14 @@ class TableExecutionRepository(GenericRepository[TableExecution]):
             params[f"{key}_name"] = key
             params[f"{key}_value"] = str(value)  
 
-        self.logger.debug(f"[{self.__class__.__name__}] Executing SQL query for latest execution with restrictions: {query}")
+        self.logger.debug("[%s] Executing SQL query for latest execution with restrictions: %s", self.__class__.__name__, query)
         
         result = self.session.execute(query, params).fetchone()
 
         if result:
-            self.logger.debug(f"[{self.__class__.__name__}] Found latest execution with restrictions for table [{table_id}]: {result}")
+            self.logger.debug("[%s] Found latest execution with restrictions for table [%s]: %s", self.__class__.__name__, table_id, result)
             return TableExecution(**result._mapping)
 
-        self.logger.debug(f"[{self.__class__.__name__}] No execution found with restrictions for table [{table_id}].")
+        self.logger.debug("[%s] No execution found with restrictions for table [%s].", self.__class__.__name__, table_id)
         return None
 
@@ -1,9 +1,10 @@
 from logging import Logger
-from typing import List
+from typing import Iterable, List
 from injector import inject
 from sqlalchemy.orm import Session
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
+from src.itaufluxcontrol.models.partitions import Partitions
 from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
 
 class TablePartitionExecRepository(GenericRepository[TablePartitionExec]):
@@ -17,7 +18,7 @@ class TablePartitionExecRepository(GenericRepository[TablePartitionExec]):
         """
         Retorna o registro mais recente com `tag_latest = True` para uma combinação de table_id e partition_id.
         """
-        self.logger.debug(f"[{self.__class__.__name__}] Getting latest by table and partition: [{table_id}] [{partition_id}]")
+        self.logger.debug("[%s] Getting latest by table and partition: [%s] [%s]", self.__class__.__name__, table_id, partition_id)
         return (
             self.session.query(TablePartitionExec)
             .filter(
@@ -29,7 +30,7 @@ class TablePartitionExecRepository(GenericRepository[TablePartitionExec]):
         )
 
     def get_by_table_partition_and_value(self, table_id: int, partition_id: int, value: str) -> TablePartitionExec:
-        self.logger.debug(f"[{self.__class__.__name__}] Getting by table, partition and value: [{table_id}] [{partition_id}] [{value}]")
+        self.logger.debug("[%s] Getting by table, partition and value: [%s] [%s] [%s]", self.__class__.__name__, table_id, partition_id, value)
         return self.session.query(TablePartitionExec).filter_by(
             table_id=table_id,
             partition_id=partition_id,
@@ -37,5 +38,17 @@ class TablePartitionExecRepository(GenericRepository[TablePartitionExec]):
         ).first()
         
     def get_by_execution(self, execution_id: int) -> List[TablePartitionExec]:
-        self.logger.debug(f"[{self.__class__.__name__}] Getting partitions exec for execution: [{execution_id}]")
-        return self.session.query(TablePartitionExec).filter_by(execution_id=execution_id).all()
\ No newline at end of file
+        self.logger.debug("[%s] Getting partitions exec for execution: [%s]", self.__class__.__name__, execution_id)
+        return self.session.query(TablePartitionExec).filter_by(execution_id=execution_id).all()
+
+    def get_values_by_executions(self, execution_ids: Iterable[int]) -> List:
+        """
+        Nome e valor das partições de várias execuções, numa consulta só.
+        """
+        execution_ids = list(execution_ids)
+        self.logger.debug("[%s] Getting partition values for %s executions", self.__class__.__name__, len(execution_ids))
+        return self.session.query(
+            TablePartitionExec.execution_id, Partitions.name, TablePartitionExec.value
+        ).join(Partitions, Partitions.id == TablePartitionExec.partition_id).filter(
+            TablePartitionExec.execution_id.in_(execution_ids)
+        ).order_by(TablePartitionExec.execution_id, Partitions.name).all()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from logging import Logger
+from typing import List, Optional
+
+from injector import inject
+from sqlalchemy import select, update
+
+from src.itaufluxcontrol.models.approval_status import ApprovalStatus
+from src.itaufluxcontrol.models.table_process_summary import TableProcessSummary
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
+
+
+class TableProcessSummaryRepository(GenericRepository[TableProcessSummary]):
+    @inject
+    def __init__(self, session_provider: SessionProvider, logger: Logger):
+        super().__init__(session_provider.get_session(), TableProcessSummary, logger)
+        self.session = session_provider.get_session()
+        self.logger = logger
+
+    def set_tasks(self, execution_id: int, task_executors: str, status: str, now: datetime) -> int:
+        """
+        Grava os executores dos agendamentos disparados pela execução e o status.
+        """
+        return self._update(TableProcessSummary.execution_id == execution_id, {"task_executors": task_executors, "status": status, "last_updated": now})
+
+    def set_status_by_schedule(self, task_schedule_id: int, status: str, now: datetime) -> int:
+        """
+        Grava o status na linha da execução que disparou o agendamento.
+        """
+        execution_id = select(TaskSchedule.table_execution_id).where(TaskSchedule.id == task_schedule_id).scalar_subquery()
+        return self._update(TableProcessSummary.execution_id == execution_id, {"status": status, "last_updated": now})
+
+    def set_approver(self, approval_status_ids: List[int], approver_name: str, now: datetime) -> int:
+        """
+        Grava o aprovador nas linhas das execuções que dispararam os
+        agendamentos das aprovações.
+        """
+        if not approval_status_ids:
+            return 0
+        execution_ids = select(TaskSchedule.table_execution_id).join(
+            ApprovalStatus, ApprovalStatus.task_schedule_id == TaskSchedule.id
+        ).where(ApprovalStatus.id.in_(approval_status_ids))
+        return self._update(TableProcessSummary.execution_id.in_(execution_ids), {"approver_name": approver_name, "last_updated": now})
+
+    def get_page(self, after_id: int, limit: int, table_id: Optional[int] = None, table_name: Optional[str] = None) -> List[TableProcessSummary]:
+        """
+        Página (keyset por id) do resumo, opcionalmente de uma tabela.
+        """
+        self.logger.debug("[%s] Getting process summary after id %s (limit %s)", self.__class__.__name__, after_id, limit)
+        query = self.session.query(TableProcessSummary).filter(
+            TableProcessSummary.date_deleted.is_(None),
+            TableProcessSummary.id > after_id,
+        )
+        if table_id:
+            query = query.filter(TableProcessSummary.table_id == table_id)
+        if table_name:
+            query = query.filter(TableProcessSummary.table_name == table_name)
+        return query.order_by(TableProcessSummary.id).limit(limit).all()
+
+    def _update(self, condition, values) -> int:
+        statement = update(TableProcessSummary).where(condition).values(**values).execution_options(synchronize_session=False)
+        return self.session.execute(statement).rowcount
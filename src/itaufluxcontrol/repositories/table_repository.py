@@ -1,5 +1,7 @@
 from logging import Logger
+from typing import Dict, Iterable, List, Optional
 from injector import inject
+from sqlalchemy import bindparam, or_, update
 from sqlalchemy.orm import Session
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
@@ -13,9 +15,52 @@ class TableRepository(GenericRepository[Tables]):
         self.logger = logger
 
     def get_by_name(self, name):
-        self.logger.debug(f"[{self.__class__.__name__}] request to get table by name [{name}]")
+        self.logger.debug("[%s] request to get table by name [%s]", self.__class__.__name__, name)
         return self.session.query(Tables).filter(Tables.name == name).first()
     
     def get_by_dependecy(self, dependecy_id):
-        self.logger.debug(f"[{self.__class__.__name__}] request to get tables by dependency_id [{dependecy_id}]")
-        return self.session.query(Tables).filter(Tables.dependencies.any(id=dependecy_id)).all()
\ No newline at end of file
+        self.logger.debug("[%s] request to get tables by dependency_id [%s]", self.__class__.__name__, dependecy_id)
+        return self.session.query(Tables).filter(
+            Tables.dependencies.any(dependency_id=dependecy_id)
+        ).order_by(Tables.topo_order, Tables.id).all()
+
+    def get_names(self, table_ids: Iterable[int]) -> Dict[int, str]:
+        table_ids = list(table_ids)
+        if not table_ids:
+            return {}
+        self.logger.debug("[%s] request to get names of %s tables", self.__class__.__name__, len(table_ids))
+        return dict(self.session.query(Tables.id, Tables.name).filter(Tables.id.in_(table_ids)).all())
+
+    def get_topo_orders(self, table_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        table_ids = list(table_ids)
+        if not table_ids:
+            return {}
+        return dict(self.session.query(Tables.id, Tables.topo_order).filter(Tables.id.in_(table_ids)).all())
+
+    def set_topo_orders(self, orders: Dict[int, int]):
+        """
+        Grava as novas posições em um único UPDATE em lote (executemany), sem
+        tocar em `last_modified_at`: a tabela em si não foi alterada.
+        """
+        if not orders:
+            return
+        self.logger.debug("[%s] Updating topological order of %s tables", self.__class__.__name__, len(orders))
+        self.session.execute(
+            update(Tables.__table__).where(Tables.__table__.c.id == bindparam("b_id")).values(
+                topo_order=bindparam("b_order"), last_modified_at=Tables.__table__.c.last_modified_at
+            ),
+            [{"b_id": table_id, "b_order": order} for table_id, order in orders.items()],
+        )
+
+    def get_by_names_or_ids(self, names: Iterable[str], table_ids: Iterable[int]) -> List:
+        """
+        Tabelas (inclusive excluídas) pelo nome ou ID, só com `id`, `name` e
+        `date_deleted`, numa consulta só.
+        """
+        names, table_ids = list(names), list(table_ids)
+        if not names and not table_ids:
+            return []
+        self.logger.debug("[%s] request to get %s tables by name and %s by id", self.__class__.__name__, len(names), len(table_ids))
+        return self.session.query(Tables.id, Tables.name, Tables.date_deleted).filter(
+            or_(Tables.name.in_(names), Tables.id.in_(table_ids))
+        ).all()
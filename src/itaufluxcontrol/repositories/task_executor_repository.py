@@ -1,5 +1,7 @@
 from logging import Logger
+from typing import Iterable, List
 from injector import inject
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
@@ -13,5 +15,15 @@ class TaskExecutorRepository(GenericRepository[TaskExecutor]):
         self.logger = logger
 
     def get_by_alias(self, alias: str) -> TaskExecutor:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding task executor by alias: [{alias}]")
-        return self.session.query(TaskExecutor).filter(TaskExecutor.alias == alias).first()
\ No newline at end of file
+        self.logger.debug("[%s] Finding task executor by alias: [%s]", self.__class__.__name__, alias)
+        return self.session.query(TaskExecutor).filter(TaskExecutor.alias == alias).first()
+
+    def get_by_aliases_or_ids(self, aliases: Iterable[str], task_executor_ids: Iterable[int]) -> List:
+        aliases, task_executor_ids = list(aliases), list(task_executor_ids)
+        if not aliases and not task_executor_ids:
+            return []
+        self.logger.debug("[%s] Finding %s task executors by alias and %s by id", self.__class__.__name__, len(aliases), len(task_executor_ids))
+        return self.session.query(TaskExecutor.id, TaskExecutor.alias).filter(
+            TaskExecutor.date_deleted.is_(None),
+            or_(TaskExecutor.alias.in_(aliases), TaskExecutor.id.in_(task_executor_ids)),
+        ).all()
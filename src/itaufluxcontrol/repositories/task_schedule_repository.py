@@ -1,9 +1,15 @@
+from datetime import datetime
 from logging import Logger
+from typing import Dict, List, Optional
 from injector import inject
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, literal, or_, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
-from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_COMPLETED, STATIC_SCHEDULE_FAILED, STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
+from src.itaufluxcontrol.models.table_execution import TableExecution
 from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.models.task_table import TaskTable
 from src.itaufluxcontrol.repositories.generic_repository import GenericRepository
 
 
@@ -18,8 +24,268 @@ class TaskScheduleRepository(GenericRepository[TaskSchedule]):
         return self.session.query(TaskSchedule).filter(TaskSchedule.status == STATIC_SCHEDULE_PENDENT).all()
     
     def get_by_unique_alias_and_pendent(self, unique_alias):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting task schedule by unique alias: {unique_alias}")
+        self.logger.debug("[%s] Getting task schedule by unique alias: %s", self.__class__.__name__, unique_alias)
         return self.session.query(TaskSchedule).filter(
             TaskSchedule.unique_alias == unique_alias,
             TaskSchedule.status.in_([STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL])
-        ).first()
\ No newline at end of file
+        ).first()
+
+    def claim(self, task_schedule_id: int, now: datetime, stale_before: datetime) -> bool:
+        """
+        Reivindica o agendamento pendente com um UPDATE condicional: só uma
+        entrega concorrente afeta a linha; as demais recebem rowcount 0.
+        Claims anteriores a `stale_before` são considerados abandonados. O
+        disparo também marca o schedule como removido: ele é criado com
+        `ActionAfterCompletion=DELETE` e o Scheduler já o apagou.
+        """
+        self.logger.debug("[%s] Claiming task schedule: %s", self.__class__.__name__, task_schedule_id)
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(
+                TaskSchedule.id == task_schedule_id,
+                TaskSchedule.status == STATIC_SCHEDULE_PENDENT,
+                TaskSchedule.date_deleted.is_(None),
+                or_(TaskSchedule.claimed_at.is_(None), TaskSchedule.claimed_at < stale_before)
+            )
+            .values(claimed_at=now, schedule_deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def release(self, task_schedule_id: int):
+        self.logger.debug("[%s] Releasing task schedule claim: %s", self.__class__.__name__, task_schedule_id)
+        self.session.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id == task_schedule_id, TaskSchedule.status == STATIC_SCHEDULE_PENDENT)
+            .values(claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def set_pending(self, task_schedules: List[TaskSchedule], due_times: Dict[int, datetime]) -> int:
+        """
+        Volta para `pending`, em um único UPDATE, os agendamentos aguardando
+        aprovação (ou já pendentes), cada um com o próprio horário de disparo
+        (`CASE` por id). Os objetos recebem os novos valores sem ficarem
+        sujos na sessão.
+        """
+        if not due_times:
+            return 0
+        self.logger.debug("[%s] Setting %s task schedules as pending", self.__class__.__name__, len(due_times))
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(
+                TaskSchedule.id.in_(due_times),
+                TaskSchedule.status.in_([STATIC_SCHEDULE_WAITING_APPROVAL, STATIC_SCHEDULE_PENDENT]),
+                TaskSchedule.date_deleted.is_(None)
+            )
+            .values(status=STATIC_SCHEDULE_PENDENT, scheduled_execution_time=case(due_times, value=TaskSchedule.id), schedule_deleted_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        for task_schedule in task_schedules:
+            set_committed_value(task_schedule, "status", STATIC_SCHEDULE_PENDENT)
+            set_committed_value(task_schedule, "scheduled_execution_time", due_times[task_schedule.id])
+            set_committed_value(task_schedule, "schedule_deleted_at", None)
+        return result.rowcount
+
+    def get_pendent_page(self, after_id: int, limit: int) -> List:
+        """
+        Página (keyset por id) dos agendamentos pendentes, só com as colunas
+        usadas na reconciliação com o Scheduler.
+        """
+        self.logger.debug("[%s] Getting pending task schedules after id %s (limit %s)", self.__class__.__name__, after_id, limit)
+        return self.session.query(
+            TaskSchedule.id, TaskSchedule.schedule_alias, TaskSchedule.schedule_group, TaskSchedule.scheduled_execution_time,
+            TaskSchedule.schedule_deleted_at
+        ).filter(
+            TaskSchedule.status == STATIC_SCHEDULE_PENDENT,
+            TaskSchedule.date_deleted.is_(None),
+            TaskSchedule.id > after_id
+        ).order_by(TaskSchedule.id).limit(limit).all()
+
+    def expire(self, task_schedule_ids: List[int], error_message: str) -> int:
+        """
+        Marca como `failed` os agendamentos que ainda estão pendentes.
+        """
+        if not task_schedule_ids:
+            return 0
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id.in_(task_schedule_ids), TaskSchedule.status == STATIC_SCHEDULE_PENDENT)
+            .values(status=STATIC_SCHEDULE_FAILED, error_message=error_message)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def get_due(self, now: datetime, stale_before: datetime, limit: int) -> List:
+        """
+        Agendamentos pendentes com horário vencido e sem claim vigente, em
+        ordem de vencimento. As linhas ficam travadas até o commit; ticks
+        concorrentes pulam as travadas (`SKIP LOCKED`).
+        """
+        self.logger.debug("[%s] Getting due task schedules (limit %s)", self.__class__.__name__, limit)
+        return self.session.query(
+            TaskSchedule.id, TaskSchedule.task_id, TaskSchedule.table_execution_id, TaskSchedule.trigger_attempts
+        ).filter(
+            TaskSchedule.status == STATIC_SCHEDULE_PENDENT,
+            TaskSchedule.date_deleted.is_(None),
+            TaskSchedule.scheduled_execution_time <= now,
+            or_(TaskSchedule.claimed_at.is_(None), TaskSchedule.claimed_at < stale_before)
+        ).order_by(TaskSchedule.scheduled_execution_time, TaskSchedule.id).limit(limit).with_for_update(skip_locked=True).all()
+
+    def park(self, task_schedule_ids: List[int]) -> int:
+        """
+        Tira do polling os agendamentos que continuam pendentes depois do
+        disparo (dependências não prontas); o próximo registro os posterga.
+        """
+        if not task_schedule_ids:
+            return 0
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id.in_(task_schedule_ids), TaskSchedule.status == STATIC_SCHEDULE_PENDENT)
+            .values(scheduled_execution_time=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def retry_later(self, task_schedule_id: int, attempts: int, scheduled_execution_time: datetime) -> int:
+        """
+        Registra mais uma tentativa de disparo que falhou e reagenda o
+        agendamento, se ele ainda está pendente.
+        """
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id == task_schedule_id, TaskSchedule.status == STATIC_SCHEDULE_PENDENT)
+            .values(trigger_attempts=attempts, scheduled_execution_time=scheduled_execution_time)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def get_finished_with_schedule(self, limit: int) -> List:
+        """
+        Agendamentos concluídos ou com falha cujo schedule no Scheduler ainda
+        não foi removido, só com as colunas usadas na limpeza.
+        """
+        self.logger.debug("[%s] Getting finished task schedules with scheduler events (limit %s)", self.__class__.__name__, limit)
+        return self.session.query(
+            TaskSchedule.id, TaskSchedule.schedule_alias, TaskSchedule.schedule_group
+        ).filter(
+            TaskSchedule.status.in_([STATIC_SCHEDULE_COMPLETED, STATIC_SCHEDULE_FAILED]),
+            TaskSchedule.schedule_deleted_at.is_(None),
+            TaskSchedule.schedule_alias.isnot(None)
+        ).order_by(TaskSchedule.id).limit(limit).all()
+
+    def mark_schedule_deleted(self, task_schedule_ids: List[int], now: datetime) -> int:
+        if not task_schedule_ids:
+            return 0
+        result = self.session.execute(
+            update(TaskSchedule)
+            .where(TaskSchedule.id.in_(task_schedule_ids))
+            .values(schedule_deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def get_latency_rows(self, start: datetime, end: datetime, table_id: Optional[int] = None) -> List:
+        """
+        Agendamentos concluídos com chegada da tabela dependente em
+        [`start`, `end`), só com as colunas da análise de latência: tabela de
+        origem e dependente, chegada da origem, disparo e chegada da dependente.
+        """
+        self.logger.debug("[%s] Getting latency rows between %s and %s (table %s)", self.__class__.__name__, start, end, table_id)
+        trigger_execution = aliased(TableExecution)
+        result_execution = aliased(TableExecution)
+        query = self.session.query(
+            trigger_execution.table_id,
+            TaskTable.table_id,
+            trigger_execution.date_time,
+            TaskSchedule.scheduled_execution_time,
+            result_execution.date_time,
+        ).join(
+            TaskTable, TaskTable.id == TaskSchedule.task_id
+        ).join(
+            trigger_execution, trigger_execution.id == TaskSchedule.table_execution_id
+        ).join(
+            result_execution, result_execution.id == TaskSchedule.result_execution_id
+        ).filter(
+            TaskSchedule.status == STATIC_SCHEDULE_COMPLETED,
+            TaskSchedule.date_deleted.is_(None),
+            TaskSchedule.scheduled_execution_time.isnot(None),
+            result_execution.date_time >= start,
+            result_execution.date_time < end,
+        )
+        if table_id:
+            query = query.filter(TaskTable.table_id == table_id)
+        return query.all()
+
+    def supports_recursive_cte(self) -> bool:
+        # CTE recursiva: MySQL 8+ e MariaDB 10.2.2+; o SQLite suporta desde 3.8.3
+        dialect = self.session.get_bind().dialect
+        if dialect.name != "mysql":
+            return True
+        version = dialect.server_version_info or (0,)
+        return version >= ((10, 2, 2) if dialect.is_mariadb else (8, 0))
+
+    def get_lineage(self, execution_id: int, downstream: bool, max_depth: int) -> List:
+        """
+        Agendamentos da linhagem da execução até `max_depth` saltos, com a
+        profundidade de cada um. Um agendamento liga a execução que o disparou
+        (`table_execution_id`) à execução que ele produziu (`result_execution_id`):
+        para baixo, a linhagem segue os agendamentos disparados pela execução e
+        pelas que eles produziram; para cima, os que a produziram.
+
+        Com suporte a CTE recursiva, a linhagem vem numa consulta só; sem
+        suporte, numa busca em largura com uma consulta por nível.
+        """
+        source, target = (
+            (TaskSchedule.table_execution_id, TaskSchedule.result_execution_id) if downstream
+            else (TaskSchedule.result_execution_id, TaskSchedule.table_execution_id)
+        )
+        self.logger.debug("[%s] Getting %s lineage of execution %s (depth %s)", self.__class__.__name__, "downstream" if downstream else "upstream", execution_id, max_depth)
+        if not self.supports_recursive_cte():
+            return self._get_lineage_by_level(execution_id, source, target, max_depth)
+
+        lineage = select(
+            TaskSchedule.id.label("id"), target.label("next_execution_id"), literal(1).label("depth")
+        ).where(source == execution_id, TaskSchedule.date_deleted.is_(None)).cte("lineage", recursive=True)
+        lineage = lineage.union(
+            select(TaskSchedule.id, target, lineage.c.depth + 1).join(
+                lineage, source == lineage.c.next_execution_id
+            ).where(lineage.c.depth < max_depth, TaskSchedule.date_deleted.is_(None))
+        )
+        # Um agendamento alcançado por mais de um caminho fica com a menor profundidade
+        reached = select(lineage.c.id, func.min(lineage.c.depth).label("depth")).group_by(lineage.c.id).subquery()
+        return self._lineage_query(reached.c.depth).join(reached, reached.c.id == TaskSchedule.id).order_by(reached.c.depth, TaskSchedule.id).all()
+
+    def _get_lineage_by_level(self, execution_id: int, source, target, max_depth: int) -> List:
+        depths: Dict[int, int] = {}
+        visited = {execution_id}
+        frontier = [execution_id]
+        depth = 1
+        while frontier and depth <= max_depth:
+            rows = self.session.query(TaskSchedule.id, target).filter(
+                source.in_(frontier), TaskSchedule.date_deleted.is_(None)
+            ).all()
+            frontier = []
+            for task_schedule_id, next_execution_id in rows:
+                depths.setdefault(task_schedule_id, depth)
+                if next_execution_id is not None and next_execution_id not in visited:
+                    visited.add(next_execution_id)
+                    frontier.append(next_execution_id)
+            depth += 1
+        if not depths:
+            return []
+        depth_column = case(depths, value=TaskSchedule.id)
+        return self._lineage_query(depth_column).filter(TaskSchedule.id.in_(list(depths))).order_by(depth_column, TaskSchedule.id).all()
+
+    def _lineage_query(self, depth_column):
+        return self.session.query(
+            TaskSchedule.id,
+            TaskSchedule.task_id,
+            TaskTable.alias.label("task_alias"),
+            TaskSchedule.status,
+            TaskSchedule.table_execution_id,
+            TaskSchedule.result_execution_id,
+            TaskSchedule.scheduled_execution_time,
+            TaskSchedule.error_message,
+            depth_column.label("depth"),
+        ).join(TaskTable, TaskTable.id == TaskSchedule.task_id)
@@ -0,0 +1,112 @@
+import os
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List, Optional
+
+from injector import inject
+
+from src.itaufluxcontrol.config.constants import (
+    STATIC_APPROVE_STATUS_APPROVED,
+    STATIC_APPROVE_STATUS_PENDING,
+    STATIC_SCHEDULE_PENDENT,
+    STATIC_SCHEDULE_WAITING_APPROVAL,
+)
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.models.approval_status import ApprovalStatus
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.service.approval_status_service import ApprovalStatusService
+from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+
+
+class ApprovalBatchService:
+    """
+    Aprovação e rejeição em lote (`POST /approve/batch` e `/reject/batch`).
+
+    As aprovações vêm numa consulta só, por IDs ou por filtro (tabela,
+    partições e janela de `requested_at`), limitada a
+    `APPROVAL_BATCH_MAX_ITEMS` + 1 e travada até o commit. As
+    pendentes são revisadas num único UPDATE de `approval_status`; na
+    aprovação, os agendamentos voltam para `pending` num único UPDATE de
+    `task_schedule` e os eventos vão para o outbox de uma vez, sem consultar
+    o Scheduler item a item.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        approval_status_service: ApprovalStatusService,
+        task_schedule_service: TaskScheduleService,
+        event_bridge_scheduler_service: EventBridgeSchedulerService,
+    ):
+        self.logger = logger
+        self.approval_status_service = approval_status_service
+        self.task_schedule_service = task_schedule_service
+        self.event_bridge_scheduler_service = event_bridge_scheduler_service
+        self.max_items = int(os.getenv("APPROVAL_BATCH_MAX_ITEMS", "500"))
+
+    @tracer.trace()
+    def review(
+        self,
+        status: str,
+        user: str,
+        approval_status_ids: Optional[List[int]] = None,
+        table_id: Optional[int] = None,
+        table_name: Optional[str] = None,
+        partitions: Optional[Dict[str, Any]] = None,
+        requested_from: Optional[datetime] = None,
+        requested_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Aprova ou rejeita o lote.
+
+        :param status: `approved` ou `rejected`.
+        :param approval_status_ids: IDs das aprovações; sem eles, todas as pendentes que atendem aos filtros.
+        :param partitions: Valores de partição que o agendamento precisa ter (ex.: `{"ano_mes_referencia": "202305"}`).
+        :return: `count` (aprovações revisadas), `has_more` (o filtro encontrou
+                 mais que `APPROVAL_BATCH_MAX_ITEMS`; basta repetir a chamada) e
+                 `items`, com `approval_status_id`, `task_schedule_id` e `status`
+                 (`approved`, `rejected`, `not_pending` ou `not_found`).
+        """
+        approvals = self.approval_status_service.find_for_review(
+            approval_status_ids=approval_status_ids,
+            table_id=table_id,
+            table_name=table_name,
+            requested_from=requested_from,
+            requested_to=requested_to,
+            partitions=partitions,
+            limit=self.max_items + 1,
+        )
+        has_more = not approval_status_ids and len(approvals) > self.max_items
+        approvals = approvals[:self.max_items]
+
+        reviewable = [approval for approval in approvals if self._reviewable(approval, status)]
+        self.approval_status_service.review_many([approval.id for approval in reviewable], status, user)
+        if status == STATIC_APPROVE_STATUS_APPROVED and reviewable:
+            task_schedules = [approval.task_schedule for approval in reviewable]
+            self.task_schedule_service.set_pending(task_schedules)
+            self.event_bridge_scheduler_service.schedule_many(task_schedules)
+
+        reviewed = {approval.id for approval in reviewable}
+        found = {approval.id: approval for approval in approvals}
+        ids = list(dict.fromkeys(approval_status_ids)) if approval_status_ids else list(found)
+        items = []
+        for approval_status_id in ids:
+            approval = found.get(approval_status_id)
+            items.append({
+                "approval_status_id": approval_status_id,
+                "task_schedule_id": approval.task_schedule_id if approval else None,
+                "status": status if approval_status_id in reviewed else "not_pending" if approval else "not_found",
+            })
+        self.logger.info(f"[{self.__class__.__name__}] {len(reviewed)} of {len(items)} approval(s) {status} by {user}")
+        return {"count": len(reviewed), "has_more": has_more, "items": items}
+
+    @staticmethod
+    def _reviewable(approval: ApprovalStatus, status: str) -> bool:
+        # Aprovar só libera agendamentos que ainda aguardam o disparo
+        task_schedule: TaskSchedule = approval.task_schedule
+        return approval.status == STATIC_APPROVE_STATUS_PENDING and (
+            status != STATIC_APPROVE_STATUS_APPROVED
+            or (task_schedule.date_deleted is None and task_schedule.status in (STATIC_SCHEDULE_WAITING_APPROVAL, STATIC_SCHEDULE_PENDENT))
+        )
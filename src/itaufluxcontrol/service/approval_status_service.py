@@ -1,48 +1,73 @@
 from datetime import datetime
 from logging import Logger
+from typing import List
 from injector import inject
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
 
-from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_APPROVED, STATIC_APPROVE_STATUS_REJECTED
+from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_APPROVED, STATIC_APPROVE_STATUS_PENDING, STATIC_APPROVE_STATUS_REJECTED
 from src.itaufluxcontrol.models.approval_status import ApprovalStatus
 from src.itaufluxcontrol.repositories.approval_status_repository import ApprovalStatusRepository
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
 
 
 class ApprovalStatusService:
     @inject
-    def __init__(self, logger: Logger, repository: ApprovalStatusRepository):
+    def __init__(self, logger: Logger, repository: ApprovalStatusRepository, table_process_summary_service: TableProcessSummaryService):
         self.logger = logger
         self.repository = repository
+        self.table_process_summary_service = table_process_summary_service
         
     def query(self, **filters):
-        self.logger.debug(f"[{self.__class__.__name__}] Querying approval status with filters: [{filters}]")
+        self.logger.debug("[%s] Querying approval status with filters: [%s]", self.__class__.__name__, filters)
         return self.repository.query(**filters)
         
     def find(self, id: int) -> ApprovalStatus:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding approval status: [{id}]")
+        self.logger.debug("[%s] Finding approval status: [%s]", self.__class__.__name__, id)
         return self.repository.get_by_id(id)
     
     def find_by_task_schedule_id(self, task_schedule_id: int) -> ApprovalStatus:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding approval status by task_schedule_id: [{task_schedule_id}]")
+        self.logger.debug("[%s] Finding approval status by task_schedule_id: [%s]", self.__class__.__name__, task_schedule_id)
         return self.repository.get_by_task_schedule_id(task_schedule_id)
         
-    def save(self, approval_status: dict) -> ApprovalStatus:
-        self.logger.debug(f"[{self.__class__.__name__}] Saving approval status: {approval_status}")
-        approval_status = ApprovalStatus(**approval_status)
-        approval_status.requested_at = datetime.now()
-        return self.repository.save(approval_status)
+    def find_for_review(self, **filters) -> List[ApprovalStatus]:
+        self.logger.debug("[%s] Finding approval status for review: %s", self.__class__.__name__, filters)
+        return self.repository.get_for_review(**filters)
+
+    def review_many(self, ids: List[int], status: str, user: str) -> int:
+        """
+        Aprova ou rejeita em um único UPDATE as aprovações pendentes de `ids`.
+        """
+        self.logger.debug("[%s] Reviewing %s approval status as %s", self.__class__.__name__, len(ids), status)
+        count = self.repository.patch_many(ids, STATIC_APPROVE_STATUS_PENDING, status=status, approver_name=user, reviewed_at=datetime.now())
+        if count:
+            self.table_process_summary_service.set_approver(ids, user)
+        return count
+
+    def save(self, approval_status: dict):
+        """
+        Registra (ou reabre) o pedido de aprovação do agendamento em um único
+        upsert pela chave única `task_schedule_id`, sem buscar a aprovação antes.
+
+        :param approval_status: Dados da aprovação (`task_schedule_id`, `status`); `id` é ignorado.
+        """
+        self.logger.debug("[%s] Saving approval status: %s", self.__class__.__name__, approval_status)
+        row = {key: value for key, value in approval_status.items() if key != "id"}
+        row.update(requested_at=datetime.now(), reviewed_at=None, approver_name=None)
+        self.repository.upsert([row], ["task_schedule_id"], [key for key in row if key != "task_schedule_id"])
     
     def approve(self, id: int, user: str) -> ApprovalStatus:
-        self.logger.debug(f"[{self.__class__.__name__}] Approving approval status: [{id}]")
-        approval_status = self.find(id)
-        approval_status.status = STATIC_APPROVE_STATUS_APPROVED
-        approval_status.approver_name = user
-        approval_status.reviewed_at = datetime.now()
-        return self.repository.save(approval_status)
+        self.logger.debug("[%s] Approving approval status: [%s]", self.__class__.__name__, id)
+        if not self.repository.patch(id, status=STATIC_APPROVE_STATUS_APPROVED, approver_name=user, reviewed_at=datetime.now()):
+            raise NotFoundError(f"Approval status with id [{id}] not found.")
+        self.table_process_summary_service.set_approver([id], user)
+        return self.find(id)
     
     def reject(self, id: int, user: str) -> ApprovalStatus:
-        self.logger.debug(f"[{self.__class__.__name__}] Rejecting approval status: [{id}]")
-        approval_status = self.find(id)
-        approval_status.status = STATIC_APPROVE_STATUS_REJECTED
-        approval_status.approver_name = user
-        approval_status.reviewed_at = datetime.now()
-        return self.repository.save(approval_status)
\ No newline at end of file
+        """
+        Rejeita uma aprovação; só aprovações pendentes podem ser rejeitadas.
+        """
+        self.logger.debug("[%s] Rejecting approval status: [%s]", self.__class__.__name__, id)
+        if not self.repository.patch(id, STATIC_APPROVE_STATUS_PENDING, status=STATIC_APPROVE_STATUS_REJECTED, approver_name=user, reviewed_at=datetime.now()):
+            raise NotFoundError(f"Pending approval status with id [{id}] not found.")
+        self.table_process_summary_service.set_approver([id], user)
+        return self.find(id)
@@ -6,6 +6,8 @@ from typing import Optional
 
 import requests
 
+from src.itaufluxcontrol.config.tracer import tracer
+
 
 class BotoService:
     @inject
@@ -27,14 +29,15 @@ class BotoService:
         key = (service_name, region_name)
         if key not in self._clients:
             endpoint_url = self._get_localstack_endpoint(service_name)
-            self.logger.debug(f"Creating new client for service: {service_name} in region: {region_name}, endpoint: {endpoint_url}")
+            self.logger.debug("Creating new client for service: %s in region: %s, endpoint: %s", service_name, region_name, endpoint_url)
             self._clients[key] = self.session.client(
                 service_name, 
                 region_name=region_name,
                 endpoint_url=endpoint_url  
             )
+            self._register_tracing_hooks(self._clients[key])
         else:
-            self.logger.debug(f"Reusing existing client for service: {service_name} in region: {region_name}")
+            self.logger.debug("Reusing existing client for service: %s in region: %s", service_name, region_name)
         return self._clients[key]
 
     def get_resource(self, service_name: str, region_name: Optional[str] = None) -> Session.resource:
@@ -45,14 +48,14 @@ class BotoService:
         key = (service_name, region_name)
         if key not in self._resources:
             endpoint_url = self._get_localstack_endpoint(service_name)
-            self.logger.debug(f"Creating new resource for service: {service_name} in region: {region_name}, endpoint: {endpoint_url}")
+            self.logger.debug("Creating new resource for service: %s in region: %s, endpoint: %s", service_name, region_name, endpoint_url)
             self._resources[key] = self.session.resource(
                 service_name, 
                 region_name=region_name,
                 endpoint_url=endpoint_url  
             )
         else:
-            self.logger.debug(f"Reusing existing resource for service: {service_name} in region: {region_name}")
+            self.logger.debug("Reusing existing resource for service: %s in region: %s", service_name, region_name)
         return self._resources[key]
 
     def clear_cache(self):
@@ -63,6 +66,26 @@ class BotoService:
         self._clients.clear()
         self._resources.clear()
 
+    def _register_tracing_hooks(self, client):
+        """
+        Registra hooks do botocore para abrir um span por chamada de API do client.
+        """
+        client.meta.events.register_first("before-call.*.*", self._start_call_span)
+        client.meta.events.register_first("after-call.*.*", self._end_call_span)
+        client.meta.events.register_first("after-call-error.*.*", self._end_call_span)
+
+    @staticmethod
+    def _start_call_span(model=None, context=None, **kwargs):
+        if context is not None and model is not None:
+            context["itaufluxcontrol_span"] = tracer.start_span(
+                f"{model.service_model.service_name}.{model.name}"
+            )
+
+    @staticmethod
+    def _end_call_span(context=None, exception=None, **kwargs):
+        if context is not None:
+            tracer.end_span(context.pop("itaufluxcontrol_span", None), exception)
+
     def _get_localstack_endpoint(self, service_name: str) -> Optional[str]:
         """
         Retorna o endpoint do LocalStack se a variável LOCALSTACK_HOST estiver configurada.
@@ -71,6 +94,6 @@ class BotoService:
         if LOCALSTACK_HOST:
             port = 4566  # Porta padrão do LocalStack
             endpoint_url = f"http://{LOCALSTACK_HOST}:{port}"
-            self.logger.debug(f"Using LocalStack endpoint for service {service_name}: {endpoint_url}")
+            self.logger.debug("Using LocalStack endpoint for service %s: %s", service_name, endpoint_url)
             return endpoint_url
         return None
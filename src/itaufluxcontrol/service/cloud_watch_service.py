@@ -24,15 +24,16 @@ class CloudWatchService:
         :param value: Value of the metric.
         :param unit: Unit of the metric (e.g., Count, Seconds).
         """
-        self.logger.debug(f"Adding metric: {name}, Value: {value}, Unit: {unit}")
+        self.logger.debug("Adding metric: %s, Value: %s, Unit: %s", name, value, unit)
         self._metric_data.append({"name": name, "value": value, "unit": unit})
 
     def flush_metrics(self):
         """
         Sends all collected metrics to CloudWatch.
         """
-        self.logger.debug(f"[{self.__class__.__name__}] Flushing metrics to CloudWatch.")
+        self.logger.debug("[%s] Flushing metrics to CloudWatch.", self.__class__.__name__)
         for metric in self._metric_data:
             self.metrics.add_metric(name=metric["name"], value=metric["value"], unit=metric["unit"])
         self.metrics.flush_metrics()
-        self.logger.debug(f"[{self.__class__.__name__}] Metrics flushed successfully.")
\ No newline at end of file
+        self._metric_data.clear()
+        self.logger.debug("[%s] Metrics flushed successfully.", self.__class__.__name__)
\ No newline at end of file
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import List, Optional
+
+from injector import inject
+
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_PENDENT
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.service.approval_status_service import ApprovalStatusService
+from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+
+
+class DatabaseSchedulerService(EventBridgeSchedulerService):
+    """
+    Backend de debounce sem EventBridge Scheduler (`SCHEDULER_BACKEND=database`).
+
+    O horário de disparo fica só em `task_schedule.scheduled_execution_time`;
+    registrar ou postergar é um UPDATE na linha, sem recursos na AWS. Os
+    agendamentos vencidos são disparados pelo `DatabaseSchedulerWorker`
+    (rota `/scheduler/tick` ou `ItauFluxControl.run_scheduler_worker`).
+    """
+
+    @inject
+    def __init__(self, logger: Logger, task_schedule_service: TaskScheduleService, approval_status_service: ApprovalStatusService, outbox_service: OutboxService, table_process_summary_service: TableProcessSummaryService):
+        self.logger = logger
+        self.backend = "database"
+        self.scheduler_client = None
+        self.task_schedule_service: TaskScheduleService = task_schedule_service
+        self.approval_status_service: ApprovalStatusService = approval_status_service
+        self.outbox_service: OutboxService = outbox_service
+        self.table_process_summary_service: TableProcessSummaryService = table_process_summary_service
+        # Sem schedules no Scheduler: sem grupos
+        self.group_strategy = "default"
+
+    def schedule_exists(self, task_schedule: TaskSchedule) -> bool:
+        """
+        A própria linha é o agendamento: se ela existe, basta postergá-la.
+        """
+        return task_schedule is not None
+
+    def _register_event(self, task_schedule: TaskSchedule):
+        scheduled_execution_time = datetime.now() + timedelta(seconds=task_schedule.task_table.debounce_seconds)
+        self.task_schedule_service.update(task_schedule.id, scheduled_execution_time=scheduled_execution_time, status=STATIC_SCHEDULE_PENDENT)
+        self.logger.info(f"[{self.__class__.__name__}] Event registered for {scheduled_execution_time}: {task_schedule.schedule_alias}")
+
+    def schedule_many(self, task_schedules: List[TaskSchedule]):
+        # O horário de disparo já foi gravado em `task_schedule`; o worker faz o resto
+        self.logger.info(f"[{self.__class__.__name__}] {len(task_schedules)} event(s) registered in database")
+
+    def _update_event(self, task_schedule: TaskSchedule):
+        # Na postergação a linha já foi salva como pendente com o novo horário
+        if task_schedule.status == STATIC_SCHEDULE_PENDENT and task_schedule.scheduled_execution_time:
+            self.logger.debug("[%s] Event postponed to %s: %s", self.__class__.__name__, task_schedule.scheduled_execution_time, task_schedule.schedule_alias)
+            return
+
+        self._register_event(task_schedule)
+        possible_task_approval = self.approval_status_service.find_by_task_schedule_id(task_schedule.id)
+        if possible_task_approval:
+            self.approval_status_service.approve(possible_task_approval.id, 'automatic')
+
+    def delete_event(self, task_schedule: TaskSchedule):
+        self.logger.info(f"[{self.__class__.__name__}] No scheduler event to delete for schedule ID: {task_schedule.id}")
+
+    def delete_orphan_event(self, schedule_alias: str, group_name: Optional[str] = None):
+        self.logger.info(f"[{self.__class__.__name__}] No scheduler event to delete: {schedule_alias}")
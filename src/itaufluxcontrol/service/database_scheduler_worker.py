@@ -0,0 +1,90 @@
+import os
+from logging import Logger
+from typing import Dict, Optional
+
+from injector import inject
+
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+from src.itaufluxcontrol.service.task_service import TaskService
+
+
+class DatabaseSchedulerWorker:
+    """
+    Dispara os agendamentos vencidos do backend `database`.
+
+    Cada tick trava em lote (`SELECT ... FOR UPDATE SKIP LOCKED`) os
+    pendentes com `scheduled_execution_time` vencido, executa o mesmo fluxo
+    do `/trigger` para cada um dentro de um savepoint e faz um único commit;
+    ticks concorrentes (várias Lambdas ou workers) pulam as linhas travadas.
+    Agendamentos que continuam pendentes (dependências não prontas) saem do
+    polling até serem postergados. Os que falharam são reagendados com
+    backoff exponencial e, depois de `SCHEDULER_TICK_MAX_ATTEMPTS` tentativas,
+    marcados como `failed`.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        session_provider: SessionProvider,
+        task_schedule_service: TaskScheduleService,
+        task_service: TaskService,
+        cloudwatch_service: CloudWatchService,
+    ):
+        self.logger = logger
+        self.session_provider = session_provider
+        self.task_schedule_service = task_schedule_service
+        self.task_service = task_service
+        self.cloudwatch_service = cloudwatch_service
+        self.batch_size = int(os.getenv("SCHEDULER_TICK_BATCH_SIZE", "100"))
+        self.max_attempts = int(os.getenv("SCHEDULER_TICK_MAX_ATTEMPTS", "5"))
+        self.backoff_base_seconds = int(os.getenv("SCHEDULER_TICK_BACKOFF_BASE_SECONDS", "30"))
+        self.backoff_max_seconds = int(os.getenv("SCHEDULER_TICK_BACKOFF_MAX_SECONDS", "900"))
+
+    @tracer.trace()
+    def tick(self, limit: Optional[int] = None) -> Dict[str, int]:
+        session = self.session_provider.get_session()
+        try:
+            due = self.task_schedule_service.get_due(limit or self.batch_size)
+            processed, failed = [], 0
+            for row in due:
+                try:
+                    with session.begin_nested():
+                        self.task_service.trigger_tables(
+                            task_schedule_id=row.id,
+                            task_table_id=row.task_id,
+                            dependency_execution_id=row.table_execution_id,
+                        )
+                    processed.append(row.id)
+                except Exception as e:
+                    self.logger.error(f"[{self.__class__.__name__}] Error triggering task schedule {row.id}: {e}")
+                    self._retry_or_fail(row, e)
+                    failed += 1
+
+            parked = self.task_schedule_service.park(processed)
+            self.session_provider.commit()
+        except Exception:
+            self.session_provider.rollback()
+            raise
+        finally:
+            self.session_provider.close()
+
+        result = {"due": len(due), "triggered": len(processed) - parked, "parked": parked, "failed": failed}
+        if due:
+            self.logger.info(f"[{self.__class__.__name__}] Tick finished: {result}")
+        self.cloudwatch_service.add_metric("SchedulerTickDue", len(due), "Count")
+        self.cloudwatch_service.add_metric("SchedulerTickFailed", failed, "Count")
+        return result
+
+    def _retry_or_fail(self, row, error: Exception) -> None:
+        # O savepoint desfez o claim; sem isso a linha venceria de novo a cada tick
+        attempts = (row.trigger_attempts or 0) + 1
+        if attempts >= self.max_attempts:
+            self.logger.warning(f"[{self.__class__.__name__}] Task schedule {row.id} failed after {attempts} trigger attempts")
+            self.task_schedule_service.expire([row.id], f"Trigger failed after {attempts} attempts: {error}"[:350])
+            return
+        delay_seconds = min(self.backoff_base_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+        self.task_schedule_service.retry_later(row.id, attempts, delay_seconds)
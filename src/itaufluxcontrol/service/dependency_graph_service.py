@@ -0,0 +1,151 @@
+import os
+import time
+from collections import OrderedDict, defaultdict, deque
+from logging import Logger
+from typing import Any, Dict, List, Tuple
+
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
+from injector import inject
+
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.repositories.dependency_repository import DependencyRepository
+
+DOWNSTREAM = "downstream"
+UPSTREAM = "upstream"
+
+
+class DependencyGraph:
+    """
+    Snapshot em memória do grafo de dependências, com listas de adjacência
+    nos dois sentidos e as closures já calculadas (LRU por tabela e sentido).
+    """
+
+    def __init__(self, version: Tuple, tables: List, edges: List, tasks: List, closure_cache_size: int):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.names: Dict[int, str] = {table.id: table.name for table in tables}
+        self.adjacency: Dict[str, Dict[int, List[Tuple[int, bool]]]] = {DOWNSTREAM: defaultdict(list), UPSTREAM: defaultdict(list)}
+        for edge in edges:
+            if edge.table_id in self.names and edge.dependency_id in self.names:
+                self.adjacency[DOWNSTREAM][edge.dependency_id].append((edge.table_id, bool(edge.is_required)))
+                self.adjacency[UPSTREAM][edge.table_id].append((edge.dependency_id, bool(edge.is_required)))
+        self.tasks: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for task in tasks:
+            self.tasks[task.table_id].append({"id": task.id, "alias": task.alias})
+        self.closure_cache_size = closure_cache_size
+        self._closures: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+
+    def closure(self, table_id: int, direction: str) -> Dict[str, Any]:
+        key = (table_id, direction)
+        if key in self._closures:
+            self._closures.move_to_end(key)
+            return self._closures[key]
+        result = self._walk(table_id, self.adjacency[direction], direction)
+        self._closures[key] = result
+        if len(self._closures) > self.closure_cache_size:
+            self._closures.popitem(last=False)
+        return result
+
+    def _walk(self, table_id: int, adjacency: Dict[int, List[Tuple[int, bool]]], direction: str) -> Dict[str, Any]:
+        # Busca em largura iterativa: tabelas alcançáveis a partir da origem
+        reached = {table_id}
+        queue = deque([table_id])
+        while queue:
+            node = queue.popleft()
+            for neighbor, _ in adjacency.get(node, ()):
+                if neighbor not in reached:
+                    reached.add(neighbor)
+                    queue.append(neighbor)
+
+        # Kahn sobre a closure: o nível é o caminho mais longo desde a origem,
+        # ou seja, uma tabela só entra depois de todas as anteriores a ela
+        in_degree = dict.fromkeys(reached, 0)
+        for node in reached:
+            for neighbor, _ in adjacency.get(node, ()):
+                in_degree[neighbor] += 1
+        levels = dict.fromkeys((node for node, degree in in_degree.items() if degree == 0), 0)
+        ready = deque(levels)
+        while ready:
+            node = ready.popleft()
+            for neighbor, _ in adjacency.get(node, ()):
+                levels[neighbor] = max(levels.get(neighbor, 0), levels[node] + 1)
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    ready.append(neighbor)
+
+        by_level: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for node in sorted(reached - {table_id}):
+            if in_degree[node] == 0:
+                by_level[levels[node]].append(self.describe(node))
+
+        edges = []
+        for node in reached:
+            for neighbor, is_required in adjacency.get(node, ()):
+                table, dependency = (neighbor, node) if direction == DOWNSTREAM else (node, neighbor)
+                edges.append({"table_id": table, "dependency_id": dependency, "is_required": is_required})
+        edges.sort(key=lambda edge: (edge["dependency_id"], edge["table_id"]))
+
+        return {
+            "count": len(reached) - 1,
+            "levels": [{"level": level, "tables": by_level[level]} for level in sorted(by_level)],
+            "edges": edges,
+            "cycles": sorted(node for node, degree in in_degree.items() if degree > 0),
+        }
+
+    def describe(self, table_id: int) -> Dict[str, Any]:
+        return {"id": table_id, "name": self.names[table_id], "tasks": self.tasks.get(table_id, [])}
+
+
+class DependencyGraphService:
+    """
+    Responde "se a tabela X chegar, o que roda e em que ordem?" a partir de
+    `dependencies`, sem N chamadas a `/tables`.
+
+    O grafo inteiro é carregado em três consultas só de colunas e mantido em
+    memória entre invocações (o serviço é singleton). A cada chamada uma
+    consulta de versão (contagens e máximos) decide se o snapshot ainda vale;
+    `DEPENDENCY_GRAPH_CACHE_TTL_SECONDS` limita a idade do snapshot para
+    alterações que não mudam a versão (ex.: `is_required` ou alias de tarefa).
+    Há um snapshot por tenant.
+    """
+
+    @inject
+    def __init__(self, logger: Logger, dependency_repository: DependencyRepository):
+        self.logger = logger
+        self.dependency_repository = dependency_repository
+        self.ttl_seconds = float(os.getenv("DEPENDENCY_GRAPH_CACHE_TTL_SECONDS", "300"))
+        self.closure_cache_size = int(os.getenv("DEPENDENCY_GRAPH_CLOSURE_CACHE_SIZE", "256"))
+        self._graphs: Dict[int, DependencyGraph] = {}
+
+    @tracer.trace()
+    def impact(self, table_id: int, direction: str = "both") -> Dict[str, Any]:
+        """
+        Closure transitiva da tabela com níveis topológicos.
+
+        :param table_id: ID da tabela de origem.
+        :param direction: `downstream` (o que roda depois), `upstream` (do que ela depende) ou `both`.
+        :return: A tabela e, por sentido, os níveis (1 = vizinhos diretos; cada
+                 nível só depende dos anteriores), as arestas com `is_required`,
+                 as tarefas de cada tabela e, em `cycles`, as que não podem ser
+                 ordenadas por estarem num ciclo (ou depois dele).
+        """
+        directions = (DOWNSTREAM, UPSTREAM) if direction == "both" else (direction,)
+        graph = self.graph()
+        if table_id not in graph.names:
+            raise NotFoundError(f"Table with id [{table_id}] not found.")
+        result = {"table": graph.describe(table_id)}
+        for current in directions:
+            result[current] = graph.closure(table_id, current)
+        return result
+
+    def graph(self) -> DependencyGraph:
+        version = self.dependency_repository.get_graph_version()
+        tenant_id = tenant_context.tenant_id
+        graph = self._graphs.get(tenant_id)
+        if graph and graph.version == version and time.monotonic() - graph.loaded_at < self.ttl_seconds:
+            return graph
+        tables, edges, tasks = self.dependency_repository.get_graph()
+        graph = self._graphs[tenant_id] = DependencyGraph(version, tables, edges, tasks, self.closure_cache_size)
+        self.logger.info(f"[{self.__class__.__name__}] Dependency graph loaded for tenant {tenant_id}: {len(tables)} tables, {len(edges)} dependencies")
+        return graph
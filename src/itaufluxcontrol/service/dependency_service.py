@@ -1,14 +1,26 @@
+from collections import deque
 from logging import Logger
-from typing import List
+from typing import Dict, List, Optional
 
 from injector import inject
-from src.itaufluxcontrol.models.dependencies import Dependencies
 from src.itaufluxcontrol.models.dto.table_dto import DependencyDTO
 from src.itaufluxcontrol.exceptions.table_insert_error import TableInsertError
 from src.itaufluxcontrol.repositories.dependency_repository import DependencyRepository
 from src.itaufluxcontrol.repositories.table_repository import TableRepository
 
 class DependencyService:
+    """
+    Mantém as dependências entre tabelas e a `topo_order` de cada tabela, uma
+    ordem topológica global (a dependência vem sempre antes da dependente).
+
+    A ordem é mantida de forma incremental (Pearce–Kelly): uma aresta que já
+    respeita a ordem não custa nada; uma que não respeita só percorre as
+    tabelas com posição entre as duas pontas, onde também detecta o ciclo, e
+    troca as posições apenas dessas tabelas. As posições são uma permutação
+    dos IDs das tabelas, então uma tabela nova entra com o próprio ID, depois
+    de todas as existentes. Remover dependências nunca invalida a ordem.
+    """
+
     @inject
     def __init__(self, logger: Logger, repository: TableRepository, dependency_repository: DependencyRepository):
         self.logger = logger
@@ -16,24 +28,142 @@ class DependencyService:
         self.dependency_repository = dependency_repository
 
     def save_dependencies(self, table_id: int, dependencies_dto: List[DependencyDTO]):
+        """
+        Sincroniza as dependências da tabela com `dependencies_dto` (estado desejado).
+
+        Os nomes são resolvidos numa consulta só; a diferença é calculada em
+        memória: dependências novas ou com `is_required` alterado vão num
+        único upsert e as que saíram da lista, num único soft delete. As
+        arestas novas passam antes pela ordem topológica.
+        """
         existing_dependencies = {
-            d.dependency_id for d in self.dependency_repository.get_by_table_id(table_id)
+            d.dependency_id: d for d in self.dependency_repository.get_by_table_id(table_id)
         }
+        names = {d.dependency_name for d in dependencies_dto if not d.dependency_id and d.dependency_name}
+        ids_by_name = {
+            row.name: row.id for row in self.repository.get_by_names_or_ids(names, []) if row.date_deleted is None
+        } if names else {}
+
+        desired: Dict[int, bool] = {}
         for dependency_data in dependencies_dto:
-            if dependency_data.dependency_id and dependency_data.dependency_id not in existing_dependencies:
-                dependency = Dependencies(
-                    table_id=table_id,
-                    dependency_id=dependency_data.dependency_id,
-                    is_required=dependency_data.is_required
-                )
-                self.dependency_repository.save(dependency)
-            elif not dependency_data.dependency_id and dependency_data.dependency_name:
-                dependency_table = self.repository.get_by_name(dependency_data.dependency_name)
-                if not dependency_table:
+            if dependency_data.dependency_id:
+                desired.setdefault(dependency_data.dependency_id, dependency_data.is_required)
+            elif dependency_data.dependency_name:
+                if dependency_data.dependency_name not in ids_by_name:
                     raise TableInsertError(f"Dependency table '{dependency_data.dependency_name}' not found.")
-                dependency = Dependencies(
-                    table_id=table_id,
-                    dependency_id=dependency_table.id,
-                    is_required=dependency_data.is_required
-                )
-                self.dependency_repository.save(dependency)
+                desired.setdefault(ids_by_name[dependency_data.dependency_name], dependency_data.is_required)
+
+        new_edges = [
+            dependency_id for dependency_id in desired
+            if dependency_id not in existing_dependencies or existing_dependencies[dependency_id].date_deleted is not None
+        ]
+        self.add_edges(table_id, new_edges)
+
+        rows = [
+            {"table_id": table_id, "dependency_id": dependency_id, "is_required": is_required, "date_deleted": None, "deleted_by": None}
+            for dependency_id, is_required in desired.items()
+            if dependency_id in new_edges or existing_dependencies[dependency_id].is_required != is_required
+        ]
+        removed = [
+            d.id for dependency_id, d in existing_dependencies.items()
+            if dependency_id not in desired and d.date_deleted is None
+        ]
+        self.dependency_repository.upsert(rows, ["table_id", "dependency_id"], ["is_required", "date_deleted", "deleted_by"])
+        self.dependency_repository.bulk_soft_delete(removed)
+
+    def add_edges(self, table_id: int, dependency_ids: List[int]):
+        """
+        Ajusta a ordem topológica para as arestas `dependency_id -> table_id`,
+        antes de elas serem gravadas. As posições vêm numa consulta só; só as
+        arestas fora de ordem percorrem a região afetada.
+
+        :raises TableInsertError: Se alguma aresta fecha um ciclo com as dependências já cadastradas.
+        """
+        if not dependency_ids:
+            return
+        if table_id in dependency_ids:
+            raise TableInsertError(f"Table '{table_id}' cannot depend on itself.")
+
+        orders = self._get_orders([table_id, *dependency_ids])
+        for dependency_id in dependency_ids:
+            lower, upper = orders[table_id], orders[dependency_id]
+            if upper < lower:
+                continue
+
+            # Região afetada: o que vem depois da dependente e o que vem antes da
+            # dependência, ambos limitados às posições entre as duas pontas
+            forward = self._search(table_id, lower, lower, upper, downstream=True, target=dependency_id)
+            backward = self._search(dependency_id, upper, lower, upper, downstream=False)
+
+            affected = sorted(backward.items(), key=lambda item: item[1]) + sorted(forward.items(), key=lambda item: item[1])
+            positions = sorted(order for _, order in affected)
+            changes = {node: order for (node, current), order in zip(affected, positions) if current != order}
+            self.repository.set_topo_orders(changes)
+            orders.update((node, order) for node, order in changes.items() if node in orders)
+            self.logger.debug("[%s] Topological order updated for %s tables (edge %s -> %s)", self.__class__.__name__, len(changes), dependency_id, table_id)
+
+    def _search(self, start: int, start_order: int, lower: int, upper: int, downstream: bool, target: Optional[int] = None) -> Dict[int, int]:
+        """
+        Busca em largura, uma consulta por nível, pelas tabelas alcançáveis a
+        partir de `start` com posição em [`lower`, `upper`].
+        """
+        reached = {start: start_order}
+        frontier = deque([start])
+        while frontier:
+            neighbors = self.dependency_repository.get_neighbors_in_order_range(list(frontier), downstream, lower, upper)
+            frontier.clear()
+            for node, order in neighbors:
+                if node == target:
+                    names = self.repository.get_names([target, start])
+                    raise TableInsertError(
+                        f"Dependency '{names.get(target, target)}' -> '{names.get(start, start)}' creates a circular dependency."
+                    )
+                if node not in reached:
+                    reached[node] = order
+                    frontier.append(node)
+        return reached
+
+    def _get_orders(self, table_ids: List[int]) -> Dict[int, int]:
+        orders = self.repository.get_topo_orders(table_ids)
+        missing = [table_id for table_id in table_ids if table_id not in orders]
+        if missing:
+            raise TableInsertError(f"Dependency table '{missing[0]}' not found.")
+        if any(order is None for order in orders.values()):
+            self.rebuild_topological_order()
+            orders = self.repository.get_topo_orders(table_ids)
+            # Tabelas excluídas ficam fora da reconstrução e mantêm o próprio ID
+            unordered = {table_id: table_id for table_id, order in orders.items() if order is None}
+            self.repository.set_topo_orders(unordered)
+            orders.update(unordered)
+        return orders
+
+    def rebuild_topological_order(self):
+        """
+        Recalcula a ordem de todas as tabelas ativas (Kahn); usada só quando
+        existem tabelas sem posição, ex.: cadastradas antes da coluna existir.
+        Tabelas presas em ciclos antigos vão para o fim, em ordem de ID.
+        """
+        tables, edges, _ = self.dependency_repository.get_graph()
+        table_ids = sorted(table.id for table in tables)
+        in_degree = dict.fromkeys(table_ids, 0)
+        dependents = {table_id: [] for table_id in table_ids}
+        for edge in edges:
+            if edge.table_id in in_degree and edge.dependency_id in in_degree:
+                dependents[edge.dependency_id].append(edge.table_id)
+                in_degree[edge.table_id] += 1
+
+        ordered = []
+        ready = deque(table_id for table_id, degree in in_degree.items() if degree == 0)
+        while ready:
+            node = ready.popleft()
+            ordered.append(node)
+            for dependent in dependents[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        cyclic = [table_id for table_id, degree in in_degree.items() if degree > 0]
+        if cyclic:
+            self.logger.warning(f"[{self.__class__.__name__}] Tables in circular dependencies placed last: {cyclic}")
+        self.repository.set_topo_orders(dict(zip(ordered + cyclic, table_ids)))
+        self.logger.info(f"[{self.__class__.__name__}] Topological order rebuilt for {len(table_ids)} tables")
@@ -1,26 +1,41 @@
 from datetime import datetime, timedelta
 import json
+import os
 import re
 from logging import Logger
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from injector import inject
 
+from src.itaufluxcontrol.config.logger import log_context
+from src.itaufluxcontrol.config.tenant import TENANT_FIELD, tenant_context
+from src.itaufluxcontrol.config.tracer import tracer
 from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_PENDING, STATIC_SCHEDULE_COMPLETED, STATIC_SCHEDULE_FAILED, STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
 from src.itaufluxcontrol.models.tables import Tables
 from src.itaufluxcontrol.service.approval_status_service import ApprovalStatusService
 from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
 from src.itaufluxcontrol.service.boto_service import BotoService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
 from src.itaufluxcontrol.models.table_execution import TableExecution
 from src.itaufluxcontrol.models.task_table import TaskTable
 from src.itaufluxcontrol.models.task_schedule import TaskSchedule
 
+TENANT_GROUP_SUFFIX = "-tenant-{}"
+TENANT_GROUP_PATTERN = re.compile(r"-tenant-\d+$")
+
 class EventBridgeSchedulerService:
     @inject
-    def __init__(self, logger: Logger, boto_service: BotoService, task_schedule_service: TaskScheduleService, approval_status_service: ApprovalStatusService):
+    def __init__(self, logger: Logger, boto_service: BotoService, task_schedule_service: TaskScheduleService, approval_status_service: ApprovalStatusService, outbox_service: OutboxService, table_process_summary_service: TableProcessSummaryService):
         self.logger = logger
+        self.backend = "eventbridge"
         self.scheduler_client = boto_service.get_client('scheduler')
         self.task_schedule_service: TaskScheduleService = task_schedule_service
         self.approval_status_service: ApprovalStatusService = approval_status_service
+        self.outbox_service: OutboxService = outbox_service
+        self.table_process_summary_service: TableProcessSummaryService = table_process_summary_service
+        self.group_strategy = os.getenv("SCHEDULER_GROUP_STRATEGY", "default")
+        self.group_name = os.getenv("SCHEDULER_GROUP_NAME", "itaufluxcontrol")
+        self.purge_batch_size = int(os.getenv("SCHEDULER_PURGE_BATCH_SIZE", "20"))
 
     @staticmethod
     def dict_to_clean_string(input_dict: Dict[str, Any]) -> str:
@@ -38,12 +53,9 @@ class EventBridgeSchedulerService:
         """
         Finaliza um agendamento com sucesso.
         """
-        task_schedule = self.task_schedule_service.find(task_schedule_id)
-        if task_schedule:
-            self.logger.info(f"[{self.__class__.__name__}] Finishing task schedule with success: {task_schedule_id}")
-            task_schedule.status = STATIC_SCHEDULE_COMPLETED
-            task_schedule.result_execution_id = table_execution.id
-            self.task_schedule_service.save(task_schedule.dict())
+        if self.task_schedule_service.update(task_schedule_id, status=STATIC_SCHEDULE_COMPLETED, result_execution_id=table_execution.id):
+            self.logger.info(f"[{self.__class__.__name__}] Finished task schedule with success: {task_schedule_id}")
+            self.table_process_summary_service.set_status(task_schedule_id, STATIC_SCHEDULE_COMPLETED)
         else:
             self.logger.error(f"[{self.__class__.__name__}] Task schedule not found: {task_schedule_id}")
             
@@ -51,15 +63,94 @@ class EventBridgeSchedulerService:
         """
         Finaliza um agendamento com erro.
         """
-        task_schedule = self.task_schedule_service.find(task_schedule_id)
-        if task_schedule:
-            self.logger.info(f"[{self.__class__.__name__}] Finishing task schedule with error: {task_schedule_id}")
-            task_schedule.status = STATIC_SCHEDULE_FAILED
-            task_schedule.error_message = error_message
-            self.task_schedule_service.save(task_schedule)
+        if self.task_schedule_service.update(task_schedule_id, status=STATIC_SCHEDULE_FAILED, error_message=error_message):
+            self.logger.info(f"[{self.__class__.__name__}] Finished task schedule with error: {task_schedule_id}")
+            self.table_process_summary_service.set_status(task_schedule_id, STATIC_SCHEDULE_FAILED)
         else:
             self.logger.error(f"[{self.__class__.__name__}] Task schedule not found: {task_schedule_id}")
 
+    def purge_finished_schedules(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Remove do Scheduler, em lote, os schedules de agendamentos concluídos
+        ou com falha que ainda não foram removidos (schedules antigos, criados
+        sem `ActionAfterCompletion=DELETE`, ou que nunca dispararam — o
+        disparo já grava `schedule_deleted_at`). Os que já têm remoção no
+        outbox ficam de fora; os que falharam voltam na próxima. Roda na
+        reconciliação (`/scheduler/reconcile`), fora do caminho da finalização.
+
+        :param limit: Máximo de schedules por chamada (padrão `SCHEDULER_PURGE_BATCH_SIZE`).
+        :return: `schedule_alias` dos schedules com remoção enfileirada.
+        """
+        finished = self.task_schedule_service.get_finished_with_schedule(limit or self.purge_batch_size)
+        # `schedule_deleted_at` é gravado pelo dispatcher depois da remoção; até lá não se enfileira de novo
+        pending = self.outbox_service.pending_delete_ids([row.id for row in finished])
+        finished = [row for row in finished if row.id not in pending]
+        for row in finished:
+            self.outbox_service.enqueue("scheduler.delete_schedule", self._schedule_key(row.schedule_alias, row.schedule_group), aggregate_id=row.id)
+        if finished:
+            self.logger.info(f"[{self.__class__.__name__}] Purge of {len(finished)} finished schedule(s) enqueued")
+        return [row.schedule_alias for row in finished]
+
+    def scheduler_group(self, task_table: TaskTable) -> Optional[str]:
+        """
+        Grupo do Scheduler dos schedules da tabela, conforme `SCHEDULER_GROUP_STRATEGY`:
+        `default` (grupo padrão), `single` (`SCHEDULER_GROUP_NAME`) ou `table`
+        (`SCHEDULER_GROUP_NAME-<id da tabela>`).
+
+        Tenants fora do padrão usam grupos próprios (sufixo `-tenant-<id>`):
+        em bancos separados os ids, e portanto os nomes dos schedules, se
+        repetem, e a reconciliação de um tenant não enxerga os do outro.
+        """
+        if tenant_context.is_default:
+            if self.group_strategy == "single":
+                return self.group_name[:64]
+            if self.group_strategy == "table":
+                return f"{self.group_name}-{task_table.table_id}"[:64]
+            return None
+        suffix = TENANT_GROUP_SUFFIX.format(tenant_context.tenant_id)
+        group_name = f"{self.group_name}-{task_table.table_id}" if self.group_strategy == "table" else self.group_name
+        return f"{group_name[:64 - len(suffix)]}{suffix}"
+
+    def in_scope(self, group_name: Optional[str]) -> bool:
+        """
+        Indica se o grupo do Scheduler pertence a esta aplicação e ao tenant
+        da invocação. O grupo padrão continua no escopo (do tenant padrão) por
+        causa dos schedules criados antes dos grupos.
+        """
+        if not tenant_context.is_default:
+            suffix = TENANT_GROUP_SUFFIX.format(tenant_context.tenant_id)
+            return bool(group_name) and group_name.endswith(suffix) and group_name.startswith(self.group_name[:64 - len(suffix)])
+        if group_name and TENANT_GROUP_PATTERN.search(group_name):
+            return False
+        if group_name in (None, "default"):
+            return True
+        if self.group_strategy == "single":
+            return group_name == self.group_name[:64]
+        if self.group_strategy == "table":
+            return group_name.startswith(f"{self.group_name}-")
+        return False
+
+    @staticmethod
+    def _schedule_key(schedule_alias: str, group_name: Optional[str]) -> Dict[str, Any]:
+        key = {"Name": schedule_alias}
+        if group_name:
+            key["GroupName"] = group_name
+        return key
+
+    def _schedule_request(self, task_schedule: TaskSchedule, schedule_expression: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        task_executor = task_schedule.task_table.task_executor
+        return {
+            **self._schedule_key(task_schedule.schedule_alias, task_schedule.schedule_group),
+            "ScheduleExpression": schedule_expression,
+            "FlexibleTimeWindow": {'Mode': 'OFF'},
+            "ActionAfterCompletion": "DELETE",
+            "Target": {
+                'Arn': task_executor.identification,
+                'Input': json.dumps(payload),
+                'RoleArn': task_executor.target_role_arn
+            }
+        }
+
     def generate_unique_alias(self, task_table: TaskTable, last_execution: TableExecution, partitions: Dict[str, Any]) -> str:
         """
         Gera um alias único para a execução da tarefa.
@@ -91,6 +182,7 @@ class EventBridgeSchedulerService:
                     "unique_alias": task_schedule.unique_alias,
                 },
                 "partitions": partitions,
+                TENANT_FIELD: tenant_context.tenant_id,
             },
             "metadata": {
                 "unique_alias": task_schedule.unique_alias,
@@ -98,15 +190,18 @@ class EventBridgeSchedulerService:
             }
         }
         
-    def check_event_exists(self, schedule_alias: str) -> bool:
+    def check_event_exists(self, schedule_alias: str, group_name: Optional[str] = None) -> bool:
         """
         Verifica se um evento existe no EventBridge Scheduler.
         
         :param schedule_alias: O alias do agendamento a ser verificado.
+        :param group_name: Grupo do Scheduler do agendamento (None para o grupo padrão).
         :return: True se o evento existir, False caso contrário.
         """
+        if not schedule_alias:
+            return False
         try:
-            response = self.scheduler_client.list_schedules(NamePrefix=schedule_alias)
+            response = self.scheduler_client.list_schedules(NamePrefix=schedule_alias, GroupName=group_name or "default")
             schedules = response.get("Schedules", [])
             for schedule in schedules:
                 self.logger.info(f"[{self.__class__.__name__}] Checking event existence: {schedule.get('Name')}={schedule_alias}")
@@ -120,16 +215,25 @@ class EventBridgeSchedulerService:
             raise
         return False
 
+    def schedule_exists(self, task_schedule: TaskSchedule) -> bool:
+        """
+        Verifica se o agendamento existe no Scheduler ou ainda está no outbox
+        aguardando envio (criado na mesma transação ou em retry).
+        """
+        return self.outbox_service.has_pending_schedule(task_schedule.id) or self.check_event_exists(task_schedule.schedule_alias, task_schedule.schedule_group)
+
+    @tracer.trace()
     def register_or_postergate_event(self, task_table: TaskTable, trigger_execution: TableExecution, last_execution: TableExecution, table_last_execution: Dict[str, Any]):
         """
         Registra ou atualiza um evento no EventBridge para a execução da tarefa.
         """
         try:
             unique_alias = self.generate_unique_alias(task_table, last_execution, table_last_execution)
+            log_context.bind_unique_alias(unique_alias)
             self.logger.info(f"[{self.__class__.__name__}] Generated unique alias: {unique_alias}")
             possible_schedule = self.task_schedule_service.get_by_unique_alias_and_pendent(unique_alias)
 
-            if possible_schedule and self.check_event_exists(possible_schedule.schedule_alias):
+            if possible_schedule and self.schedule_exists(possible_schedule):
                 self.logger.info(f"[{self.__class__.__name__}] Found existing schedule for alias: {unique_alias}. Updating event.")
                 self.postergate_event(possible_schedule.schedule_alias, possible_schedule, trigger_execution, table_last_execution)
             else:
@@ -146,7 +250,7 @@ class EventBridgeSchedulerService:
         """
         try:
             self.logger.info(f"[{self.__class__.__name__}] Scheduling event for schedule ID: {task_schedule.id}")
-            if self.check_event_exists(task_schedule.schedule_alias):
+            if self.schedule_exists(task_schedule):
                 self.logger.info(f"[{self.__class__.__name__}] Found existing schedule for alias: {task_schedule.schedule_alias}. Updating event.")
                 self._update_event(task_schedule)
             else:
@@ -156,6 +260,22 @@ class EventBridgeSchedulerService:
             self.logger.error(f"[{self.__class__.__name__}] Failed to schedule event: {e}")
             raise
 
+    def schedule_many(self, task_schedules: List[TaskSchedule]):
+        """
+        Agenda em lote os eventos de agendamentos já gravados como pendentes
+        com o horário de disparo (aprovação em lote). Sem `check_event_exists`
+        por item: tudo vai para o outbox como `update_schedule`, que cria o
+        schedule quando ele não existe (`OutboxDispatcher`).
+        """
+        messages = []
+        for task_schedule in task_schedules:
+            partitions = json.loads(task_schedule.partitions) if task_schedule.partitions else {}
+            payload = self.build_event_payload(task_schedule.task_table, task_schedule.table_execution, task_schedule, partitions)
+            schedule_expression = task_schedule.scheduled_execution_time.strftime("at(%Y-%m-%dT%H:%M:%S)")
+            messages.append(("scheduler.update_schedule", self._schedule_request(task_schedule, schedule_expression, payload), task_schedule.id))
+        self.outbox_service.enqueue_many(messages)
+        self.logger.info(f"[{self.__class__.__name__}] Event scheduling enqueued for {len(messages)} schedule(s)")
+
     def register_event(self, possible_schedule: TaskSchedule, unique_alias: str, task_table: TaskTable, trigger_execution: TableExecution, partitions: Dict[str, Any]):
         """
         Registra um novo evento no EventBridge.
@@ -168,10 +288,10 @@ class EventBridgeSchedulerService:
             schedule_alias = f"{schedule_execution_time.strftime('%Y%m%d%H%M%S')}-{task_table.id}"[:64]
             
             task_schedule_dict = {
-                "id": possible_schedule.id if possible_schedule else None,
                 "task_id": task_table.id,
                 "unique_alias": unique_alias,
                 "schedule_alias": schedule_alias,
+                "schedule_group": self.scheduler_group(task_table),
                 "table_execution_id": trigger_execution.id,
                 "scheduled_execution_time": schedule_execution_time,
                 "partitions": json.dumps(partitions) if partitions else None,
@@ -181,12 +301,14 @@ class EventBridgeSchedulerService:
             if table.requires_approval:
                 task_schedule_dict["status"] = STATIC_SCHEDULE_WAITING_APPROVAL
             
-            task_schedule = self.task_schedule_service.save(task_schedule_dict)
+            if possible_schedule:
+                self.task_schedule_service.update(possible_schedule.id, **task_schedule_dict)
+                task_schedule = possible_schedule
+            else:
+                task_schedule = self.task_schedule_service.save(task_schedule_dict)
             
             if table.requires_approval:
-                possible_task_approval = self.approval_status_service.find_by_task_schedule_id(task_schedule.id)
                 self.approval_status_service.save({
-                    "id": possible_task_approval.id if possible_task_approval else None,
                     "task_schedule_id": task_schedule.id,
                     "status": STATIC_APPROVE_STATUS_PENDING
                 })
@@ -204,24 +326,21 @@ class EventBridgeSchedulerService:
         payload = self.build_event_payload(task_table, trigger_execution, task_schedule, partitions)
         
         schedule_execution_time = datetime.now() + timedelta(seconds=task_table.debounce_seconds)
-        schedule_expression = schedule_execution_time.strftime("cron(%M %H %d %m ? *)")
+        schedule_expression = schedule_execution_time.strftime("at(%Y-%m-%dT%H:%M:%S)")
         
-        task_schedule.scheduled_execution_time = schedule_execution_time
-        task_schedule.status = STATIC_SCHEDULE_PENDENT
-        self.task_schedule_service.save(task_schedule.dict())
+        self.task_schedule_service.update(task_schedule.id, scheduled_execution_time=schedule_execution_time, status=STATIC_SCHEDULE_PENDENT, schedule_deleted_at=None)
 
-        response = self.scheduler_client.create_schedule(
-            Name=schedule_alias,
-            ScheduleExpression=schedule_expression,
-            FlexibleTimeWindow={'Mode': 'OFF'},
-            Target={
-                'Arn': task_table.task_executor.identification,
-                'Input': json.dumps(payload),
-                'RoleArn': task_table.task_executor.target_role_arn
-            }
-        )
+        message = self.outbox_service.enqueue("scheduler.create_schedule", self._schedule_request(task_schedule, schedule_expression, payload), aggregate_id=task_schedule.id)
 
-        self.logger.info(f"[{self.__class__.__name__}] Event registered successfully: {response.get('ScheduleArn', 'unknown')}")
+        self.logger.info(f"[{self.__class__.__name__}] Event registration enqueued: {schedule_alias} (outbox {message.id})")
+
+    def recreate_event(self, task_schedule: TaskSchedule):
+        """
+        Recria no Scheduler o evento de um agendamento pendente que ficou sem
+        schedule (ex.: create perdido), a partir do próprio `task_schedule`.
+        """
+        self.logger.info(f"[{self.__class__.__name__}] Recreating event for schedule ID: {task_schedule.id}")
+        self._register_event(task_schedule)
 
     def postergate_event(self, schedule_alias: str, task_schedule: TaskSchedule, trigger_execution: TableExecution, partitions: Dict[str, Any]):
         """
@@ -234,9 +353,6 @@ class EventBridgeSchedulerService:
             schedule_execution_time = datetime.now() + timedelta(seconds=task_schedule.task_table.debounce_seconds)
             
             task_schedule_dict = {
-                "id": task_schedule.id,
-                "task_id": task_schedule.task_table.id,
-                "unique_alias": task_schedule.unique_alias,
                 "schedule_alias": schedule_alias,
                 "table_execution_id": trigger_execution.id,
                 "scheduled_execution_time": schedule_execution_time,
@@ -247,12 +363,10 @@ class EventBridgeSchedulerService:
             if table.requires_approval:
                 task_schedule_dict["status"] = STATIC_SCHEDULE_WAITING_APPROVAL
             
-            task_schedule = self.task_schedule_service.save(task_schedule_dict)   
+            self.task_schedule_service.update(task_schedule.id, **task_schedule_dict)
             
             if table.requires_approval:
-                possible_task_approval = self.approval_status_service.find_by_task_schedule_id(task_schedule.id)
                 self.approval_status_service.save({
-                    "id": possible_task_approval.id if possible_task_approval else None,
                     "task_schedule_id": task_schedule.id,
                     "status": STATIC_APPROVE_STATUS_PENDING
                 })  
@@ -269,30 +383,19 @@ class EventBridgeSchedulerService:
         schedule_alias = task_schedule.schedule_alias
         
         schedule_execution_time = datetime.now() + timedelta(seconds=task_schedule.task_table.debounce_seconds)
-        schedule_expression = schedule_execution_time.strftime("cron(%M %H %d %m ? *)")
+        schedule_expression = schedule_execution_time.strftime("at(%Y-%m-%dT%H:%M:%S)")
         
         payload = self.build_event_payload(task_schedule.task_table, trigger_execution, task_schedule, partitions)
         
-        task_schedule.scheduled_execution_time = schedule_execution_time
-        task_schedule.status = STATIC_SCHEDULE_PENDENT
-        self.task_schedule_service.save(task_schedule.dict())
+        self.task_schedule_service.update(task_schedule.id, scheduled_execution_time=schedule_execution_time, status=STATIC_SCHEDULE_PENDENT, schedule_deleted_at=None)
         possible_task_approval = self.approval_status_service.find_by_task_schedule_id(task_schedule.id)
         
         if possible_task_approval:
             self.approval_status_service.approve(possible_task_approval.id, 'automatic')
 
-        response = self.scheduler_client.update_schedule(
-            Name=schedule_alias,
-            ScheduleExpression=schedule_expression,
-            FlexibleTimeWindow={'Mode': 'OFF'},
-            Target={
-                'Arn': task_schedule.task_table.task_executor.identification,
-                'Input': json.dumps(payload),
-                'RoleArn': task_schedule.task_table.task_executor.target_role_arn
-            }
-        )
+        message = self.outbox_service.enqueue("scheduler.update_schedule", self._schedule_request(task_schedule, schedule_expression, payload), aggregate_id=task_schedule.id)
 
-        self.logger.info(f"[{self.__class__.__name__}] Event updated successfully: {response}")
+        self.logger.info(f"[{self.__class__.__name__}] Event update enqueued: {schedule_alias} (outbox {message.id})")
         
     def delete_event(self, task_schedule: TaskSchedule):
         """
@@ -300,8 +403,15 @@ class EventBridgeSchedulerService:
         """
         try:
             self.logger.info(f"[{self.__class__.__name__}] Deleting event for schedule ID: {task_schedule.id}")
-            response = self.scheduler_client.delete_schedule(Name=task_schedule.schedule_alias)
-            self.logger.info(f"[{self.__class__.__name__}] Event deleted successfully: {response}")
+            message = self.outbox_service.enqueue("scheduler.delete_schedule", self._schedule_key(task_schedule.schedule_alias, task_schedule.schedule_group), aggregate_id=task_schedule.id)
+            self.logger.info(f"[{self.__class__.__name__}] Event deletion enqueued: {task_schedule.schedule_alias} (outbox {message.id})")
         except Exception as e:
             self.logger.error(f"[{self.__class__.__name__}] Failed to delete event: {e}")
             raise
+
+    def delete_orphan_event(self, schedule_alias: str, group_name: Optional[str] = None):
+        """
+        Deleta um schedule do Scheduler que não corresponde a nenhum agendamento pendente.
+        """
+        message = self.outbox_service.enqueue("scheduler.delete_schedule", self._schedule_key(schedule_alias, group_name))
+        self.logger.info(f"[{self.__class__.__name__}] Orphan event deletion enqueued: {schedule_alias} (outbox {message.id})")
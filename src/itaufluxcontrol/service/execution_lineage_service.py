@@ -0,0 +1,98 @@
+import os
+from collections import defaultdict
+from logging import Logger
+from typing import Any, Dict, Optional
+
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
+from injector import inject
+
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.repositories.table_execution_repository import TableExecutionRepository
+from src.itaufluxcontrol.repositories.table_partition_exec_repository import TablePartitionExecRepository
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+
+UP = "up"
+DOWN = "down"
+
+
+class ExecutionLineageService:
+    """
+    Linhagem de uma execução (`/executions/<id>/lineage`): os agendamentos
+    ligam a execução que os disparou à execução que produziram, e a cadeia
+    é percorrida para baixo (o que a execução disparou) ou para cima (o que
+    a produziu). São três consultas, qualquer que seja a profundidade: a
+    linhagem (CTE recursiva), as execuções e as partições delas.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        task_schedule_service: TaskScheduleService,
+        table_execution_repository: TableExecutionRepository,
+        table_partition_exec_repository: TablePartitionExecRepository,
+    ):
+        self.logger = logger
+        self.task_schedule_service = task_schedule_service
+        self.table_execution_repository = table_execution_repository
+        self.table_partition_exec_repository = table_partition_exec_repository
+        self.default_depth = int(os.getenv("EXECUTION_LINEAGE_DEFAULT_DEPTH", "5"))
+        self.max_depth = int(os.getenv("EXECUTION_LINEAGE_MAX_DEPTH", "20"))
+
+    @tracer.trace()
+    def lineage(self, execution_id: int, direction: str = DOWN, depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        :param direction: `down` (padrão) ou `up`.
+        :param depth: Máximo de saltos (padrão `EXECUTION_LINEAGE_DEFAULT_DEPTH`).
+        :return: `executions` (com `depth`, 0 para a origem, e `partitions`) e
+                 `schedules` (com `depth` e as execuções de origem e resultado).
+        :raises NotFoundError: Se a execução não existe.
+        """
+        depth = depth or self.default_depth
+        schedules = self.task_schedule_service.get_lineage(execution_id, direction == DOWN, depth)
+
+        depths = {execution_id: 0}
+        for schedule in schedules:
+            reached = schedule.result_execution_id if direction == DOWN else schedule.table_execution_id
+            if reached is not None and reached not in depths:
+                depths[reached] = schedule.depth
+
+        executions = {row.id: row for row in self.table_execution_repository.get_with_table_names(depths)}
+        if execution_id not in executions:
+            raise NotFoundError(f"Execution with id [{execution_id}] not found.")
+        partitions = defaultdict(dict)
+        for row in self.table_partition_exec_repository.get_values_by_executions(depths):
+            partitions[row.execution_id][row.name] = row.value
+
+        self.logger.debug("[%s] Lineage %s of execution %s: %s executions, %s schedules", self.__class__.__name__, direction, execution_id, len(executions), len(schedules))
+        return {
+            "execution_id": execution_id,
+            "direction": direction,
+            "depth": depth,
+            "executions": [
+                {
+                    "id": row.id,
+                    "table_id": row.table_id,
+                    "table_name": row.table_name,
+                    "date_time": row.date_time.isoformat() if row.date_time else None,
+                    "source": row.source,
+                    "depth": depths[row.id],
+                    "partitions": partitions.get(row.id, {}),
+                }
+                for row in sorted(executions.values(), key=lambda row: (depths[row.id], row.id))
+            ],
+            "schedules": [
+                {
+                    "id": schedule.id,
+                    "task_id": schedule.task_id,
+                    "task_alias": schedule.task_alias,
+                    "status": schedule.status,
+                    "table_execution_id": schedule.table_execution_id,
+                    "result_execution_id": schedule.result_execution_id,
+                    "scheduled_execution_time": schedule.scheduled_execution_time.isoformat() if schedule.scheduled_execution_time else None,
+                    "error_message": schedule.error_message,
+                    "depth": schedule.depth,
+                }
+                for schedule in schedules
+            ],
+        }
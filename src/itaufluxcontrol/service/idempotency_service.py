@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import Any, Optional, Tuple
+
+from aws_lambda_powertools.event_handler.exceptions import ServiceError
+from injector import inject
+from sqlalchemy.exc import IntegrityError
+
+from src.itaufluxcontrol.config.constants import STATIC_IDEMPOTENCY_COMPLETED, STATIC_IDEMPOTENCY_IN_PROGRESS
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.models.idempotency_key import IdempotencyKey
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.repositories.idempotency_repository import IdempotencyRepository
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class IdempotencyService:
+    """
+    Armazena a resposta das rotas com efeito colateral por chave de idempotência,
+    para que reentregas (retry do Scheduler, produtores reenviando) sejam
+    respondidas sem repetir o trabalho.
+
+    A chave vem do header `Idempotency-Key` ou do campo `idempotency_key` do body
+    (TTL `IDEMPOTENCY_TTL_SECONDS`); sem elas, usa o hash do payload canônico,
+    com TTL curto (`IDEMPOTENCY_PAYLOAD_TTL_SECONDS`) para não bloquear
+    reprocessamentos legítimos das mesmas partições. Fora do tenant padrão a
+    chave inclui o tenant, já que a coluna `key` é única na tabela inteira.
+    """
+
+    @inject
+    def __init__(self, logger: Logger, repository: IdempotencyRepository, session_provider: SessionProvider):
+        self.logger = logger
+        self.repository = repository
+        self.session_provider = session_provider
+        self.ttl_seconds = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+        self.payload_ttl_seconds = int(os.getenv("IDEMPOTENCY_PAYLOAD_TTL_SECONDS", "300"))
+        self.lock_seconds = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300"))
+
+    @staticmethod
+    def build_key(route: str, client_key: Optional[str], body: Any) -> str:
+        source = client_key or json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+        tenant = "" if tenant_context.is_default else f"{tenant_context.tenant_id}\n"
+        return hashlib.sha256(f"{tenant}{route}\n{source}".encode("utf-8")).hexdigest()
+
+    def begin(self, key: str, route: str, client_key: bool) -> Tuple[IdempotencyKey, bool]:
+        """
+        Registra a chave como em andamento, na mesma transação do trabalho.
+
+        :return: (registro, novo). Se a chave já tem registro vigente — concluído
+                 dentro do TTL ou em andamento dentro do lock, inclusive de uma
+                 entrega concorrente —, devolve esse registro com `novo=False`.
+        """
+        now = datetime.utcnow()
+        record = self.repository.get_by_key(key)
+        if record and not self._is_stale(record, now):
+            return record, False
+
+        ttl = self.ttl_seconds if client_key else self.payload_ttl_seconds
+        record = record or IdempotencyKey(key=key)
+        record.route = route
+        record.status = STATIC_IDEMPOTENCY_IN_PROGRESS
+        record.response = None
+        record.created_at = now
+        record.expires_at = now + timedelta(seconds=ttl)
+        try:
+            return self.repository.save(record), True
+        except IntegrityError:
+            self.session_provider.rollback()
+            self.logger.info(f"[{self.__class__.__name__}] Concurrent delivery for idempotency key {key}.")
+            return self.repository.get_by_key(key), False
+
+    def complete(self, record_id: int, response: Any):
+        self.repository.complete(record_id, response)
+
+    def purge_expired(self) -> int:
+        removed = self.repository.delete_expired(datetime.utcnow())
+        self.logger.info(f"[{self.__class__.__name__}] {removed} expired idempotency keys removed.")
+        return removed
+
+    def replay_or_conflict(self, record: IdempotencyKey) -> Any:
+        """
+        Resposta para uma entrega duplicada: a resposta armazenada ou 409 se a
+        primeira entrega ainda está em andamento.
+        """
+        if record.status == STATIC_IDEMPOTENCY_COMPLETED:
+            self.logger.info(f"[{self.__class__.__name__}] Duplicate request on {record.route} answered from idempotency store.")
+            return record.response
+        raise ServiceError(409, f"Request with the same idempotency key is already in progress on {record.route}.")
+
+    def _is_stale(self, record: IdempotencyKey, now: datetime) -> bool:
+        if record.expires_at <= now:
+            return True
+        return record.status == STATIC_IDEMPOTENCY_IN_PROGRESS and record.created_at <= now - timedelta(seconds=self.lock_seconds)
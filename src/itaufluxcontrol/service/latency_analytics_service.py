@@ -0,0 +1,187 @@
+import json
+from collections import defaultdict, deque
+from datetime import date, datetime, time, timedelta
+from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
+
+from injector import inject
+
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.repositories.table_repository import TableRepository
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+
+HOP_METRICS = ("debounce_wait", "dispatch_to_completion", "landing_lag")
+PERCENTILES = (50, 95)
+
+
+class LatencyAnalyticsService:
+    """
+    Latência de ponta a ponta do DAG, reconstruída de `task_schedule`.
+
+    Para cada agendamento concluído (um salto origem -> dependente):
+      - `debounce_wait`: chegada da origem até o disparo do schedule;
+      - `dispatch_to_completion`: disparo até a chegada da dependente;
+      - `landing_lag`: chegada da origem até a chegada da dependente.
+
+    Os agendamentos são lidos em colunas e agregados com NumPy por tabela e
+    dia (contagem, média, p50, p95 e máximo); o caminho crítico de cada dia é
+    o caminho mais longo do DAG usando o p95 de `landing_lag` de cada salto.
+    Os horários são comparados como gravados (a Lambda roda em UTC).
+    """
+
+    @inject
+    def __init__(self, logger: Logger, task_schedule_service: TaskScheduleService, table_repository: TableRepository, cloudwatch_service: CloudWatchService):
+        self.logger = logger
+        self.task_schedule_service = task_schedule_service
+        self.table_repository = table_repository
+        self.cloudwatch_service = cloudwatch_service
+
+    @tracer.trace()
+    def compute(self, start: date, end: date, table_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Calcula as latências por tabela e dia e o caminho crítico de cada dia.
+
+        :param start: Primeiro dia (inclusive).
+        :param end: Último dia (inclusive).
+        :param table_id: Restringe às chegadas de uma tabela dependente.
+        :return: `tables` (uma linha por tabela e dia) e `critical_paths` (um por dia).
+        """
+        # Import tardio: o NumPy pesa no cold start e só as rotas de análise o usam
+        import numpy as np
+
+        report = {"from": start.isoformat(), "to": end.isoformat(), "tables": [], "critical_paths": []}
+        rows = self.task_schedule_service.get_latency_rows(
+            datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min), table_id
+        )
+        if not rows:
+            return report
+
+        upstream, downstream, landed, fired, completed = (np.asarray(column) for column in zip(*rows))
+        landed, fired, completed = (
+            column.astype("datetime64[ms]").astype(np.int64) / 1000.0 for column in (landed, fired, completed)
+        )
+        day = (completed // 86_400).astype(np.int64)
+        upstream, downstream = upstream.astype(np.int64), downstream.astype(np.int64)
+        metrics = {
+            "debounce_wait": fired - landed,
+            "dispatch_to_completion": completed - fired,
+            "landing_lag": completed - landed,
+        }
+
+        names = self.table_repository.get_names({int(value) for value in np.concatenate([upstream, downstream])})
+
+        (table_ids, days), counts, stats = self._grouped_stats(np, (downstream, day), metrics)
+        for index in range(len(counts)):
+            report["tables"].append({
+                "table_id": int(table_ids[index]),
+                "table_name": names.get(int(table_ids[index])),
+                "day": self._day(np, days[index]),
+                "count": int(counts[index]),
+                **{name: {stat: round(float(values[index]), 3) for stat, values in stats[name].items()} for name in HOP_METRICS},
+            })
+
+        (hop_upstream, hop_downstream, hop_days), _, hop_stats = self._grouped_stats(np, (upstream, downstream, day), {"landing_lag": metrics["landing_lag"]})
+        hops_by_day: Dict[int, List[Tuple[int, int, float]]] = defaultdict(list)
+        for index, hop_day in enumerate(hop_days):
+            hops_by_day[int(hop_day)].append((int(hop_upstream[index]), int(hop_downstream[index]), float(hop_stats["landing_lag"]["p95"][index])))
+        for hop_day in sorted(hops_by_day):
+            report["critical_paths"].append({"day": self._day(np, hop_day), **self._critical_path(hops_by_day[hop_day], names)})
+
+        self.logger.info(f"[{self.__class__.__name__}] Latency computed: {len(rows)} hops, {len(report['tables'])} table-days")
+        return report
+
+    @tracer.trace()
+    def publish(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Job diário: calcula o dia (padrão: ontem, UTC) e emite uma linha JSON
+        `latency_summary` por tabela e uma `critical_path` no log, além das
+        métricas agregadas no CloudWatch.
+        """
+        day = day or datetime.utcnow().date() - timedelta(days=1)
+        report = self.compute(day, day)
+        for table in report["tables"]:
+            self.logger.info(json.dumps({"type": "latency_summary", **table}))
+        for critical_path in report["critical_paths"]:
+            self.logger.info(json.dumps({"type": "critical_path", **critical_path}))
+            self.cloudwatch_service.add_metric("CriticalPathSeconds", critical_path["total_seconds"], "Seconds")
+        self.cloudwatch_service.add_metric("LatencyTableDays", len(report["tables"]), "Count")
+        return report
+
+    @staticmethod
+    def _grouped_stats(np, keys: Tuple, values: Dict[str, Any]):
+        """
+        Agrupa pelas colunas de `keys` e calcula, sem laço por grupo, contagem
+        e média/p50/p95/máximo de cada coluna de `values` (percentil com
+        interpolação linear, como `np.percentile`).
+        """
+        order = np.lexsort(keys[::-1])
+        sorted_keys = [key[order] for key in keys]
+        size = len(order)
+        boundary = np.zeros(size, dtype=bool)
+        boundary[0] = True
+        for key in sorted_keys:
+            boundary[1:] |= key[1:] != key[:-1]
+        starts = np.flatnonzero(boundary)
+        counts = np.diff(np.append(starts, size))
+        group = np.cumsum(boundary) - 1
+
+        stats = {}
+        for name, column in values.items():
+            column = column[order]
+            column = column[np.lexsort((column, group))]
+            result = {"mean": np.add.reduceat(column, starts) / counts}
+            for percentile in PERCENTILES:
+                rank = (counts - 1) * percentile / 100
+                lower = np.floor(rank).astype(np.int64)
+                upper = np.minimum(lower + 1, counts - 1)
+                low_values, high_values = column[starts + lower], column[starts + upper]
+                result[f"p{percentile}"] = low_values + (high_values - low_values) * (rank - lower)
+            result["max"] = np.maximum.reduceat(column, starts)
+            stats[name] = result
+        return [key[starts] for key in sorted_keys], counts, stats
+
+    @staticmethod
+    def _critical_path(hops: List[Tuple[int, int, float]], names: Dict[int, str]) -> Dict[str, Any]:
+        """
+        Caminho mais longo (soma dos p95) em ordem topológica; tabelas em
+        ciclo ficam de fora.
+        """
+        outgoing = defaultdict(list)
+        in_degree = defaultdict(int)
+        for upstream, downstream, seconds in hops:
+            outgoing[upstream].append((downstream, seconds))
+            in_degree[downstream] += 1
+            in_degree.setdefault(upstream, 0)
+
+        distance = {node: 0.0 for node, degree in in_degree.items() if degree == 0}
+        previous: Dict[int, Tuple[int, float]] = {}
+        ready = deque(distance)
+        while ready:
+            node = ready.popleft()
+            for downstream, seconds in outgoing[node]:
+                if distance[node] + seconds > distance.get(downstream, -1.0):
+                    distance[downstream] = distance[node] + seconds
+                    previous[downstream] = (node, seconds)
+                in_degree[downstream] -= 1
+                if in_degree[downstream] == 0:
+                    ready.append(downstream)
+
+        if not distance:
+            return {"total_seconds": 0.0, "tables": [], "hops": []}
+        node = max(distance, key=distance.get)
+        path, path_hops = [node], []
+        while node in previous:
+            upstream, seconds = previous[node]
+            path_hops.append({"upstream_table_id": upstream, "table_id": node, "p95_seconds": round(seconds, 3)})
+            path.append(upstream)
+            node = upstream
+        return {
+            "total_seconds": round(max(distance.values()), 3),
+            "tables": [{"id": table_id, "name": names.get(table_id)} for table_id in reversed(path)],
+            "hops": path_hops[::-1],
+        }
+
+    @staticmethod
+    def _day(np, epoch_day) -> str:
+        return np.datetime64(int(epoch_day), "D").item().isoformat()
@@ -0,0 +1,164 @@
+import os
+from logging import Logger
+from typing import Any, Callable, Dict, List, Optional
+
+from injector import inject
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_FAILED
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+from src.itaufluxcontrol.service.task_service import TaskService
+
+
+class OutboxDispatcher:
+    """
+    Envia as mensagens do outbox depois do commit.
+
+    As mensagens são reivindicadas em lote com um UPDATE condicional
+    (`dispatching` + token) e commit; depois cada uma é enviada (com commit
+    das escritas do envio) e o lote é marcado como `dispatched`, ou a mensagem
+    é reagendada com backoff. Se a invocação morrer no meio, o lease expira e
+    o sweeper reenvia — a entrega é pelo menos uma vez.
+
+    Operações suportadas:
+      - `scheduler.<método>`: chamada ao client do EventBridge Scheduler com o payload como kwargs
+        (grupos inexistentes são criados no primeiro `create_schedule`); um
+        `delete_schedule` enviado grava `schedule_deleted_at` no agendamento.
+      - `task.dispatch`: disparo da tarefa pelo `TaskService.dispatch`; ao
+        esgotar as tentativas, o agendamento é finalizado com erro.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        outbox_service: OutboxService,
+        session_provider: SessionProvider,
+        task_service: TaskService,
+        task_schedule_service: TaskScheduleService,
+        boto_service: BotoService,
+        cloudwatch_service: CloudWatchService,
+    ):
+        self.logger = logger
+        self.outbox_service = outbox_service
+        self.session_provider = session_provider
+        self.task_service = task_service
+        self.task_schedule_service = task_schedule_service
+        self.boto_service = boto_service
+        self.cloudwatch_service = cloudwatch_service
+        self.batch_size = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+
+    @tracer.trace()
+    def dispatch(self, ids: List[int]) -> Dict[str, int]:
+        """
+        Drena as mensagens enfileiradas na invocação corrente (pós-commit).
+        """
+        result = {"dispatched": 0, "retrying": 0, "failed": 0}
+        for start in range(0, len(ids), self.batch_size):
+            self._run(lambda: self.outbox_service.claim(ids[start:start + self.batch_size]), result)
+        return result
+
+    @tracer.trace()
+    def sweep(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Reenvia as sobras: mensagens cujo backoff venceu e mensagens presas
+        em `dispatching` por um dispatcher que não terminou (lease expirado).
+        """
+        result = {"dispatched": 0, "retrying": 0, "failed": 0}
+        self._run(lambda: self.outbox_service.claim_dispatchable(limit or self.batch_size), result)
+        return result
+
+    def _run(self, claim: Callable[[], List[OutboxMessage]], result: Dict[str, int]):
+        try:
+            messages = [(message.id, message.operation, message.payload, message.aggregate_id) for message in claim()]
+            self.session_provider.commit()
+
+            dispatched = []
+            for message_id, operation, payload, aggregate_id in messages:
+                try:
+                    self.send(operation, payload)
+                    self.confirm(operation, aggregate_id)
+                    self.session_provider.commit()
+                    dispatched.append(message_id)
+                except Exception as e:
+                    self.session_provider.rollback()
+                    message = self.outbox_service.mark_failed(message_id, str(e))
+                    if message.status == STATIC_OUTBOX_FAILED:
+                        self.give_up(operation, payload, str(e))
+                    self.session_provider.commit()
+                    result["failed" if message.status == STATIC_OUTBOX_FAILED else "retrying"] += 1
+            self.outbox_service.mark_dispatched(dispatched)
+            result["dispatched"] += len(dispatched)
+            self.session_provider.commit()
+        except Exception:
+            self.session_provider.rollback()
+            raise
+        finally:
+            self.session_provider.close()
+
+        self.logger.info(f"[{self.__class__.__name__}] Outbox drained: {result}")
+        self.cloudwatch_service.add_metric(name="OutboxDispatched", value=result["dispatched"], unit="Count")
+        self.cloudwatch_service.add_metric(name="OutboxRetrying", value=result["retrying"], unit="Count")
+        self.cloudwatch_service.add_metric(name="OutboxFailed", value=result["failed"], unit="Count")
+
+    def send(self, operation: str, payload: Dict[str, Any]):
+        self.logger.debug("[%s] Sending outbox operation %s: %s", self.__class__.__name__, operation, payload)
+        if operation == "task.dispatch":
+            return self.task_service.dispatch(payload)
+
+        service, _, method = operation.partition(".")
+        if service != "scheduler" or not method:
+            raise ValueError(f"Operação de outbox não suportada: {operation}")
+
+        scheduler_client = self.boto_service.get_client("scheduler")
+        try:
+            return getattr(scheduler_client, method)(**payload)
+        except scheduler_client.exceptions.ResourceNotFoundException:
+            if method == "delete_schedule":
+                self.logger.info(f"[{self.__class__.__name__}] Schedule {payload.get('Name')} already deleted.")
+                return None
+            if method == "update_schedule":
+                self.logger.warning(f"[{self.__class__.__name__}] Schedule {payload.get('Name')} not found, creating it.")
+                return self._create_schedule(scheduler_client, payload)
+            if method == "create_schedule" and payload.get("GroupName"):
+                return self._create_schedule(scheduler_client, payload)
+            raise
+
+    def confirm(self, operation: str, aggregate_id: Optional[int]):
+        """
+        Registra o efeito da mensagem enviada: o schedule de um
+        `scheduler.delete_schedule` só conta como removido depois da remoção.
+        """
+        if operation == "scheduler.delete_schedule" and aggregate_id:
+            self.task_schedule_service.mark_schedule_deleted([aggregate_id])
+
+    def give_up(self, operation: str, payload: Dict[str, Any], error: str):
+        """
+        Trata a mensagem que esgotou as tentativas: o agendamento de um
+        `task.dispatch` é finalizado com erro, em vez de ficar `in_progress`.
+        """
+        if operation == "task.dispatch":
+            self.task_service.dispatch_failed(payload, error)
+
+    def _create_schedule(self, scheduler_client, payload: Dict[str, Any]):
+        """
+        Cria o schedule; se o grupo do Scheduler ainda não existe, cria o grupo
+        e tenta de novo.
+        """
+        try:
+            return scheduler_client.create_schedule(**payload)
+        except scheduler_client.exceptions.ResourceNotFoundException:
+            group_name = payload.get("GroupName")
+            if not group_name:
+                raise
+            self.logger.info(f"[{self.__class__.__name__}] Creating schedule group {group_name}.")
+            try:
+                scheduler_client.create_schedule_group(Name=group_name)
+            except scheduler_client.exceptions.ConflictException:
+                self.logger.debug("[%s] Schedule group %s already exists.", self.__class__.__name__, group_name)
+            return scheduler_client.create_schedule(**payload)
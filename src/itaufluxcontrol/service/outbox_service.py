@@ -0,0 +1,112 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from injector import inject
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_FAILED, STATIC_OUTBOX_PENDING
+from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+from src.itaufluxcontrol.repositories.outbox_repository import OutboxRepository
+
+
+class OutboxService:
+    """
+    Outbox transacional: as chamadas remotas (Scheduler, Step Functions, SQS...)
+    são gravadas em `outbox_message` na mesma transação da regra de negócio e
+    enviadas só depois do commit pelo `OutboxDispatcher`.
+
+    O serviço guarda os ids enfileirados na invocação corrente para o
+    dispatcher drenar logo após o commit; o que sobrar fica para o sweeper.
+    """
+
+    @inject
+    def __init__(self, logger: Logger, repository: OutboxRepository):
+        self.logger = logger
+        self.repository = repository
+        self.max_attempts = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+        self.backoff_base_seconds = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "5"))
+        self.backoff_max_seconds = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "900"))
+        self.lease_seconds = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+        self._enqueued: List[int] = []
+
+    def enqueue(self, operation: str, payload: Dict[str, Any], aggregate_id: Optional[int] = None) -> OutboxMessage:
+        message = self.repository.save(OutboxMessage(
+            operation=operation,
+            payload=payload,
+            aggregate_id=aggregate_id,
+            status=STATIC_OUTBOX_PENDING,
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+        ))
+        self.logger.debug("[%s] Enqueued outbox message %s: %s", self.__class__.__name__, message.id, operation)
+        self._enqueued.append(message.id)
+        return message
+
+    def enqueue_many(self, messages: List[Tuple[str, Dict[str, Any], Optional[int]]]) -> List[OutboxMessage]:
+        """
+        Enfileira várias mensagens (`operation`, `payload`, `aggregate_id`) com um único flush.
+        """
+        now = datetime.utcnow()
+        saved = self.repository.save_all([
+            OutboxMessage(
+                operation=operation,
+                payload=payload,
+                aggregate_id=aggregate_id,
+                status=STATIC_OUTBOX_PENDING,
+                attempts=0,
+                next_attempt_at=now,
+            )
+            for operation, payload, aggregate_id in messages
+        ])
+        self.logger.debug("[%s] Enqueued %s outbox messages", self.__class__.__name__, len(saved))
+        self._enqueued.extend(message.id for message in saved)
+        return saved
+
+    def take_enqueued(self) -> List[int]:
+        enqueued, self._enqueued = self._enqueued, []
+        return enqueued
+
+    def has_pending_schedule(self, task_schedule_id: Optional[int]) -> bool:
+        if not task_schedule_id:
+            return False
+        return self.repository.has_pending(task_schedule_id, ["scheduler.create_schedule", "scheduler.update_schedule"])
+
+    def pending_schedule_ids(self, task_schedule_ids: List[int]) -> Set[int]:
+        return self.repository.get_pending_aggregate_ids(task_schedule_ids, ["scheduler.create_schedule", "scheduler.update_schedule"])
+
+    def pending_delete_ids(self, task_schedule_ids: List[int]) -> Set[int]:
+        return self.repository.get_pending_aggregate_ids(task_schedule_ids, ["scheduler.delete_schedule"])
+
+    def claim(self, ids: List[int]) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+        return self.repository.claim(ids, uuid.uuid4().hex, now, now - timedelta(seconds=self.lease_seconds))
+
+    def claim_dispatchable(self, limit: int) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+        ids = self.repository.get_dispatchable_ids(now, now - timedelta(seconds=self.lease_seconds), limit)
+        return self.claim(ids)
+
+    def mark_dispatched(self, ids: List[int]):
+        if ids:
+            self.repository.mark_dispatched(ids, datetime.utcnow())
+
+    def mark_failed(self, message_id: int, error: str) -> OutboxMessage:
+        """
+        Registra a falha e agenda a próxima tentativa com backoff exponencial;
+        após `max_attempts` a mensagem fica como `failed` para análise.
+        """
+        message = self.repository.get_by_id(message_id)
+        message.attempts += 1
+        message.last_error = error[:1000]
+        if message.attempts >= self.max_attempts:
+            message.status = STATIC_OUTBOX_FAILED
+            self.logger.error(f"[{self.__class__.__name__}] Outbox message {message.id} failed after {message.attempts} attempts: {error}")
+        else:
+            delay = min(self.backoff_base_seconds * 2 ** (message.attempts - 1), self.backoff_max_seconds)
+            message.status = STATIC_OUTBOX_PENDING
+            message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            self.logger.warning(f"[{self.__class__.__name__}] Outbox message {message.id} failed (attempt {message.attempts}), retrying in {delay}s: {error}")
+        self.repository.flush()
+        return message
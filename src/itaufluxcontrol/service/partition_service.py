@@ -1,5 +1,5 @@
 from logging import Logger
-from typing import List
+from typing import List, Optional
 
 from injector import inject
 
@@ -7,6 +7,8 @@ from src.itaufluxcontrol.models.partitions import Partitions
 from src.itaufluxcontrol.models.dto.table_dto import PartitionDTO
 from src.itaufluxcontrol.repositories.partition_repository import PartitionRepository
 
+PARTITION_FIELDS = ("type", "is_required", "sync_column")
+
 class PartitionService:
     @inject
     def __init__(self, logger: Logger, repository: PartitionRepository):
@@ -14,17 +16,38 @@ class PartitionService:
         self.repository = repository
 
     def save_partitions(self, table_id: int, partitions_dto: List[PartitionDTO]):
-        self.logger.debug(f"[{self.__class__.__name__}] Saving partitions for table [{table_id}]")
+        """
+        Sincroniza as partições da tabela com `partitions_dto` (estado desejado).
+
+        A diferença é calculada em memória: partições novas, alteradas
+        (`type`, `is_required`, `sync_column`) ou removidas antes e enviadas de
+        novo vão num único upsert; as que saíram da lista, num único soft delete.
+        """
+        self.logger.debug("[%s] Saving partitions for table [%s]", self.__class__.__name__, table_id)
         existing_partitions = {
-            p.name for p in self.repository.get_by_table_id(table_id)
+            p.name: p for p in self.repository.get_by_table_id(table_id)
         }
+        desired = {}
         for partition_data in partitions_dto:
-            if partition_data.name not in existing_partitions:
-                partition = Partitions(
-                    table_id=table_id,
-                    name=partition_data.name,
-                    type=partition_data.type,
-                    is_required=partition_data.is_required,
-                    sync_column=partition_data.sync_column
-                )
-                self.repository.save(partition)
+            desired.setdefault(partition_data.name, partition_data)
+
+        rows = [
+            {"table_id": table_id, **partition_data.model_dump(), "date_deleted": None, "deleted_by": None}
+            for name, partition_data in desired.items()
+            if self._changed(existing_partitions.get(name), partition_data)
+        ]
+        removed = [
+            p.id for name, p in existing_partitions.items()
+            if name not in desired and p.date_deleted is None
+        ]
+        self.repository.upsert(rows, ["table_id", "name"], [*PARTITION_FIELDS, "date_deleted", "deleted_by"])
+        self.repository.bulk_soft_delete(removed)
+        self.logger.debug("[%s] Partitions of table [%s]: %s upserted, %s removed", self.__class__.__name__, table_id, len(rows), len(removed))
+
+    @staticmethod
+    def _changed(partition: Optional[Partitions], partition_data: PartitionDTO) -> bool:
+        return (
+            partition is None
+            or partition.date_deleted is not None
+            or any(getattr(partition, field) != getattr(partition_data, field) for field in PARTITION_FIELDS)
+        )
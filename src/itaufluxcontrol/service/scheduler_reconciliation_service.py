@@ -0,0 +1,178 @@
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import Any, Dict, Optional, Set
+
+from injector import inject
+
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.itaufluxcontrol.service.task_schedule_service import TaskScheduleService
+
+# Formato do `schedule_alias` gerado em `EventBridgeSchedulerService.register_event`
+SCHEDULE_ALIAS_PATTERN = re.compile(r"^\d{14}-\d+$")
+
+
+class SchedulerReconciliationService:
+    """
+    Reconcilia `task_schedule` com o EventBridge Scheduler.
+
+    Pagina os schedules do Scheduler (só os com nome no formato do
+    `schedule_alias`, nos grupos da aplicação) e os agendamentos pendentes do
+    banco, e corrige:
+      - órfãos: schedules sem agendamento pendente (rollback depois do create,
+        agendamentos já executados que nunca tiveram o schedule deletado);
+      - faltantes: agendamentos pendentes sem schedule e sem envio no outbox
+        (os que já dispararam e foram liberados com dependências pendentes
+        não têm schedule de propósito e esperam a próxima postergação);
+      - vencidos: pendentes cujo horário passou há mais de
+        `SCHEDULER_RECONCILE_STALE_SECONDS` — viram `failed`.
+
+    Fora do `dry_run`, também enfileira a limpeza dos schedules de
+    agendamentos finalizados (`purge_finished_schedules`); esses não são
+    removidos de novo como órfãos.
+
+    As correções passam pelo outbox e são limitadas a `limit` por execução;
+    as páginas do `list_schedules` respeitam `SCHEDULER_RECONCILE_RATE_PER_SECOND`.
+    No backend `database` não há schedules no Scheduler e nada é feito.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        boto_service: BotoService,
+        task_schedule_service: TaskScheduleService,
+        event_bridge_scheduler_service: EventBridgeSchedulerService,
+        outbox_service: OutboxService,
+        cloudwatch_service: CloudWatchService,
+    ):
+        self.logger = logger
+        self.scheduler_client = boto_service.get_client('scheduler')
+        self.task_schedule_service = task_schedule_service
+        self.event_bridge_scheduler_service = event_bridge_scheduler_service
+        self.outbox_service = outbox_service
+        self.cloudwatch_service = cloudwatch_service
+        self.batch_size = int(os.getenv("SCHEDULER_RECONCILE_BATCH_SIZE", "50"))
+        self.page_size = int(os.getenv("SCHEDULER_RECONCILE_PAGE_SIZE", "100"))
+        self.rate_per_second = float(os.getenv("SCHEDULER_RECONCILE_RATE_PER_SECOND", "5"))
+        self.stale_seconds = int(os.getenv("SCHEDULER_RECONCILE_STALE_SECONDS", "86400"))
+        self._last_call = 0.0
+
+    @tracer.trace()
+    def reconcile(self, dry_run: bool = True, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compara Scheduler e banco e aplica (ou só reporta, em `dry_run`) as correções.
+
+        :param dry_run: Só calcula o relatório, sem alterar nada.
+        :param limit: Máximo de correções nesta execução (padrão `SCHEDULER_RECONCILE_BATCH_SIZE`).
+        :return: Relatório com os totais encontrados, as ações do lote e o que ficou para a próxima execução;
+                 no backend `database`, só `{"dry_run": ..., "skipped": true}`.
+        """
+        if self.event_bridge_scheduler_service.backend == "database":
+            # Sem schedules no Scheduler, todo pendente pareceria faltante
+            self.logger.info(f"[{self.__class__.__name__}] Reconciliation skipped: scheduler backend is database")
+            return {"dry_run": dry_run, "skipped": True}
+
+        limit = limit or self.batch_size
+        stale_before = datetime.now() - timedelta(seconds=self.stale_seconds)
+
+        scheduler_aliases = self._list_scheduler_aliases()
+        purged = set() if dry_run else set(self.event_bridge_scheduler_service.purge_finished_schedules())
+        active_aliases: Set[str] = set()
+        pending_count = 0
+        stale, candidates = [], []
+        for page in self._pendent_pages():
+            pending_count += len(page)
+            for row in page:
+                if row.scheduled_execution_time and row.scheduled_execution_time < stale_before:
+                    stale.append(row.id)
+                    continue
+                if not row.schedule_alias or row.schedule_deleted_at:
+                    continue
+                active_aliases.add(row.schedule_alias)
+                if row.schedule_alias not in scheduler_aliases:
+                    candidates.append(row.id)
+
+        in_outbox = self.outbox_service.pending_schedule_ids(candidates)
+        missing = [task_schedule_id for task_schedule_id in candidates if task_schedule_id not in in_outbox]
+        orphans = sorted(scheduler_aliases.keys() - active_aliases - purged)
+
+        actions = {"expire": [], "delete": [], "recreate": []}
+        budget = limit
+        for action, items in (("expire", stale), ("delete", orphans), ("recreate", missing)):
+            actions[action] = items[:budget]
+            budget -= len(actions[action])
+
+        report = {
+            "dry_run": dry_run,
+            "scheduler_schedules": len(scheduler_aliases),
+            "pending_schedules": pending_count,
+            "found": {"expire": len(stale), "delete": len(orphans), "recreate": len(missing)},
+            "actions": actions,
+            "remaining": len(stale) + len(orphans) + len(missing) - (limit - budget),
+            "purged": len(purged),
+        }
+
+        if dry_run:
+            self.logger.info(f"[{self.__class__.__name__}] Dry run: {report['found']} ({report['remaining']} beyond limit)")
+            return report
+
+        self._apply(actions, scheduler_aliases)
+        self.cloudwatch_service.add_metric("SchedulerOrphansDeleted", len(actions["delete"]), "Count")
+        self.cloudwatch_service.add_metric("SchedulerSchedulesRecreated", len(actions["recreate"]), "Count")
+        self.cloudwatch_service.add_metric("SchedulerSchedulesExpired", len(actions["expire"]), "Count")
+        self.logger.info(f"[{self.__class__.__name__}] Reconciliation applied: {report['found']} ({report['remaining']} remaining)")
+        return report
+
+    def _apply(self, actions: Dict[str, list], scheduler_aliases: Dict[str, str]):
+        self.task_schedule_service.expire(actions["expire"], "Expired by scheduler reconciliation.")
+        for schedule_alias in actions["delete"]:
+            self.event_bridge_scheduler_service.delete_orphan_event(schedule_alias, scheduler_aliases[schedule_alias])
+        for task_schedule_id in actions["recreate"]:
+            task_schedule = self.task_schedule_service.find(task_schedule_id)
+            if task_schedule:
+                self.event_bridge_scheduler_service.recreate_event(task_schedule)
+
+    def _list_scheduler_aliases(self) -> Dict[str, str]:
+        """
+        Schedules da aplicação no Scheduler, como `{schedule_alias: grupo}`.
+        """
+        aliases = {}
+        next_token = None
+        while True:
+            self._throttle()
+            params = {"MaxResults": self.page_size}
+            if next_token:
+                params["NextToken"] = next_token
+            response = self.scheduler_client.list_schedules(**params)
+            aliases.update(
+                (schedule["Name"], schedule.get("GroupName", "default")) for schedule in response.get("Schedules", [])
+                if SCHEDULE_ALIAS_PATTERN.match(schedule.get("Name", ""))
+                and self.event_bridge_scheduler_service.in_scope(schedule.get("GroupName"))
+            )
+            next_token = response.get("NextToken")
+            if not next_token:
+                return aliases
+
+    def _pendent_pages(self):
+        after_id = 0
+        while True:
+            page = self.task_schedule_service.get_pendent_page(after_id, self.page_size)
+            if not page:
+                return
+            yield page
+            after_id = page[-1].id
+
+    def _throttle(self):
+        if self.rate_per_second <= 0:
+            return
+        wait = self._last_call + 1 / self.rate_per_second - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_call = time.monotonic()
@@ -0,0 +1,164 @@
+import json
+from logging import Logger
+from typing import Any, Dict, List, Tuple
+
+from injector import inject
+
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.models.dto.table_partition_exec_dto import TablePartitionExecDTO
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.table_partition_exec_service import TablePartitionExecService
+from src.itaufluxcontrol.service.task_service import TaskService
+
+SQS_EVENT_SOURCE = "aws:sqs"
+
+
+class SqsBatchService:
+    """
+    Processa lotes de mensagens SQS (`Records`) com payloads de `/register_execution`
+    e `/trigger` — no mesmo formato do evento do API Gateway/EventBridge Scheduler:
+
+        {"path": "/register_execution", "body": {"data": [...], "user": "..."}}
+
+    Todas as mensagens compartilham a sessão da invocação, cada uma dentro de
+    um savepoint. O acionamento das dependentes é adiado para o fim do lote e
+    feito uma vez por tabela/conjunto de partições, só para as mensagens
+    cujo savepoint foi confirmado; se o acionamento falha, as mensagens que o
+    originaram também voltam para a fila. Retorna os `messageId` que
+    falharam, para o `batchItemFailures`.
+
+    Um lote com mensagens de vários tenants (campo `tenant_id` do body) é
+    separado com `group_by_tenant` e cada grupo é processado no seu tenant.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        session_provider: SessionProvider,
+        table_partition_exec_service: TablePartitionExecService,
+        task_service: TaskService,
+        cloudwatch_service: CloudWatchService,
+    ):
+        self.logger = logger
+        self.session_provider = session_provider
+        self.table_partition_exec_service = table_partition_exec_service
+        self.task_service = task_service
+        self.cloudwatch_service = cloudwatch_service
+
+    @staticmethod
+    def is_sqs_batch(event: Dict[str, Any]) -> bool:
+        records = event.get("Records") if isinstance(event, dict) else None
+        return bool(records) and all(record.get("eventSource") == SQS_EVENT_SOURCE for record in records)
+
+    @classmethod
+    def group_by_tenant(cls, records: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Separa as mensagens por tenant, na ordem do lote. Mensagens inválidas
+        ficam no tenant padrão, onde falham no processamento.
+        """
+        groups: Dict[int, List[Dict[str, Any]]] = {}
+        for record in records:
+            try:
+                _, body = cls._parse(record)
+                tenant_id = tenant_context.resolve({"body": body})
+            except (KeyError, TypeError, ValueError):
+                tenant_id = tenant_context.default_tenant_id
+            groups.setdefault(tenant_id, []).append(record)
+        return groups
+
+    @tracer.trace()
+    def process_batch(self, records: List[Dict[str, Any]]) -> List[str]:
+        session = self.session_provider.get_session()
+        failures: List[str] = []
+        pending_triggers: Dict[Tuple, Tuple[int, int, List[str]]] = {}
+        processed_schedules = set()
+
+        for record in records:
+            message_id = record["messageId"]
+            try:
+                path, body = self._parse(record)
+                tenant_id = tenant_context.resolve({"body": body})
+                if tenant_id != tenant_context.tenant_id:
+                    raise ValueError(f"Message from tenant {tenant_id} processed in tenant {tenant_context.tenant_id}")
+                registered = []
+                with session.begin_nested():
+                    if path == "/register_execution":
+                        registered = self._register(body)
+                    elif path == "/trigger":
+                        self._trigger(body, processed_schedules)
+                    else:
+                        raise ValueError(f"Rota não suportada em lote SQS: {path}")
+                # Só entra no acionamento o que foi gravado (savepoint confirmado)
+                for key, table_id, execution_id in registered:
+                    message_ids = pending_triggers[key][2] if key in pending_triggers else []
+                    message_ids.append(message_id)
+                    pending_triggers[key] = (table_id, execution_id, message_ids)
+            except Exception as e:
+                self.logger.error(f"[{self.__class__.__name__}] Error processing message {message_id}: {e}")
+                failures.append(message_id)
+
+        for (table_id, _), (_, execution_id, message_ids) in pending_triggers.items():
+            try:
+                with session.begin_nested():
+                    # `trigger_tables` não propaga o erro; a falha desfaz o savepoint
+                    if not self.table_partition_exec_service.trigger_tables(table_id, execution_id):
+                        raise RuntimeError(f"Trigger of execution {execution_id} failed")
+            except Exception as e:
+                self.logger.error(f"[{self.__class__.__name__}] Error triggering dependents of table {table_id}: {e}")
+                failures.extend(message_id for message_id in dict.fromkeys(message_ids) if message_id not in failures)
+
+        self.logger.info(
+            f"[{self.__class__.__name__}] Batch processed: {len(records)} messages, "
+            f"{len(pending_triggers)} trigger passes, {len(failures)} failures."
+        )
+        self.cloudwatch_service.add_metric(name="SqsBatchSize", value=len(records), unit="Count")
+        self.cloudwatch_service.add_metric(name="SqsBatchTriggerPasses", value=len(pending_triggers), unit="Count")
+        self.cloudwatch_service.add_metric(name="SqsBatchItemFailures", value=len(failures), unit="Count")
+        return failures
+
+    def _register(self, body: Dict[str, Any]) -> List[Tuple[Tuple, int, int]]:
+        """
+        Registra as execuções da mensagem sem acionar as dependentes.
+
+        :return: Chave (tabela, partições), tabela e execução de cada item, para o acionamento do fim do lote.
+        """
+        data = body.get("data")
+        if not data:
+            raise ValueError("Data is required")
+
+        registered = []
+        for item in data if isinstance(data, list) else [data]:
+            dto = TablePartitionExecDTO(**item, user=body.get("user"))
+            result = self.table_partition_exec_service.register_partitions_exec(dto, trigger=False)
+            key = (result["table_id"], tuple(sorted((str(p.partition_id or p.partition_name), p.value) for p in dto.partitions)))
+            registered.append((key, result["table_id"], result["execution_id"]))
+        return registered
+
+    def _trigger(self, body: Dict[str, Any], processed_schedules: set):
+        for field in ("task_table", "execution", "task_schedule"):
+            if not body.get(field):
+                raise ValueError(f"{field} is required in payload")
+
+        task_schedule_id = body["task_schedule"]["id"]
+        if task_schedule_id in processed_schedules:
+            self.logger.info(f"[{self.__class__.__name__}] Duplicated trigger for task schedule {task_schedule_id} ignored.")
+            return
+        self.task_service.trigger_tables(
+            task_schedule_id=task_schedule_id,
+            task_table_id=body["task_table"]["id"],
+            dependency_execution_id=body["execution"]["id"],
+        )
+        processed_schedules.add(task_schedule_id)
+
+    @staticmethod
+    def _parse(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        message = json.loads(record["body"])
+        body = message.get("body")
+        if isinstance(body, str):
+            body = json.loads(body)
+        if not isinstance(body, dict):
+            raise ValueError("Body is required")
+        return message.get("path"), body
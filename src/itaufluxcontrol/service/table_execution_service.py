@@ -14,7 +14,7 @@ class TableExecutionService:
         self.table_execution_repository = repository
         
     def create_execution(self, table_id: int, source: str):
-        self.logger.debug(f"[{self.__class__.__name__}] Creating execution for table {table_id} with source {source}")
+        self.logger.debug("[%s] Creating execution for table %s with source %s", self.__class__.__name__, table_id, source)
         return self.table_execution_repository.save(
             TableExecution(
                 table_id=table_id,
@@ -23,13 +23,13 @@ class TableExecutionService:
         )
         
     def find(self, id: int) -> TableExecution:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding execution: [{id}]")
+        self.logger.debug("[%s] Finding execution: [%s]", self.__class__.__name__, id)
         return self.table_execution_repository.get_by_id(id)
     
     def get_latest_execution(self, table_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting latest execution for table [{table_id}]")
+        self.logger.debug("[%s] Getting latest execution for table [%s]", self.__class__.__name__, table_id)
         return self.table_execution_repository.get_latest_execution(table_id)
     
     def get_latest_execution_with_restrictions(self, table_id: int, required_partitions: Dict[str, Any]):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting latest execution for table [{table_id}] with restrictions: [{required_partitions}]")
+        self.logger.debug("[%s] Getting latest execution for table [%s] with restrictions: [%s]", self.__class__.__name__, table_id, required_partitions)
         return self.table_execution_repository.get_latest_execution_with_restrictions(table_id, required_partitions)
\ No newline at end of file
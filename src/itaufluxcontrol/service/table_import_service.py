@@ -0,0 +1,233 @@
+import os
+from collections import defaultdict, deque
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List
+
+from injector import inject
+from pydantic import ValidationError
+
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.models.dto.table_dto import TableDTO
+from src.itaufluxcontrol.models.task_table import TaskTable
+from src.itaufluxcontrol.repositories.dependency_repository import DependencyRepository
+from src.itaufluxcontrol.repositories.partition_repository import PartitionRepository
+from src.itaufluxcontrol.repositories.table_repository import TableRepository
+from src.itaufluxcontrol.repositories.task_executor_repository import TaskExecutorRepository
+from src.itaufluxcontrol.repositories.task_table_repository import TaskTableRepository
+
+# Mesmas chaves em todas as linhas: um único INSERT multi-row de tarefas
+DEFAULT_DEBOUNCE_SECONDS = TaskTable.__table__.c.debounce_seconds.default.arg
+
+
+class TableImportService:
+    """
+    Importação em lote de um DAG de tabelas novas (`POST /tables/bulk`).
+
+    O lote inteiro é validado antes de qualquer escrita, contra um único mapa
+    nome -> ID buscado numa consulta (nomes do lote e dependências): nomes
+    repetidos ou já cadastrados, dependências e executores inexistentes e
+    ciclos dentro do lote. Com algum erro nada é gravado e o relatório traz
+    os erros de cada item; sem erros as tabelas entram em ordem topológica
+    e `partitions`, `dependencies` e `task_table` em INSERTs multi-row, tudo
+    na transação da rota.
+    """
+
+    @inject
+    def __init__(
+        self,
+        logger: Logger,
+        table_repository: TableRepository,
+        partition_repository: PartitionRepository,
+        dependency_repository: DependencyRepository,
+        task_table_repository: TaskTableRepository,
+        task_executor_repository: TaskExecutorRepository,
+    ):
+        self.logger = logger
+        self.table_repository = table_repository
+        self.partition_repository = partition_repository
+        self.dependency_repository = dependency_repository
+        self.task_table_repository = task_table_repository
+        self.task_executor_repository = task_executor_repository
+        self.max_items = int(os.getenv("TABLES_BULK_MAX_ITEMS", "1000"))
+
+    @tracer.trace()
+    def import_tables(self, items: List[Dict[str, Any]], user: str) -> Dict[str, Any]:
+        """
+        Valida e importa o lote inteiro (tudo ou nada).
+
+        :param items: Tabelas no formato de `POST /tables`, sem `id`.
+        :param user: Usuário gravado em `created_by`.
+        :return: `imported`, `count` e `items`, um por item na ordem recebida,
+                 com `status` (`created`, `valid` ou `invalid`), `id` quando
+                 criado e `errors` quando inválido.
+        """
+        tables: Dict[int, TableDTO] = {}
+        errors: Dict[int, List[str]] = defaultdict(list)
+        for index, item in enumerate(items):
+            try:
+                tables[index] = TableDTO(**item)
+            except (ValidationError, TypeError) as e:
+                errors[index].extend(
+                    [f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()]
+                    if isinstance(e, ValidationError) else [str(e)]
+                )
+
+        edges = self._validate(tables, errors)
+        order = self._topological_order(tables, edges, errors)
+
+        if errors:
+            self.logger.warning(f"[{self.__class__.__name__}] Bulk import rejected: {len(errors)} of {len(items)} items invalid")
+            return self._report(items, tables, errors, {})
+
+        ids = self._insert(tables, order, edges, user)
+        self.logger.info(f"[{self.__class__.__name__}] Bulk import created {len(ids)} tables")
+        return self._report(items, tables, errors, ids)
+
+    def _validate(self, tables: Dict[int, TableDTO], errors: Dict[int, List[str]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve nomes e IDs contra o banco e o próprio lote.
+
+        :return: Por item, `batch` (índices das dependências do lote),
+                 `existing` (IDs das dependências já cadastradas, com
+                 `is_required`) e `executors` (ID do executor de cada tarefa).
+        """
+        batch_names: Dict[str, int] = {}
+        for index, table in tables.items():
+            if table.name in batch_names:
+                errors[index].append(f"Table name '{table.name}' is not unique.")
+            else:
+                batch_names[table.name] = index
+
+        dependency_names = {d.dependency_name for t in tables.values() for d in t.dependencies if not d.dependency_id and d.dependency_name}
+        dependency_ids = {d.dependency_id for t in tables.values() for d in t.dependencies if d.dependency_id}
+        existing = self.table_repository.get_by_names_or_ids(set(batch_names) | dependency_names, dependency_ids)
+        existing_by_name = {row.name: row for row in existing}
+        active_ids = {row.id for row in existing if row.date_deleted is None}
+
+        aliases = {task.task_executor for t in tables.values() for task in t.tasks if not task.task_executor_id and task.task_executor}
+        executor_ids = {task.task_executor_id for t in tables.values() for task in t.tasks if task.task_executor_id}
+        executors = self.task_executor_repository.get_by_aliases_or_ids(aliases, executor_ids)
+        executors_by_alias = {row.alias: row.id for row in executors}
+        known_executors = {row.id for row in executors}
+
+        edges = {}
+        for index, table in tables.items():
+            table_edges = {"batch": {}, "existing": {}, "executors": []}
+            edges[index] = table_edges
+            if table.id:
+                errors[index].append("ID must not be provided on bulk import.")
+            if table.name in existing_by_name:
+                errors[index].append(f"Table '{table.name}' already exists.")
+
+            for dependency in table.dependencies:
+                if dependency.dependency_id:
+                    if dependency.dependency_id not in active_ids:
+                        errors[index].append(f"Dependency table '{dependency.dependency_id}' not found.")
+                    else:
+                        table_edges["existing"].setdefault(dependency.dependency_id, dependency.is_required)
+                elif not dependency.dependency_name:
+                    errors[index].append("Dependency must have either a 'id' or a 'name'.")
+                elif dependency.dependency_name == table.name:
+                    errors[index].append(f"Table '{table.name}' cannot depend on itself.")
+                elif dependency.dependency_name in batch_names:
+                    table_edges["batch"].setdefault(batch_names[dependency.dependency_name], dependency.is_required)
+                elif dependency.dependency_name in existing_by_name and existing_by_name[dependency.dependency_name].id in active_ids:
+                    table_edges["existing"].setdefault(existing_by_name[dependency.dependency_name].id, dependency.is_required)
+                else:
+                    errors[index].append(f"Dependency table '{dependency.dependency_name}' not found.")
+
+            for task in table.tasks:
+                executor_id = task.task_executor_id if task.task_executor_id in known_executors else executors_by_alias.get(task.task_executor)
+                if task.id:
+                    errors[index].append(f"Task '{task.alias}' must not have an ID on bulk import.")
+                if not executor_id:
+                    errors[index].append(f"Task executor '{task.task_executor_id or task.task_executor}' not found for task '{task.alias}'.")
+                table_edges["executors"].append(executor_id)
+        return edges
+
+    @staticmethod
+    def _topological_order(tables: Dict[int, TableDTO], edges: Dict[int, Dict[str, Any]], errors: Dict[int, List[str]]) -> List[int]:
+        """
+        Kahn sobre as dependências internas do lote; o que sobra está num
+        ciclo ou depende de um. Dependências já cadastradas não fecham ciclo:
+        nenhuma tabela existente depende de uma tabela nova.
+        """
+        in_degree = {index: len(edges[index]["batch"]) for index in tables}
+        dependents = defaultdict(list)
+        for index in tables:
+            for dependency_index in edges[index]["batch"]:
+                dependents[dependency_index].append(index)
+
+        order = []
+        ready = deque(sorted(index for index, degree in in_degree.items() if degree == 0))
+        while ready:
+            index = ready.popleft()
+            order.append(index)
+            for dependent in dependents[index]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        for index, degree in in_degree.items():
+            if degree > 0:
+                errors[index].append(f"Circular dependency detected involving '{tables[index].name}'.")
+        return order
+
+    def _insert(self, tables: Dict[int, TableDTO], order: List[int], edges: Dict[int, Dict[str, Any]], user: str) -> Dict[int, int]:
+        now = datetime.now()
+        self.table_repository.insert_many([
+            {
+                "name": tables[index].name,
+                "description": tables[index].description,
+                "requires_approval": tables[index].requires_approval,
+                "created_by": user,
+                "created_at": now,
+            }
+            for index in order
+        ])
+        index_by_name = {tables[index].name: index for index in order}
+        ids = {index_by_name[row.name]: row.id for row in self.table_repository.get_by_names_or_ids(index_by_name, [])}
+
+        # Tabelas novas ficam depois de todas as existentes, na ordem do lote
+        self.table_repository.set_topo_orders(dict(zip((ids[index] for index in order), sorted(ids.values()))))
+
+        partitions, dependencies, tasks = [], [], []
+        for index in order:
+            table_id, table = ids[index], tables[index]
+            names = set()
+            for partition in table.partitions:
+                if partition.name not in names:
+                    names.add(partition.name)
+                    partitions.append({"table_id": table_id, **partition.model_dump()})
+            for dependency_id, is_required in edges[index]["existing"].items():
+                dependencies.append({"table_id": table_id, "dependency_id": dependency_id, "is_required": is_required})
+            for dependency_index, is_required in edges[index]["batch"].items():
+                dependencies.append({"table_id": table_id, "dependency_id": ids[dependency_index], "is_required": is_required})
+            for task, executor_id in zip(table.tasks, edges[index]["executors"]):
+                tasks.append({
+                    "table_id": table_id,
+                    "task_executor_id": executor_id,
+                    "alias": task.alias,
+                    "params": task.params,
+                    "debounce_seconds": DEFAULT_DEBOUNCE_SECONDS if task.debounce_seconds is None else task.debounce_seconds,
+                })
+
+        self.partition_repository.insert_many(partitions)
+        self.dependency_repository.insert_many(dependencies)
+        self.task_table_repository.insert_many(tasks)
+        return ids
+
+    @staticmethod
+    def _report(items: List[Dict[str, Any]], tables: Dict[int, TableDTO], errors: Dict[int, List[str]], ids: Dict[int, int]) -> Dict[str, Any]:
+        report = []
+        for index, item in enumerate(items):
+            entry = {"index": index, "name": tables[index].name if index in tables else (item.get("name") if isinstance(item, dict) else None)}
+            if index in errors:
+                entry.update(status="invalid", errors=errors[index])
+            elif index in ids:
+                entry.update(status="created", id=ids[index])
+            else:
+                entry["status"] = "valid"
+            report.append(entry)
+        return {"imported": bool(ids), "count": len(ids), "items": report}
@@ -1,10 +1,13 @@
 from logging import Logger
-from typing import List
+from typing import List, Optional
 from injector import inject
 from datetime import datetime
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_PENDENT, STATIC_SCHEDULE_WAITING_APPROVAL
+from src.itaufluxcontrol.config.tracer import tracer
 from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
 from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
 from src.itaufluxcontrol.service.partition_service import PartitionService
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
 from src.itaufluxcontrol.service.table_service import TableService
 from src.itaufluxcontrol.service.table_execution_service import TableExecutionService
 from src.itaufluxcontrol.models.table_execution import TableExecution
@@ -16,7 +19,7 @@ from src.itaufluxcontrol.repositories.table_partition_exec_repository import Tab
 
 class TablePartitionExecService:
     @inject
-    def __init__(self, logger: Logger, repository: TablePartitionExecRepository, table_service: TableService, table_execution_service: TableExecutionService, partition_service: PartitionService, event_bridge_scheduler_service: EventBridgeSchedulerService, cloudwatch_service: CloudWatchService):
+    def __init__(self, logger: Logger, repository: TablePartitionExecRepository, table_service: TableService, table_execution_service: TableExecutionService, partition_service: PartitionService, event_bridge_scheduler_service: EventBridgeSchedulerService, cloudwatch_service: CloudWatchService, table_process_summary_service: TableProcessSummaryService):
         self.logger = logger
         self.repository = repository
         self.table_service = table_service
@@ -24,28 +27,40 @@ class TablePartitionExecService:
         self.partition_service = partition_service
         self.event_bridge_scheduler_service = event_bridge_scheduler_service
         self.cloudwatch_service = cloudwatch_service
+        self.table_process_summary_service = table_process_summary_service
         
     def query(self, **filters):
-        self.logger.debug(f"[{self.__class__.__name__}] Querying table partition exec with filters: [{filters}]")
+        self.logger.debug("[%s] Querying table partition exec with filters: [%s]", self.__class__.__name__, filters)
         return self.repository.query(**filters)
 
     def get_by_execution(self, execution_id: int) -> List[TablePartitionExec]:
         return self.repository.get_by_execution(execution_id)
 
-    def trigger_tables(self, table_id: int):
+    @tracer.trace()
+    def trigger_tables(self, table_id: int, execution_id: Optional[int] = None):
+        """
+        Aciona as tabelas dependentes de `table_id` a partir da última execução
+        da tabela ou, quando informada, da execução `execution_id`.
+
+        :return: `False` se o acionamento falhou (o erro é logado e contado na
+                 métrica `TriggerTablesErrorCount`, não propagado).
+        """
         start_time = datetime.utcnow()
         error_count = 0
 
         try:
             table = self.table_service.find(table_id=table_id)
-            self.logger.debug(f"[{self.__class__.__name__}] Triggering tables for: [{table.name}]")
+            self.logger.debug("[%s] Triggering tables for: [%s]", self.__class__.__name__, table.name)
             tables: List[Tables] = self.table_service.find_by_dependency(table_id)
 
-            last_execution: TableExecution = self.table_execution_service.get_latest_execution(table_id)
-            self.logger.debug(f"[{self.__class__.__name__}] Last execution ID for table [{table.name}]: [{last_execution.id}]")
+            if execution_id:
+                trigger_execution: TableExecution = self.table_execution_service.find(execution_id)
+            else:
+                trigger_execution: TableExecution = self.table_execution_service.get_latest_execution(table_id)
+            self.logger.debug("[%s] Last execution ID for table [%s]: [%s]", self.__class__.__name__, table.name, trigger_execution.id)
             current_partitions = {
                 p.partition.name: p.value
-                for p in self.get_by_execution(last_execution.id)
+                for p in self.get_by_execution(trigger_execution.id)
             }
             
             ready_tables = []
@@ -54,16 +69,19 @@ class TablePartitionExecService:
                 dependencies = [ t.dependency_table for t in table.dependencies if t.is_required ]
                 ready = True
                 for dep in dependencies:
-                    last_execution = self.table_execution_service.get_latest_execution(dep.id)
-                    if not last_execution:
-                        self.logger.debug(f"[{self.__class__.__name__}] No execution found for dependency table [{dep.name}]")    
+                    dependency_execution = self.table_execution_service.get_latest_execution(dep.id)
+                    if not dependency_execution:
+                        self.logger.debug("[%s] No execution found for dependency table [%s]", self.__class__.__name__, dep.name)    
                         ready = False
                         break                    
-                    self.logger.debug(f"[{self.__class__.__name__}] Last execution ID for dependency table [{dep.name}]: [{last_execution.id}]")
+                    self.logger.debug("[%s] Last execution ID for dependency table [%s]: [%s]", self.__class__.__name__, dep.name, dependency_execution.id)
                     
                 if ready:
                     ready_tables.append(table)
 
+            # Executores agendados por execução de disparo, para o resumo do processamento
+            scheduled = {}
+
             for table in ready_tables: 
                 execution: TableExecution = self.table_execution_service.get_latest_execution_with_restrictions(table.id, current_partitions)
 
@@ -76,8 +94,15 @@ class TablePartitionExecService:
                     }
 
                 for task in table.task_table:
-                    self.logger.debug(f"[{self.__class__.__name__}] Registering or postponing event for task [{task.id}] in table [{table.name}]")
-                    self.event_bridge_scheduler_service.register_or_postergate_event(task, last_execution, execution, table_last_execution)
+                    self.logger.debug("[%s] Registering or postponing event for task [%s] in table [%s]", self.__class__.__name__, task.id, table.name)
+                    self.event_bridge_scheduler_service.register_or_postergate_event(task, trigger_execution, execution, table_last_execution)
+                    executors, status = scheduled.get(trigger_execution.id, ([], STATIC_SCHEDULE_PENDENT))
+                    if task.task_executor:
+                        executors.append(task.task_executor.alias)
+                    scheduled[trigger_execution.id] = (executors, STATIC_SCHEDULE_WAITING_APPROVAL if table.requires_approval else status)
+
+            for trigger_execution_id, (executors, status) in scheduled.items():
+                self.table_process_summary_service.set_tasks(trigger_execution_id, executors, status)
 
         except Exception as e:
             self.logger.error(f"[{self.__class__.__name__}] Error triggering tables: {str(e)}")
@@ -88,7 +113,10 @@ class TablePartitionExecService:
             self.cloudwatch_service.add_metric(name="TriggerTablesExecutionTime", value=total_execution_time, unit="Milliseconds")
             self.cloudwatch_service.add_metric(name="TriggerTablesErrorCount", value=error_count, unit="Count")
 
-    def register_partitions_exec(self, dto: TablePartitionExecDTO):
+        return error_count == 0
+
+    @tracer.trace()
+    def register_partitions_exec(self, dto: TablePartitionExecDTO, trigger: bool = True):
         """
         Registra execuções de partições para uma tabela, usando ID ou nome.
         Valida:
@@ -96,12 +124,15 @@ class TablePartitionExecService:
         2. Pode conter qualquer conjunto de partições opcionais.
         3. Todas as partições fornecidas devem estar associadas à tabela.
         4. Atualiza automaticamente a versão mais recente para cada conjunto `table x partition`.
+
+        Com `trigger=False` o acionamento das dependentes fica a cargo do chamador
+        (ex.: lote SQS, que aciona uma vez por tabela/partição).
         """
         start_time = datetime.utcnow()
         error_count = 0
 
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Registering partitions exec for DTO: {dto}")
+            self.logger.debug("[%s] Registering partitions exec for DTO: %s", self.__class__.__name__, dto)
 
             table = None
             if dto.table_id:
@@ -156,22 +187,32 @@ class TablePartitionExecService:
 
             new_execution = self.table_execution_service.create_execution(table.id, dto.source)
 
-            for partition in resolved_partitions:
-                new_entry = TablePartitionExec(
+            # Ninguém usa os IDs das linhas: um INSERT multi-row para todas as partições
+            self.repository.save_all([
+                TablePartitionExec(
                     table_id=table.id,
                     partition_id=partition.partition_id,
                     value=partition.value,
                     execution_date=datetime.utcnow(),
                     execution_id=new_execution.id  
                 )
-                self.repository.save(new_entry)
-
-            self.logger.debug(f"[{self.__class__.__name__}] Triggering dependent tables for execution ID: {new_execution.id}")
-            self.trigger_tables(new_execution.table_id)
+                for partition in resolved_partitions
+            ], fetch_ids=False)
+            self.table_process_summary_service.register_execution(table, new_execution, {
+                partitions[partition.partition_id].name: partition.value for partition in resolved_partitions
+            })
+
+            if trigger:
+                self.logger.debug("[%s] Triggering dependent tables for execution ID: %s", self.__class__.__name__, new_execution.id)
+                self.trigger_tables(new_execution.table_id)
             
             if dto.task_schedule_id:
                 self.event_bridge_scheduler_service.finish_with_success(dto.task_schedule_id, new_execution)
-            return {"message": "Table partition execution entries registered successfully."}
+            return {
+                "message": "Table partition execution entries registered successfully.",
+                "table_id": table.id,
+                "execution_id": new_execution.id,
+            }
         
         except TableInsertError as e:
             self.logger.error(f"[{self.__class__.__name__}] Table insertion error: {str(e)}")
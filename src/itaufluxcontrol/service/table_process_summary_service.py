@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, List, Optional
+
+from injector import inject
+
+from src.itaufluxcontrol.models.table_execution import TableExecution
+from src.itaufluxcontrol.models.table_process_summary import TableProcessSummary
+from src.itaufluxcontrol.models.tables import Tables
+from src.itaufluxcontrol.repositories.table_process_summary_repository import TableProcessSummaryRepository
+
+
+class TableProcessSummaryService:
+    """
+    Mantém o resumo do processamento (uma linha por tabela x conjunto de
+    partições), que substitui a `table_process_view`. Em vez de agregar todo
+    o histórico a cada leitura, cada evento grava só a sua parte:
+
+    - registro de execução: upsert da linha com a nova execução;
+    - acionamento das dependentes: executores agendados e status;
+    - fim do agendamento (sucesso ou erro): status;
+    - aprovação ou rejeição: aprovador.
+    """
+
+    @inject
+    def __init__(self, logger: Logger, repository: TableProcessSummaryRepository):
+        self.logger = logger
+        self.repository = repository
+
+    @staticmethod
+    def partition_set(partitions: Dict[str, Any]) -> str:
+        """
+        Conjunto de partições no formato da view (`nome=valor, nome=valor`),
+        ordenado pelo nome para que o mesmo conjunto gere sempre a mesma chave.
+        """
+        return ", ".join(f"{name}={value}" for name, value in sorted(partitions.items()))
+
+    def register_execution(self, table: Tables, execution: TableExecution, partitions: Dict[str, Any]):
+        """
+        Grava a execução como a última do conjunto de partições, em um único
+        upsert; executores, aprovador e status recomeçam com a nova execução.
+        """
+        partition_set = self.partition_set(partitions)
+        self.logger.debug("[%s] Registering execution %s of table %s [%s]", self.__class__.__name__, execution.id, table.id, partition_set)
+        row = {
+            "table_id": table.id,
+            "partition_key": hashlib.sha1(partition_set.encode("utf-8")).hexdigest(),
+            "partition_set": partition_set,
+            "table_name": table.name,
+            "table_description": table.description,
+            "execution_id": execution.id,
+            "execution_time": execution.date_time,
+            "approver_name": None,
+            "task_executors": None,
+            "status": None,
+            "last_updated": datetime.utcnow(),
+        }
+        self.repository.upsert([row], ["table_id", "partition_key"], [key for key in row if key not in ("table_id", "partition_key")])
+
+    def set_tasks(self, execution_id: int, task_executors: List[str], status: str):
+        """
+        Grava, em um único UPDATE, os executores das tarefas agendadas a partir
+        da execução (sem repetir, na ordem do disparo) e o status.
+        """
+        self.logger.debug("[%s] Setting %s task executor(s) (%s) for execution %s", self.__class__.__name__, len(task_executors), status, execution_id)
+        self.repository.set_tasks(execution_id, ", ".join(dict.fromkeys(task_executors)) or None, status, datetime.utcnow())
+
+    def set_status(self, task_schedule_id: int, status: str):
+        self.logger.debug("[%s] Setting status %s from task schedule %s", self.__class__.__name__, status, task_schedule_id)
+        self.repository.set_status_by_schedule(task_schedule_id, status, datetime.utcnow())
+
+    def set_approver(self, approval_status_ids: List[int], approver_name: str):
+        self.logger.debug("[%s] Setting approver %s for %s approval(s)", self.__class__.__name__, approver_name, len(approval_status_ids))
+        self.repository.set_approver(approval_status_ids, approver_name, datetime.utcnow())
+
+    def get_page(self, after_id: int, limit: int, table_id: Optional[int] = None, table_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Página do resumo, com as colunas da antiga `table_process_view`.
+
+        :return: `items` e `next_after_id` (None na última página).
+        """
+        rows: List[TableProcessSummary] = self.repository.get_page(after_id, limit, table_id, table_name)
+        items = [
+            {
+                "id": row.id,
+                "table_id": row.table_id,
+                "table_name": row.table_name,
+                "table_description": row.table_description,
+                "partition_set": row.partition_set,
+                "execution_id": row.execution_id,
+                "execution_time": row.execution_time.isoformat() if row.execution_time else None,
+                "approver_name": row.approver_name,
+                "task_executors": row.task_executors,
+                "status": row.status,
+                "last_updated": row.last_updated.isoformat() if row.last_updated else None,
+            }
+            for row in rows
+        ]
+        return {"items": items, "next_after_id": rows[-1].id if len(rows) == limit else None}
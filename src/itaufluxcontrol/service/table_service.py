@@ -34,11 +34,11 @@ class TableService:
         self.task_table_service = task_table_service
         
     def query(self, **filters):
-        self.logger.debug(f"[{self.__class__.__name__}] Querying tables with filters: [{filters}]")
+        self.logger.debug("[%s] Querying tables with filters: [%s]", self.__class__.__name__, filters)
         return self.table_repository.query(**filters)
         
     def find(self, table_id: Optional[str] = None, table_name: Optional[str] = None):
-        self.logger.debug(f"[{self.__class__.__name__}] Finding table: [{table_id}] [{table_name}]")
+        self.logger.debug("[%s] Finding table: [%s] [%s]", self.__class__.__name__, table_id, table_name)
         if table_id:
             table = self.table_repository.get_by_id(table_id)
             if not table:
@@ -53,7 +53,7 @@ class TableService:
             raise RuntimeError("Table id or name is required.")
 
     def save_table(self, table_dto: TableDTO, user: str):
-        self.logger.debug(f"[{self.__class__.__name__}] Saving table: [{table_dto}]")
+        self.logger.debug("[%s] Saving table: [%s]", self.__class__.__name__, table_dto)
         if not table_dto:
             raise TableInsertError("Table data is required.")
 
@@ -78,28 +78,39 @@ class TableService:
         self.table_repository.save(table)            
         self.table_repository.session.flush()  
 
-        self.logger.debug(f"[{self.__class__.__name__}] Table ID after flush: {table.id}")
+        self.logger.debug("[%s] Table ID after flush: %s", self.__class__.__name__, table.id)
 
-        self.partition_service.save_partitions(table.id, table_dto.partitions)
-        self.dependency_service.save_dependencies(table.id, table_dto.dependencies)
+        if table.topo_order is None:
+            # Tabela nova: o próprio ID a coloca depois de todas as existentes.
+            # O flush grava a posição antes de `save_dependencies` lê-la do banco
+            table.topo_order = table.id
+            self.table_repository.session.flush()
+
+        # Partições e dependências são sincronizadas com a lista enviada; numa
+        # atualização, uma lista omitida do payload fica como está
+        if not table_dto.id or "partitions" in table_dto.model_fields_set:
+            self.partition_service.save_partitions(table.id, table_dto.partitions)
+        if not table_dto.id or "dependencies" in table_dto.model_fields_set:
+            self.dependency_service.save_dependencies(table.id, table_dto.dependencies)
         
-        for task_dto in table_dto.tasks:
-           self.task_table_service.save(task_dto, table.id)
+        with self.table_repository.batch():
+            for task_dto in table_dto.tasks:
+                self.task_table_service.save(task_dto, table.id)
 
         return f"Table '{table.name}' saved successfully."
 
     
     def get_latest(self, table_id: Optional[str] = None, table_name: Optional[str] = None):
-        self.logger.debug(f"[{self.__class__.__name__}] Getting latest execution for table: [{table_id}] [{table_name}]")
+        self.logger.debug("[%s] Getting latest execution for table: [%s] [%s]", self.__class__.__name__, table_id, table_name)
         table: Tables = self.find(table_id, table_name)
         
         return self.table_execution_service.get_latest_execution(table.id)
         
     def find_by_dependency(self, table_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Finding tables by dependency: [{table_id}]")
+        self.logger.debug("[%s] Finding tables by dependency: [%s]", self.__class__.__name__, table_id)
         return self.table_repository.get_by_dependecy(table_id)
     
     def delete(self, table_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Deleting table: [{table_id}]")
+        self.logger.debug("[%s] Deleting table: [%s]", self.__class__.__name__, table_id)
         self.table_repository.soft_delete(table_id)
         return f"Table ['{table_id}'] deleted successfully."
\ No newline at end of file
@@ -14,11 +14,11 @@ class TaskExecutorService:
         self.repository = repository
         
     def query(self, **filters):
-        self.logger.debug(f"[{self.__class__.__name__}] Querying task executor with filters: [{filters}]")
+        self.logger.debug("[%s] Querying task executor with filters: [%s]", self.__class__.__name__, filters)
         return self.repository.query(**filters)
 
     def find(self, task_executor_id: Optional[int] = None, alias: Optional[str] = None):
-        self.logger.debug(f"[{self.__class__.__name__}] Finding task executor: [{task_executor_id}] [{alias}]")
+        self.logger.debug("[%s] Finding task executor: [%s] [%s]", self.__class__.__name__, task_executor_id, alias)
         if task_executor_id:
             task_executor = self.repository.get_by_id(task_executor_id)
             if not task_executor:
@@ -33,9 +33,9 @@ class TaskExecutorService:
             raise Exception("Task executor id or alias is required.")
         
     def save(self, task_executor_dto: TaskExecutorDTO):
-        self.logger.debug(f"[{self.__class__.__name__}] Saving task executor: [{task_executor_dto}]")
+        self.logger.debug("[%s] Saving task executor: [%s]", self.__class__.__name__, task_executor_dto)
         return self.repository.save(TaskExecutor(**task_executor_dto.model_dump()))
     
     def delete(self, task_executor_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Deleting task executor: [{task_executor_id}]")
+        self.logger.debug("[%s] Deleting task executor: [%s]", self.__class__.__name__, task_executor_id)
         return self.repository.soft_delete(task_executor_id)
\ No newline at end of file
@@ -1,5 +1,7 @@
+import os
+from datetime import datetime, timedelta
 from logging import Logger
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from injector import inject
 
@@ -12,6 +14,7 @@ class TaskScheduleService:
     def __init__(self, logger: Logger, repository: TaskScheduleRepository):
         self.logger = logger
         self.repository = repository
+        self.claim_lease_seconds = int(os.getenv("TASK_SCHEDULE_CLAIM_LEASE_SECONDS", "300"))
         
     def get_pendent_schedules(self):
         return self.repository.get_pendent_schedules()
@@ -22,9 +25,32 @@ class TaskScheduleService:
     def save(self, task_schedule: Dict[str, Any]):
         task_schedule: TaskSchedule = TaskSchedule(**task_schedule)
         return self.repository.save(task_schedule)
-    
+
+    def update(self, task_schedule_id: int, expected_status: Optional[Union[str, List[str]]] = None, **fields) -> bool:
+        """
+        Grava só os campos informados do agendamento, em um único UPDATE.
+
+        :param task_schedule_id: ID do agendamento.
+        :param expected_status: Status em que o agendamento precisa estar para ser atualizado.
+        :return: True se o agendamento foi atualizado.
+        """
+        self.logger.debug("[%s] Updating task schedule [%s]: %s", self.__class__.__name__, task_schedule_id, fields)
+        return self.repository.patch(task_schedule_id, expected_status, **fields)
+
+    def set_pending(self, task_schedules: List[TaskSchedule]) -> int:
+        """
+        Libera em lote agendamentos aprovados: `pending`, com disparo depois
+        do debounce da tarefa de cada um, em um único UPDATE.
+        """
+        now = datetime.now()
+        due_times = {
+            task_schedule.id: now + timedelta(seconds=task_schedule.task_table.debounce_seconds)
+            for task_schedule in task_schedules
+        }
+        return self.repository.set_pending(task_schedules, due_times)
+
     def find(self, id: int) -> TaskSchedule:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding task schedule: [{id}]")
+        self.logger.debug("[%s] Finding task schedule: [%s]", self.__class__.__name__, id)
         return self.repository.get_by_id(id)
         
     def query(self, **filters) -> List[TaskSchedule]:
@@ -34,9 +60,59 @@ class TaskScheduleService:
         :param filters: Filtros passados como argumentos nomeados (key=value).
         :return: Lista de objetos TaskSchedule que atendem aos filtros.
         """
-        self.logger.debug(f"[{self.__class__.__name__}] Querying task schedule with filters: {filters}")
+        self.logger.debug("[%s] Querying task schedule with filters: %s", self.__class__.__name__, filters)
         return self.repository.query(**filters)
 
+    def claim(self, task_schedule_id: int) -> Optional[TaskSchedule]:
+        """
+        Reivindica atomicamente um agendamento pendente antes do processamento.
+
+        :param task_schedule_id: ID do agendamento.
+        :return: O agendamento reivindicado, ou None se outra entrega já o
+                 reivindicou (dentro do lease) ou ele não está mais pendente.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.claim_lease_seconds)
+        if not self.repository.claim(task_schedule_id, now, stale_before):
+            return None
+        return self.repository.get_by_id(task_schedule_id)
+
+    def get_pendent_page(self, after_id: int, limit: int) -> List:
+        return self.repository.get_pendent_page(after_id, limit)
+
+    def expire(self, task_schedule_ids: List[int], error_message: str) -> int:
+        return self.repository.expire(task_schedule_ids, error_message)
+
+    def get_due(self, limit: int) -> List:
+        # `scheduled_execution_time` é gravado em horário local; `claimed_at`, em UTC
+        stale_before = datetime.utcnow() - timedelta(seconds=self.claim_lease_seconds)
+        return self.repository.get_due(datetime.now(), stale_before, limit)
+
+    def park(self, task_schedule_ids: List[int]) -> int:
+        return self.repository.park(task_schedule_ids)
+
+    def retry_later(self, task_schedule_id: int, attempts: int, delay_seconds: int) -> int:
+        return self.repository.retry_later(task_schedule_id, attempts, datetime.now() + timedelta(seconds=delay_seconds))
+
+    def get_finished_with_schedule(self, limit: int) -> List:
+        return self.repository.get_finished_with_schedule(limit)
+
+    def mark_schedule_deleted(self, task_schedule_ids: List[int]) -> int:
+        return self.repository.mark_schedule_deleted(task_schedule_ids, datetime.utcnow())
+
+    def get_latency_rows(self, start: datetime, end: datetime, table_id: Optional[int] = None) -> List:
+        return self.repository.get_latency_rows(start, end, table_id)
+
+    def get_lineage(self, execution_id: int, downstream: bool, max_depth: int) -> List:
+        return self.repository.get_lineage(execution_id, downstream, max_depth)
+
+    def release(self, task_schedule_id: int):
+        """
+        Libera o claim de um agendamento que continua pendente, para que o
+        próximo disparo possa processá-lo.
+        """
+        self.repository.release(task_schedule_id)
+
     def delete(self, task_schedule_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Deleting task schedule: [{task_schedule_id}]")
+        self.logger.debug("[%s] Deleting task schedule: [%s]", self.__class__.__name__, task_schedule_id)
         return self.repository.soft_delete(task_schedule_id)
\ No newline at end of file
@@ -2,7 +2,8 @@ from datetime import datetime
 from injector import inject
 from jinja2 import Template
 import requests
-from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_IN_PROGRESS, STATIC_SCHEDULE_PENDENT
+from src.itaufluxcontrol.config.tracer import tracer
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_IN_PROGRESS
 from src.itaufluxcontrol.models.dto.trigger_process_dto import TriggerProcess
 from src.itaufluxcontrol.models.task_schedule import TaskSchedule
 from src.itaufluxcontrol.service.event_bridge_scheduler_service import EventBridgeSchedulerService
@@ -11,6 +12,7 @@ from src.itaufluxcontrol.service.boto_service import BotoService
 from src.itaufluxcontrol.models.table_execution import TableExecution
 from src.itaufluxcontrol.service.task_table_service import TaskTableService
 from src.itaufluxcontrol.service.cloud_watch_service import CloudWatchService
+from src.itaufluxcontrol.service.outbox_service import OutboxService
 from src.itaufluxcontrol.service.table_service import TableService
 from src.itaufluxcontrol.service.table_execution_service import TableExecutionService
 from src.itaufluxcontrol.service.table_partition_exec_service import TablePartitionExecService
@@ -38,7 +40,8 @@ class TaskService:
             task_table_service: TaskTableService, 
             boto_service: BotoService,
             task_schedule_service: TaskScheduleService,
-            event_bridge_scheduler_service: EventBridgeSchedulerService
+            event_bridge_scheduler_service: EventBridgeSchedulerService,
+            outbox_service: OutboxService
         ):
         self.logger = logger
         self.table_execution_service = table_execution_service
@@ -49,7 +52,9 @@ class TaskService:
         self.boto_service = boto_service
         self.task_schedule_service = task_schedule_service
         self.event_bridge_scheduler_service = event_bridge_scheduler_service
+        self.outbox_service = outbox_service
         
+    @tracer.trace()
     def run(self, trigger_process: TriggerProcess):
         """
         Aciona a execução de tabelas com base nas dependências e nas partições fornecidas.
@@ -83,26 +88,26 @@ class TaskService:
             self.cloudwatch_service.add_metric("TriggerTablesErrorCount", 1, "Count")
             raise
 
+    @tracer.trace()
     def trigger_tables(self, task_schedule_id: int, task_table_id: int, dependency_execution_id: int):
         """
         Aciona a execução de tabelas com base nas dependências e nas partições fornecidas.
 
+        O agendamento é reivindicado antes de resolver as dependências; entregas
+        concorrentes do mesmo agendamento saem após o UPDATE do claim.
+
+        :param task_schedule_id: ID do agendamento disparado.
         :param task_table_id: ID da tabela da tarefa a ser executada.
         :param dependency_execution_id: ID da execução da dependência.
         """
         try:
-            task_schedule_list = self.task_schedule_service.query(
-                id=task_schedule_id,
-                status=STATIC_SCHEDULE_PENDENT
-            )
-            
-            task_schedule = task_schedule_list[0] if task_schedule_list else None
-            
+            task_schedule = self.task_schedule_service.claim(task_schedule_id)
+
             if not task_schedule:
                 self.logger.warning(f"[{self.__class__.__name__}] Task Schedule não encontrado ou já processado.")
                 return
             
-            self.logger.debug(f"[{self.__class__.__name__}] Task Schedule encontrado: {task_schedule}")
+            self.logger.debug("[%s] Task Schedule encontrado: %s", self.__class__.__name__, task_schedule)
             
             task_table = self.task_table_service.find(task_id=task_table_id)
             table = task_table.table
@@ -113,11 +118,12 @@ class TaskService:
                 for p in self.table_partition_exec_service.get_by_execution(dependency_execution.id)
             }
             
-            self.logger.debug(f"[{self.__class__.__name__}][{table.name}] Partições atuais: {current_partitions}")
+            self.logger.debug("[%s][%s] Partições atuais: %s", self.__class__.__name__, table.name, current_partitions)
             dependencies_partitions = self._resolve_dependencies(table, current_partitions)
             
             if dependencies_partitions is None:
                 self.logger.warning(f"[{self.__class__.__name__}][{table.name}] Dependências não resolvidas. Execução cancelada.")
+                self.task_schedule_service.release(task_schedule.id)
                 return
 
             self.process(task_schedule, task_table, dependency_execution, dependencies_partitions)
@@ -148,20 +154,28 @@ class TaskService:
 
         return dependencies_partitions
 
+    @tracer.trace()
     def process(self, task_schedule: TaskSchedule, task_table: TaskTable, execution: TableExecution, dependencies_partitions: Dict[str, Any], params: Optional[dict] = None):
         """
         Processa a execução da tarefa da tabela.
 
+        O disparo não é feito aqui: o payload interpolado vai para o outbox na
+        mesma transação e é enviado pelo `OutboxDispatcher` após o commit.
+
         :param task_schedule: Instância de TaskSchedule.
         :param task_table: Instância de TaskTable.
         :param execution: Instância de TableExecution associada.
         :param dependencies_partitions: Dicionário com as partições resolvidas das dependências.
         """
-        self.logger.debug(f"[{self.__class__.__name__}][{task_table.table.name}] Iniciando processamento.")
+        self.logger.debug("[%s][%s] Iniciando processamento.", self.__class__.__name__, task_table.table.name)
         try:
             task: TaskExecutor = task_table.task_executor
-                
-            self.logger.debug(f"[{self.__class__.__name__}][{task_table.table.name}] Parâmetros da tarefa: {task_table.params}({type(task_table.params)})")
+
+            if task.method not in self.method_map():
+                self.logger.error(f"[{self.__class__.__name__}][{task_table.table.name}] Método de processamento desconhecido: {task.method}")
+                raise ValueError(f"Método de processamento não suportado: {task.method}")
+
+            self.logger.debug("[%s][%s] Parâmetros da tarefa: %s(%s)", self.__class__.__name__, task_table.table.name, task_table.params, type(task_table.params))
 
             payload = self._interpolate_payload(
                 params if params else task_table.params,
@@ -172,36 +186,69 @@ class TaskService:
                 task_table=task_table
             )
 
-            method_map = {
-                "stepfunction_process": self.stepfunction_process,
-                "sqs_process": self.sqs_process,
-                "glue_process": self.glue_process,
-                "lambda_process": self.lambda_process,
-                "eventbridge_process": self.eventbridge_process,
-                "api_process": self.api_process
-            }
-
-            if task.method in method_map:
-                response = method_map[task.method](task_table, execution, payload, task, task_schedule)
-                self.cloudwatch_service.add_metric(f"{task.method.capitalize()}Count", 1, "Count")
-
-                if response:
-                    self.logger.info(f"[{self.__class__.__name__}][{task_table.table.name}] Processamento iniciado: {response}")
-
-                    self.task_schedule_service.save({
-                        "id": task_schedule.id,
-                        "unique_alias": task_schedule.unique_alias,
-                        "status": STATIC_SCHEDULE_IN_PROGRESS,
-                        "execution_arn": response.get("identification", None),
-                    })
-            else:
-                self.logger.error(f"[{self.__class__.__name__}][{task_table.table.name}] Método de processamento desconhecido: {task.method}")
-                raise ValueError(f"Método de processamento não suportado: {task.method}")
+            self.outbox_service.enqueue("task.dispatch", {
+                "task_schedule_id": task_schedule.id,
+                "task_table_id": task_table.id,
+                "execution_id": execution.id,
+                "payload": payload,
+            }, aggregate_id=task_schedule.id)
 
+            self.task_schedule_service.update(task_schedule.id, status=STATIC_SCHEDULE_IN_PROGRESS)
         except Exception as e:
             self.logger.exception(f"[{self.__class__.__name__}][{task_table.table.name}] Erro no processamento: {str(e)}")
             self.cloudwatch_service.add_metric("ProcessingErrors", 1, "Count")
             raise
+
+    @tracer.trace()
+    def dispatch(self, message_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Envia uma tarefa enfileirada no outbox por `process`.
+
+        :param message_payload: Payload da mensagem (`task_schedule_id`, `task_table_id`, `execution_id`, `payload`).
+        """
+        task_schedule = self.task_schedule_service.find(message_payload["task_schedule_id"])
+        task_table = self.task_table_service.find(task_id=message_payload["task_table_id"])
+        execution = self.table_execution_service.find(id=message_payload["execution_id"])
+        return self.execute(task_schedule, task_table, execution, message_payload["payload"])
+
+    def dispatch_failed(self, message_payload: Dict[str, Any], error: str):
+        """
+        Finaliza com erro o agendamento de uma tarefa cujo envio esgotou as
+        tentativas do outbox.
+        """
+        self.logger.error(f"[{self.__class__.__name__}] Task dispatch for schedule {message_payload['task_schedule_id']} failed: {error}")
+        self.event_bridge_scheduler_service.finish_with_error(message_payload["task_schedule_id"], f"Task dispatch failed: {error}"[:350])
+
+    def execute(self, task_schedule: TaskSchedule, task_table: TaskTable, execution: TableExecution, payload: dict) -> Dict[str, Any]:
+        """
+        Dispara a tarefa no executor configurado e grava o identificador da execução.
+        Uma resposta com erro levanta exceção para que o outbox tente novamente.
+        """
+        task: TaskExecutor = task_table.task_executor
+        response = self.method_map()[task.method](task_table, execution, payload, task, task_schedule)
+        self.cloudwatch_service.add_metric(f"{task.method.capitalize()}Count", 1, "Count")
+
+        if response and response.get("status_code", 200) >= 400:
+            self.cloudwatch_service.add_metric("ProcessingErrors", 1, "Count")
+            raise RuntimeError(f"Falha ao disparar {task.method} para {task_table.table.name}: {response.get('error')}")
+
+        if response:
+            self.logger.info(f"[{self.__class__.__name__}][{task_table.table.name}] Processamento iniciado: {response}")
+
+            # Só o identificador: o status já foi gravado em `process` e pode ter
+            # avançado se a tarefa terminou antes desta resposta
+            self.task_schedule_service.update(task_schedule.id, execution_arn=response.get("identification", None))
+        return response
+
+    def method_map(self) -> Dict[str, Any]:
+        return {
+            "stepfunction_process": self.stepfunction_process,
+            "sqs_process": self.sqs_process,
+            "glue_process": self.glue_process,
+            "lambda_process": self.lambda_process,
+            "eventbridge_process": self.eventbridge_process,
+            "api_process": self.api_process
+        }
         
     def _sanitize_partitions(self, partitions):
         chaves_particoes = [
@@ -225,6 +272,7 @@ class TaskService:
                     break         
         return partitions
 
+    @tracer.trace()
     def _interpolate_payload(self, payload: Optional[dict], **kwargs) -> dict:
         """
         Interpola o payload JSON fornecido usando o Jinja2.
@@ -256,7 +304,7 @@ class TaskService:
         :return: Dicionário com status_code, identification e outros dados relevantes.
         """
         try:
-            self.logger.debug(f"[{self.__class__.__name__}] Invoking Step Function [{task_executor.identification}] for execution: [{execution.id}]")
+            self.logger.debug("[%s] Invoking Step Function [%s] for execution: [%s]", self.__class__.__name__, task_executor.identification, execution.id)
             
             client = self.boto_service.get_client('stepfunctions')
 
@@ -18,11 +18,11 @@ class TaskTableService:
         self.task_executor_service = task_executor_service
         
     def query(self, **filters):
-        self.logger.debug(f"[{self.__class__.__name__}] Querying task table with filters: [{filters}]")
+        self.logger.debug("[%s] Querying task table with filters: [%s]", self.__class__.__name__, filters)
         return self.repository.query(**filters)
         
     def find(self, task_id: Optional[int] = None, task_name: Optional[str] = None) -> TaskTable:
-        self.logger.debug(f"[{self.__class__.__name__}] Finding task table by id: {task_id} or name: {task_name}")
+        self.logger.debug("[%s] Finding task table by id: %s or name: %s", self.__class__.__name__, task_id, task_name)
         res = None
         if task_id:
             res = self.repository.get_by_id(task_id)
@@ -35,7 +35,7 @@ class TaskTableService:
         return res
     
     def save(self, dto: TaskDTO, table_id: Optional[int] = None) -> TaskTable:
-        self.logger.debug(f"[{self.__class__.__name__}] Saving task table: [{dto}]")
+        self.logger.debug("[%s] Saving task table: [%s]", self.__class__.__name__, dto)
         
         task_table: TaskTable = None
         if dto.id:
@@ -59,5 +59,5 @@ class TaskTableService:
         return self.repository.save(task_table)
     
     def delete(self, task_id: int):
-        self.logger.debug(f"[{self.__class__.__name__}] Deleting task table: [{task_id}]")
+        self.logger.debug("[%s] Deleting task table: [%s]", self.__class__.__name__, task_id)
         return self.repository.soft_delete(task_id)
\ No newline at end of file
@@ -8,7 +8,7 @@ setup(
     author='Leonardo Rodrigues',
     author_email='leonardo.a.rodrigues@itau-unibanco.com.br',
     url='',  
-    packages=find_packages(where=".", exclude=("tests*", "docs*")),
+    packages=find_packages(where=".", exclude=("tests*", "docs*", "benchmarks*")),
     include_package_data=True,
     install_requires=[
         "alembic==1.14.0",
@@ -31,6 +31,7 @@ setup(
         "Mako==1.3.6",
         "MarkupSafe==3.0.2",
         "mysql-connector-python==9.1.0",
+        "numpy==2.1.3",
         "packaging==24.2",
         "pycparser==2.22",
         "pydantic==2.9.2",
@@ -0,0 +1,88 @@
+import pytest
+
+from src.benchmarks.baseline import compare
+from src.benchmarks.dag_generator import DagGenerator
+from src.benchmarks.runner import BenchmarkRunner, percentile
+from src.itaufluxcontrol.models.dependencies import Dependencies
+from src.itaufluxcontrol.models.table_execution import TableExecution
+from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
+from src.itaufluxcontrol.models.task_table import TaskTable
+
+
+@pytest.fixture
+def runner():
+    return BenchmarkRunner(memory_sample=1)
+
+
+@pytest.mark.parametrize(
+    "shape, size, expected_roots, expected_edges",
+    [
+        ("chain", 5, 1, 4),
+        ("fan_out", 5, 1, 4),
+        ("fan_in", 5, 4, 4),
+        ("diamond", 5, 1, 6),
+    ],
+)
+def test_generator_builds_expected_shape(runner, shape, size, expected_roots, expected_edges):
+    dag = runner.generate(shape, size)
+
+    assert len(dag.table_names) == size
+    assert len(dag.roots) == expected_roots
+    assert runner.session.query(Dependencies).count() == expected_edges
+    assert runner.session.query(TaskTable).count() == size
+
+
+def test_layered_generator_links_each_layer_to_previous(runner):
+    generator = DagGenerator(runner.session)
+    dag = generator.generate("layered", 30, layer_width=10)
+
+    assert len(dag.roots) == 10
+    assert runner.session.query(Dependencies).count() == 20 * 3
+
+
+def test_seed_executions_inserts_history_in_chunks(runner):
+    generator = DagGenerator(runner.session, chunk_size=7)
+    dag = generator.generate("chain", 3)
+
+    generator.seed_executions(dag, 20)
+
+    assert runner.session.query(TableExecution).count() == 20
+    assert runner.session.query(TablePartitionExec).count() == 40
+
+
+def test_run_all_drives_every_route_without_errors(runner):
+    dag = runner.generate("diamond", 4, executions=10)
+
+    results = {name: result.as_dict() for name, result in runner.run_all(dag, iterations=3).items()}
+
+    assert set(results) >= {"register_execution", "trigger", "run", "GET /tables"}
+    assert all(metrics["errors"] == 0 for metrics in results.values())
+    assert results["register_execution"]["iterations"] == 3
+    assert results["register_execution"]["queries_per_call"] > 0
+    assert results["trigger"]["iterations"] > 0
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_query_growth_and_ignores_sub_millisecond_noise():
+    baseline = {"GET /tables": {"p50_ms": 0.5, "p95_ms": 0.8, "throughput": 1000, "queries_per_call": 1.0, "peak_memory_kb": 40, "errors": 0}}
+    noisy = {"GET /tables": {"p50_ms": 0.9, "p95_ms": 1.5, "throughput": 600, "queries_per_call": 1.0, "peak_memory_kb": 60, "errors": 0}}
+    n_plus_one = {"GET /tables": {**noisy["GET /tables"], "queries_per_call": 11.0}}
+
+    assert compare(noisy, baseline) == []
+    assert compare(n_plus_one, baseline) == ["GET /tables: queries_per_call 11.0 > 1.0"]
+
+
+def test_cold_start_health_does_not_touch_database_or_boto():
+    from src.benchmarks.cold_start import measure
+
+    lazy = measure(True, "/health", runs=1, secret_latency_ms=0)
+    tables = measure(True, "/tables", runs=1, secret_latency_ms=0)
+
+    assert lazy["status"] == 200
+    assert (lazy["boto_clients"], lazy["secrets_fetched"]) == (0, 0)
+    assert tables["status"] == 200
+    assert tables["secrets_fetched"] == 1
@@ -0,0 +1,94 @@
+import json
+import time
+
+import pytest
+
+from src.benchmarks.replay import ReplayConfig, ReplayDriver, extract_events, load_replay_file, write_replay_file
+from src.tests.providers.mock_scheduler_cliente_provider import LatencyInjectingClient, MockSQSClient
+
+
+def record(method, path, body=None, offset_ms=0):
+    event = {"httpMethod": method, "path": path}
+    if body is not None:
+        event["body"] = json.dumps(body)
+    return {"offset_ms": offset_ms, "event": event}
+
+
+def register(table_name):
+    return record("POST", "/register_execution", {
+        "data": [{"table_name": table_name, "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+        "user": "lrcxpnu",
+    })
+
+
+def test_extract_events_reads_prefixed_log_lines_in_order():
+    lines = [
+        '2024-05-01 10:00:01,000 - root - INFO - {"type": "captured_event", "captured_at": 101.5, "event": {"path": "/b"}}\n',
+        "2024-05-01 10:00:00,000 - root - INFO - outra mensagem\n",
+        '{"type": "captured_event", "captured_at": 100.0, "event": {"path": "/a"}}\n',
+    ]
+
+    records = extract_events(lines)
+
+    assert records == [
+        {"offset_ms": 0.0, "event": {"path": "/a"}},
+        {"offset_ms": 1500.0, "event": {"path": "/b"}},
+    ]
+
+
+def test_replay_file_round_trip(tmp_path):
+    path = str(tmp_path / "replay.jsonl")
+    records = [record("GET", "/health")]
+
+    write_replay_file(path, records)
+
+    assert load_replay_file(path) == records
+
+
+def test_split_runs_setup_first_and_spreads_duplicates_across_workers():
+    driver = ReplayDriver(ReplayConfig(workers=2, duplicate=2))
+    setup_event = record("POST", "/tables", {"data": []})
+
+    setup, shards = driver.split([setup_event, register("a"), register("b")])
+
+    assert setup == [setup_event]
+    assert [len(shard) for shard in shards] == [2, 2]
+    assert shards[0][0] == shards[1][0] == register("a")
+
+
+def test_latency_injecting_client_delays_calls_but_not_attributes():
+    client = LatencyInjectingClient(MockSQSClient(), latency_ms=30)
+
+    started = time.perf_counter()
+    response = client.send_message(QueueUrl="q", MessageBody="{}")
+
+    assert time.perf_counter() - started >= 0.03
+    assert response == {"MessageId": "msg-1"}
+    assert client.exceptions is MockSQSClient().exceptions
+
+
+def test_replay_runs_concurrent_workers_against_shared_database(tmp_path):
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    records = [
+        record("POST", "/task_executor", {"alias": "sqs_executor", "method": "sqs_process", "identification": "http://queue"}),
+        record("POST", "/tables", {
+            "data": [
+                {"name": "tb_origem", "description": "origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_destino", "description": "destino", "requires_approval": False, "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "sqs_executor", "alias": "destino_task", "params": {}, "debounce_seconds": 30}],
+                },
+            ],
+            "user": "lrcxpnu",
+        }),
+        register("tb_origem"),
+        register("tb_origem"),
+    ]
+    config = ReplayConfig(database_url=f"sqlite:///{tmp_path / 'replay.db'}", workers=2, duplicate=2, latency_ms=5)
+
+    report = ReplayDriver(config).run(records)
+
+    assert report["events"] == 4
+    assert report["routes"]["POST /register_execution"]["count"] == 4
+    assert "duplicated_pending_schedules" in report
@@ -146,3 +146,28 @@ def test_boto3_session_binding():
     assert boto3_session_1 is boto3_session_2 
     assert boto3_session_1.region_name == boto3_session_2.region_name
     assert boto3_session_1.get_credentials() == boto3_session_2.get_credentials()
+
+def test_lazy_module_defers_expensive_singletons(mock_database_provider):
+    """Testa se, com lazy=True, os singletons só são construídos no primeiro uso."""
+    from src.itaufluxcontrol.provider.lazy_provider import is_materialized
+
+    class LazyTestModule(AppModule):
+        def configure(self, binder):
+            super().configure(binder)
+            binder.bind(DatabaseProvider, to=mock_database_provider)
+
+    injector = Injector([LazyTestModule(lazy=True)])
+    session_provider = injector.get(SessionProvider)
+    table_service = injector.get(TableService)
+
+    assert isinstance(session_provider, SessionProvider)
+    assert isinstance(table_service, TableService)
+    assert not is_materialized(session_provider)
+    assert not is_materialized(table_service)
+    assert not is_materialized(injector.get(boto3.Session))
+
+    table_service.query()
+
+    assert is_materialized(table_service)
+    assert is_materialized(session_provider)
+    assert injector.get(TableService) is table_service
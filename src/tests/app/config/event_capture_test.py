@@ -0,0 +1,61 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.config.event_capture import SCRUBBED, EventCapture
+
+
+@pytest.fixture
+def event_capture():
+    capture = EventCapture()
+    capture.enabled = True
+    capture.sample_rate = 1.0
+    capture.logger = MagicMock()
+    return capture
+
+
+def test_scrub_event_masks_credentials_and_pseudonymizes_users(event_capture):
+    event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "headers": {"Authorization": "Bearer abc", "Content-Type": "application/json"},
+        "requestContext": {"httpMethod": "POST", "identity": {"sourceIp": "10.0.0.1"}, "accountId": "123"},
+        "body": json.dumps({"data": [{"table_name": "tb", "api_token": "xyz"}], "user": "lrcxpnu"}),
+    }
+
+    scrubbed = event_capture.scrub_event(event)
+    body = json.loads(scrubbed["body"])
+
+    assert scrubbed["headers"] == {"Authorization": SCRUBBED, "Content-Type": "application/json"}
+    assert scrubbed["requestContext"] == {"httpMethod": "POST"}
+    assert body["data"][0] == {"table_name": "tb", "api_token": SCRUBBED}
+    assert body["user"].startswith("user-") and body["user"] != "lrcxpnu"
+    assert body["user"] == json.loads(event_capture.scrub_event(event)["body"])["user"]
+    assert event["headers"]["Authorization"] == "Bearer abc"
+
+
+def test_scrub_event_keeps_scheduler_payload_structure(event_capture):
+    event = {
+        "httpMethod": "POST",
+        "path": "/trigger",
+        "body": {"task_table": {"id": 1}, "execution": {"id": 2}, "task_schedule": {"id": 3}},
+    }
+
+    assert event_capture.scrub_event(event) == event
+
+
+def test_capture_logs_single_line_when_enabled(event_capture):
+    event_capture.capture({"httpMethod": "GET", "path": "/health"})
+
+    record = json.loads(event_capture.logger.info.call_args[0][0])
+    assert record["type"] == "captured_event"
+    assert record["event"] == {"httpMethod": "GET", "path": "/health"}
+
+
+def test_capture_is_noop_when_disabled(event_capture):
+    event_capture.enabled = False
+
+    event_capture.capture({"httpMethod": "GET", "path": "/health"})
+
+    event_capture.logger.info.assert_not_called()
@@ -0,0 +1,95 @@
+import json
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.config.logger import CorrelationFilter, JsonFormatter, LogContext, SampledLogger
+
+
+class Unprintable:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "unprintable"
+
+
+@pytest.fixture
+def handler():
+    handler = logging.Handler()
+    handler.emit = MagicMock()
+    handler.addFilter(CorrelationFilter())
+    return handler
+
+
+@pytest.fixture
+def sampled_logger(handler):
+    logger = SampledLogger("itaufluxcontrol.test")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_debug_is_not_formatted_when_disabled(sampled_logger, handler):
+    value = Unprintable()
+
+    sampled_logger.debug("[%s] payload: %s", "Test", value)
+
+    assert value.formatted == 0
+    handler.emit.assert_not_called()
+
+
+def test_debug_is_emitted_for_sampled_invocation(sampled_logger, handler):
+    context = LogContext()
+    context.debug_sample_rate = 1.0
+
+    with context.invocation("req-1"):
+        sampled_logger.debug("[%s] payload: %s", "Test", "value")
+    sampled_logger.debug("fora da invocação")
+
+    handler.emit.assert_called_once()
+    record = handler.emit.call_args[0][0]
+    assert record.getMessage() == "[Test] payload: value"
+    assert record.request_id == "req-1"
+
+
+def test_invocation_resets_correlation(sampled_logger, handler):
+    context = LogContext()
+
+    with context.invocation("req-1"):
+        context.bind_unique_alias("tb_vendas_202405")
+        sampled_logger.info("dentro")
+    sampled_logger.info("fora")
+
+    inside, outside = [call[0][0] for call in handler.emit.call_args_list]
+    assert (inside.request_id, inside.unique_alias) == ("req-1", "tb_vendas_202405")
+    assert inside.correlation == "[request_id=req-1 unique_alias=tb_vendas_202405] "
+    assert (outside.request_id, outside.unique_alias, outside.correlation) == (None, None, "")
+
+
+def test_json_formatter_emits_structured_line():
+    record = logging.LogRecord("itaufluxcontrol", logging.INFO, __file__, 1, "Processing %s", ("/tables",), None)
+    record.request_id = "req-1"
+    record.unique_alias = None
+    record.route = "/tables"
+
+    document = json.loads(JsonFormatter().format(record))
+
+    assert document["level"] == "INFO"
+    assert document["message"] == "Processing /tables"
+    assert document["request_id"] == "req-1"
+    assert document["route"] == "/tables"
+    assert "unique_alias" not in document
+
+
+def test_json_formatter_promotes_json_messages():
+    message = json.dumps({"type": "captured_event", "captured_at": 1.0, "event": {"path": "/health"}})
+    record = logging.LogRecord("itaufluxcontrol", logging.INFO, __file__, 1, message, (), None)
+
+    document = json.loads(JsonFormatter().format(record))
+
+    assert document["type"] == "captured_event"
+    assert document["event"] == {"path": "/health"}
+    assert "message" not in document
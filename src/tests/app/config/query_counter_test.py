@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.itaufluxcontrol.config.query_counter import QueryCounter, query_counter
+from src.tests.providers.query_budget import QueryBudgetExceeded, assert_query_budget
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def counter():
+    counter = QueryCounter()
+    counter.install()
+    return counter
+
+
+def test_counts_statements_rows_and_time(engine, counter):
+    with counter.count() as stats:
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO items (name) VALUES ('a')"))
+            conn.execute(text("INSERT INTO items (name) VALUES ('b')"))
+            conn.execute(text("UPDATE items SET name = 'c'"))
+
+    assert stats.statements == 3
+    assert stats.rows == 4
+    assert stats.db_time_ms >= 0
+    assert stats.as_dict()["sql_statements"] == 3
+
+
+def test_does_not_count_outside_of_block(engine, counter):
+    with counter.count() as stats:
+        pass
+    with engine.begin() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert stats.statements == 0
+
+
+def test_nested_blocks_are_counted_independently(engine, counter):
+    with counter.count() as outer:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+            with counter.count() as inner:
+                conn.execute(text("SELECT 2"))
+
+    assert inner.statements == 1
+    assert outer.statements == 2
+
+
+def test_failed_statement_leaves_nothing_on_the_connection(engine, counter):
+    with counter.count() as stats:
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            leftovers = [key for key in conn.info if str(key).startswith("itaufluxcontrol")]
+
+    assert leftovers == []
+    assert stats.statements == 1
+
+
+def test_most_common_groups_repeated_statements(engine, counter):
+    with counter.count() as stats:
+        with engine.begin() as conn:
+            for item_id in range(3):
+                conn.execute(text("SELECT * FROM items WHERE id = :id"), {"id": item_id})
+
+    assert stats.most_common(1) == [("SELECT * FROM items WHERE id = ?", 3)]
+
+
+def test_query_budget_fails_when_exceeded(engine):
+    query_counter.install()
+    with pytest.raises(QueryBudgetExceeded, match="2 statements SQL \\(orçamento: 1\\)"):
+        with assert_query_budget(1, "loop"):
+            with engine.begin() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 1"))
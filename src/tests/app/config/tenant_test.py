@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from src.itaufluxcontrol.config.tenant import TenantContext
+
+
+@pytest.fixture
+def context(monkeypatch):
+    monkeypatch.setenv("DEFAULT_TENANT_ID", "1")
+    return TenantContext()
+
+
+def test_tenant_comes_from_header_before_body(context):
+    event = {"headers": {"x-tenant-id": "7"}, "body": json.dumps({"tenant_id": 9})}
+
+    assert context.resolve(event) == 7
+    assert context.resolve({"body": json.dumps({"tenant_id": 9})}) == 9
+    assert context.resolve({"body": {"tenant_id": "9"}}) == 9
+
+
+def test_default_tenant_when_event_has_none(context):
+    assert context.resolve({"httpMethod": "GET", "path": "/health"}) == 1
+    assert context.resolve({"headers": None, "body": "not json"}) == 1
+
+
+@pytest.mark.parametrize("value", ["abc", "0", "-3"])
+def test_invalid_tenant_is_rejected(context, value):
+    with pytest.raises(ValueError):
+        context.resolve({"headers": {"X-Tenant-Id": value}})
+
+
+def test_invocation_sets_and_restores_tenant(context):
+    assert context.tenant_id == 1 and context.is_default
+    with context.invocation(4):
+        assert context.tenant_id == 4
+        assert not context.is_default
+    assert context.tenant_id == 1
@@ -0,0 +1,137 @@
+import json
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from src.itaufluxcontrol.config.tracer import Span, Tracer
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.tests.providers.mock_xray_collector import MockXRayCollector
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.enabled = True
+    tracer.xray_enabled = False
+    tracer.logger = MagicMock()
+    return tracer
+
+
+def emitted_summary(tracer):
+    return json.loads(tracer.logger.info.call_args[0][0])
+
+
+def test_invocation_emits_single_summary_with_nested_spans(tracer):
+    with tracer.invocation("/register_execution", method="POST"):
+        with tracer.span("TablePartitionExecService.register_partitions_exec"):
+            with tracer.span("TaskService._interpolate_payload"):
+                pass
+            with tracer.span("TaskService._interpolate_payload"):
+                pass
+
+    tracer.logger.info.assert_called_once()
+    summary = emitted_summary(tracer)
+    assert summary["type"] == "trace_summary"
+    assert summary["name"] == "/register_execution"
+    assert summary["annotations"] == {"method": "POST"}
+    register = summary["children"][0]
+    assert register["name"] == "TablePartitionExecService.register_partitions_exec"
+    assert [child["name"] for child in register["children"]] == ["TaskService._interpolate_payload"] * 2
+    assert summary["totals"]["TaskService._interpolate_payload"]["count"] == 2
+    assert summary["duration_ms"] >= register["duration_ms"]
+
+
+def test_trace_decorator_names_span_after_concrete_class(tracer):
+    class Base:
+        @tracer.trace()
+        def save(self):
+            return "saved"
+
+    class TableRepository(Base):
+        pass
+
+    with tracer.invocation("/tables"):
+        assert TableRepository().save() == "saved"
+
+    assert emitted_summary(tracer)["children"][0]["name"] == "TableRepository.save"
+
+
+def test_trace_is_noop_outside_invocation(tracer):
+    @tracer.trace()
+    def work():
+        return tracer.current_span()
+
+    assert work() is None
+    tracer.logger.info.assert_not_called()
+
+
+def test_span_records_error_and_reraises(tracer):
+    with pytest.raises(ValueError):
+        with tracer.invocation("/trigger"):
+            with tracer.span("TaskService.process"):
+                raise ValueError("boom")
+
+    summary = emitted_summary(tracer)
+    assert summary["error"] == "ValueError: boom"
+    assert summary["children"][0]["error"] == "ValueError: boom"
+
+
+def test_spans_over_limit_only_count_in_totals(tracer):
+    tracer.max_spans = 2
+    with tracer.invocation("/register_execution"):
+        for _ in range(5):
+            with tracer.span("TableRepository.get_by_id"):
+                pass
+
+    summary = emitted_summary(tracer)
+    assert len(summary["children"]) == 2
+    assert summary["totals"]["TableRepository.get_by_id"]["count"] == 5
+
+
+def test_xray_segment_is_sent_to_collector(tracer, monkeypatch):
+    collector = MockXRayCollector()
+    monkeypatch.setenv("AWS_XRAY_DAEMON_ADDRESS", collector.address)
+    monkeypatch.delenv("_X_AMZN_TRACE_ID", raising=False)
+    tracer.xray_enabled = True
+    try:
+        with tracer.invocation("/trigger"):
+            with tracer.span("TaskService.process"):
+                pass
+        segment = collector.receive()
+    finally:
+        collector.close()
+
+    assert segment["name"] == "itaufluxcontrol"
+    assert segment["trace_id"].startswith("1-")
+    assert segment["annotations"]["route"] == "/trigger"
+    assert segment["subsegments"][0]["name"] == "TaskService.process"
+    assert segment["end_time"] >= segment["start_time"]
+
+
+def test_xray_document_is_subsegment_inside_lambda(tracer, monkeypatch):
+    monkeypatch.setenv("_X_AMZN_TRACE_ID", "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8;Sampled=1")
+    root = Span("/health")
+    root.finish()
+
+    document = tracer.build_xray_document(root)
+
+    assert document["type"] == "subsegment"
+    assert document["name"] == "/health"
+    assert document["trace_id"] == "1-5759e988-bd862e3fe1be46a994272793"
+    assert document["parent_id"] == "53995c3f42cd8ad8"
+
+
+def test_boto_client_calls_are_traced(tracer, monkeypatch):
+    monkeypatch.setattr("src.itaufluxcontrol.service.boto_service.tracer", tracer)
+    session = boto3.Session(aws_access_key_id="test", aws_secret_access_key="test", region_name="us-east-1")
+    service = BotoService(logger=MagicMock(), session_provider=session)
+    client = service.get_client("sqs")
+
+    with Stubber(client) as stubber:
+        stubber.add_response("send_message", {"MessageId": "msg-1"})
+        with tracer.invocation("/trigger"):
+            client.send_message(QueueUrl="http://localhost:4566/000000000000/queue", MessageBody="{}")
+
+    assert emitted_summary(tracer)["children"][0]["name"] == "sqs.SendMessage"
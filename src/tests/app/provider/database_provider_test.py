@@ -0,0 +1,45 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.provider.database_provider import DatabaseProvider
+
+SECRETS = {
+    "default_secret": {"username": "app", "password": "pwd", "host": "db-shared", "dbname": "lambdacontrole"},
+    "tenant-7": {"username": "t7", "password": "pwd", "host": "db-tenant-7", "dbname": "lambdacontrole"},
+}
+
+
+@pytest.fixture
+def database_provider(monkeypatch):
+    monkeypatch.setenv("DB_SECRET_NAME", "default_secret")
+    monkeypatch.setenv("TENANT_DATABASES", json.dumps({"7": {"secret": "tenant-7"}, "9": {"schema": "lambdacontrole_t9"}, "11": {}}))
+    boto_service = MagicMock()
+    boto_service.get_client.return_value.get_secret_value.side_effect = lambda SecretId: {"SecretString": json.dumps(SECRETS[SecretId])}
+    return DatabaseProvider(boto_service)
+
+
+def test_tenants_without_route_use_the_default_engine(database_provider):
+    assert database_provider.get_engine(1) is database_provider.engine
+    assert database_provider.get_engine(2) is database_provider.engine
+
+
+def test_tenants_are_routed_to_their_own_database(database_provider):
+    secret_engine = database_provider.get_engine(7)
+    schema_engine = database_provider.get_engine(9)
+
+    assert (secret_engine.url.host, secret_engine.url.username) == ("db-tenant-7", "t7")
+    assert (schema_engine.url.host, schema_engine.url.database) == ("db-shared", "lambdacontrole_t9")
+    assert database_provider.get_engine(7) is secret_engine
+    with pytest.raises(ValueError):
+        database_provider.get_engine(11)
+
+
+def test_session_binds_to_the_engine_of_the_current_tenant(database_provider):
+    session = next(database_provider.get_session())
+
+    assert session.get_bind() is database_provider.engine
+    with tenant_context.invocation(7):
+        assert session.get_bind() is database_provider.get_engine(7)
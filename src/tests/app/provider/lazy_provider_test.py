@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from injector import ClassProvider, Injector, singleton
+
+from src.itaufluxcontrol.provider.lazy_provider import LazyProvider, LazyProxy, is_materialized
+
+
+class ExpensiveService:
+    built = 0
+
+    def __init__(self):
+        ExpensiveService.built += 1
+        self.value = "real"
+
+    def ping(self):
+        return "pong"
+
+
+def test_proxy_builds_on_first_attribute_access():
+    factory = MagicMock(return_value=ExpensiveService())
+    proxy = LazyProxy(ExpensiveService, factory)
+
+    assert isinstance(proxy, ExpensiveService)
+    assert not is_materialized(proxy)
+    factory.assert_not_called()
+
+    assert proxy.ping() == "pong"
+    assert proxy.value == "real"
+    factory.assert_called_once()
+    assert is_materialized(proxy)
+
+
+def test_proxy_forwards_attribute_assignment():
+    proxy = LazyProxy(ExpensiveService, ExpensiveService)
+
+    proxy.value = "changed"
+
+    assert proxy.value == "changed"
+
+
+def test_lazy_provider_with_singleton_scope_builds_once():
+    ExpensiveService.built = 0
+    injector = Injector()
+    injector.binder.bind(ExpensiveService, to=LazyProvider(ExpensiveService, ClassProvider(ExpensiveService)), scope=singleton)
+
+    first = injector.get(ExpensiveService)
+    second = injector.get(ExpensiveService)
+
+    assert first is second
+    assert ExpensiveService.built == 0
+    first.ping()
+    second.ping()
+    assert ExpensiveService.built == 1
+
+
+def test_is_materialized_for_regular_objects():
+    assert is_materialized(ExpensiveService())
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, DateTime, create_engine
+from sqlalchemy import Column, Integer, String, DateTime, create_engine, event
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 
@@ -16,6 +16,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
+    status = Column(String, nullable=True)
     date_deleted = Column(DateTime, nullable=True)
     
     posts = relationship("Post", back_populates="user")
@@ -289,3 +290,77 @@ def test_query_excludes_soft_deleted(post_repository, db_session, mock_logger):
 
     assert len(result) == 1
     assert result[0].title == "ActivePost"
+
+@pytest.fixture
+def flush_count(db_session):
+    counter = {"count": 0}
+    event.listen(db_session, "after_flush", lambda *_: counter.__setitem__("count", counter["count"] + 1))
+    return counter
+
+def make_users(count):
+    return [User(name=f"User{i}", email=f"user{i}@example.com") for i in range(count)]
+
+def test_batch_flushes_once_on_exit(user_repository, flush_count):
+    with user_repository.batch():
+        saved_users = [user_repository.save(user) for user in make_users(6)]
+        assert flush_count["count"] == 0
+        assert all(user.id is None for user in saved_users)
+
+    assert flush_count["count"] == 1
+    assert sorted(user.id for user in saved_users) == [1, 2, 3, 4, 5, 6]
+
+def test_nested_batch_flushes_only_on_outer_exit(user_repository, flush_count):
+    with user_repository.batch():
+        with user_repository.batch():
+            user_repository.save_all(make_users(2))
+        assert flush_count["count"] == 0
+
+    assert flush_count["count"] == 1
+
+def test_batch_does_not_flush_on_error(user_repository, db_session, flush_count):
+    with pytest.raises(RuntimeError):
+        with user_repository.batch():
+            user_repository.save(make_users(1)[0])
+            raise RuntimeError("boom")
+
+    assert flush_count["count"] == 0
+    db_session.rollback()
+    assert db_session.query(User).count() == 0
+    assert user_repository.save(make_users(1)[0]).id is not None
+
+def test_save_all_fetches_ids_with_a_single_flush(user_repository, flush_count):
+    saved_users = user_repository.save_all(make_users(3))
+
+    assert flush_count["count"] == 1
+    assert [user.id for user in saved_users] == [1, 2, 3]
+
+def test_save_all_without_ids_inserts_rows_directly(user_repository, db_session, flush_count):
+    saved_users = user_repository.save_all(make_users(3), fetch_ids=False)
+
+    assert flush_count["count"] == 0
+    assert all(user.id is None for user in saved_users)
+    assert sorted(name for (name,) in db_session.query(User.name)) == ["User0", "User1", "User2"]
+
+def test_patch_updates_only_given_columns(user_repository, db_session):
+    user = User(name="Ivy", email="ivy@example.com", status="active")
+    db_session.add(user)
+    db_session.flush()
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert user_repository.patch(user.id, name="Ivy Smith") is True
+
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE users SET name=?")
+    assert user.name == "Ivy Smith"
+    assert user not in db_session.dirty
+
+def test_patch_with_expected_status(user_repository, db_session):
+    user = User(name="Jack", email="jack@example.com", status="active")
+    db_session.add(user)
+    db_session.flush()
+
+    assert user_repository.patch(user.id, "blocked", status="active") is False
+    assert user_repository.patch(user.id, ["active", "blocked"], status="blocked") is True
+    assert user.status == "blocked"
+    assert user_repository.patch(999, name="Nobody") is False
@@ -0,0 +1,58 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.service.approval_batch_service import ApprovalBatchService
+
+
+def approval(id, status="pending", schedule_status="waiting_approval", month="202305"):
+    task_schedule = SimpleNamespace(id=id * 10, status=schedule_status, date_deleted=None, partitions=json.dumps({"ano_mes_referencia": month}))
+    return SimpleNamespace(id=id, status=status, task_schedule_id=task_schedule.id, task_schedule=task_schedule)
+
+
+@pytest.fixture
+def service():
+    return ApprovalBatchService(
+        logger=MagicMock(),
+        approval_status_service=MagicMock(),
+        task_schedule_service=MagicMock(),
+        event_bridge_scheduler_service=MagicMock(),
+    )
+
+
+def test_approve_by_ids_reports_each_item(service: ApprovalBatchService):
+    approvals = [approval(1), approval(2, status="approved"), approval(3, schedule_status="completed")]
+    service.approval_status_service.find_for_review.return_value = approvals
+
+    report = service.review("approved", "user", approval_status_ids=[1, 2, 3, 4, 1])
+
+    assert report == {"count": 1, "has_more": False, "items": [
+        {"approval_status_id": 1, "task_schedule_id": 10, "status": "approved"},
+        {"approval_status_id": 2, "task_schedule_id": 20, "status": "not_pending"},
+        {"approval_status_id": 3, "task_schedule_id": 30, "status": "not_pending"},
+        {"approval_status_id": 4, "task_schedule_id": None, "status": "not_found"},
+    ]}
+    service.approval_status_service.review_many.assert_called_once_with([1], "approved", "user")
+    service.task_schedule_service.set_pending.assert_called_once_with([approvals[0].task_schedule])
+    service.event_bridge_scheduler_service.schedule_many.assert_called_once_with([approvals[0].task_schedule])
+
+
+def test_reject_by_filter_pushes_partitions_and_limit_to_the_query(service: ApprovalBatchService):
+    service.max_items = 2
+    service.approval_status_service.find_for_review.return_value = [
+        approval(1), approval(3), approval(4, schedule_status="completed"),
+    ]
+
+    report = service.review("rejected", "user", table_name="tb", partitions={"ano_mes_referencia": 202305})
+
+    service.approval_status_service.find_for_review.assert_called_once_with(
+        approval_status_ids=None, table_id=None, table_name="tb", requested_from=None, requested_to=None,
+        partitions={"ano_mes_referencia": 202305}, limit=3,
+    )
+    assert report["has_more"] is True
+    assert [(item["approval_status_id"], item["status"]) for item in report["items"]] == [(1, "rejected"), (3, "rejected")]
+    service.approval_status_service.review_many.assert_called_once_with([1, 3], "rejected", "user")
+    service.task_schedule_service.set_pending.assert_not_called()
+    service.event_bridge_scheduler_service.schedule_many.assert_not_called()
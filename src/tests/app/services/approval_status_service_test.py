@@ -0,0 +1,44 @@
+from unittest.mock import MagicMock
+
+import pytest
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
+
+from src.itaufluxcontrol.service.approval_status_service import ApprovalStatusService
+
+
+@pytest.fixture
+def service():
+    return ApprovalStatusService(logger=MagicMock(), repository=MagicMock(), table_process_summary_service=MagicMock())
+
+
+def test_save_upserts_by_task_schedule(service: ApprovalStatusService):
+    service.save({"id": None, "task_schedule_id": 7, "status": "pending"})
+
+    (rows, conflict_columns, update_columns), _ = service.repository.upsert.call_args
+    assert rows[0]["task_schedule_id"] == 7
+    assert "id" not in rows[0]
+    assert rows[0]["reviewed_at"] is None and rows[0]["approver_name"] is None
+    assert conflict_columns == ["task_schedule_id"]
+    assert update_columns == ["status", "requested_at", "reviewed_at", "approver_name"]
+    service.repository.get_by_task_schedule_id.assert_not_called()
+
+
+def test_reject_only_pending_approvals(service: ApprovalStatusService):
+    service.repository.patch.return_value = False
+
+    with pytest.raises(NotFoundError):
+        service.reject(9, "user")
+
+    args, fields = service.repository.patch.call_args
+    assert args == (9, "pending")
+    assert fields["status"] == "rejected" and fields["approver_name"] == "user"
+    service.repository.get_by_id.assert_not_called()
+    service.table_process_summary_service.set_approver.assert_not_called()
+
+
+def test_approve_records_approver_in_process_summary(service: ApprovalStatusService):
+    service.repository.patch.return_value = True
+
+    service.approve(9, "user")
+
+    service.table_process_summary_service.set_approver.assert_called_once_with([9], "user")
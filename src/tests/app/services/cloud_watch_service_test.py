@@ -36,3 +36,12 @@ def test_flush_metrics(cloudwatch_service):
     mock_add_metric.assert_any_call(name="Metric1", value=1.0, unit=MetricUnit.Count)
     mock_add_metric.assert_any_call(name="Metric2", value=2.0, unit=MetricUnit.Seconds)
     mock_flush_metrics.assert_called_once()
+
+def test_flush_metrics_clears_buffer(cloudwatch_service):
+    service, mock_metrics = cloudwatch_service
+
+    service.add_metric(name="Metric1", value=1.0, unit=MetricUnit.Count)
+    service.flush_metrics()
+    service.flush_metrics()
+
+    mock_metrics.add_metric.assert_called_once_with(name="Metric1", value=1.0, unit=MetricUnit.Count)
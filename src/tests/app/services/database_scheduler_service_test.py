@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.service.database_scheduler_service import DatabaseSchedulerService
+from src.itaufluxcontrol.service.database_scheduler_worker import DatabaseSchedulerWorker
+
+
+@pytest.fixture
+def service():
+    return DatabaseSchedulerService(
+        logger=MagicMock(),
+        task_schedule_service=MagicMock(),
+        approval_status_service=MagicMock(),
+        outbox_service=MagicMock(),
+        table_process_summary_service=MagicMock(),
+    )
+
+
+@pytest.fixture
+def worker():
+    return DatabaseSchedulerWorker(
+        logger=MagicMock(),
+        session_provider=MagicMock(),
+        task_schedule_service=MagicMock(),
+        task_service=MagicMock(),
+        cloudwatch_service=MagicMock(),
+    )
+
+
+def test_register_event_only_sets_due_time(service: DatabaseSchedulerService):
+    task_schedule = TaskSchedule(id=1, status="waiting_approval", schedule_alias="20261019100000-1")
+    task_schedule.task_table = MagicMock(debounce_seconds=30)
+    service.approval_status_service.find_by_task_schedule_id.return_value = MagicMock(id=9)
+
+    service.schedule(task_schedule)
+
+    service.task_schedule_service.update.assert_called_once()
+    task_schedule_id, = service.task_schedule_service.update.call_args.args
+    fields = service.task_schedule_service.update.call_args.kwargs
+    assert task_schedule_id == 1
+    assert fields["status"] == "pending"
+    assert timedelta(seconds=29) < fields["scheduled_execution_time"] - datetime.now() <= timedelta(seconds=30)
+    service.task_schedule_service.save.assert_not_called()
+    service.approval_status_service.approve.assert_called_once_with(9, 'automatic')
+    service.outbox_service.enqueue.assert_not_called()
+
+
+def test_postergated_schedule_is_not_saved_twice(service: DatabaseSchedulerService):
+    task_schedule = TaskSchedule(id=1, status="pending", scheduled_execution_time=datetime.now())
+
+    service._update_event(task_schedule)
+
+    service.task_schedule_service.update.assert_not_called()
+    service.approval_status_service.find_by_task_schedule_id.assert_not_called()
+
+
+def test_tick_triggers_due_schedules_and_parks_unresolved(worker: DatabaseSchedulerWorker):
+    worker.task_schedule_service.get_due.return_value = [
+        SimpleNamespace(id=1, task_id=10, table_execution_id=100, trigger_attempts=0),
+        SimpleNamespace(id=2, task_id=20, table_execution_id=200, trigger_attempts=0),
+        SimpleNamespace(id=3, task_id=30, table_execution_id=300, trigger_attempts=0),
+    ]
+    worker.task_service.trigger_tables.side_effect = [None, RuntimeError("boom"), None]
+    worker.task_schedule_service.park.return_value = 1
+
+    result = worker.tick()
+
+    assert result == {"due": 3, "triggered": 1, "parked": 1, "failed": 1}
+    worker.task_service.trigger_tables.assert_any_call(task_schedule_id=2, task_table_id=20, dependency_execution_id=200)
+    worker.task_schedule_service.park.assert_called_once_with([1, 3])
+    worker.session_provider.commit.assert_called_once()
+    worker.session_provider.close.assert_called_once()
+
+
+def test_tick_backs_off_failed_triggers_and_fails_after_max_attempts(worker: DatabaseSchedulerWorker):
+    worker.max_attempts = 3
+    worker.task_schedule_service.get_due.return_value = [
+        SimpleNamespace(id=1, task_id=10, table_execution_id=100, trigger_attempts=0),
+        SimpleNamespace(id=2, task_id=20, table_execution_id=200, trigger_attempts=1),
+        SimpleNamespace(id=3, task_id=30, table_execution_id=300, trigger_attempts=2),
+    ]
+    worker.task_service.trigger_tables.side_effect = RuntimeError("boom")
+    worker.task_schedule_service.park.return_value = 0
+
+    result = worker.tick()
+
+    assert result == {"due": 3, "triggered": 0, "parked": 0, "failed": 3}
+    assert worker.task_schedule_service.retry_later.call_args_list == [
+        ((1, 1, 30),),
+        ((2, 2, 60),),
+    ]
+    worker.task_schedule_service.expire.assert_called_once_with([3], "Trigger failed after 3 attempts: boom")
+    worker.session_provider.commit.assert_called_once()
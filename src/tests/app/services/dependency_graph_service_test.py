@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
+
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.service.dependency_graph_service import DependencyGraphService
+
+
+def table(id):
+    return SimpleNamespace(id=id, name=f"t{id}")
+
+
+def edge(table_id, dependency_id, is_required=True):
+    return SimpleNamespace(table_id=table_id, dependency_id=dependency_id, is_required=is_required)
+
+
+@pytest.fixture
+def repository():
+    """
+    Diamante 1 -> (2, 3) -> 4, com 3 -> 4 opcional e um atalho 1 -> 4.
+    """
+    repository = MagicMock()
+    repository.get_graph_version.return_value = (1,)
+    repository.get_graph.return_value = (
+        [table(1), table(2), table(3), table(4), table(5)],
+        [edge(2, 1), edge(3, 1), edge(4, 2), edge(4, 3, False), edge(4, 1)],
+        [SimpleNamespace(id=10, table_id=4, alias="t4_task")],
+    )
+    return repository
+
+
+@pytest.fixture
+def service(repository):
+    return DependencyGraphService(logger=MagicMock(), dependency_repository=repository)
+
+
+def test_downstream_closure_is_ordered_by_longest_path(service):
+    result = service.impact(1, "downstream")
+
+    assert result["table"] == {"id": 1, "name": "t1", "tasks": []}
+    downstream = result["downstream"]
+    assert downstream["count"] == 3
+    assert [[t["id"] for t in level["tables"]] for level in downstream["levels"]] == [[2, 3], [4]]
+    assert downstream["levels"][1]["tables"][0]["tasks"] == [{"id": 10, "alias": "t4_task"}]
+    assert {"table_id": 4, "dependency_id": 3, "is_required": False} in downstream["edges"]
+    assert len(downstream["edges"]) == 5
+    assert downstream["cycles"] == []
+    assert "upstream" not in result
+
+
+def test_upstream_closure(service):
+    result = service.impact(4, "both")
+
+    assert result["downstream"]["count"] == 0
+    assert [[t["id"] for t in level["tables"]] for level in result["upstream"]["levels"]] == [[2, 3], [1]]
+
+
+def test_graph_is_cached_until_version_changes(service, repository):
+    service.impact(1)
+    service.impact(2)
+    assert repository.get_graph.call_count == 1
+
+    repository.get_graph_version.return_value = (2,)
+    service.impact(1)
+    assert repository.get_graph.call_count == 2
+
+
+def test_graph_is_cached_per_tenant(service, repository):
+    service.impact(1)
+    with tenant_context.invocation(2):
+        repository.get_graph.return_value = ([table(7)], [], [])
+        assert service.impact(7)["table"]["name"] == "t7"
+        with pytest.raises(NotFoundError):
+            service.impact(1)
+    service.impact(1)
+    assert repository.get_graph.call_count == 2
+
+
+def test_cycles_are_reported_instead_of_ordered(service, repository):
+    repository.get_graph.return_value = ([table(1), table(2), table(3)], [edge(2, 1), edge(3, 2), edge(2, 3)], [])
+
+    downstream = service.impact(1, "downstream")["downstream"]
+
+    assert downstream["levels"] == []
+    assert downstream["cycles"] == [2, 3]
+
+
+def test_unknown_table_raises_not_found(service):
+    with pytest.raises(NotFoundError):
+        service.impact(99)
+
+
+def test_large_layered_graph(service, repository):
+    width, depth = 100, 100
+    tables = [table(i) for i in range(width * depth)]
+    edges = [
+        edge(layer * width + i, (layer - 1) * width + (i + offset) % width)
+        for layer in range(1, depth) for i in range(width) for offset in range(3)
+    ]
+    repository.get_graph.return_value = (tables, edges, [])
+
+    downstream = service.impact(0, "downstream")["downstream"]
+
+    # cada camada alcança duas tabelas a mais que a anterior, até a largura toda
+    assert downstream["count"] == sum(min(1 + 2 * layer, width) for layer in range(1, depth))
+    assert len(downstream["levels"]) == depth - 1
+    assert service.impact(0, "downstream")["downstream"] is downstream
@@ -1,4 +1,6 @@
 import pytest
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from src.itaufluxcontrol.models.dependencies import Dependencies
 from src.itaufluxcontrol.models.dto.table_dto import DependencyDTO
@@ -7,31 +9,54 @@ from src.itaufluxcontrol.service.dependency_service import DependencyService
 
 
 @pytest.fixture
-def dependency_service():
+def graph():
+    """
+    Grafo em memória servido pelos mocks: `orders` (tabela -> topo_order) e
+    `edges` (dependência, dependente).
+    """
+    return SimpleNamespace(orders={1: 10, 2: 2, 3: 3}, edges=[])
+
+
+@pytest.fixture
+def dependency_service(graph):
     logger = MagicMock()
     table_repository = MagicMock()
     dependency_repository = MagicMock()
+
+    def neighbors(table_ids, downstream, lower, upper):
+        pairs = [(dependency, dependent) if downstream else (dependent, dependency) for dependency, dependent in graph.edges]
+        return [(target, graph.orders[target]) for source, target in pairs if source in table_ids and lower <= graph.orders[target] <= upper]
+
+    table_repository.get_topo_orders.side_effect = lambda ids: {i: graph.orders[i] for i in ids if i in graph.orders}
+    table_repository.set_topo_orders.side_effect = lambda orders: graph.orders.update(orders)
+    table_repository.get_names.side_effect = lambda ids: {i: f"tb_{i}" for i in ids}
+    dependency_repository.get_neighbors_in_order_range.side_effect = neighbors
     service = DependencyService(logger, table_repository, dependency_repository)
     return service, logger, table_repository, dependency_repository
 
 
+def upserted(dependency_repository):
+    return dependency_repository.upsert.call_args[0][0]
+
+
 def test_save_dependencies_with_existing_dependency(dependency_service):
     service, logger, table_repository, dependency_repository = dependency_service
-    dependency_repository.get_by_table_id.return_value = [Dependencies(table_id=1, dependency_id=2)]
+    dependency_repository.get_by_table_id.return_value = [Dependencies(id=7, table_id=1, dependency_id=2, is_required=False)]
 
-    dependencies_dto = [DependencyDTO(dependency_id=3)]
+    dependencies_dto = [DependencyDTO(dependency_id=2), DependencyDTO(dependency_id=3)]
     service.save_dependencies(1, dependencies_dto)
 
-    assert dependency_repository.save.call_count == 1
-    saved_dependency = dependency_repository.save.call_args[0][0]
-    assert saved_dependency.table_id == 1
-    assert saved_dependency.dependency_id == 3
+    assert upserted(dependency_repository) == [
+        {"table_id": 1, "dependency_id": 3, "is_required": False, "date_deleted": None, "deleted_by": None},
+    ]
+    dependency_repository.bulk_soft_delete.assert_called_once_with([])
+    dependency_repository.save.assert_not_called()
 
 
 def test_save_dependencies_with_nonexistent_dependency_name(dependency_service):
     service, logger, table_repository, dependency_repository = dependency_service
     dependency_repository.get_by_table_id.return_value = []
-    table_repository.get_by_name.return_value = None
+    table_repository.get_by_names_or_ids.return_value = []
 
     dependencies_dto = [DependencyDTO(dependency_name="nonexistent_table")]
 
@@ -42,23 +67,105 @@ def test_save_dependencies_with_nonexistent_dependency_name(dependency_service):
 def test_save_dependencies_with_dependency_name(dependency_service):
     service, logger, table_repository, dependency_repository = dependency_service
     dependency_repository.get_by_table_id.return_value = []
-    table_repository.get_by_name.return_value = MagicMock(id=3)
+    table_repository.get_by_names_or_ids.return_value = [SimpleNamespace(id=3, name="existing_table", date_deleted=None)]
 
-    dependencies_dto = [DependencyDTO(dependency_name="existing_table")]
+    dependencies_dto = [DependencyDTO(dependency_name="existing_table", is_required=True)]
     service.save_dependencies(1, dependencies_dto)
 
-    assert dependency_repository.save.call_count == 1
-    saved_dependency = dependency_repository.save.call_args[0][0]
-    assert saved_dependency.table_id == 1
-    assert saved_dependency.dependency_id == 3
-
+    table_repository.get_by_names_or_ids.assert_called_once_with({"existing_table"}, [])
+    assert upserted(dependency_repository) == [
+        {"table_id": 1, "dependency_id": 3, "is_required": True, "date_deleted": None, "deleted_by": None},
+    ]
 
 
-def test_save_dependencies_ignores_existing_dependency(dependency_service):
+def test_save_dependencies_ignores_unchanged_dependency(dependency_service):
     service, logger, table_repository, dependency_repository = dependency_service
-    dependency_repository.get_by_table_id.return_value = [Dependencies(table_id=1, dependency_id=2)]
+    dependency_repository.get_by_table_id.return_value = [Dependencies(id=7, table_id=1, dependency_id=2, is_required=False)]
 
     dependencies_dto = [DependencyDTO(dependency_id=2)]
     service.save_dependencies(1, dependencies_dto)
 
-    dependency_repository.save.assert_not_called()
+    assert upserted(dependency_repository) == []
+    table_repository.get_topo_orders.assert_not_called()
+
+
+def test_save_dependencies_updates_flags_revives_and_removes(dependency_service):
+    service, logger, table_repository, dependency_repository = dependency_service
+    dependency_repository.get_by_table_id.return_value = [
+        Dependencies(id=7, table_id=1, dependency_id=2, is_required=False),
+        Dependencies(id=8, table_id=1, dependency_id=3, is_required=True, date_deleted=datetime(2026, 1, 1)),
+        Dependencies(id=9, table_id=1, dependency_id=4, is_required=True),
+    ]
+
+    dependencies_dto = [DependencyDTO(dependency_id=2, is_required=True), DependencyDTO(dependency_id=3, is_required=True)]
+    service.save_dependencies(1, dependencies_dto)
+
+    assert upserted(dependency_repository) == [
+        {"table_id": 1, "dependency_id": 2, "is_required": True, "date_deleted": None, "deleted_by": None},
+        {"table_id": 1, "dependency_id": 3, "is_required": True, "date_deleted": None, "deleted_by": None},
+    ]
+    dependency_repository.bulk_soft_delete.assert_called_once_with([9])
+    table_repository.get_topo_orders.assert_called_once_with([1, 3])
+
+
+def test_edge_already_in_order_skips_the_search(dependency_service):
+    service, logger, table_repository, dependency_repository = dependency_service
+    dependency_repository.get_by_table_id.return_value = []
+
+    service.save_dependencies(1, [DependencyDTO(dependency_id=2)])
+
+    dependency_repository.get_neighbors_in_order_range.assert_not_called()
+    table_repository.set_topo_orders.assert_not_called()
+
+
+def test_edge_against_the_order_reorders_only_the_affected_region(dependency_service, graph):
+    service, logger, table_repository, dependency_repository = dependency_service
+    # 1 -> 2 -> 3 -> 4 e 5 -> 6 fora da região; nova aresta 4 -> 2 obriga a reordenar
+    graph.orders = {1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7}
+    graph.edges = [(1, 2), (2, 3), (5, 6), (6, 7)]
+    dependency_repository.get_by_table_id.return_value = []
+
+    service.save_dependencies(2, [DependencyDTO(dependency_id=4)])
+
+    graph.edges.append((4, 2))
+    assert all(graph.orders[dependency] < graph.orders[dependent] for dependency, dependent in graph.edges)
+    assert {graph.orders[table] for table in (2, 3, 4)} == {2, 3, 4}
+    assert (graph.orders[1], graph.orders[5], graph.orders[6], graph.orders[7]) == (1, 5, 6, 7)
+    assert len(upserted(dependency_repository)) == 1
+
+
+def test_edge_closing_a_cycle_with_existing_tables_is_rejected(dependency_service, graph):
+    service, logger, table_repository, dependency_repository = dependency_service
+    graph.orders = {1: 1, 2: 2, 3: 3}
+    graph.edges = [(1, 2), (2, 3)]
+    dependency_repository.get_by_table_id.return_value = []
+
+    with pytest.raises(TableInsertError, match="'tb_3' -> 'tb_1' creates a circular dependency"):
+        service.save_dependencies(1, [DependencyDTO(dependency_id=3)])
+
+    dependency_repository.upsert.assert_not_called()
+    assert graph.orders == {1: 1, 2: 2, 3: 3}
+
+
+def test_self_dependency_is_rejected(dependency_service):
+    service, logger, table_repository, dependency_repository = dependency_service
+    dependency_repository.get_by_table_id.return_value = []
+
+    with pytest.raises(TableInsertError, match="cannot depend on itself"):
+        service.save_dependencies(2, [DependencyDTO(dependency_id=2)])
+
+
+def test_missing_orders_trigger_a_single_rebuild(dependency_service, graph):
+    service, logger, table_repository, dependency_repository = dependency_service
+    graph.orders = {1: None, 2: None, 3: None}
+    dependency_repository.get_graph.return_value = (
+        [SimpleNamespace(id=1), SimpleNamespace(id=2), SimpleNamespace(id=3)],
+        [SimpleNamespace(table_id=1, dependency_id=3), SimpleNamespace(table_id=3, dependency_id=2)],
+        [],
+    )
+    dependency_repository.get_by_table_id.return_value = []
+
+    service.save_dependencies(1, [DependencyDTO(dependency_id=2)])
+
+    assert graph.orders == {2: 1, 3: 2, 1: 3}
+    dependency_repository.get_graph.assert_called_once()
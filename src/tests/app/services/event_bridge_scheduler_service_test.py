@@ -1,7 +1,8 @@
 from datetime import datetime
 import pytest
 from botocore.exceptions import ClientError
-from unittest.mock import MagicMock, PropertyMock
+from unittest.mock import MagicMock, PropertyMock, call
+from src.itaufluxcontrol.config.tenant import tenant_context
 from src.itaufluxcontrol.models.table_execution import TableExecution
 from src.itaufluxcontrol.models.tables import Tables
 from src.itaufluxcontrol.models.task_executor import TaskExecutor
@@ -18,6 +19,8 @@ def mock_services():
         "boto_service": MagicMock(),
         "task_schedule_service": MagicMock(),
         "approval_status_service": MagicMock(),
+        "outbox_service": MagicMock(),
+        "table_process_summary_service": MagicMock(),
     }
 
 @pytest.fixture
@@ -26,6 +29,7 @@ def service(mock_services):
     service = EventBridgeSchedulerService(**mock_services)
     service.scheduler_client = MagicMock()
     service.approval_status_service = MagicMock()
+    service.outbox_service.has_pending_schedule.return_value = False
 
     type(service.scheduler_client).exceptions = PropertyMock(
         return_value=MagicMock(Exception=ClientError)
@@ -116,14 +120,14 @@ def test_check_event_exists_success(service):
     schedule_alias = "test_schedule_alias"
     result = service.check_event_exists(schedule_alias)
     assert result is True
-    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias)
+    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias, GroupName="default")
 
 def test_check_event_exists_not_found(service):
     service.scheduler_client.list_schedules.return_value = {"Schedules": []}
     schedule_alias = "test_schedule_alias"
     result = service.check_event_exists(schedule_alias)
     assert result is False
-    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias)
+    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias, GroupName="default")
 
 def test_check_event_exists_resource_not_found_exception(service):
     service.scheduler_client.list_schedules.side_effect = (
@@ -135,7 +139,7 @@ def test_check_event_exists_resource_not_found_exception(service):
     schedule_alias = "test_schedule_alias"
     result = service.check_event_exists(schedule_alias)
     assert result is False
-    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias)
+    service.scheduler_client.list_schedules.assert_called_once_with(NamePrefix=schedule_alias, GroupName="default")
     
 def test_register_or_postergate_event(service, mock_services):
     task_table = MagicMock(spec=TaskTable)
@@ -181,7 +185,8 @@ def test_register_or_postergate_event(service, mock_services):
     service.register_or_postergate_event(task_table, trigger_execution, last_execution, partitions)
 
     service.task_schedule_service.get_by_unique_alias_and_pendent.assert_called_once()
-    service.scheduler_client.create_schedule.assert_called_once()
+    service.outbox_service.enqueue.assert_called_once()
+    service.scheduler_client.create_schedule.assert_not_called()
 
 def test_register_event(service, mock_services):
     task_table = MagicMock(spec=TaskTable)
@@ -223,7 +228,12 @@ def test_register_event(service, mock_services):
 
     service.register_event(None, unique_alias, task_table, trigger_execution, partitions)
 
-    service.scheduler_client.create_schedule.assert_called_once()
+    operation, payload = service.outbox_service.enqueue.call_args.args
+    assert operation == "scheduler.create_schedule"
+    assert payload["Name"] == "schedule_alias"
+    assert payload["Target"]["Arn"] == "arn:aws:lambda:region:account:function"
+    assert service.outbox_service.enqueue.call_args.kwargs == {"aggregate_id": 1}
+    service.scheduler_client.create_schedule.assert_not_called()
 
 def test_postergate_event(service, mock_services):
     task_schedule = MagicMock(spec=TaskSchedule)
@@ -264,13 +274,94 @@ def test_postergate_event(service, mock_services):
 
     service.postergate_event(task_schedule.unique_alias, task_schedule, trigger_execution, partitions={})
 
-    service.scheduler_client.update_schedule.assert_called_once()
+    operation, payload = service.outbox_service.enqueue.call_args.args
+    assert operation == "scheduler.update_schedule"
+    assert payload["Name"] == "schedule_alias"
+    service.scheduler_client.update_schedule.assert_not_called()
 
 def test_delete_event(service):
     task_schedule = MagicMock(spec=TaskSchedule)
     task_schedule.id = 1
     task_schedule.schedule_alias = "schedule_alias"
+    task_schedule.schedule_group = None
 
     service.delete_event(task_schedule)
 
-    service.scheduler_client.delete_schedule.assert_called_once_with(Name="schedule_alias")
+    service.outbox_service.enqueue.assert_called_once_with("scheduler.delete_schedule", {"Name": "schedule_alias"}, aggregate_id=1)
+    service.scheduler_client.delete_schedule.assert_not_called()
+
+def test_register_or_postergate_event_updates_schedule_pending_in_outbox(service):
+    task_table = MagicMock(spec=TaskTable)
+    task_table.table = MagicMock(spec=Tables)
+    task_table.table.name = "example_table"
+    task_table.alias = "example_alias"
+    possible_schedule = MagicMock(spec=TaskSchedule)
+    possible_schedule.id = 7
+    possible_schedule.schedule_alias = "schedule_alias"
+    service.task_schedule_service.get_by_unique_alias_and_pendent.return_value = possible_schedule
+    service.outbox_service.has_pending_schedule.return_value = True
+    service.postergate_event = MagicMock()
+
+    service.register_or_postergate_event(task_table, MagicMock(spec=TableExecution), None, {})
+
+    service.outbox_service.has_pending_schedule.assert_called_once_with(7)
+    service.scheduler_client.list_schedules.assert_not_called()
+    service.postergate_event.assert_called_once()
+
+def test_scheduler_group_follows_strategy(service):
+    task_table = MagicMock(spec=TaskTable)
+    task_table.table_id = 7
+
+    assert service.scheduler_group(task_table) is None
+    assert service.in_scope("default") is True
+    assert service.in_scope("outro-grupo") is False
+
+    service.group_strategy = "table"
+    assert service.scheduler_group(task_table) == "itaufluxcontrol-7"
+    assert service.in_scope("itaufluxcontrol-7") is True
+    assert service.in_scope("default") is True
+
+    service.group_strategy = "single"
+    assert service.scheduler_group(task_table) == "itaufluxcontrol"
+    assert service.in_scope("itaufluxcontrol-7") is False
+
+def test_scheduler_group_is_per_tenant(service):
+    task_table = MagicMock(spec=TaskTable)
+    task_table.table_id = 7
+    service.group_strategy = "table"
+
+    with tenant_context.invocation(2):
+        assert service.scheduler_group(task_table) == "itaufluxcontrol-7-tenant-2"
+        assert service.in_scope("itaufluxcontrol-7-tenant-2") is True
+        assert service.in_scope("itaufluxcontrol-7-tenant-3") is False
+        assert service.in_scope("itaufluxcontrol-7") is False
+        assert service.in_scope("default") is False
+
+    assert service.in_scope("itaufluxcontrol-7-tenant-2") is False
+    assert service.in_scope("itaufluxcontrol-7") is True
+
+def test_finish_with_success_does_not_purge(service):
+    service.task_schedule_service.find.return_value = TaskSchedule(id=1, status="in_progress")
+
+    service.finish_with_success(1, MagicMock(id=10))
+
+    service.task_schedule_service.get_finished_with_schedule.assert_not_called()
+    service.outbox_service.enqueue.assert_not_called()
+
+def test_purge_finished_schedules_skips_deletes_already_in_outbox(service):
+    service.task_schedule_service.get_finished_with_schedule.return_value = [
+        MagicMock(id=1, schedule_alias="20261019100000-1", schedule_group=None),
+        MagicMock(id=2, schedule_alias="20261019100000-2", schedule_group="itaufluxcontrol-7"),
+        MagicMock(id=3, schedule_alias="20261019100000-3", schedule_group=None),
+    ]
+    service.outbox_service.pending_delete_ids.return_value = {3}
+
+    assert service.purge_finished_schedules() == ["20261019100000-1", "20261019100000-2"]
+
+    service.task_schedule_service.get_finished_with_schedule.assert_called_once_with(20)
+    service.outbox_service.pending_delete_ids.assert_called_once_with([1, 2, 3])
+    assert service.outbox_service.enqueue.call_args_list == [
+        call("scheduler.delete_schedule", {"Name": "20261019100000-1"}, aggregate_id=1),
+        call("scheduler.delete_schedule", {"Name": "20261019100000-2", "GroupName": "itaufluxcontrol-7"}, aggregate_id=2),
+    ]
+    service.task_schedule_service.mark_schedule_deleted.assert_not_called()
@@ -0,0 +1,52 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from aws_lambda_powertools.event_handler.exceptions import NotFoundError
+
+from src.itaufluxcontrol.service.execution_lineage_service import ExecutionLineageService
+
+
+@pytest.fixture
+def service():
+    return ExecutionLineageService(
+        logger=MagicMock(),
+        task_schedule_service=MagicMock(),
+        table_execution_repository=MagicMock(),
+        table_partition_exec_repository=MagicMock(),
+    )
+
+
+def schedule(schedule_id, table_execution_id, result_execution_id, depth):
+    return SimpleNamespace(
+        id=schedule_id, task_id=1, task_alias="task", status="completed", table_execution_id=table_execution_id,
+        result_execution_id=result_execution_id, scheduled_execution_time=None, error_message=None, depth=depth,
+    )
+
+
+def execution(execution_id):
+    return SimpleNamespace(id=execution_id, table_id=execution_id, table_name=f"tb_{execution_id}", date_time=datetime(2026, 10, 19), source="glue")
+
+
+def test_upstream_lineage_reaches_trigger_executions(service: ExecutionLineageService):
+    service.task_schedule_service.get_lineage.return_value = [schedule(7, 20, 30, 1), schedule(5, 10, 20, 2)]
+    service.table_execution_repository.get_with_table_names.return_value = [execution(10), execution(20), execution(30)]
+    service.table_partition_exec_repository.get_values_by_executions.return_value = [SimpleNamespace(execution_id=10, name="dt", value="2026-10-19")]
+
+    result = service.lineage(30, "up", 3)
+
+    service.task_schedule_service.get_lineage.assert_called_once_with(30, False, 3)
+    assert [(item["id"], item["depth"]) for item in result["executions"]] == [(30, 0), (20, 1), (10, 2)]
+    assert result["executions"][2]["partitions"] == {"dt": "2026-10-19"}
+    assert [item["id"] for item in result["schedules"]] == [7, 5]
+
+
+def test_unknown_execution_raises_not_found(service: ExecutionLineageService):
+    service.task_schedule_service.get_lineage.return_value = []
+    service.table_execution_repository.get_with_table_names.return_value = []
+
+    with pytest.raises(NotFoundError):
+        service.lineage(99)
+
+    service.task_schedule_service.get_lineage.assert_called_once_with(99, True, service.default_depth)
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from aws_lambda_powertools.event_handler.exceptions import ServiceError
+from sqlalchemy.exc import IntegrityError
+
+from src.itaufluxcontrol.config.constants import STATIC_IDEMPOTENCY_COMPLETED, STATIC_IDEMPOTENCY_IN_PROGRESS
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.models.idempotency_key import IdempotencyKey
+from src.itaufluxcontrol.service.idempotency_service import IdempotencyService
+
+
+@pytest.fixture
+def idempotency_service(monkeypatch):
+    monkeypatch.setenv("IDEMPOTENCY_TTL_SECONDS", "3600")
+    monkeypatch.setenv("IDEMPOTENCY_PAYLOAD_TTL_SECONDS", "60")
+    monkeypatch.setenv("IDEMPOTENCY_LOCK_SECONDS", "30")
+    repository = MagicMock()
+    repository.get_by_key.return_value = None
+    repository.save.side_effect = lambda record: setattr(record, "id", 1) or record
+    return IdempotencyService(logger=MagicMock(), repository=repository, session_provider=MagicMock())
+
+
+def test_build_key_is_canonical_for_payload():
+    first = IdempotencyService.build_key("/trigger", None, {"a": 1, "b": [1, 2]})
+    second = IdempotencyService.build_key("/trigger", None, {"b": [1, 2], "a": 1})
+
+    assert first == second
+    assert first != IdempotencyService.build_key("/approve", None, {"a": 1, "b": [1, 2]})
+    assert IdempotencyService.build_key("/trigger", "abc", {"a": 1}) == IdempotencyService.build_key("/trigger", "abc", {"a": 2})
+
+
+def test_build_key_is_scoped_by_tenant():
+    default = IdempotencyService.build_key("/trigger", "abc", {})
+    with tenant_context.invocation(2):
+        assert IdempotencyService.build_key("/trigger", "abc", {}) != default
+
+
+def test_begin_registers_new_key_with_ttl_by_source(idempotency_service):
+    record, new = idempotency_service.begin("k1", "/trigger", client_key=True)
+
+    assert new is True
+    assert record.status == STATIC_IDEMPOTENCY_IN_PROGRESS
+    assert 3590 < (record.expires_at - record.created_at).total_seconds() <= 3600
+
+    record, _ = idempotency_service.begin("k2", "/trigger", client_key=False)
+    assert (record.expires_at - record.created_at).total_seconds() == 60
+
+
+def test_begin_returns_existing_record_for_duplicate(idempotency_service):
+    now = datetime.utcnow()
+    existing = IdempotencyKey(id=5, key="k1", route="/trigger", status=STATIC_IDEMPOTENCY_COMPLETED,
+                              response={"ok": True}, created_at=now, expires_at=now + timedelta(minutes=5))
+    idempotency_service.repository.get_by_key.return_value = existing
+
+    record, new = idempotency_service.begin("k1", "/trigger", client_key=True)
+
+    assert new is False
+    assert idempotency_service.replay_or_conflict(record) == {"ok": True}
+    idempotency_service.repository.save.assert_not_called()
+
+
+def test_begin_reuses_abandoned_in_progress_key(idempotency_service):
+    now = datetime.utcnow()
+    existing = IdempotencyKey(id=5, key="k1", route="/trigger", status=STATIC_IDEMPOTENCY_IN_PROGRESS,
+                              created_at=now - timedelta(minutes=1), expires_at=now + timedelta(minutes=5))
+    idempotency_service.repository.get_by_key.return_value = existing
+
+    record, new = idempotency_service.begin("k1", "/trigger", client_key=True)
+
+    assert new is True
+    assert record is existing
+    assert record.created_at > now - timedelta(seconds=1)
+
+
+def test_concurrent_delivery_in_progress_conflicts(idempotency_service):
+    now = datetime.utcnow()
+    winner = IdempotencyKey(id=9, key="k1", route="/approve", status=STATIC_IDEMPOTENCY_IN_PROGRESS,
+                            created_at=now, expires_at=now + timedelta(minutes=5))
+    idempotency_service.repository.get_by_key.side_effect = [None, winner]
+    idempotency_service.repository.save.side_effect = IntegrityError("insert", {}, Exception("duplicate"))
+
+    record, new = idempotency_service.begin("k1", "/approve", client_key=True)
+
+    assert new is False
+    idempotency_service.session_provider.rollback.assert_called_once()
+    with pytest.raises(ServiceError) as error:
+        idempotency_service.replay_or_conflict(record)
+    assert error.value.status_code == 409
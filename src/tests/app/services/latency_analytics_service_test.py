@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.itaufluxcontrol.service.latency_analytics_service import LatencyAnalyticsService
+
+
+def hop(upstream, downstream, landed, debounce, dispatch):
+    """
+    Linha colunar de `get_latency_rows`: chegada da origem, disparo e chegada da dependente.
+    """
+    fired = landed + timedelta(seconds=debounce)
+    return (upstream, downstream, landed, fired, fired + timedelta(seconds=dispatch))
+
+
+@pytest.fixture
+def service():
+    table_repository = MagicMock()
+    table_repository.get_names.side_effect = lambda ids: {table_id: f"t{table_id}" for table_id in ids}
+    return LatencyAnalyticsService(
+        logger=MagicMock(),
+        task_schedule_service=MagicMock(),
+        table_repository=table_repository,
+        cloudwatch_service=MagicMock(),
+    )
+
+
+def test_hop_latencies_are_aggregated_per_table_and_day(service):
+    day = datetime(2026, 10, 18, 10)
+    service.task_schedule_service.get_latency_rows.return_value = [
+        hop(1, 2, day, 30, 60),
+        hop(1, 2, day + timedelta(hours=1), 40, 120),
+        hop(1, 2, day + timedelta(hours=2), 50, 180),
+        hop(1, 2, day + timedelta(days=1), 10, 10),
+        hop(2, 3, day, 5, 5),
+    ]
+
+    report = service.compute(date(2026, 10, 18), date(2026, 10, 19))
+
+    service.task_schedule_service.get_latency_rows.assert_called_once_with(datetime(2026, 10, 18), datetime(2026, 10, 20), None)
+    assert [(row["table_id"], row["day"], row["count"]) for row in report["tables"]] == [(2, "2026-10-18", 3), (2, "2026-10-19", 1), (3, "2026-10-18", 1)]
+    table_day = report["tables"][0]
+    lags = [90, 160, 230]
+    assert table_day["table_name"] == "t2"
+    assert table_day["debounce_wait"] == {"mean": 40.0, "p50": 40.0, "p95": 49.0, "max": 50.0}
+    assert table_day["dispatch_to_completion"]["p50"] == 120.0
+    assert table_day["landing_lag"]["p95"] == pytest.approx(float(np.percentile(lags, 95)), abs=0.001)
+
+
+def test_critical_path_follows_the_slowest_chain(service):
+    day = datetime(2026, 10, 18, 10)
+    service.task_schedule_service.get_latency_rows.return_value = [
+        hop(1, 2, day, 10, 10),
+        hop(2, 4, day, 10, 10),
+        hop(1, 3, day, 100, 100),
+        hop(3, 4, day, 5, 5),
+    ]
+
+    critical_path = service.compute(date(2026, 10, 18), date(2026, 10, 18))["critical_paths"][0]
+
+    assert critical_path["day"] == "2026-10-18"
+    assert critical_path["total_seconds"] == 210.0
+    assert [table["id"] for table in critical_path["tables"]] == [1, 3, 4]
+    assert critical_path["hops"][0] == {"upstream_table_id": 1, "table_id": 3, "p95_seconds": 200.0}
+
+
+def test_publish_logs_and_emits_metrics_for_yesterday(service):
+    service.task_schedule_service.get_latency_rows.return_value = []
+
+    report = service.publish()
+
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    assert report == {"from": yesterday.isoformat(), "to": yesterday.isoformat(), "tables": [], "critical_paths": []}
+    service.cloudwatch_service.add_metric.assert_called_once_with("LatencyTableDays", 0, "Count")
@@ -0,0 +1,130 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.config.constants import STATIC_OUTBOX_FAILED, STATIC_OUTBOX_PENDING
+from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+from src.itaufluxcontrol.service.outbox_dispatcher import OutboxDispatcher
+from src.itaufluxcontrol.service.outbox_service import OutboxService
+from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockSchedulerClient
+
+
+@pytest.fixture
+def outbox_service(monkeypatch):
+    monkeypatch.setenv("OUTBOX_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("OUTBOX_BACKOFF_BASE_SECONDS", "10")
+    repository = MagicMock()
+    repository.save.side_effect = lambda message: setattr(message, "id", 1) or message
+    return OutboxService(logger=MagicMock(), repository=repository)
+
+
+@pytest.fixture
+def dispatcher(outbox_service):
+    return OutboxDispatcher(
+        logger=MagicMock(),
+        outbox_service=outbox_service,
+        session_provider=MagicMock(),
+        task_service=MagicMock(),
+        task_schedule_service=MagicMock(),
+        boto_service=MockBotoService(mock_scheduler_client=MockSchedulerClient()),
+        cloudwatch_service=MagicMock(),
+    )
+
+
+def test_enqueue_tracks_ids_until_taken(outbox_service):
+    message = outbox_service.enqueue("scheduler.delete_schedule", {"Name": "alias"}, aggregate_id=7)
+
+    assert message.status == STATIC_OUTBOX_PENDING
+    assert message.aggregate_id == 7
+    assert outbox_service.take_enqueued() == [1]
+    assert outbox_service.take_enqueued() == []
+
+
+def test_mark_failed_backs_off_until_max_attempts(outbox_service):
+    message = OutboxMessage(id=1, attempts=0, status=STATIC_OUTBOX_PENDING)
+    outbox_service.repository.get_by_id.return_value = message
+
+    outbox_service.mark_failed(1, "throttled")
+    first_retry = message.next_attempt_at
+    outbox_service.mark_failed(1, "throttled")
+
+    assert message.status == STATIC_OUTBOX_PENDING
+    assert (message.next_attempt_at - datetime.utcnow()).total_seconds() > (first_retry - datetime.utcnow()).total_seconds()
+    assert 15 < (message.next_attempt_at - datetime.utcnow()).total_seconds() <= 20
+
+    outbox_service.mark_failed(1, "throttled")
+
+    assert message.status == STATIC_OUTBOX_FAILED
+    assert message.attempts == 3
+    assert message.last_error == "throttled"
+
+
+def test_dispatch_sends_claimed_messages_and_retries_failures(dispatcher, outbox_service):
+    outbox_service.repository.claim.return_value = [
+        OutboxMessage(id=1, operation="scheduler.create_schedule", payload={"Name": "a", "ScheduleExpression": "cron(0 0 1 1 ? *)", "FlexibleTimeWindow": {"Mode": "OFF"}, "Target": {}}),
+        OutboxMessage(id=2, operation="scheduler.delete_schedule", payload={"Name": "missing"}),
+        OutboxMessage(id=3, operation="unknown.operation", payload={}),
+    ]
+    outbox_service.repository.get_by_id.return_value = OutboxMessage(id=3, attempts=0)
+
+    result = dispatcher.dispatch([1, 2, 3])
+
+    assert result == {"dispatched": 2, "retrying": 1, "failed": 0}
+    assert "a" in dispatcher.boto_service.scheduler._schedules
+    outbox_service.repository.mark_dispatched.assert_called_once()
+    assert outbox_service.repository.mark_dispatched.call_args.args[0] == [1, 2]
+    outbox_service.repository.get_by_id.assert_called_once_with(3)
+    dispatcher.session_provider.close.assert_called_once()
+
+
+def test_schedule_is_marked_deleted_only_after_the_delete(dispatcher, outbox_service):
+    outbox_service.repository.claim.return_value = [
+        OutboxMessage(id=1, operation="scheduler.delete_schedule", payload={"Name": "gone"}, aggregate_id=7),
+        OutboxMessage(id=2, operation="scheduler.delete_schedule", payload={}, aggregate_id=8),
+    ]
+    outbox_service.repository.get_by_id.return_value = OutboxMessage(id=2, attempts=0)
+
+    result = dispatcher.dispatch([1, 2])
+
+    assert result == {"dispatched": 1, "retrying": 1, "failed": 0}
+    dispatcher.task_schedule_service.mark_schedule_deleted.assert_called_once_with([7])
+
+
+def test_task_dispatch_that_runs_out_of_attempts_fails_its_schedule(dispatcher, outbox_service):
+    payload = {"task_schedule_id": 9, "task_table_id": 1, "execution_id": 2, "payload": {}}
+    outbox_service.repository.claim.return_value = [OutboxMessage(id=4, operation="task.dispatch", payload=payload)]
+    outbox_service.repository.get_by_id.side_effect = lambda message_id: message
+    dispatcher.task_service.dispatch.side_effect = RuntimeError("status 500")
+
+    message = OutboxMessage(id=4, attempts=0)
+    assert dispatcher.dispatch([4]) == {"dispatched": 0, "retrying": 1, "failed": 0}
+    dispatcher.task_service.dispatch_failed.assert_not_called()
+
+    message.attempts = 2
+    assert dispatcher.dispatch([4]) == {"dispatched": 0, "retrying": 0, "failed": 1}
+    dispatcher.task_service.dispatch_failed.assert_called_once_with(payload, "status 500")
+
+
+def test_update_of_missing_schedule_falls_back_to_create(dispatcher):
+    dispatcher.send("scheduler.update_schedule", {"Name": "late", "ScheduleExpression": "cron(0 0 1 1 ? *)", "FlexibleTimeWindow": {"Mode": "OFF"}, "Target": {}})
+
+    assert "late" in dispatcher.boto_service.scheduler._schedules
+
+
+def test_task_dispatch_is_delegated_to_task_service(dispatcher):
+    dispatcher.send("task.dispatch", {"task_schedule_id": 1})
+
+    dispatcher.task_service.dispatch.assert_called_once_with({"task_schedule_id": 1})
+
+
+def test_create_in_missing_group_creates_the_group(dispatcher):
+    payload = {"Name": "grouped", "GroupName": "itaufluxcontrol-7", "ScheduleExpression": "at(2026-01-01T00:00:00)", "FlexibleTimeWindow": {"Mode": "OFF"}, "ActionAfterCompletion": "DELETE", "Target": {}}
+
+    dispatcher.send("scheduler.create_schedule", payload)
+    dispatcher.send("scheduler.delete_schedule", {"Name": "grouped", "GroupName": "itaufluxcontrol-7"})
+    dispatcher.send("scheduler.create_schedule", payload)
+
+    scheduler = dispatcher.boto_service.scheduler
+    assert "itaufluxcontrol-7" in scheduler._groups
+    assert scheduler._schedules["grouped"]["GroupName"] == "itaufluxcontrol-7"
@@ -0,0 +1,38 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.models.dto.table_dto import PartitionDTO
+from src.itaufluxcontrol.models.partitions import Partitions
+from src.itaufluxcontrol.service.partition_service import PartitionService
+
+
+@pytest.fixture
+def partition_service():
+    return PartitionService(logger=MagicMock(), repository=MagicMock())
+
+
+def test_save_partitions_diffs_desired_against_existing(partition_service):
+    partition_service.repository.get_by_table_id.return_value = [
+        Partitions(id=1, table_id=5, name="dt", type="date", is_required=True, sync_column=False),
+        Partitions(id=2, table_id=5, name="hr", type="int", is_required=False, sync_column=False),
+        Partitions(id=3, table_id=5, name="old", type="int", is_required=False, sync_column=False),
+        Partitions(id=4, table_id=5, name="region", type="string", is_required=False, sync_column=False, date_deleted=datetime(2026, 1, 1)),
+    ]
+
+    partition_service.save_partitions(5, [
+        PartitionDTO(name="dt", type="date", is_required=True),
+        PartitionDTO(name="hr", type="int", is_required=True),
+        PartitionDTO(name="region", type="string"),
+        PartitionDTO(name="new", type="date"),
+        PartitionDTO(name="new", type="int"),
+    ])
+
+    rows, conflict_columns, update_columns = partition_service.repository.upsert.call_args[0]
+    assert [(row["name"], row["type"], row["is_required"]) for row in rows] == [("hr", "int", True), ("region", "string", False), ("new", "date", False)]
+    assert all(row["table_id"] == 5 and row["date_deleted"] is None for row in rows)
+    assert conflict_columns == ["table_id", "name"]
+    assert "is_required" in update_columns and "date_deleted" in update_columns
+    partition_service.repository.bulk_soft_delete.assert_called_once_with([3])
+    partition_service.repository.save.assert_not_called()
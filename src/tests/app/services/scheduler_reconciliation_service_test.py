@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.service.scheduler_reconciliation_service import SchedulerReconciliationService
+from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockSchedulerClient
+
+
+@pytest.fixture
+def scheduler_client():
+    client = MockSchedulerClient()
+    for name in ("20261019100000-1", "20261019100000-2", "20261019100000-3", "schedule-de-outro-sistema"):
+        client._schedules[name] = {}
+    return client
+
+
+@pytest.fixture
+def reconciliation_service(monkeypatch, scheduler_client):
+    monkeypatch.setenv("SCHEDULER_RECONCILE_PAGE_SIZE", "2")
+    monkeypatch.setenv("SCHEDULER_RECONCILE_RATE_PER_SECOND", "0")
+    now = datetime.now()
+    rows = [
+        SimpleNamespace(id=1, schedule_alias="20261019100000-1", scheduled_execution_time=now, schedule_deleted_at=None),
+        SimpleNamespace(id=4, schedule_alias="20261019100000-4", scheduled_execution_time=now, schedule_deleted_at=None),
+        SimpleNamespace(id=5, schedule_alias="20261019100000-5", scheduled_execution_time=now, schedule_deleted_at=None),
+        SimpleNamespace(id=6, schedule_alias="20261019100000-2", scheduled_execution_time=now - timedelta(days=2), schedule_deleted_at=None),
+        # Já disparou e foi liberado com dependências pendentes: sem schedule de propósito
+        SimpleNamespace(id=7, schedule_alias="20261019100000-7", scheduled_execution_time=now, schedule_deleted_at=now),
+    ]
+    task_schedule_service = MagicMock()
+    task_schedule_service.get_pendent_page.side_effect = lambda after_id, limit: [row for row in rows if row.id > after_id][:limit]
+    outbox_service = MagicMock()
+    outbox_service.pending_schedule_ids.return_value = {5}
+    event_bridge_scheduler_service = MagicMock(backend="eventbridge")
+    event_bridge_scheduler_service.purge_finished_schedules.return_value = []
+    return SchedulerReconciliationService(
+        logger=MagicMock(),
+        boto_service=MockBotoService(mock_scheduler_client=scheduler_client),
+        task_schedule_service=task_schedule_service,
+        event_bridge_scheduler_service=event_bridge_scheduler_service,
+        outbox_service=outbox_service,
+        cloudwatch_service=MagicMock(),
+    )
+
+
+def test_dry_run_reports_drift_without_repairing(reconciliation_service):
+    report = reconciliation_service.reconcile(dry_run=True)
+
+    assert report["scheduler_schedules"] == 3
+    assert report["pending_schedules"] == 5
+    assert report["actions"] == {"expire": [6], "delete": ["20261019100000-2", "20261019100000-3"], "recreate": [4]}
+    assert report["remaining"] == 0
+    reconciliation_service.outbox_service.pending_schedule_ids.assert_called_once_with([4, 5])
+    reconciliation_service.task_schedule_service.expire.assert_not_called()
+    reconciliation_service.event_bridge_scheduler_service.delete_orphan_event.assert_not_called()
+    reconciliation_service.event_bridge_scheduler_service.recreate_event.assert_not_called()
+    reconciliation_service.event_bridge_scheduler_service.purge_finished_schedules.assert_not_called()
+
+
+def test_reconcile_applies_repairs_up_to_limit(reconciliation_service):
+    report = reconciliation_service.reconcile(dry_run=False, limit=2)
+
+    assert report["actions"] == {"expire": [6], "delete": ["20261019100000-2"], "recreate": []}
+    assert report["remaining"] == 2
+    reconciliation_service.task_schedule_service.expire.assert_called_once_with([6], "Expired by scheduler reconciliation.")
+    reconciliation_service.event_bridge_scheduler_service.delete_orphan_event.assert_called_once_with("20261019100000-2", "default")
+    reconciliation_service.event_bridge_scheduler_service.recreate_event.assert_not_called()
+
+
+def test_reconcile_recreates_missing_schedules(reconciliation_service):
+    task_schedule = MagicMock()
+    reconciliation_service.task_schedule_service.find.return_value = task_schedule
+
+    reconciliation_service.reconcile(dry_run=False)
+
+    reconciliation_service.task_schedule_service.find.assert_called_once_with(4)
+    reconciliation_service.event_bridge_scheduler_service.recreate_event.assert_called_once_with(task_schedule)
+
+
+def test_reconcile_purges_finished_schedules_once(reconciliation_service):
+    reconciliation_service.event_bridge_scheduler_service.purge_finished_schedules.return_value = ["20261019100000-3"]
+
+    report = reconciliation_service.reconcile(dry_run=False)
+
+    assert report["purged"] == 1
+    assert report["actions"]["delete"] == ["20261019100000-2"]
+    reconciliation_service.event_bridge_scheduler_service.purge_finished_schedules.assert_called_once_with()
+    reconciliation_service.event_bridge_scheduler_service.delete_orphan_event.assert_called_once_with("20261019100000-2", "default")
+
+
+def test_reconcile_is_a_no_op_with_the_database_backend(reconciliation_service, scheduler_client):
+    reconciliation_service.event_bridge_scheduler_service.backend = "database"
+    scheduler_client.list_schedules = MagicMock()
+
+    assert reconciliation_service.reconcile(dry_run=False) == {"dry_run": False, "skipped": True}
+
+    scheduler_client.list_schedules.assert_not_called()
+    reconciliation_service.task_schedule_service.get_pendent_page.assert_not_called()
+    reconciliation_service.event_bridge_scheduler_service.recreate_event.assert_not_called()
@@ -0,0 +1,135 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.config.tenant import tenant_context
+from src.itaufluxcontrol.service.sqs_batch_service import SqsBatchService
+
+
+@pytest.fixture
+def sqs_batch_service():
+    return SqsBatchService(
+        logger=MagicMock(),
+        session_provider=MagicMock(),
+        table_partition_exec_service=MagicMock(),
+        task_service=MagicMock(),
+        cloudwatch_service=MagicMock(),
+    )
+
+
+def record(message_id, path, body):
+    return {"messageId": message_id, "eventSource": "aws:sqs", "body": json.dumps({"path": path, "body": body})}
+
+
+def register_body(table_name, value):
+    return {"data": [{"table_name": table_name, "partitions": [{"partition_name": "dt", "value": value}], "source": "glue"}], "user": "lrcxpnu"}
+
+
+def trigger_body(task_schedule_id):
+    return {"task_table": {"id": 1}, "execution": {"id": 2}, "task_schedule": {"id": task_schedule_id}}
+
+
+def test_is_sqs_batch():
+    assert SqsBatchService.is_sqs_batch({"Records": [{"eventSource": "aws:sqs"}]})
+    assert not SqsBatchService.is_sqs_batch({"Records": [{"eventSource": "aws:s3"}]})
+    assert not SqsBatchService.is_sqs_batch({"httpMethod": "GET", "path": "/health"})
+
+
+def test_register_triggers_once_per_table_and_partitions(sqs_batch_service):
+    exec_service = sqs_batch_service.table_partition_exec_service
+    exec_service.register_partitions_exec.side_effect = [
+        {"table_id": 10, "execution_id": 100},
+        {"table_id": 10, "execution_id": 101},
+        {"table_id": 10, "execution_id": 102},
+    ]
+
+    failures = sqs_batch_service.process_batch([
+        record("m1", "/register_execution", register_body("tb", "2405")),
+        record("m2", "/register_execution", register_body("tb", "2405")),
+        record("m3", "/register_execution", register_body("tb", "2406")),
+    ])
+
+    assert failures == []
+    assert exec_service.register_partitions_exec.call_args.kwargs == {"trigger": False}
+    assert [call.args for call in exec_service.trigger_tables.call_args_list] == [(10, 101), (10, 102)]
+
+
+def test_failed_messages_are_reported_and_skip_trigger(sqs_batch_service):
+    exec_service = sqs_batch_service.table_partition_exec_service
+    exec_service.register_partitions_exec.side_effect = Exception("Tabela não encontrada")
+
+    failures = sqs_batch_service.process_batch([
+        record("m1", "/register_execution", register_body("tb", "2405")),
+        record("m2", "/unknown", {"data": []}),
+        {"messageId": "m3", "eventSource": "aws:sqs", "body": "not json"},
+    ])
+
+    assert failures == ["m1", "m2", "m3"]
+    exec_service.trigger_tables.assert_not_called()
+
+
+
+def test_rolled_back_message_does_not_feed_the_trigger(sqs_batch_service):
+    exec_service = sqs_batch_service.table_partition_exec_service
+    exec_service.register_partitions_exec.side_effect = [
+        {"table_id": 10, "execution_id": 100},
+        {"table_id": 10, "execution_id": 101},
+        Exception("Partição inválida"),
+    ]
+    body = register_body("tb", "2405")
+    body["data"].append({"table_name": "tb", "partitions": [{"partition_name": "dt", "value": "2406"}], "source": "glue"})
+
+    failures = sqs_batch_service.process_batch([
+        record("m1", "/register_execution", register_body("tb", "2405")),
+        record("m2", "/register_execution", body),
+    ])
+
+    assert failures == ["m2"]
+    exec_service.trigger_tables.assert_called_once_with(10, 100)
+
+
+def test_messages_whose_trigger_fails_are_sent_back(sqs_batch_service):
+    exec_service = sqs_batch_service.table_partition_exec_service
+    exec_service.register_partitions_exec.side_effect = [
+        {"table_id": 10, "execution_id": 100},
+        {"table_id": 10, "execution_id": 101},
+        {"table_id": 20, "execution_id": 200},
+    ]
+    exec_service.trigger_tables.side_effect = [False, True]
+
+    failures = sqs_batch_service.process_batch([
+        record("m1", "/register_execution", register_body("tb", "2405")),
+        record("m2", "/register_execution", register_body("tb", "2405")),
+        record("m3", "/register_execution", register_body("tb_outra", "2405")),
+    ])
+
+    assert failures == ["m1", "m2"]
+    assert [call.args for call in exec_service.trigger_tables.call_args_list] == [(10, 101), (20, 200)]
+
+
+def test_duplicated_triggers_are_processed_once(sqs_batch_service):
+    failures = sqs_batch_service.process_batch([
+        record("m1", "/trigger", trigger_body(7)),
+        record("m2", "/trigger", trigger_body(7)),
+        record("m3", "/trigger", {"task_table": {"id": 1}}),
+    ])
+
+    assert failures == ["m3"]
+    sqs_batch_service.task_service.trigger_tables.assert_called_once_with(task_schedule_id=7, task_table_id=1, dependency_execution_id=2)
+
+
+def test_records_are_grouped_by_tenant(sqs_batch_service):
+    records = [
+        record("m1", "/trigger", {**trigger_body(7), "tenant_id": 2}),
+        record("m2", "/trigger", trigger_body(8)),
+        record("m3", "/trigger", {**trigger_body(9), "tenant_id": 2}),
+        {"messageId": "m4", "eventSource": "aws:sqs", "body": "not json"},
+    ]
+
+    groups = SqsBatchService.group_by_tenant(records)
+
+    assert {tenant_id: [r["messageId"] for r in group] for tenant_id, group in groups.items()} == {2: ["m1", "m3"], 1: ["m2", "m4"]}
+    with tenant_context.invocation(2):
+        assert sqs_batch_service.process_batch(groups[2]) == []
+    assert [call.kwargs["task_schedule_id"] for call in sqs_batch_service.task_service.trigger_tables.call_args_list] == [7, 9]
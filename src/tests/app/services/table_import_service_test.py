@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.service.table_import_service import TableImportService
+
+
+def table(name, dependencies=(), tasks=()):
+    return {"name": name, "partitions": [{"name": "dt", "type": "date"}], "dependencies": list(dependencies), "tasks": list(tasks)}
+
+
+@pytest.fixture
+def import_service():
+    service = TableImportService(
+        logger=MagicMock(),
+        table_repository=MagicMock(),
+        partition_repository=MagicMock(),
+        dependency_repository=MagicMock(),
+        task_table_repository=MagicMock(),
+        task_executor_repository=MagicMock(),
+    )
+    service.table_repository.get_by_names_or_ids.return_value = [SimpleNamespace(id=1, name="tb_raw", date_deleted=None)]
+    service.task_executor_repository.get_by_aliases_or_ids.return_value = [SimpleNamespace(id=7, alias="sfn")]
+    return service
+
+
+def test_invalid_batch_is_reported_per_item_without_writes(import_service):
+    report = import_service.import_tables([
+        table("tb_a", [{"dependency_name": "tb_b"}]),
+        table("tb_b", [{"dependency_name": "tb_a"}]),
+        table("tb_a"),
+        table("tb_c", [{"dependency_id": 99}], [{"alias": "c", "task_executor": "glue"}]),
+    ], "user")
+
+    assert report["imported"] is False
+    assert [item["errors"] for item in report["items"]] == [
+        ["Circular dependency detected involving 'tb_a'."],
+        ["Circular dependency detected involving 'tb_b'."],
+        ["Table name 'tb_a' is not unique."],
+        ["Dependency table '99' not found.", "Task executor 'glue' not found for task 'c'."],
+    ]
+    import_service.table_repository.insert_many.assert_not_called()
+    import_service.dependency_repository.insert_many.assert_not_called()
+
+
+def test_valid_batch_is_inserted_in_topological_order(import_service):
+    created = {}
+
+    def insert_tables(rows):
+        created.update({row["name"]: 10 + position for position, row in enumerate(rows)})
+
+    def names_or_ids(names, ids):
+        if created:
+            return [SimpleNamespace(id=table_id, name=name, date_deleted=None) for name, table_id in created.items()]
+        return [SimpleNamespace(id=1, name="tb_raw", date_deleted=None)]
+
+    import_service.table_repository.insert_many.side_effect = insert_tables
+    import_service.table_repository.get_by_names_or_ids.side_effect = names_or_ids
+
+    report = import_service.import_tables([
+        table("tb_mart", [{"dependency_name": "tb_stage", "is_required": True}], [{"alias": "mart", "task_executor": "sfn"}]),
+        table("tb_stage", [{"dependency_name": "tb_raw", "is_required": True}]),
+    ], "user")
+
+    assert report == {"imported": True, "count": 2, "items": [
+        {"index": 0, "name": "tb_mart", "status": "created", "id": 11},
+        {"index": 1, "name": "tb_stage", "status": "created", "id": 10},
+    ]}
+    assert [row["name"] for row in import_service.table_repository.insert_many.call_args[0][0]] == ["tb_stage", "tb_mart"]
+    import_service.table_repository.set_topo_orders.assert_called_once_with({10: 10, 11: 11})
+    assert import_service.dependency_repository.insert_many.call_args[0][0] == [
+        {"table_id": 10, "dependency_id": 1, "is_required": True},
+        {"table_id": 11, "dependency_id": 10, "is_required": True},
+    ]
+    assert import_service.task_table_repository.insert_many.call_args[0][0] == [
+        {"table_id": 11, "task_executor_id": 7, "alias": "mart", "params": None, "debounce_seconds": 10},
+    ]
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import ANY, MagicMock, call, patch
 from datetime import datetime
+from src.itaufluxcontrol.config.constants import STATIC_SCHEDULE_PENDENT
 from src.itaufluxcontrol.service.table_partition_exec_service import TablePartitionExecService
 from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
 from src.itaufluxcontrol.models.tables import Tables
@@ -19,6 +20,7 @@ def mock_services():
         "partition_service": MagicMock(),
         "event_bridge_scheduler_service": MagicMock(),
         "cloudwatch_service": MagicMock(),
+        "table_process_summary_service": MagicMock(),
     }
 
 @pytest.fixture
@@ -130,6 +132,40 @@ def test_trigger_tables_with_execution_dependencies(service, mock_services):
 
     mock_services["event_bridge_scheduler_service"].register_or_postergate_event.assert_has_calls(expected_calls, any_order=True)
     
+def test_trigger_tables_keys_summary_on_triggering_execution(service, mock_services):
+    """
+    Com mais de uma dependência obrigatória, o agendamento e o resumo do
+    processamento usam a execução que disparou, não a última das dependências.
+    """
+    mock_services["table_service"].find.return_value = MagicMock(id=1)
+    origin, other_dependency = MagicMock(id=1), MagicMock(id=4)
+    origin.name, other_dependency.name = "Origin", "OtherDependency"
+    task_table = MagicMock(id=7, task_executor=MagicMock(alias="glue_executor"))
+    mock_services["table_service"].find_by_dependency.return_value = [
+        Tables(id=2, name="Dependent", requires_approval=False, task_table=[task_table], dependencies=[
+            MagicMock(dependency_table=origin, is_required=True),
+            MagicMock(dependency_table=other_dependency, is_required=True),
+        ]),
+    ]
+    trigger_execution = MagicMock(id=10, table_id=1)
+    latest_executions = {1: trigger_execution, 4: MagicMock(id=40, table_id=4)}
+    mock_services["table_execution_service"].find.return_value = trigger_execution
+    mock_services["table_execution_service"].get_latest_execution.side_effect = latest_executions.get
+    mock_services["table_execution_service"].get_latest_execution_with_restrictions.return_value = None
+    mock_services["repository"].get_by_execution.return_value = []
+
+    assert service.trigger_tables(1, execution_id=10) is True
+
+    mock_services["event_bridge_scheduler_service"].register_or_postergate_event.assert_called_once_with(task_table, trigger_execution, None, {})
+    mock_services["table_process_summary_service"].set_tasks.assert_called_once_with(10, ["glue_executor"], STATIC_SCHEDULE_PENDENT)
+
+def test_trigger_tables_reports_failure(service, mock_services):
+    """`trigger_tables` não propaga o erro, mas devolve `False`."""
+    mock_services["table_service"].find.side_effect = Exception("Database error")
+
+    assert service.trigger_tables(1) is False
+    mock_services["cloudwatch_service"].add_metric.assert_any_call(name="TriggerTablesErrorCount", value=1, unit="Count")
+
 def test_register_partitions_exec_with_table_id(service, mock_services):
     """Test the register_partitions_exec method of TablePartitionExecService."""
     mock_table = MagicMock(id=1, name="TestTable")
@@ -149,7 +185,7 @@ def test_register_partitions_exec_with_table_id(service, mock_services):
         ]
     )
 
-    mock_services["repository"].save = MagicMock()
+    mock_services["repository"].save_all = MagicMock()
     mock_new_execution = MagicMock(id=100, table_id=1)
     mock_services["table_execution_service"].create_execution.return_value = mock_new_execution
 
@@ -161,7 +197,9 @@ def test_register_partitions_exec_with_table_id(service, mock_services):
     ])    
     assert mock_services["table_service"].find.call_count == 2
     mock_services["table_execution_service"].create_execution.assert_called_once_with(1, "TestSource")
-    mock_services["repository"].save.assert_called()
+    entries = mock_services["repository"].save_all.call_args[0][0]
+    assert [(entry.partition_id, entry.value, entry.execution_id) for entry in entries] == [(1, "Value1", 100), (2, "Value2", 100)]
+    assert mock_services["repository"].save_all.call_args[1] == {"fetch_ids": False}
 
 def test_register_partitions_exec_missing_required_partition(service, mock_services):
     """Test the register_partitions_exec method when required partitions are missing."""
@@ -0,0 +1,45 @@
+import hashlib
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import ANY, MagicMock
+
+import pytest
+
+from src.itaufluxcontrol.service.table_process_summary_service import TableProcessSummaryService
+
+
+@pytest.fixture
+def service():
+    return TableProcessSummaryService(logger=MagicMock(), repository=MagicMock())
+
+
+def test_register_execution_upserts_by_table_and_partition_set(service: TableProcessSummaryService):
+    table = SimpleNamespace(id=3, name="tb_origem", description="Origem")
+    execution = SimpleNamespace(id=10, date_time=datetime(2026, 10, 19, 10, 0))
+
+    service.register_execution(table, execution, {"versao": "1", "ano_mes_referencia": "202305"})
+
+    (rows, conflict_columns, update_columns), _ = service.repository.upsert.call_args
+    assert rows[0]["partition_set"] == "ano_mes_referencia=202305, versao=1"
+    assert rows[0]["partition_key"] == hashlib.sha1(b"ano_mes_referencia=202305, versao=1").hexdigest()
+    assert rows[0]["execution_id"] == 10 and rows[0]["task_executors"] is None
+    assert conflict_columns == ["table_id", "partition_key"]
+    assert "table_id" not in update_columns and "execution_time" in update_columns
+
+
+def test_set_tasks_joins_executors_without_repeating(service: TableProcessSummaryService):
+    service.set_tasks(10, ["glue", "stepfunction", "glue"], "pending")
+
+    service.repository.set_tasks.assert_called_once_with(10, "glue, stepfunction", "pending", ANY)
+
+
+def test_get_page_returns_next_cursor_only_for_full_pages(service: TableProcessSummaryService):
+    rows = [SimpleNamespace(
+        id=row_id, table_id=1, table_name="tb", table_description=None, partition_set="", execution_id=row_id,
+        execution_time=datetime(2026, 10, 19), approver_name=None, task_executors=None, status=None, last_updated=None,
+    ) for row_id in (4, 7)]
+    service.repository.get_page.return_value = rows
+
+    assert service.get_page(0, 2)["next_after_id"] == 7
+    assert service.get_page(0, 3)["next_after_id"] is None
+    service.repository.get_page.assert_called_with(0, 3, None, None)
@@ -19,6 +19,7 @@ def task_service():
     boto_service = MagicMock()
     task_schedule_service = MagicMock()
     event_bridge_scheduler_service = MagicMock()
+    outbox_service = MagicMock()
 
     return TaskService(
         logger,
@@ -29,7 +30,8 @@ def task_service():
         task_table_service,
         boto_service,
         task_schedule_service,
-        event_bridge_scheduler_service
+        event_bridge_scheduler_service,
+        outbox_service
     )
 
 def test_trigger_tables_success(task_service):
@@ -38,7 +40,7 @@ def test_trigger_tables_success(task_service):
     dependency_execution_id = 3
 
     task_schedule = TaskSchedule(id=task_schedule_id, status="pending", unique_alias="alias")
-    task_service.task_schedule_service.query.return_value = [task_schedule]
+    task_service.task_schedule_service.claim.return_value = task_schedule
 
     task_table = TaskTable(id=task_table_id, params={}, task_executor=MagicMock(method="lambda_process"))
     task_service.task_table_service.find.return_value = task_table
@@ -55,24 +57,26 @@ def test_trigger_tables_success(task_service):
 
     task_service.trigger_tables(task_schedule_id, task_table_id, dependency_execution_id)
 
-    task_service.task_schedule_service.query.assert_called_once_with(id=task_schedule_id, status="pending")
+    task_service.task_schedule_service.claim.assert_called_once_with(task_schedule_id)
     task_service.task_table_service.find.assert_called_once_with(task_id=task_table_id)
     task_service.table_execution_service.find.assert_called_once_with(id=dependency_execution_id)
     task_service._resolve_dependencies.assert_called_once()
     task_service.process.assert_called_once()
 
 def test_trigger_tables_no_schedule(task_service):
-    task_service.task_schedule_service.query.return_value = []
+    task_service.task_schedule_service.claim.return_value = None
 
     task_service.trigger_tables(1, 2, 3)
 
     task_service.logger.warning.assert_called_once_with(
         "[TaskService] Task Schedule não encontrado ou já processado."
     )
+    task_service.task_table_service.find.assert_not_called()
+    task_service.table_execution_service.find.assert_not_called()
 
 def test_trigger_tables_dependency_not_resolved(task_service):
     task_schedule = TaskSchedule(id=1, status="pending", unique_alias="alias")
-    task_service.task_schedule_service.query.return_value = [task_schedule]
+    task_service.task_schedule_service.claim.return_value = task_schedule
 
     task_table = TaskTable(id=2, params={}, task_executor=MagicMock(method="lambda_process"))
     task_service.task_table_service.find.return_value = task_table
@@ -90,6 +94,7 @@ def test_trigger_tables_dependency_not_resolved(task_service):
     task_service.logger.warning.assert_called_once_with(
         "[TaskService][test_table] Dependências não resolvidas. Execução cancelada."
     )
+    task_service.task_schedule_service.release.assert_called_once_with(1)
 
 def test_process_with_lambda(task_service):
     task_schedule = TaskSchedule(id=1, unique_alias="alias")
@@ -98,6 +103,7 @@ def test_process_with_lambda(task_service):
     task_table.task_executor = MagicMock(method="lambda_process")
     task_table.table = MagicMock(spec=Tables)
     task_table.table.name = "test_table"
+    task_table.table.id = 1
     
     execution = MagicMock(spec=TableExecution)
     execution.id = 1
@@ -111,6 +117,8 @@ def test_process_with_lambda(task_service):
     task_service.boto_service.get_client.return_value.invoke.return_value = {"StatusCode": 200}
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.boto_service.get_client.assert_called_once_with("lambda")
@@ -135,9 +143,11 @@ def test_process_with_stepfunctions(task_service):
     dependencies_partitions = {}
 
     task_service._interpolate_payload = MagicMock(return_value={"key": "value"})
-    task_service.boto_service.get_client.return_value.start_execution.return_value = {"ExecutionArn": "arn:aws:states:..."}
+    task_service.boto_service.get_client.return_value.start_execution.return_value = {"executionArn": "arn:aws:states:..."}
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.boto_service.get_client.assert_called_once_with("stepfunctions")
@@ -150,6 +160,7 @@ def test_process_with_sqs(task_service):
     task_table.task_executor = MagicMock(method="sqs_process")
     task_table.table = MagicMock(spec=Tables)
     task_table.table.name = "test_table"
+    task_table.table.id = 1
 
     execution = MagicMock(spec=TableExecution)
     execution.id = 1
@@ -163,6 +174,8 @@ def test_process_with_sqs(task_service):
     task_service.boto_service.get_client.return_value.send_message.return_value = {"MessageId": "msg-id"}
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.boto_service.get_client.assert_called_once_with("sqs")
@@ -175,6 +188,7 @@ def test_process_with_glue(task_service):
     task_table.task_executor = MagicMock(method="glue_process")
     task_table.table = MagicMock(spec=Tables)
     task_table.table.name = "test_table"
+    task_table.table.id = 1
 
     execution = MagicMock(spec=TableExecution)
     execution.id = 1
@@ -188,6 +202,8 @@ def test_process_with_glue(task_service):
     task_service.boto_service.get_client.return_value.start_job_run.return_value = {"JobRunId": "job-id"}
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.boto_service.get_client.assert_called_once_with("glue")
@@ -200,6 +216,7 @@ def test_process_with_eventbridge(task_service):
     task_table.task_executor = MagicMock(method="eventbridge_process")
     task_table.table = MagicMock(spec=Tables)
     task_table.table.name = "test_table"
+    task_table.table.id = 1
 
     execution = MagicMock(spec=TableExecution)
     execution.id = 1
@@ -213,6 +230,8 @@ def test_process_with_eventbridge(task_service):
     task_service.boto_service.get_client.return_value.put_events.return_value = {"Entries": [{"EventId": "event-id"}]}
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.boto_service.get_client.assert_called_once_with("events")
@@ -228,6 +247,7 @@ def test_process_with_api(mock_request_post, task_service):
     task_table.task_executor.identification = "http://test.com"
     task_table.table = MagicMock(spec=Tables)
     task_table.table.name = "test_table"
+    task_table.table.id = 1
 
     execution = MagicMock(spec=TableExecution)
     execution.id = 1
@@ -239,8 +259,16 @@ def test_process_with_api(mock_request_post, task_service):
 
     task_service._interpolate_payload = MagicMock(return_value={"key": "value"})
     mock_request_post.return_value.status_code = 200
+    task_service.boto_service.get_client.return_value.post.return_value.status_code = 200
 
     task_service.process(task_schedule, task_table, execution, dependencies_partitions)
+    task_service.outbox_service.enqueue.assert_called_once()
+    task_service.execute(task_schedule, task_table, execution, {"key": "value"})
 
     task_service._interpolate_payload.assert_called_once()
     task_service.logger.info.assert_called()
+
+def test_dispatch_failed_finishes_schedule_with_error(task_service):
+    task_service.dispatch_failed({"task_schedule_id": 9, "task_table_id": 1, "execution_id": 2, "payload": {}}, "status 500")
+
+    task_service.event_bridge_scheduler_service.finish_with_error.assert_called_once_with(9, "Task dispatch failed: status 500")
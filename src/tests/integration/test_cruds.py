@@ -2,20 +2,25 @@ import json
 from unittest.mock import ANY
 import pytest
 from injector import Injector, Binder, singleton
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from src.itaufluxcontrol.config.constants import STATIC_APPROVE_STATUS_PENDING
 from src.itaufluxcontrol.itaufluxcontrol import ItauFluxControl
 from src.itaufluxcontrol.models.approval_status import ApprovalStatus
 from src.itaufluxcontrol.models.base import Base  
+from src.itaufluxcontrol.models.dependencies import Dependencies
 from src.itaufluxcontrol.config.config import AppModule
 from src.itaufluxcontrol.models.table_execution import TableExecution
 from src.itaufluxcontrol.models.tables import Tables
+from src.itaufluxcontrol.models.task_executor import TaskExecutor
+from src.itaufluxcontrol.models.task_table import TaskTable
 from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.service.boto_service import BotoService
+from src.itaufluxcontrol.service.table_service import TableService
 from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockEventsClient, MockGlueClient, MockLambdaClient, MockRequestsClient, MockSQSClient, MockSchedulerClient, MockStepFunctionClient
 from src.tests.providers.mock_session_provider import TestSessionProvider
+from src.tests.providers.query_budget import query_budget
 
 @pytest.fixture
 def mock_boto_service():
@@ -330,4 +335,279 @@ def test_delete_table(test_injector, itaufluxcontrol: ItauFluxControl):
     data = get_body if get_body else []
 
     assert isinstance(data, list), "O campo 'data' não é uma lista."
-    assert len(data) == 0, "A tabela excluída ainda está presente na resposta GET."
\ No newline at end of file
+    assert len(data) == 0, "A tabela excluída ainda está presente na resposta GET."
+
+def test_route_dependencies_plan_reuses_shared_instances(test_injector, itaufluxcontrol: ItauFluxControl):
+    """
+    Testa que singletons e instâncias fixas são resolvidos uma única vez
+    e que os demais serviços continuam sendo criados por requisição.
+    """
+    from logging import Logger
+    from unittest.mock import patch
+    from src.itaufluxcontrol.service.table_service import TableService
+
+    get_event = {"httpMethod": "GET", "path": "/tables"}
+
+    response = itaufluxcontrol.process_event(get_event, None)
+    assert response["statusCode"] == 200
+
+    with patch.object(test_injector, "get", wraps=test_injector.get) as injector_get:
+        for _ in range(2):
+            response = itaufluxcontrol.process_event(get_event, None)
+            assert response["statusCode"] == 200
+
+    injector_get.assert_not_called()
+    assert itaufluxcontrol._shared_dependencies[TableService] is test_injector.get(TableService)
+    assert itaufluxcontrol._shared_dependencies[Logger] is test_injector.get(Logger)
+
+    with patch.object(test_injector, "get", wraps=test_injector.get) as injector_get:
+        itaufluxcontrol.process_event({"httpMethod": "GET", "path": "/tasks-tables"}, None)
+
+    assert injector_get.call_args_list[0].args[0].__name__ == "TaskTableService"
+
+
+def test_table_impact_returns_downstream_and_upstream_closure(test_injector, itaufluxcontrol: ItauFluxControl):
+    """
+    Testa a closure de dependências de uma tabela: níveis, arestas opcionais
+    e o cache do grafo, invalidado quando uma tabela nova é criada.
+    """
+    def table(name, dependencies):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "date"}], "dependencies": dependencies, "tasks": []}
+
+    def create(*tables):
+        event = {"httpMethod": "POST", "path": "/tables", "body": json.dumps({"data": list(tables), "user": "lrcxpnu"})}
+        assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    def impact(table_id, direction="both"):
+        return itaufluxcontrol.process_event({
+            "httpMethod": "GET",
+            "path": f"/tables/{table_id}/impact",
+            "queryStringParameters": {"direction": direction},
+        }, None)
+
+    create(
+        table("tb_raw", []),
+        table("tb_stage", [{"dependency_name": "tb_raw", "is_required": True}]),
+        table("tb_lookup", [{"dependency_name": "tb_raw", "is_required": False}]),
+        table("tb_mart", [{"dependency_name": "tb_stage", "is_required": True}, {"dependency_name": "tb_lookup", "is_required": False}]),
+    )
+    session = test_injector.get(SessionProvider).get_session()
+    ids = {table.name: table.id for table in session.query(Tables).all()}
+
+    response = impact(ids["tb_raw"])
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert [[t["name"] for t in level["tables"]] for level in body["downstream"]["levels"]] == [["tb_stage", "tb_lookup"], ["tb_mart"]]
+    assert {"table_id": ids["tb_lookup"], "dependency_id": ids["tb_raw"], "is_required": False} in body["downstream"]["edges"]
+    assert body["upstream"]["count"] == 0
+
+    create(table("tb_report", [{"dependency_name": "tb_mart", "is_required": True}]))
+    body = json.loads(impact(ids["tb_raw"], "downstream")["body"])
+    assert body["downstream"]["count"] == 4
+    assert "upstream" not in body
+
+    body = json.loads(impact(ids["tb_mart"], "upstream")["body"])
+    assert [[t["name"] for t in level["tables"]] for level in body["upstream"]["levels"]] == [["tb_stage", "tb_lookup"], ["tb_raw"]]
+
+    assert impact(ids["tb_raw"], "sideways")["statusCode"] == 400
+    assert impact(9999)["statusCode"] == 404
+
+
+def test_dependencies_closing_a_cycle_with_existing_tables_are_rejected(test_injector, itaufluxcontrol: ItauFluxControl):
+    """
+    Testa a ordem topológica persistida: uma dependência que fecha um ciclo
+    com tabelas já cadastradas é rejeitada e uma fora de ordem reordena as
+    tabelas, com as dependentes acionadas na ordem topológica.
+    """
+    def table(name, dependencies):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "date"}], "dependencies": dependencies, "tasks": []}
+
+    def save(method, path, *tables):
+        event = {"httpMethod": method, "path": path, "body": json.dumps({"data": list(tables), "user": "lrcxpnu"})}
+        return itaufluxcontrol.process_event(event, None)
+
+    assert save("POST", "/tables",
+        table("tb_raw", []),
+        table("tb_stage", [{"dependency_name": "tb_raw", "is_required": True}]),
+        table("tb_mart", [{"dependency_name": "tb_stage", "is_required": True}]),
+        table("tb_lookup", []),
+    )["statusCode"] == 200
+    session = test_injector.get(SessionProvider).get_session()
+    ids = {table.name: table.id for table in session.query(Tables).all()}
+
+    response = save("PUT", f"/tables/{ids['tb_raw']}", table("tb_raw", [{"dependency_name": "tb_mart", "is_required": True}]))
+    assert response["statusCode"] == 500
+    assert session.query(Dependencies).filter_by(table_id=ids["tb_raw"]).count() == 0
+
+    assert save("PUT", f"/tables/{ids['tb_stage']}", table("tb_stage", [{"dependency_name": "tb_lookup", "is_required": False}]))["statusCode"] == 200
+
+    session.expire_all()
+    orders = {table.name: table.topo_order for table in session.query(Tables).all()}
+    assert orders["tb_raw"] < orders["tb_stage"] < orders["tb_mart"]
+    assert orders["tb_lookup"] < orders["tb_stage"]
+    assert sorted(orders.values()) == sorted(ids.values())
+
+    assert save("POST", "/tables", table("tb_report", [{"dependency_name": "tb_lookup", "is_required": False}]))["statusCode"] == 200
+    dependents = test_injector.get(TableService).find_by_dependency(ids["tb_lookup"])
+    assert [table.name for table in dependents] == ["tb_stage", "tb_report"]
+
+
+def test_new_tables_get_their_position_without_autoflush(db_session, test_injector, itaufluxcontrol: ItauFluxControl, monkeypatch):
+    """
+    Com `autoflush=False`, como nas sessões de produção, a tabela nova já tem
+    posição gravada quando as dependências são salvas: nenhuma reconstrução
+    da ordem e nenhuma posição repetida.
+    """
+    from src.itaufluxcontrol.service.dependency_service import DependencyService
+
+    rebuilds = []
+    rebuild = DependencyService.rebuild_topological_order
+    monkeypatch.setattr(DependencyService, "rebuild_topological_order", lambda self: rebuilds.append(1) or rebuild(self))
+    db_session.autoflush = False
+
+    def table(name, dependencies):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "date"}], "dependencies": dependencies, "tasks": []}
+
+    for name, dependencies in [("tb_a", []), ("tb_b", []), ("tb_c", ["tb_b"]), ("tb_d", ["tb_a"])]:
+        body = {"data": [table(name, [{"dependency_name": dependency, "is_required": True} for dependency in dependencies])], "user": "lrcxpnu"}
+        assert itaufluxcontrol.process_event({"httpMethod": "POST", "path": "/tables", "body": json.dumps(body)}, None)["statusCode"] == 200
+
+    db_session.expire_all()
+    tables = {table.name: table for table in db_session.query(Tables).all()}
+    assert rebuilds == []
+    assert sorted(table.topo_order for table in tables.values()) == sorted(table.id for table in tables.values())
+    assert tables["tb_b"].topo_order < tables["tb_c"].topo_order
+    assert tables["tb_a"].topo_order < tables["tb_d"].topo_order
+
+
+def test_bulk_import_creates_the_dag_in_topological_order(test_injector, itaufluxcontrol: ItauFluxControl, query_budget):
+    """
+    Testa a importação em lote: dependências do lote fora de ordem e já
+    cadastradas, INSERTs em lote com número fixo de statements e, num lote
+    inválido, o relatório por item sem nada gravado.
+    """
+    def table(name, dependencies, tasks=()):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "date"}], "dependencies": dependencies, "tasks": list(tasks)}
+
+    def bulk(*tables):
+        event = {"httpMethod": "POST", "path": "/tables/bulk", "body": json.dumps({"data": list(tables), "user": "lrcxpnu"})}
+        response = itaufluxcontrol.process_event(event, None)
+        return response["statusCode"], json.loads(response["body"])
+
+    session = test_injector.get(SessionProvider).get_session()
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    event = {"httpMethod": "POST", "path": "/tables", "body": json.dumps({"data": [table("tb_raw", [])], "user": "lrcxpnu"})}
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    with query_budget(8, "/tables/bulk com 4 tabelas"):
+        status, body = bulk(
+            table("tb_mart", [{"dependency_name": "tb_stage", "is_required": True}], [{"alias": "mart_sfn", "task_executor": "step_function_executor"}]),
+            table("tb_stage", [{"dependency_name": "tb_raw", "is_required": True}, {"dependency_name": "tb_lookup"}]),
+            table("tb_lookup", []),
+            table("tb_report", [{"dependency_name": "tb_mart", "is_required": True}], [{"alias": "report_sfn", "task_executor": "step_function_executor", "debounce_seconds": 30}]),
+        )
+
+    assert status == 201
+    assert body["imported"] is True and body["count"] == 4
+    assert [item["status"] for item in body["items"]] == ["created"] * 4
+    session.expire_all()
+    tables = {t.name: t for t in session.query(Tables).all()}
+    assert tables["tb_raw"].topo_order < tables["tb_stage"].topo_order < tables["tb_mart"].topo_order < tables["tb_report"].topo_order
+    assert tables["tb_lookup"].topo_order < tables["tb_stage"].topo_order
+    assert {(d.dependency_table.name, d.is_required) for d in tables["tb_stage"].dependencies} == {("tb_raw", True), ("tb_lookup", False)}
+    assert [p.name for p in tables["tb_report"].partitions] == ["dt"]
+    assert {(t.alias, t.debounce_seconds) for t in session.query(TaskTable).all()} == {("mart_sfn", 10), ("report_sfn", 30)}
+
+    status, body = bulk(
+        table("tb_a", [{"dependency_name": "tb_b"}]),
+        table("tb_b", [{"dependency_name": "tb_a"}]),
+        table("tb_c", [{"dependency_name": "tb_missing"}], [{"alias": "c_task", "task_executor": "glue_executor"}]),
+        table("tb_raw", []),
+        table("tb_ok", [{"dependency_id": tables["tb_raw"].id}]),
+        {"description": "sem nome"},
+    )
+    assert status == 400
+    assert body["imported"] is False and body["count"] == 0
+    items = body["items"]
+    assert items[0]["errors"] == ["Circular dependency detected involving 'tb_a'."]
+    assert items[1]["errors"] == ["Circular dependency detected involving 'tb_b'."]
+    assert items[2]["errors"] == ["Dependency table 'tb_missing' not found.", "Task executor 'glue_executor' not found for task 'c_task'."]
+    assert items[3]["errors"] == ["Table 'tb_raw' already exists."]
+    assert items[4] == {"index": 4, "name": "tb_ok", "status": "valid"}
+    assert items[5]["status"] == "invalid" and items[5]["errors"][0].startswith("name:")
+    assert session.query(Tables).filter(Tables.name.in_(["tb_a", "tb_b", "tb_c", "tb_ok"])).count() == 0
+
+
+def test_update_table_upserts_partitions_and_dependencies(test_injector, itaufluxcontrol: ItauFluxControl, query_budget):
+    """
+    Testa a sincronização de partições e dependências numa atualização:
+    flags alteradas, itens removidos (soft delete) e reenviados, com o mesmo
+    número de statements qualquer que seja a quantidade de itens.
+    """
+    def table(name, partitions, dependencies):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": partitions, "dependencies": dependencies, "tasks": []}
+
+    def save(method, path, *tables):
+        event = {"httpMethod": method, "path": path, "body": json.dumps({"data": list(tables), "user": "lrcxpnu"})}
+        assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    partitions = [{"name": f"p{i}", "type": "int"} for i in range(10)]
+    save("POST", "/tables",
+        table("tb_raw", [], []),
+        table("tb_lookup", [], []),
+        table("tb_stage", partitions, [{"dependency_name": "tb_raw", "is_required": False}, {"dependency_name": "tb_lookup"}]),
+    )
+    session = test_injector.get(SessionProvider).get_session()
+    ids = {t.name: t.id for t in session.query(Tables).all()}
+
+    updated = [{**p, "is_required": p["name"] == "p0"} for p in partitions[:9]] + [{"name": "p10", "type": "date"}]
+    with query_budget(12, "PUT /tables com 10 partições"):
+        save("PUT", f"/tables/{ids['tb_stage']}", table("tb_stage", updated, [{"dependency_name": "tb_raw", "is_required": True}]))
+
+    session.expire_all()
+    stage = session.get(Tables, ids["tb_stage"])
+    assert sorted(p.name for p in stage.partitions) == sorted([f"p{i}" for i in range(9)] + ["p10"])
+    assert [p.name for p in stage.partitions if p.is_required] == ["p0"]
+    assert [(d.dependency_table.name, d.is_required) for d in stage.dependencies] == [("tb_raw", True)]
+    assert session.query(Dependencies).filter(Dependencies.table_id == ids["tb_stage"], Dependencies.date_deleted.isnot(None)).count() == 1
+
+    save("PUT", f"/tables/{ids['tb_stage']}", {"name": "tb_stage", "description": "sem listas"})
+    save("PUT", f"/tables/{ids['tb_stage']}", table("tb_stage", partitions, [{"dependency_name": "tb_raw"}, {"dependency_name": "tb_lookup"}]))
+    session.expire_all()
+    stage = session.get(Tables, ids["tb_stage"])
+    assert sorted(p.name for p in stage.partitions) == sorted(p["name"] for p in partitions)
+    assert sorted(d.dependency_table.name for d in stage.dependencies) == ["tb_lookup", "tb_raw"]
+    assert session.query(Dependencies).filter(Dependencies.table_id == ids["tb_stage"]).count() == 2
+
+
+def test_tables_are_isolated_by_tenant(db_session, itaufluxcontrol: ItauFluxControl):
+    """
+    Testa o isolamento por tenant: o header `X-Tenant-Id` grava o tenant nas
+    linhas criadas e restringe as consultas; sem header vale o tenant padrão.
+    """
+    def table(name):
+        return {"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "date"}], "dependencies": [], "tasks": []}
+
+    def request(method, path, tenant_id=None, body=None):
+        event = {"httpMethod": method, "path": path, "body": json.dumps(body) if body else None}
+        if tenant_id:
+            event["headers"] = {"X-Tenant-Id": str(tenant_id)}
+        return itaufluxcontrol.process_event(event, None)
+
+    def table_names(tenant_id=None):
+        response = request("GET", "/tables", tenant_id)
+        assert response["statusCode"] == 200
+        return sorted(item["name"] for item in json.loads(response["body"]))
+
+    assert request("POST", "/tables", body={"data": [table("tb_default")], "user": "lrcxpnu"})["statusCode"] == 200
+    assert request("POST", "/tables", 2, {"data": [table("tb_tenant_2")], "user": "lrcxpnu"})["statusCode"] == 200
+
+    assert table_names() == ["tb_default"]
+    assert table_names(2) == ["tb_tenant_2"]
+    assert table_names(3) == []
+    # SQL textual não recebe o filtro de tenant
+    assert set(db_session.execute(text("SELECT name, tenant_id FROM tables")).all()) == {("tb_default", 1), ("tb_tenant_2", 2)}
+
+    tenant_2_table_id = db_session.execute(text("SELECT id FROM tables WHERE name = 'tb_tenant_2'")).scalar()
+    assert request("GET", f"/tables/{tenant_2_table_id}")["statusCode"] == 404
+    assert request("GET", "/tables", "abc")["statusCode"] == 400
@@ -0,0 +1,181 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from injector import Injector, Binder, singleton
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.itaufluxcontrol.config.config import AppModule
+from src.itaufluxcontrol.itaufluxcontrol import ItauFluxControl
+from src.itaufluxcontrol.models.base import Base
+from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
+from src.itaufluxcontrol.models.task_executor import TaskExecutor
+from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+from src.itaufluxcontrol.provider.session_provider import SessionProvider
+from src.itaufluxcontrol.service.boto_service import BotoService
+from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockSchedulerClient, MockStepFunctionClient
+from src.tests.providers.mock_session_provider import TestSessionProvider
+from src.tests.providers.query_budget import query_budget
+
+
+@pytest.fixture
+def mock_boto_service():
+    return MockBotoService(
+        mock_scheduler_client=MockSchedulerClient(),
+        step_function_client=MockStepFunctionClient(),
+    )
+
+@pytest.fixture
+def db_session():
+    """
+    Fixture de banco de dados em memória, com as tabelas do projeto.
+    """
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(engine)
+
+@pytest.fixture
+def test_injector(db_session, mock_boto_service):
+    """
+    Injector com o backend `database` do debounce.
+    """
+    class TestModule(AppModule):
+        def configure(self, binder: Binder) -> None:
+            super().configure(binder)
+            binder.bind(BotoService, to=mock_boto_service, scope=singleton)
+            binder.bind(SessionProvider, to=TestSessionProvider(db_session))
+
+    return Injector([TestModule(scheduler_backend="database")])
+
+@pytest.fixture
+def itaufluxcontrol(test_injector):
+    from aws_lambda_powertools.event_handler import ApiGatewayResolver
+    return ItauFluxControl(
+        injector=test_injector,
+        app_resolver=ApiGatewayResolver(),
+    )
+
+
+def create_tables(itaufluxcontrol: ItauFluxControl, session, dependencies):
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    session.add(TaskExecutor(alias="step_function_executor", method="stepfunction_process", identification="arn:aws:states:us-east-1:123456789012:stateMachine:my-state-machine"))
+    data = [
+        {"name": name, "description": f"Tabela {name}", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []}
+        for name in dependencies
+    ]
+    data.append({
+        "name": "tb_dependente",
+        "description": "Tabela dependente",
+        "requires_approval": False,
+        "partitions": partitions,
+        "dependencies": [{"dependency_name": name, "is_required": True} for name in dependencies],
+        "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+    })
+    event = {"httpMethod": "POST", "path": "/tables", "body": json.dumps({"data": data, "user": "lrcxpnu"})}
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+
+def register(itaufluxcontrol: ItauFluxControl, table_name: str):
+    event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [{"table_name": table_name, "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+            "user": "lrcxpnu"
+        })
+    }
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+
+def tick(itaufluxcontrol: ItauFluxControl):
+    response = itaufluxcontrol.process_event({"httpMethod": "POST", "path": "/scheduler/tick", "body": json.dumps({})}, None)
+    assert response["statusCode"] == 200
+    return json.loads(response["body"])
+
+
+def test_debounce_is_stored_in_database_and_dispatched_by_tick(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, query_budget):
+    session = test_injector.get(SessionProvider).get_session()
+    create_tables(itaufluxcontrol, session, ["tb_origem"])
+
+    register(itaufluxcontrol, "tb_origem")
+    task_schedule = session.query(TaskSchedule).one()
+    first_due = task_schedule.scheduled_execution_time
+
+    assert task_schedule.status == "pending"
+    assert first_due > datetime.now()
+    assert mock_boto_service.scheduler._schedules == {}
+    assert session.query(OutboxMessage).filter(OutboxMessage.operation.like("scheduler.%")).count() == 0
+
+    # Inclui o upsert do resumo do processamento e o UPDATE com os executores agendados
+    with query_budget(18, "/register_execution postergando no backend database"):
+        register(itaufluxcontrol, "tb_origem")
+
+    session.refresh(task_schedule)
+    assert session.query(TaskSchedule).count() == 1
+    assert task_schedule.scheduled_execution_time >= first_due
+    assert tick(itaufluxcontrol) == {"due": 0, "triggered": 0, "parked": 0, "failed": 0}
+
+    task_schedule.scheduled_execution_time = datetime.now() - timedelta(seconds=1)
+    session.commit()
+
+    assert tick(itaufluxcontrol) == {"due": 1, "triggered": 1, "parked": 0, "failed": 0}
+    session.refresh(task_schedule)
+    assert task_schedule.status == "in_progress"
+    assert len(mock_boto_service.stepfunctions._executions) == 1
+    assert tick(itaufluxcontrol)["due"] == 0
+
+
+def test_tick_parks_schedules_with_unresolved_dependencies(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service):
+    session = test_injector.get(SessionProvider).get_session()
+    create_tables(itaufluxcontrol, session, ["tb_origem"])
+
+    register(itaufluxcontrol, "tb_origem")
+    session.query(TablePartitionExec).delete()
+    task_schedule = session.query(TaskSchedule).one()
+    task_schedule.scheduled_execution_time = datetime.now() - timedelta(seconds=1)
+    session.commit()
+
+    assert tick(itaufluxcontrol) == {"due": 1, "triggered": 0, "parked": 1, "failed": 0}
+    session.refresh(task_schedule)
+    assert (task_schedule.status, task_schedule.scheduled_execution_time, task_schedule.claimed_at) == ("pending", None, None)
+    assert tick(itaufluxcontrol)["due"] == 0
+    assert mock_boto_service.stepfunctions._executions == {}
+
+
+
+def test_reconcile_leaves_due_times_alone(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service):
+    session = test_injector.get(SessionProvider).get_session()
+    create_tables(itaufluxcontrol, session, ["tb_origem"])
+    register(itaufluxcontrol, "tb_origem")
+    task_schedule = session.query(TaskSchedule).one()
+    due = task_schedule.scheduled_execution_time
+
+    event = {"httpMethod": "POST", "path": "/scheduler/reconcile", "body": json.dumps({"dry_run": False})}
+    response = itaufluxcontrol.process_event(event, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"dry_run": False, "skipped": True}
+    session.refresh(task_schedule)
+    assert task_schedule.scheduled_execution_time == due
+    assert session.query(OutboxMessage).count() == 0
+
+def test_scheduler_worker_runs_ticks(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service):
+    session = test_injector.get(SessionProvider).get_session()
+    create_tables(itaufluxcontrol, session, ["tb_origem"])
+    register(itaufluxcontrol, "tb_origem")
+    session.query(TaskSchedule).one().scheduled_execution_time = datetime.now() - timedelta(seconds=1)
+    session.commit()
+
+    itaufluxcontrol.run_scheduler_worker(interval_seconds=0, max_ticks=2)
+
+    assert session.query(TaskSchedule).one().status == "in_progress"
+    assert len(mock_boto_service.stepfunctions._executions) == 1
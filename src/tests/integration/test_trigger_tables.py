@@ -16,6 +16,7 @@ from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.service.boto_service import BotoService
 from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockEventsClient, MockGlueClient, MockLambdaClient, MockRequestsClient, MockSQSClient, MockSchedulerClient, MockStepFunctionClient
 from src.tests.providers.mock_session_provider import TestSessionProvider
+from src.tests.providers.query_budget import query_budget
 
 @pytest.fixture
 def mock_boto_service():
@@ -966,4 +967,656 @@ def test_when_reject_execute_table_should_not_trigger_execution(test_injector, i
     
     all_schedules = session.query(TaskSchedule).all()
     assert len(all_schedules) == 1, f"Esperava 1 agendamento, mas encontrou {len(all_schedules)}"
-    assert len(mock_scheduler_client._schedules) == 0, f"Esperava 0 agendamento, mas encontrou {len(mock_scheduler_client._schedules)}"
\ No newline at end of file
+    assert len(mock_scheduler_client._schedules) == 0, f"Esperava 0 agendamento, mas encontrou {len(mock_scheduler_client._schedules)}"
+
+
+def test_register_execution_with_five_dependents_stays_within_query_budget(test_injector, itaufluxcontrol: ItauFluxControl, query_budget):
+    """
+    Orçamento de SQL da rota /register_execution para uma tabela com 5 dependentes.
+    Se a contagem subir, procure N+1 (get_by_id/lazy load dentro de loops).
+    """
+    partitions = [
+        {"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True},
+        {"name": "versao_processamento", "type": "int", "is_required": True}
+    ]
+    dependents = [
+        {
+            "name": f"tb_dependente_{index}",
+            "description": f"Tabela dependente {index}",
+            "requires_approval": False,
+            "partitions": partitions,
+            "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+            "tasks": [
+                {
+                    "task_executor": "step_function_executor",
+                    "alias": f"dependente_{index}_step_function_executor",
+                    "params": {"table_name": "{{table.name}}"},
+                    "debounce_seconds": 30
+                }
+            ]
+        }
+        for index in range(5)
+    ]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {
+                    "name": "tb_origem",
+                    "description": "Tabela de origem",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [],
+                    "tasks": []
+                },
+                *dependents
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session_provider = test_injector.get(SessionProvider)
+    session = session_provider.get_session()
+
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+
+    response = itaufluxcontrol.process_event(event, None)
+    assert response["statusCode"] == 200
+
+    register_event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [
+                {
+                    "table_name": "tb_origem",
+                    "partitions": [
+                        {"partition_name": "ano_mes_referencia", "value": "2405"},
+                        {"partition_name": "versao_processamento", "value": "1"}
+                    ],
+                    "source": "glue"
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    # 1 INSERT no outbox por schedule + claim/leitura/marcação do lote no dreno pós-commit
+    with query_budget(60, "/register_execution com 5 dependentes"):
+        register_response = itaufluxcontrol.process_event(register_event, None)
+
+    assert register_response["statusCode"] == 200
+
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    assert session.query(TaskSchedule).count() == 5
+
+
+def test_sqs_batch_registers_executions_and_reports_partial_failures(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service):
+    """
+    Lote SQS com duas mensagens válidas para a mesma tabela/partição e uma inválida:
+    apenas a inválida volta em batchItemFailures e as dependentes são acionadas uma única vez.
+    """
+    partitions = [
+        {"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True},
+        {"name": "versao_processamento", "type": "int", "is_required": False}
+    ]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {
+                    "name": "tb_origem",
+                    "description": "Tabela de origem",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [],
+                    "tasks": []
+                },
+                *[
+                    {
+                        "name": f"tb_dependente_{index}",
+                        "description": f"Tabela dependente {index}",
+                        "requires_approval": False,
+                        "partitions": partitions,
+                        "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                        "tasks": [
+                            {
+                                "task_executor": "step_function_executor",
+                                "alias": f"dependente_{index}_step_function_executor",
+                                "params": {"table_name": "{{table.name}}"},
+                                "debounce_seconds": 30
+                            }
+                        ]
+                    }
+                    for index in range(2)
+                ]
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+
+    response = itaufluxcontrol.process_event(event, None)
+    assert response["statusCode"] == 200
+
+    def sqs_record(message_id, table_name):
+        return {
+            "messageId": message_id,
+            "eventSource": "aws:sqs",
+            "body": json.dumps({
+                "path": "/register_execution",
+                "body": {
+                    "data": [{
+                        "table_name": table_name,
+                        "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}],
+                        "source": "glue"
+                    }],
+                    "user": "lrcxpnu"
+                }
+            })
+        }
+
+    batch = {"Records": [sqs_record("msg-1", "tb_origem"), sqs_record("msg-2", "tb_inexistente"), sqs_record("msg-3", "tb_origem")]}
+
+    response = itaufluxcontrol.process_event(batch, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-2"}]}
+    origem = session.query(Tables).filter_by(name="tb_origem").one()
+    assert session.query(TableExecution).filter_by(table_id=origem.id).count() == 2
+    assert session.query(TaskSchedule).count() == 2
+    assert len(mock_boto_service.scheduler._schedules) == 2
+
+
+def test_sqs_batch_processes_each_tenant_in_its_own_tenant(test_injector, itaufluxcontrol: ItauFluxControl):
+    """
+    Lote SQS com mensagens de dois tenants: cada grupo roda no seu tenant e
+    nenhuma mensagem volta para a fila só por ser de outro tenant.
+    """
+    from sqlalchemy import text
+
+    def create_table(name, tenant_id):
+        event = {
+            "httpMethod": "POST",
+            "path": "/tables",
+            "headers": {"X-Tenant-Id": str(tenant_id)},
+            "body": json.dumps({
+                "data": [{"name": name, "description": name, "requires_approval": False, "partitions": [{"name": "dt", "type": "int"}], "dependencies": [], "tasks": []}],
+                "user": "lrcxpnu"
+            })
+        }
+        assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    def sqs_record(message_id, table_name, tenant_id):
+        return {
+            "messageId": message_id,
+            "eventSource": "aws:sqs",
+            "body": json.dumps({
+                "path": "/register_execution",
+                "body": {
+                    "data": [{"table_name": table_name, "partitions": [{"partition_name": "dt", "value": "2405"}], "source": "glue"}],
+                    "user": "lrcxpnu",
+                    "tenant_id": tenant_id
+                }
+            })
+        }
+
+    create_table("tb_tenant_1", 1)
+    create_table("tb_tenant_2", 2)
+
+    batch = {"Records": [sqs_record("msg-1", "tb_tenant_2", 2), sqs_record("msg-2", "tb_tenant_1", 1), sqs_record("msg-3", "tb_tenant_1", 2)]}
+    response = itaufluxcontrol.process_event(batch, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-3"}]}
+    session = test_injector.get(SessionProvider).get_session()
+    executions = session.execute(text(
+        "SELECT t.name, e.tenant_id FROM table_execution e JOIN tables t ON t.id = e.table_id ORDER BY e.id"
+    )).all()
+    assert executions == [("tb_tenant_2", 2), ("tb_tenant_1", 1)]
+
+
+def test_scheduler_outage_keeps_schedule_in_outbox_until_sweep(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, monkeypatch):
+    """
+    Com o Scheduler fora do ar o registro é confirmado mesmo assim: o schedule
+    fica no outbox com backoff e é criado pelo sweeper quando o serviço volta.
+    """
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_dependente",
+                    "description": "Tabela dependente",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from datetime import datetime
+    from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    def scheduler_unavailable(**kwargs):
+        raise ConnectionError("Scheduler indisponível")
+
+    monkeypatch.setattr(mock_boto_service.scheduler, "create_schedule", scheduler_unavailable)
+    register_event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [{"table_name": "tb_origem", "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+            "user": "lrcxpnu"
+        })
+    }
+
+    assert itaufluxcontrol.process_event(register_event, None)["statusCode"] == 200
+
+    message = session.query(OutboxMessage).filter_by(operation="scheduler.create_schedule").one()
+    assert session.query(TaskSchedule).count() == 1
+    assert mock_boto_service.scheduler._schedules == {}
+    assert (message.status, message.attempts) == ("pending", 1)
+    assert "Scheduler indisponível" in message.last_error
+
+    monkeypatch.undo()
+    message.next_attempt_at = datetime.utcnow()
+    session.commit()
+
+    response = itaufluxcontrol.process_event({"httpMethod": "POST", "path": "/outbox/sweep", "body": json.dumps({})}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"dispatched": 1, "retrying": 0, "failed": 0}
+    session.refresh(message)
+    assert message.status == "dispatched"
+    assert list(mock_boto_service.scheduler._schedules) == [session.query(TaskSchedule).one().schedule_alias]
+
+
+def test_duplicate_register_execution_with_idempotency_key_is_replayed(test_injector, itaufluxcontrol: ItauFluxControl, query_budget):
+    """
+    Reentrega com o mesmo `Idempotency-Key` devolve a resposta armazenada sem
+    registrar execuções nem agendar de novo; outra chave registra normalmente.
+    """
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_dependente",
+                    "description": "Tabela dependente",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from src.itaufluxcontrol.models.idempotency_key import IdempotencyKey
+    from src.itaufluxcontrol.models.outbox_message import OutboxMessage
+    from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    def register_event(idempotency_key):
+        return {
+            "httpMethod": "POST",
+            "path": "/register_execution",
+            "headers": {"idempotency-key": idempotency_key},
+            "body": json.dumps({
+                "data": [{"table_name": "tb_origem", "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+                "user": "lrcxpnu"
+            })
+        }
+
+    first = itaufluxcontrol.process_event(register_event("glue-run-1"), None)
+    assert first["statusCode"] == 200
+    assert session.query(TablePartitionExec).count() == 1
+    outbox_messages = session.query(OutboxMessage).count()
+
+    with query_budget(2, "/register_execution reentregue"):
+        replay = itaufluxcontrol.process_event(register_event("glue-run-1"), None)
+
+    assert replay["statusCode"] == 200
+    assert replay["multiValueHeaders"]["Idempotent-Replayed"] == ["true"]
+    assert json.loads(replay["body"]) == json.loads(first["body"])
+    assert session.query(TablePartitionExec).count() == 1
+    assert session.query(OutboxMessage).count() == outbox_messages
+    assert session.query(IdempotencyKey).one().status == "completed"
+
+    assert itaufluxcontrol.process_event(register_event("glue-run-2"), None)["statusCode"] == 200
+    assert session.query(TablePartitionExec).count() == 2
+
+
+def test_idempotency_key_is_completed_in_the_work_commit(test_injector, itaufluxcontrol: ItauFluxControl, monkeypatch):
+    """
+    A chave nunca chega ao banco em andamento: é concluída antes do único commit
+    do trabalho, e um erro a descarta junto com o trabalho.
+    """
+    from src.itaufluxcontrol.models.idempotency_key import IdempotencyKey
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+
+    session_provider = test_injector.get(SessionProvider)
+    session = session_provider.get_session()
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    assert itaufluxcontrol.process_event({
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [{"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []}],
+            "user": "lrcxpnu"
+        })
+    }, None)["statusCode"] == 200
+
+    committed_statuses = []
+    commit = session_provider.commit
+
+    def spy_commit():
+        committed_statuses.extend(status for status, in session.query(IdempotencyKey.status))
+        commit()
+
+    monkeypatch.setattr(session_provider, "commit", spy_commit)
+
+    def register_event(idempotency_key, table_name):
+        return {
+            "httpMethod": "POST",
+            "path": "/register_execution",
+            "headers": {"idempotency-key": idempotency_key},
+            "body": json.dumps({
+                "data": [{"table_name": table_name, "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+                "user": "lrcxpnu"
+            })
+        }
+
+    assert itaufluxcontrol.process_event(register_event("glue-run-1", "tb_origem"), None)["statusCode"] == 200
+    assert committed_statuses and set(committed_statuses) == {"completed"}
+
+    committed_statuses.clear()
+    assert itaufluxcontrol.process_event(register_event("glue-run-2", "tb_inexistente"), None)["statusCode"] != 200
+    assert "in_progress" not in committed_statuses
+    assert [key.status for key in session.query(IdempotencyKey)] == ["completed"]
+
+
+def test_concurrent_trigger_exits_on_claim_until_lease_expires(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, query_budget):
+    """
+    Um agendamento já reivindicado por outra entrega é ignorado logo no claim,
+    sem resolver dependências; depois do lease o claim abandonado é retomado.
+    """
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_dependente",
+                    "description": "Tabela dependente",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from datetime import datetime, timedelta
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    session.add(TaskExecutor(alias="step_function_executor", method="stepfunction_process", identification="arn:aws:states:us-east-1:123456789012:stateMachine:my-state-machine"))
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    register_event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [{"table_name": "tb_origem", "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+            "user": "lrcxpnu"
+        })
+    }
+    assert itaufluxcontrol.process_event(register_event, None)["statusCode"] == 200
+
+    schedule = next(iter(mock_boto_service.scheduler._schedules.values()))
+    trigger_event = json.loads(schedule["Target"]["Input"])
+    trigger_event["body"] = json.dumps(trigger_event["body"])
+
+    task_schedule = session.query(TaskSchedule).one()
+    task_schedule.claimed_at = datetime.utcnow()
+    session.commit()
+
+    with query_budget(5, "/trigger de agendamento já reivindicado"):
+        response = itaufluxcontrol.process_event({**trigger_event, "headers": {"Idempotency-Key": "entrega-1"}}, None)
+
+    assert response["statusCode"] == 200
+    session.refresh(task_schedule)
+    assert task_schedule.status == "pending"
+    assert task_schedule.schedule_deleted_at is None
+    assert mock_boto_service.stepfunctions._executions == {}
+
+    task_schedule.claimed_at = datetime.utcnow() - timedelta(hours=1)
+    session.commit()
+
+    response = itaufluxcontrol.process_event({**trigger_event, "headers": {"Idempotency-Key": "entrega-2"}}, None)
+
+    assert response["statusCode"] == 200
+    session.refresh(task_schedule)
+    assert task_schedule.status == "in_progress"
+    assert task_schedule.schedule_deleted_at is not None
+    assert len(mock_boto_service.stepfunctions._executions) == 1
+
+
+def test_scheduler_reconcile_repairs_drift(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, monkeypatch):
+    """
+    O sweeper de reconciliação reporta em dry-run e depois corrige: remove o
+    schedule órfão e recria o schedule perdido do agendamento pendente.
+    """
+    monkeypatch.setenv("SCHEDULER_RECONCILE_PAGE_SIZE", "1")
+    monkeypatch.setenv("SCHEDULER_RECONCILE_RATE_PER_SECOND", "0")
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_dependente",
+                    "description": "Tabela dependente",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    register_event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [{"table_name": "tb_origem", "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+            "user": "lrcxpnu"
+        })
+    }
+    assert itaufluxcontrol.process_event(register_event, None)["statusCode"] == 200
+
+    schedule_alias = session.query(TaskSchedule).one().schedule_alias
+    mock_boto_service.scheduler._schedules.pop(schedule_alias)
+    mock_boto_service.scheduler._schedules["20250101000000-99"] = {}
+    mock_boto_service.scheduler._schedules["schedule-de-outro-sistema"] = {}
+
+    reconcile_event = {"httpMethod": "POST", "path": "/scheduler/reconcile", "body": json.dumps({})}
+    response = itaufluxcontrol.process_event(reconcile_event, None)
+
+    assert response["statusCode"] == 200
+    report = json.loads(response["body"])
+    assert report["dry_run"] is True
+    assert report["found"] == {"expire": 0, "delete": 1, "recreate": 1}
+    assert report["actions"]["delete"] == ["20250101000000-99"]
+    assert sorted(mock_boto_service.scheduler._schedules) == ["20250101000000-99", "schedule-de-outro-sistema"]
+
+    reconcile_event["body"] = json.dumps({"dry_run": False})
+    response = itaufluxcontrol.process_event(reconcile_event, None)
+
+    assert response["statusCode"] == 200
+    assert sorted(mock_boto_service.scheduler._schedules) == [schedule_alias, "schedule-de-outro-sistema"]
+
+    report = json.loads(itaufluxcontrol.process_event({**reconcile_event, "body": json.dumps({})}, None)["body"])
+    assert report["found"] == {"expire": 0, "delete": 0, "recreate": 0}
+
+
+def test_schedules_are_grouped_per_table_and_deleted_after_completion(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, monkeypatch):
+    """
+    Com `SCHEDULER_GROUP_STRATEGY=table` o schedule é criado no grupo da
+    tabela (o grupo é criado no primeiro envio), como execução única que o
+    Scheduler remove depois de disparar.
+    """
+    monkeypatch.setenv("SCHEDULER_GROUP_STRATEGY", "table")
+    partitions = [{"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    event = {
+        "httpMethod": "POST",
+        "path": "/tables",
+        "body": json.dumps({
+            "data": [
+                {"name": "tb_origem", "description": "Tabela de origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+                {
+                    "name": "tb_dependente",
+                    "description": "Tabela dependente",
+                    "requires_approval": False,
+                    "partitions": partitions,
+                    "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+                    "tasks": [{"task_executor": "step_function_executor", "alias": "dependente_step_function_executor", "params": {}, "debounce_seconds": 30}]
+                }
+            ],
+            "user": "lrcxpnu"
+        })
+    }
+
+    session = test_injector.get(SessionProvider).get_session()
+
+    from src.itaufluxcontrol.models.task_executor import TaskExecutor
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
+    assert itaufluxcontrol.process_event(event, None)["statusCode"] == 200
+
+    register_event = {
+        "httpMethod": "POST",
+        "path": "/register_execution",
+        "body": json.dumps({
+            "data": [{"table_name": "tb_origem", "partitions": [{"partition_name": "ano_mes_referencia", "value": "2405"}], "source": "glue"}],
+            "user": "lrcxpnu"
+        })
+    }
+    assert itaufluxcontrol.process_event(register_event, None)["statusCode"] == 200
+    assert itaufluxcontrol.process_event(register_event, None)["statusCode"] == 200
+
+    task_schedule = session.query(TaskSchedule).one()
+    dependent_table = session.query(Tables).filter_by(name="tb_dependente").one()
+    assert task_schedule.schedule_group == f"itaufluxcontrol-{dependent_table.id}"
+
+    schedule = mock_boto_service.scheduler._schedules[task_schedule.schedule_alias]
+    assert schedule["GroupName"] == task_schedule.schedule_group
+    assert schedule["ActionAfterCompletion"] == "DELETE"
+    assert schedule["ScheduleExpression"].startswith("at(")
+    assert task_schedule.schedule_group in mock_boto_service.scheduler._groups
+
+
+@pytest.mark.parametrize("recursive_cte", [True, False])
+def test_execution_lineage_up_and_down(test_injector, itaufluxcontrol: ItauFluxControl, query_budget, monkeypatch, recursive_cte):
+    """
+    /executions/<id>/lineage segue os agendamentos (execução de disparo ->
+    execução produzida) nos dois sentidos, com a CTE recursiva ou, sem
+    suporte a ela, com a busca por nível.
+    """
+    from src.itaufluxcontrol.models.partitions import Partitions
+    from src.itaufluxcontrol.models.table_partition_exec import TablePartitionExec
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    from src.itaufluxcontrol.models.task_table import TaskTable
+    from src.itaufluxcontrol.repositories.task_schedule_repository import TaskScheduleRepository
+
+    monkeypatch.setattr(TaskScheduleRepository, "supports_recursive_cte", lambda self: recursive_cte)
+    session = test_injector.get(SessionProvider).get_session()
+    tables = [Tables(name=name, created_by="lrcxpnu") for name in ("tb_a", "tb_b", "tb_c", "tb_d")]
+    session.add_all(tables)
+    session.flush()
+    partition = Partitions(table_id=tables[0].id, name="ano_mes_referencia", type="int")
+    tasks = [TaskTable(table_id=table.id, alias=f"task_{table.name}", params={}) for table in tables[1:]]
+    executions = [TableExecution(table_id=table.id, source="glue") for table in tables[:3]]
+    session.add_all([partition, *tasks, *executions])
+    session.flush()
+    session.add(TablePartitionExec(table_id=tables[0].id, partition_id=partition.id, value="202305", execution_id=executions[0].id))
+    a, b, c = executions
+    to_b = TaskSchedule(task_id=tasks[0].id, table_execution_id=a.id, result_execution_id=b.id, unique_alias="a-b", status="completed")
+    to_c = TaskSchedule(task_id=tasks[1].id, table_execution_id=b.id, result_execution_id=c.id, unique_alias="b-c", status="completed")
+    to_d = TaskSchedule(task_id=tasks[2].id, table_execution_id=a.id, unique_alias="a-d", status="pending")
+    session.add_all([to_b, to_c, to_d])
+    session.commit()
+
+    def lineage(execution_id, **params):
+        response = itaufluxcontrol.process_event({
+            "httpMethod": "GET", "path": f"/executions/{execution_id}/lineage", "queryStringParameters": params,
+        }, None)
+        return response["statusCode"], json.loads(response["body"])
+
+    # Fallback: uma consulta por nível (a, b e c) no lugar da CTE, mais a descrição dos agendamentos
+    origin_id = a.id
+    with query_budget(3 if recursive_cte else 6, "/executions/<id>/lineage para baixo"):
+        status, body = lineage(origin_id, direction="down")
+    assert status == 200
+    assert [(item["id"], item["depth"]) for item in body["executions"]] == [(a.id, 0), (b.id, 1), (c.id, 2)]
+    assert body["executions"][0]["partitions"] == {"ano_mes_referencia": "202305"}
+    assert body["executions"][1]["table_name"] == "tb_b"
+    assert [(item["id"], item["depth"]) for item in body["schedules"]] == [(to_b.id, 1), (to_d.id, 1), (to_c.id, 2)]
+    assert body["schedules"][1]["task_alias"] == "task_tb_d" and body["schedules"][1]["result_execution_id"] is None
+
+    status, body = lineage(a.id, direction="down", depth="1")
+    assert [item["id"] for item in body["executions"]] == [a.id, b.id]
+    assert [item["id"] for item in body["schedules"]] == [to_b.id, to_d.id]
+
+    status, body = lineage(c.id, direction="up")
+    assert [(item["id"], item["depth"]) for item in body["executions"]] == [(c.id, 0), (b.id, 1), (a.id, 2)]
+    assert [item["id"] for item in body["schedules"]] == [to_c.id, to_b.id]
+
+    assert lineage(999)[0] == 404
+    assert lineage(a.id, direction="sideways")[0] == 400
+    assert lineage(a.id, depth="0")[0] == 400
@@ -16,6 +16,7 @@ from src.itaufluxcontrol.provider.session_provider import SessionProvider
 from src.itaufluxcontrol.service.boto_service import BotoService
 from src.tests.providers.mock_scheduler_cliente_provider import MockBotoService, MockEventsClient, MockGlueClient, MockLambdaClient, MockRequestsClient, MockSQSClient, MockSchedulerClient, MockStepFunctionClient
 from src.tests.providers.mock_session_provider import TestSessionProvider
+from src.tests.providers.query_budget import query_budget
 
 @pytest.fixture
 def mock_boto_service():
@@ -428,7 +429,7 @@ def test_add_table_route_with_dependencies(test_injector, itaufluxcontrol: ItauF
             f"{expected_deps[dep.dependency_table.name]}"
         )
 
-def test_add_table_and_register_executions(test_injector, itaufluxcontrol: ItauFluxControl):
+def test_add_table_and_register_executions(test_injector, itaufluxcontrol: ItauFluxControl, query_budget):
     """
     1) Cria múltiplas tabelas (rota /tables).
     2) Verifica se foram salvas corretamente.
@@ -573,7 +574,9 @@ def test_add_table_and_register_executions(test_injector, itaufluxcontrol: ItauF
     from src.itaufluxcontrol.models.task_executor import TaskExecutor
     session.add(TaskExecutor(alias="step_function_executor", method="step_function"))
 
-    response = itaufluxcontrol.process_event(event, None)
+    # Por tabela: INSERT, topo_order, e um SELECT + upsert para partições e dependências
+    with query_budget(28, "/tables com 4 tabelas"):
+        response = itaufluxcontrol.process_event(event, None)
 
     assert response["statusCode"] == 200
 
@@ -664,7 +667,8 @@ def test_add_table_and_register_executions(test_injector, itaufluxcontrol: ItauF
     mock_boto_service = test_injector.get(BotoService)
     mock_scheduler_client = mock_boto_service.get_client('scheduler')
 
-    register_response = itaufluxcontrol.process_event(register_event, None)
+    with query_budget(75, "/register_execution com 4 execuções"):
+        register_response = itaufluxcontrol.process_event(register_event, None)
 
     assert register_response["statusCode"] == 200
 
@@ -1017,7 +1021,8 @@ def test_add_table_and_register_executions_and_trigger_process(
             "schedule_alias": schedule_alias,
             "unique_alias": schedule_unique_alias
         },
-        "partitions": {}
+        "partitions": {},
+        "tenant_id": 1
     }
 
     expected_trigger_event = {
@@ -1173,5 +1178,156 @@ def test_add_table_and_register_executions_and_trigger_process(
     assert len(all_schedules) == 1, f"Esperava 1 agendamento, mas encontrou {len(all_schedules)}"
     assert task_schedule.status == STATIC_SCHEDULE_COMPLETED, f"Esperava status '{STATIC_SCHEDULE_COMPLETED}', mas encontrou {task_schedule.status}"
 
+    latency_response = itaufluxcontrol.process_event({"httpMethod": "GET", "path": "/analytics/latency"}, None)
+    assert latency_response["statusCode"] == 200
+    latency = json.loads(latency_response["body"])
+    assert [(row["table_name"], row["count"]) for row in latency["tables"]] == [("tb_op_enriquecido", 1)]
+    assert latency["critical_paths"][0]["tables"][-1]["name"] == "tb_op_enriquecido"
+
     print(f"Teste para {executor_method} passou com sucesso")
-    
\ No newline at end of file
+
+
+def test_approve_and_reject_in_batch(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service, query_budget):
+    """
+    /approve/batch por filtro (tabela + partição) e /reject/batch por IDs, com
+    um resultado por item e os eventos agendados pelo outbox de uma vez.
+    """
+    from src.itaufluxcontrol.models.tables import Tables
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+    from src.itaufluxcontrol.models.task_table import TaskTable
+
+    session = test_injector.get(SessionProvider).get_session()
+    executor = TaskExecutor(alias="mock_executor", method="stepfunction_process", identification="arn:aws:states:::stateMachine:mock", target_role_arn="arn:aws:iam:::role/mock")
+    table = Tables(name="tb_aprovada", requires_approval=True, created_by="lrcxpnu")
+    other_table = Tables(name="tb_outra", requires_approval=True, created_by="lrcxpnu")
+    session.add_all([executor, table, other_table])
+    session.flush()
+    task = TaskTable(table_id=table.id, task_executor_id=executor.id, alias="aprovada", params={}, debounce_seconds=30)
+    other_task = TaskTable(table_id=other_table.id, task_executor_id=executor.id, alias="outra", params={}, debounce_seconds=30)
+    execution = TableExecution(table_id=table.id, source="glue")
+    session.add_all([task, other_task, execution])
+    session.flush()
+
+    approvals = []
+    for index, (task_table, month) in enumerate([(task, "202305"), (task, "202305"), (task, "202306"), (other_task, "202305")]):
+        schedule = TaskSchedule(
+            task_id=task_table.id, table_execution_id=execution.id, unique_alias=f"alias-{index}",
+            schedule_alias=f"20261019100000-{index}", status="waiting_approval",
+            partitions=json.dumps({"ano_mes_referencia": month}),
+        )
+        session.add(schedule)
+        session.flush()
+        approvals.append(ApprovalStatus(task_schedule_id=schedule.id, status=STATIC_APPROVE_STATUS_PENDING))
+    session.add_all(approvals)
+    session.commit()
+
+    approve_event = {
+        "httpMethod": "POST",
+        "path": "/approve/batch",
+        "body": json.dumps({
+            "filter": {"table_name": "tb_aprovada", "partitions": {"ano_mes_referencia": "202305"}},
+            "user": "lrcxpnu"
+        })
+    }
+    with query_budget(12, "/approve/batch com 2 aprovações"):
+        response = itaufluxcontrol.process_event(approve_event, None)
+
+    assert response["statusCode"] == 200
+    report = json.loads(response["body"])
+    assert report["count"] == 2 and report["has_more"] is False
+    assert [item["status"] for item in report["items"]] == ["approved", "approved"]
+    approved_ids = [item["approval_status_id"] for item in report["items"]]
+    assert approved_ids == [approvals[0].id, approvals[1].id]
+
+    session.expire_all()
+    schedules = {s.unique_alias: s for s in session.query(TaskSchedule).all()}
+    assert schedules["alias-0"].status == "pending" and schedules["alias-0"].scheduled_execution_time is not None
+    assert schedules["alias-2"].status == "waiting_approval"
+    assert set(mock_boto_service.get_client('scheduler')._schedules) == {"20261019100000-0", "20261019100000-1"}
+
+    reject_event = {
+        "httpMethod": "POST",
+        "path": "/reject/batch",
+        "body": json.dumps({
+            "approval_status_ids": [approvals[0].id, approvals[2].id, 999],
+            "user": "lrcxpnu"
+        })
+    }
+    response = itaufluxcontrol.process_event(reject_event, None)
+
+    assert response["statusCode"] == 200
+    assert [item["status"] for item in json.loads(response["body"])["items"]] == ["not_pending", "rejected", "not_found"]
+    session.expire_all()
+    assert session.get(ApprovalStatus, approvals[2].id).status == "rejected"
+    assert session.get(ApprovalStatus, approvals[3].id).status == STATIC_APPROVE_STATUS_PENDING
+
+
+def test_process_summary_is_maintained_incrementally(test_injector, itaufluxcontrol: ItauFluxControl, mock_boto_service):
+    """
+    O resumo do processamento (substituto da `table_process_view`) fica com
+    uma linha por tabela x conjunto de partições, atualizada pelo registro de
+    execuções, pela aprovação e pelo fim do agendamento, e é lido em páginas.
+    """
+    from src.itaufluxcontrol.models.table_process_summary import TableProcessSummary
+    from src.itaufluxcontrol.models.task_schedule import TaskSchedule
+
+    session = test_injector.get(SessionProvider).get_session()
+    session.add(TaskExecutor(alias="mock_executor", method="stepfunction_process", identification="arn:aws:states:::stateMachine:mock", target_role_arn="arn:aws:iam:::role/mock"))
+    session.commit()
+
+    def post(path, body):
+        response = itaufluxcontrol.process_event({"httpMethod": "POST", "path": path, "body": json.dumps(body)}, None)
+        assert response["statusCode"] == 200, response["body"]
+        return json.loads(response["body"])
+
+    def register(table_name, month, task_schedule_id=None):
+        post("/register_execution", {
+            "data": [{
+                "table_name": table_name,
+                "partitions": [{"partition_name": "ano_mes_referencia", "value": month}, {"partition_name": "versao", "value": "1"}],
+                "source": "glue",
+                "task_schedule_id": task_schedule_id,
+            }],
+            "user": "lrcxpnu"
+        })
+
+    partitions = [{"name": "versao", "type": "int", "is_required": True}, {"name": "ano_mes_referencia", "type": "int", "is_required": True, "sync_column": True}]
+    post("/tables", {"data": [
+        {"name": "tb_origem", "description": "Origem", "requires_approval": False, "partitions": partitions, "dependencies": [], "tasks": []},
+        {"name": "tb_destino", "description": "Destino", "requires_approval": True, "partitions": partitions,
+         "dependencies": [{"dependency_name": "tb_origem", "is_required": True}],
+         "tasks": [{"task_executor": "mock_executor", "alias": "destino", "params": {}, "debounce_seconds": 30}]},
+    ], "user": "lrcxpnu"})
+
+    register("tb_origem", "202305")
+    register("tb_origem", "202306")
+    register("tb_origem", "202305")
+
+    rows = session.query(TableProcessSummary).order_by(TableProcessSummary.id).all()
+    assert [row.partition_set for row in rows] == ["ano_mes_referencia=202305, versao=1", "ano_mes_referencia=202306, versao=1"]
+    latest = session.query(TableExecution).order_by(TableExecution.id.desc()).first()
+    assert rows[0].execution_id == latest.id
+    assert rows[0].task_executors == "mock_executor" and rows[0].status == "waiting_approval"
+
+    schedule = session.query(TaskSchedule).filter(TaskSchedule.table_execution_id == latest.id).one()
+    approval = session.query(ApprovalStatus).filter(ApprovalStatus.task_schedule_id == schedule.id).one()
+    post("/approve", {"approval_status_id": approval.id, "user": "aprovador"})
+    register("tb_destino", "202305", task_schedule_id=schedule.id)
+
+    session.expire_all()
+    origin = session.get(TableProcessSummary, rows[0].id)
+    assert origin.approver_name == "aprovador" and origin.status == STATIC_SCHEDULE_COMPLETED
+    assert session.query(TableProcessSummary).filter(TableProcessSummary.table_name == "tb_destino").count() == 1
+
+    response = itaufluxcontrol.process_event({"httpMethod": "GET", "path": "/process-summary", "queryStringParameters": {"limit": "2"}}, None)
+    assert response["statusCode"] == 200
+    page = json.loads(response["body"])
+    assert [item["table_name"] for item in page["items"]] == ["tb_origem", "tb_origem"]
+    assert page["items"][0]["approver_name"] == "aprovador" and page["next_after_id"] == page["items"][1]["id"]
+
+    response = itaufluxcontrol.process_event({"httpMethod": "GET", "path": "/process-summary", "queryStringParameters": {"after_id": str(page["next_after_id"]), "limit": "2"}}, None)
+    page = json.loads(response["body"])
+    assert [item["table_name"] for item in page["items"]] == ["tb_destino"] and page["next_after_id"] is None
+
+    response = itaufluxcontrol.process_event({"httpMethod": "GET", "path": "/process-summary", "queryStringParameters": {"limit": "0"}}, None)
+    assert response["statusCode"] == 400
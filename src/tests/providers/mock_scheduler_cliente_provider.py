@@ -3,6 +3,9 @@ class MockBotoExceptions:
     class ResourceNotFoundException(Exception):
         pass
 
+    class ConflictException(Exception):
+        pass
+
 class MockStepFunctionClient:
     """Mock do client 'stepfunctions' do boto3, armazenando execuções em memória."""
 
@@ -29,49 +32,74 @@ class MockSchedulerClient:
 
     def __init__(self):
         self._schedules = {}  
+        self._groups = {"default"}
         self.exceptions = MockBotoExceptions
 
-    def list_schedules(self, NamePrefix=None):
+    def list_schedules(self, NamePrefix=None, GroupName=None, MaxResults=100, NextToken=None):
         """
-        Retorna schedules cujos nomes comecem com NamePrefix (ignora case).
+        Retorna schedules cujos nomes comecem com NamePrefix (ignora case) e,
+        se informado, do grupo GroupName, paginando com MaxResults/NextToken
+        como a API real.
         """
         schedules = []
         for name, schedule_info in self._schedules.items():
-            if NamePrefix and name.lower().startswith(NamePrefix.lower()):
-                schedules.append({"Name": name, **schedule_info})
-        return {"Schedules": schedules}
+            schedule = {"Name": name, "GroupName": "default", **schedule_info}
+            if NamePrefix is not None and not name.lower().startswith(NamePrefix.lower()):
+                continue
+            if GroupName is not None and schedule["GroupName"] != GroupName:
+                continue
+            schedules.append(schedule)
+        start = int(NextToken or 0)
+        response = {"Schedules": schedules[start:start + MaxResults]}
+        if start + MaxResults < len(schedules):
+            response["NextToken"] = str(start + MaxResults)
+        return response
+
+    def create_schedule_group(self, Name):
+        """
+        Cria um grupo de schedules, senão lança ConflictException se já existir.
+        """
+        if Name in self._groups:
+            raise self.exceptions.ConflictException(f"Schedule group '{Name}' already exists.")
+        self._groups.add(Name)
+        return {"ScheduleGroupArn": f"arn:aws:scheduler:::schedule-group/{Name}"}
 
-    def create_schedule(self, Name, ScheduleExpression, FlexibleTimeWindow, Target):
+    def create_schedule(self, Name, ScheduleExpression, FlexibleTimeWindow, Target, GroupName="default", ActionAfterCompletion="NONE"):
         """
-        Cria um 'Schedule' em memória.
+        Cria um 'Schedule' em memória; lança ResourceNotFoundException se o grupo não existir.
         """
+        if GroupName not in self._groups:
+            raise self.exceptions.ResourceNotFoundException(f"Schedule group '{GroupName}' not found.")
         print(f"[MockSchedulerClient] Creating schedule: {Name}")
         self._schedules[Name] = {
+            "GroupName": GroupName,
             "ScheduleExpression": ScheduleExpression,
             "FlexibleTimeWindow": FlexibleTimeWindow,
+            "ActionAfterCompletion": ActionAfterCompletion,
             "Target": Target
         }
-        return {"ScheduleArn": f"arn:aws:scheduler:::schedule/{Name}"}
+        return {"ScheduleArn": f"arn:aws:scheduler:::schedule/{GroupName}/{Name}"}
 
-    def update_schedule(self, Name, ScheduleExpression, FlexibleTimeWindow, Target):
+    def update_schedule(self, Name, ScheduleExpression, FlexibleTimeWindow, Target, GroupName="default", ActionAfterCompletion="NONE"):
         """
         Atualiza um schedule se existir, senão lança ResourceNotFoundException.
         """
-        if Name not in self._schedules:
+        if Name not in self._schedules or self._schedules[Name].get("GroupName", "default") != GroupName:
             raise self.exceptions.ResourceNotFoundException(f"Schedule '{Name}' not found.")
 
         self._schedules[Name].update({
             "ScheduleExpression": ScheduleExpression,
             "FlexibleTimeWindow": FlexibleTimeWindow,
+            "ActionAfterCompletion": ActionAfterCompletion,
             "Target": Target
         })
-        return {"ScheduleArn": f"arn:aws:scheduler:::schedule/{Name}", "Success": True}
+        return {"ScheduleArn": f"arn:aws:scheduler:::schedule/{GroupName}/{Name}", "Success": True}
 
-    def delete_schedule(self, Name):
+    def delete_schedule(self, Name, GroupName="default"):
         """
         Deleta um schedule, senão lança ResourceNotFoundException.
         """
-        if Name not in self._schedules:
+        if Name not in self._schedules or self._schedules[Name].get("GroupName", "default") != GroupName:
             raise self.exceptions.ResourceNotFoundException(f"Schedule '{Name}' not found.")
 
         del self._schedules[Name]
@@ -188,8 +216,36 @@ class MockRequestsClient:
 
 
 
+import random
+import time
+
 from src.itaufluxcontrol.service.boto_service import BotoService
 
+
+class LatencyInjectingClient:
+    """
+    Envolve um client mockado e atrasa cada chamada de método em
+    `latency_ms` (+/- `jitter_ms`), simulando a latência de rede da AWS.
+    Atributos que não são métodos (ex.: `exceptions`) passam direto.
+    """
+
+    def __init__(self, client, latency_ms: float = 0, jitter_ms: float = 0):
+        self._client = client
+        self._latency_ms = latency_ms
+        self._jitter_ms = jitter_ms
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or isinstance(attribute, type):
+            return attribute
+
+        def delayed(*args, **kwargs):
+            delay_ms = self._latency_ms + random.uniform(-self._jitter_ms, self._jitter_ms)
+            time.sleep(max(delay_ms, 0) / 1000)
+            return attribute(*args, **kwargs)
+        return delayed
+
+
 class MockBotoService(BotoService):
     """
     Substitui o BotoService real para testes.
@@ -204,7 +260,9 @@ class MockBotoService(BotoService):
         glue_client=None,
         lambda_client=None,
         events_client=None,
-        requests_client=None 
+        requests_client=None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0
     ):
         self.scheduler = mock_scheduler_client or MockSchedulerClient()
         self.stepfunctions = step_function_client or MockStepFunctionClient()
@@ -213,8 +271,16 @@ class MockBotoService(BotoService):
         self.lambda_ = lambda_client or MockLambdaClient()
         self.events = events_client or MockEventsClient()
         self.requests = requests_client or MockRequestsClient()  
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
 
     def get_client(self, service_name: str):
+        client = self._get_mock_client(service_name)
+        if self.latency_ms or self.jitter_ms:
+            return LatencyInjectingClient(client, self.latency_ms, self.jitter_ms)
+        return client
+
+    def _get_mock_client(self, service_name: str):
         if service_name == 'scheduler':
             return self.scheduler
         elif service_name == 'stepfunctions':
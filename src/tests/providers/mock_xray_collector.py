@@ -0,0 +1,31 @@
+import json
+import socket
+
+
+class MockXRayCollector:
+    """
+    Stub do daemon do X-Ray: escuta UDP em localhost e devolve os
+    segmentos recebidos já decodificados.
+    """
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, 0))
+        self.host, self.port = self._socket.getsockname()
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def receive(self, timeout: float = 1.0) -> dict:
+        """
+        Lê um datagrama no formato `<header JSON>\\n<segmento JSON>`.
+        """
+        self._socket.settimeout(timeout)
+        data, _ = self._socket.recvfrom(65535)
+        header, document = data.decode("utf-8").split("\n", 1)
+        assert json.loads(header) == {"format": "json", "version": 1}
+        return json.loads(document)
+
+    def close(self):
+        self._socket.close()
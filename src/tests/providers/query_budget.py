@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+
+import pytest
+
+from src.itaufluxcontrol.config.query_counter import query_counter
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, label: str = "bloco"):
+    """
+    Falha quando o bloco executa mais statements SQL do que o orçamento.
+    A mensagem lista os statements mais repetidos para facilitar achar N+1.
+    """
+    query_counter.install()
+    with query_counter.count() as stats:
+        yield stats
+    if stats.statements > max_statements:
+        repeated = "\n".join(f"  {count}x {statement}" for statement, count in stats.most_common(5))
+        raise QueryBudgetExceeded(
+            f"{label}: {stats.statements} statements SQL (orçamento: {max_statements})\n{repeated}"
+        )
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Uso: `with query_budget(40, "/register_execution"): ...`
+    """
+    return assert_query_budget